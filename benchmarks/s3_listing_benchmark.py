@@ -0,0 +1,51 @@
+"""Benchmark of `S3Client.get_s3_manifest` listing against a local, moto-backed S3 bucket.
+
+The benchmark fills a mocked bucket with objects spread over `/`-delimited sub-prefixes and times the manifest
+listing for different numbers of workers. Since moto answers requests in-process, a simulated round-trip latency is
+added to every `ListObjectsV2` request to approximate a real S3 endpoint.
+
+Example:
+    $ python benchmarks/s3_listing_benchmark.py --n-objects 20000 --n-prefixes 32 --latency-ms 50 --num-workers 1 8 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import boto3
+import moto
+
+from mleko.utils.s3_helpers import S3Client
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-objects", type=int, default=10_000, help="Number of objects to create.")
+    parser.add_argument("--n-prefixes", type=int, default=16, help="Number of sub-prefixes to spread objects over.")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated latency per listing request.")
+    parser.add_argument("--num-workers", type=int, nargs="+", default=[1, 4, 16], help="Worker counts to time.")
+    args = parser.parse_args()
+
+    with moto.mock_s3():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="benchmark-bucket")
+        for i in range(args.n_objects):
+            s3.put_object(Bucket="benchmark-bucket", Key=f"data/part={i % args.n_prefixes}/{i:08d}.csv", Body=b"")
+
+        s3_client = S3Client(aws_region_name="us-east-1")
+        s3_client._client.meta.events.register(
+            "before-send.s3.ListObjectsV2", lambda **_: time.sleep(args.latency_ms / 1000)
+        )
+
+        print(f"Listing {args.n_objects} objects in {args.n_prefixes} sub-prefixes ({args.latency_ms} ms latency).")
+        for num_workers in args.num_workers:
+            start = time.perf_counter()
+            s3_manifest = s3_client.get_s3_manifest("benchmark-bucket", "data", num_workers=num_workers)
+            elapsed = time.perf_counter() - start
+            print(f"num_workers={num_workers:>4}: {len(s3_manifest)} objects in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
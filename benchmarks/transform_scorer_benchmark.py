@@ -0,0 +1,118 @@
+"""Benchmark of scoring small batches with `BaseTransformer.get_scorer` against `BaseTransformer.transform`.
+
+The benchmark fits a composite of an expression transformer, a min-max and a max-abs scaler, a label and a frequency
+encoder on a synthetic DataFrame, then transforms small batches of rows both with `transform`, building a `vaex`
+DataFrame for every batch, and with the exported scorer. The frequency encoder encodes a string feature and a numerical
+feature with NaN values. The outputs of both paths are checked to be identical before the timings are printed.
+
+Example:
+    $ python benchmarks/transform_scorer_benchmark.py --n-rows 100000 --batch-sizes 1 10 100 --repeats 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from typing import Any
+
+import numpy as np
+import pyarrow as pa
+import vaex
+
+from mleko.dataset.data_schema import DataSchema
+from mleko.dataset.transform import (
+    CompositeTransformer,
+    ExpressionTransformer,
+    FrequencyEncoderTransformer,
+    LabelEncoderTransformer,
+    MaxAbsScalerTransformer,
+    MinMaxScalerTransformer,
+)
+
+
+def make_columns(n_rows: int, seed: int) -> dict[str, Any]:
+    """Generate the columns of a synthetic DataFrame with numerical and categorical features.
+
+    Args:
+        n_rows: Number of rows.
+        seed: Seed of the random number generator.
+
+    Returns:
+        Mapping of column names to arrays.
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        "x": rng.normal(size=n_rows),
+        "y": rng.uniform(1, 100, size=n_rows),
+        "city": pa.array(rng.choice([f"city_{i}" for i in range(50)], size=n_rows)),
+        "device": pa.array(rng.choice(["ios", "android", "web"], size=n_rows)),
+        "rating": rng.choice([1.0, 2.0, 3.0, np.nan], size=n_rows),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-rows", type=int, default=100_000, help="Number of rows to fit the transformers on.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100], help="Batch sizes to time.")
+    parser.add_argument("--repeats", type=int, default=100, help="Number of batches to transform per batch size.")
+    args = parser.parse_args()
+
+    data_schema = DataSchema(numerical=["x", "y", "rating"], categorical=["city", "device"])
+    with tempfile.TemporaryDirectory() as cache_directory:
+        transformer = CompositeTransformer(
+            [
+                ExpressionTransformer(
+                    {"ratio": {"expression": "x / sqrt(y)", "type": "numerical", "is_meta": False}},
+                    cache_directory=cache_directory,
+                ),
+                MinMaxScalerTransformer(features=["y"], cache_directory=cache_directory),
+                MaxAbsScalerTransformer(features=["x", "ratio"], cache_directory=cache_directory),
+                LabelEncoderTransformer(features=["city"], cache_directory=cache_directory),
+                FrequencyEncoderTransformer(features=["device", "rating"], cache_directory=cache_directory),
+            ],
+            cache_directory=cache_directory,
+        )
+        transformer.fit_transform(data_schema, vaex.from_dict(make_columns(args.n_rows, seed=0)), disable_cache=True)
+        scorer = transformer.get_scorer()
+
+        print(f"Scoring batches with transformers fitted on {args.n_rows} rows ({args.repeats} batches per size).")
+        for batch_size in args.batch_sizes:
+            batches = [make_columns(batch_size, seed=seed) for seed in range(1, args.repeats + 1)]
+
+            start = time.perf_counter()
+            transformed = []
+            for batch in batches:
+                _, df = transformer.transform(data_schema, vaex.from_dict(batch), disable_cache=True)
+                transformed.append(
+                    {column: df[column].tolist() for column in ["x", "y", "ratio", "city", "device", "rating"]}
+                )
+            transform_elapsed = (time.perf_counter() - start) / args.repeats
+
+            scorer_batches = [
+                {
+                    column: values.to_pylist() if isinstance(values, pa.Array) else values
+                    for column, values in batch.items()
+                }
+                for batch in batches
+            ]
+            start = time.perf_counter()
+            scored = [scorer(batch) for batch in scorer_batches]
+            scorer_elapsed = (time.perf_counter() - start) / args.repeats
+
+            if any(
+                not np.array_equal(values, scored_batch[column].tolist(), equal_nan=True)
+                for transformed_batch, scored_batch in zip(transformed, scored)
+                for column, values in transformed_batch.items()
+            ):
+                raise AssertionError(f"Scorer output differs from transform output for batch size {batch_size}.")
+
+            print(
+                f"batch_size={batch_size:>5}: transform {transform_elapsed * 1e6:>10.1f} us/batch, "
+                f"scorer {scorer_elapsed * 1e6:>8.1f} us/batch ({transform_elapsed / scorer_elapsed:.0f}x faster)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,13 @@
-"""The module contains a fingerprinter for CSV files supporting Gzipped and raw CSV files."""
+"""The module contains a fingerprinter for CSV files supporting raw and compressed CSV files."""
 
 from __future__ import annotations
 
-import gzip
 import hashlib
 from concurrent import futures
 from itertools import islice
 from pathlib import Path
 
+from mleko.utils.compression_helpers import COMPRESSED_FILE_SUFFIXES, open_compressed_file
 from mleko.utils.custom_logger import CustomLogger
 
 from .base_fingerprinter import BaseFingerprinter
@@ -18,7 +18,7 @@ logger = CustomLogger()
 
 
 class CSVFingerprinter(BaseFingerprinter):
-    """A fingerprinter for CSV files supporting Gzipped and raw CSV files."""
+    """A fingerprinter for CSV files supporting raw and compressed CSV files."""
 
     def __init__(self, n_rows: int = 1000):
         """Initialize the CSVFingerprinter.
@@ -41,7 +41,8 @@ class CSVFingerprinter(BaseFingerprinter):
     def fingerprint(self, data: list[str] | list[Path]) -> str:
         """Generate a fingerprint for the given list of CSV files.
 
-        The currently supported file types are `.csv`, `.gz`, and `.csv.gz`.
+        The currently supported file types are `.csv` and CSV files compressed with gzip (`.gz`), bzip2 (`.bz2`),
+        xz (`.xz`) or Zstandard (`.zst`), e.g. `.csv.zst`.
 
         Args:
             data: A list of file paths to CSV files.
@@ -69,16 +70,12 @@ class CSVFingerprinter(BaseFingerprinter):
         Returns:
             The fingerprint as a hexadecimal string.
         """
-        if file_path.suffix not in {".csv", ".gz", ".csv.gz"}:
+        if file_path.suffix not in {".csv", *COMPRESSED_FILE_SUFFIXES}:
             msg = f"Unsupported file type: {file_path.suffix}"
             logger.error(msg)
             raise ValueError(msg)
 
-        if file_path.suffix in {".gz", ".csv.gz"}:
-            with gzip.open(file_path, "rb") as f:
-                sample = b"".join(islice((f.readline() for _ in range(self._n_rows)), self._n_rows))
-        else:
-            with open(file_path, "rb") as f:
-                sample = b"".join(islice((f.readline() for _ in range(self._n_rows)), self._n_rows))
+        with open_compressed_file(file_path) as f:
+            sample = b"".join(islice((f.readline() for _ in range(self._n_rows)), self._n_rows))
         fingerprint = hashlib.md5(str(sample).encode()).hexdigest()
         return fingerprint
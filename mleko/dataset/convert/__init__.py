@@ -3,12 +3,14 @@
 The subpackage contains the following converter classes:
     - `BaseConverter`: The abstract base class for all converters.
     - `CSVToVaexConverter`: A converter for converting CSV files to Vaex DataFrames.
+    - `SQLToVaexConverter`: A converter for streaming the results of SQL queries into Vaex DataFrames.
 """
 
 from __future__ import annotations
 
 from .base_converter import BaseConverter
 from .csv_to_vaex_converter import CSVToVaexConverter
+from .sql_to_vaex_converter import SQLToVaexConverter
 
 
-__all__ = ["BaseConverter", "CSVToVaexConverter"]
+__all__ = ["BaseConverter", "CSVToVaexConverter", "SQLToVaexConverter"]
@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import math
 import multiprocessing
+import os
 from concurrent import futures
+from dataclasses import dataclass, field
+from functools import partial
 from itertools import repeat
 from pathlib import Path
+from typing import BinaryIO, Callable
 
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 import vaex
 from pyarrow import csv as arrow_csv
+from pyarrow import fs as arrow_fs
 from tqdm.auto import tqdm
 
 from mleko.cache.fingerprinters import CSVFingerprinter
@@ -21,10 +31,17 @@ from mleko.cache.handlers.vaex_cache_handler import (
     write_vaex_dataframe,
 )
 from mleko.dataset.data_schema import DataSchema
+from mleko.utils.compression_helpers import (
+    COMPRESSED_FILE_SUFFIXES,
+    open_compressed_file,
+    open_compressed_stream,
+    open_parallel_compressed_file,
+)
 from mleko.utils.custom_logger import CustomLogger
 from mleko.utils.decorators import auto_repr
 from mleko.utils.file_helpers import clear_directory
-from mleko.utils.vaex_helpers import get_column
+from mleko.utils.s3_helpers import S3Client
+from mleko.utils.vaex_helpers import get_column, get_value_positions
 
 from .base_converter import BaseConverter
 
@@ -35,6 +52,36 @@ logger = CustomLogger()
 V_CPU_COUNT = multiprocessing.cpu_count()
 """A module-level constant representing the total number of CPUs available on the current system."""
 
+DICTIONARY_ENCODING_SAMPLE_ROWS = 100_000
+"""A module-level constant representing the number of rows sampled to select columns for dictionary encoding."""
+
+CSV_SCAN_BLOCK_SIZE = 16 * 1024**2
+"""A module-level constant representing the number of bytes read at once when scanning CSV files for record
+boundaries."""
+
+COMPRESSION_RATIO_ESTIMATES = {".gz": 5.0, ".bz2": 6.0, ".xz": 6.0, ".zst": 5.0}
+"""A module-level constant mapping compressed file suffixes to typical CSV compression ratios, used to estimate the
+uncompressed size of a file."""
+
+CSV_PARSE_MEMORY_FACTOR = 2.0
+"""A module-level constant representing the estimated peak memory of parsing a CSV file, relative to its uncompressed
+size, accounting for the raw bytes and the resulting Arrow arrays."""
+
+SMALL_TASK_BATCH_SIZE = 64 * 1024**2
+"""A module-level constant representing the total estimated memory in bytes of small files batched into a single
+conversion task, to amortize the per-task overhead of the process pool."""
+
+S3_STREAM_BLOCK_SIZE = 16 * 1024**2
+"""A module-level constant representing the size in bytes of the blocks in which CSV objects streamed from S3 are
+parsed, which also bounds the memory needed to convert them."""
+
+INTEGER_DOWNCAST_TYPES = ("int8", "int16", "int32", "int64")
+"""A module-level constant representing the candidate integer types for numeric downcasting, narrowest first."""
+
+DTYPES_FILE_SUFFIX = ".dtypes.json"
+"""A module-level constant representing the suffix of the sidecar file recording the numeric column types of a cached
+DataFrame."""
+
 RESERVED_KEYWORDS = {
     "False",
     "class",
@@ -78,12 +125,72 @@ RESERVED_KEYWORDS = {
 def write_vaex_dataframe_with_cleanup(cache_file_path: Path, output: vaex.DataFrame) -> None:
     """Writes the results of the DataFrame conversion to a file and cleans up the cache directory.
 
+    The types of the numeric columns, which may have been downcast, are recorded in a JSON sidecar file next to the
+    cache file, see `read_vaex_dataframe_with_dtypes`.
+
     Args:
         cache_file_path: The path of the cache file to be written.
         output: The Vaex DataFrame to be saved in the cache file.
     """
     write_vaex_dataframe(cache_file_path, output)
+    dtypes = {
+        column_name: str(get_column(output, column_name).dtype)
+        for column_name in output.get_column_names(dtype="numeric")
+    }
+    cache_file_path.with_suffix(DTYPES_FILE_SUFFIX).write_text(json.dumps(dtypes, indent=2))
     clear_directory(cache_file_path.parent, pattern="df_chunk_*.arrow")
+    clear_directory(cache_file_path.parent, pattern="df_compacted_*.arrow")
+
+
+def read_vaex_dataframe_with_dtypes(cache_file_path: Path) -> vaex.DataFrame:
+    """Reads a cached DataFrame and casts its numeric columns to the types recorded when it was written.
+
+    Args:
+        cache_file_path: The path of the cache file to be read.
+
+    Returns:
+        The cached DataFrame with the recorded numeric column types.
+    """
+    df = read_vaex_dataframe(cache_file_path)
+    dtypes_file_path = cache_file_path.with_suffix(DTYPES_FILE_SUFFIX)
+    if dtypes_file_path.exists():
+        for column_name, dtype in json.loads(dtypes_file_path.read_text()).items():
+            if column_name in df.get_column_names() and str(get_column(df, column_name).dtype) != dtype:
+                df[column_name] = get_column(df, column_name).astype(dtype)
+    return df
+
+
+def is_s3_uri(file_path: Path | str) -> bool:
+    """Checks whether a file path is an S3 URI of the form `s3://bucket/key`.
+
+    Args:
+        file_path: The file path to check.
+
+    Returns:
+        True if the file path is an S3 URI, False otherwise.
+    """
+    return isinstance(file_path, str) and file_path.startswith("s3://")
+
+
+@dataclass
+class CSVByteRange:
+    """A newline-aligned byte range of a CSV file that can be parsed independently of the rest of the file."""
+
+    index: int
+    """Position of the range within the file, used to order the converted chunks."""
+
+    start: int
+    """Offset of the first byte of the range."""
+
+    end: int
+    """Offset one past the last byte of the range."""
+
+    header: bytes
+    """The header row of the file, prepended to the range before parsing."""
+
+    column_types: dict[str, pa.DataType] = field(default_factory=dict)
+    """Column types inferred from the beginning of the file, shared by all ranges for a consistent schema. Columns
+    without values at the beginning of the file are read as strings."""
 
 
 class CSVToVaexConverter(BaseConverter):
@@ -120,7 +227,15 @@ class CSVToVaexConverter(BaseConverter):
         true_values: list[str] | tuple[str, ...] | tuple[()] = ("t", "True", "true", "1"),
         false_values: list[str] | tuple[str, ...] | tuple[()] = ("f", "False", "false", "0"),
         downcast_float: bool = False,
+        dictionary_encode_threshold: int | None = None,
+        downcast_numeric: bool = False,
+        compaction_target_file_size_mb: float | None = None,
+        compaction_row_group_size: int = 262_144,
+        split_file_size_mb: float | None = None,
+        max_memory_gb: float | None = None,
+        filter_expression: str | None = None,
         random_state: int | None = 42,
+        s3_client: S3Client | None = None,
         num_workers: int = V_CPU_COUNT,
         cache_directory: str | Path = "data/csv-to-vaex-converter",
         cache_size: int = 1,
@@ -138,6 +253,34 @@ class CSVToVaexConverter(BaseConverter):
             true_values: A sequence of strings to consider as True values.
             false_values: A sequence of strings to consider as False values.
             downcast_float: If True, downcast float64 to float32 during conversion.
+            dictionary_encode_threshold: If set, string columns with at most this many distinct values in the
+                inference sample (the first `100,000` rows) are written as dictionary-encoded arrays, which reduces
+                memory usage and lets downstream transformers and feature selectors operate on integer codes.
+            downcast_numeric: If True, every numeric column is cast to the narrowest type that holds all of its values
+                without loss, based on the column statistics of the full dataset. Integer columns, and float columns
+                without missing values whose values are all whole numbers, are cast to the smallest fitting signed
+                integer type. Other float64 columns are cast to float32 if the round trip is exact for all values
+                other than NaN. The chosen types are logged and recorded in a `.dtypes.json` file next to the cached
+                Arrow file, from which they are restored on a cache hit.
+            compaction_target_file_size_mb: If set, the per-file chunks are compacted into Arrow files of roughly
+                this size in MB before being merged, which avoids evaluating expressions over thousands of tiny
+                chunks. The rows are split evenly across `ceil(total_chunk_size / target_size)` output files, which
+                are written in parallel by streaming record batches, so the full frame is never materialized.
+            compaction_row_group_size: Number of rows per record batch (row group) in the compacted Arrow files.
+            split_file_size_mb: If set, uncompressed CSV files larger than this size in MB are split into byte ranges
+                of about this size, aligned to record boundaries (quoted newlines are respected), which are parsed in
+                parallel with the header and the column types inferred from the beginning of the file. Files whose
+                record boundaries cannot be validated are converted whole.
+            max_memory_gb: If set, caps the estimated memory in GB of the files converted concurrently, in addition to
+                `num_workers`. The estimate is based on the file size and a typical compression ratio for compressed
+                files. A file that exceeds the cap on its own is still converted, but never alongside others.
+            filter_expression: A `vaex` expression evaluating to a boolean, applied to each chunk before it is
+                written, so that rows not matching it are never written to disk. The expression refers to the columns
+                by their names in the CSV files, i.e. before reserved keywords are renamed, and may reference columns
+                listed in `drop_columns`. Dates are already converted to `datetime64[s]`, so they can be compared
+                using `scalar_datetime`, e.g. `"Date >= scalar_datetime('2023-01-01')"`.
+            s3_client: Client used to stream the CSV objects given as `s3://bucket/key` URIs in `file_paths`. If None,
+                a client with the default AWS profile and region is created when needed.
             random_state: A seed for the random number generator.
             num_workers: Number of workers to use for parallel processing.
             cache_directory: The directory where the converted files will be saved.
@@ -178,6 +321,14 @@ class CSVToVaexConverter(BaseConverter):
         self._true_values = tuple(true_values)
         self._false_values = tuple(false_values)
         self._downcast_float = downcast_float
+        self._dictionary_encode_threshold = dictionary_encode_threshold
+        self._downcast_numeric = downcast_numeric
+        self._compaction_target_file_size_mb = compaction_target_file_size_mb
+        self._compaction_row_group_size = compaction_row_group_size
+        self._split_file_size_mb = split_file_size_mb
+        self._max_memory_gb = max_memory_gb
+        self._filter_expression = filter_expression
+        self._s3_client = s3_client
         self._num_workers = num_workers
         self._random_state = random_state
 
@@ -197,16 +348,27 @@ class CSVToVaexConverter(BaseConverter):
         Note:
             Will read the first `100,000/len(file_paths)` rows of each file to determine if the file is the same as the
             one in the cache. If the file is the same, the cache will be used. Otherwise, the file will be converted
-            and the cache will be updated.
+            and the cache will be updated. Objects given as S3 URIs are compared by their size and last modified date.
+
+        CSV objects on S3 can be given as `s3://bucket/key` URIs, in which case they are streamed directly into
+        the conversion without being downloaded to disk first. The objects are parsed block by block while the next
+        blocks are being transferred, and compressed objects (`.gz`, `.bz2`, `.xz`, `.zst`) are decompressed on
+        the fly. Column types are inferred from the first block of each object, columns that are empty in the
+        first block are read as strings.
 
         Args:
-            file_paths: A list of file paths to be converted.
+            file_paths: A list of file paths or `s3://bucket/key` URIs to be converted.
             cache_group: The cache group to use.
             force_recompute: If set to True, forces recomputation and ignores the cache.
             disable_cache: If set to True, disables the cache.
 
         Returns:
             The resulting dataframe with the combined converted data.
+
+        Examples:
+            >>> from mleko.utils import S3Client
+            >>> converter = CSVToVaexConverter(s3_client=S3Client(aws_profile_name="mleko"))
+            >>> ds, df = converter.convert(["s3://mleko-datasets/part-0.csv.gz", "s3://mleko-datasets/part-1.csv.gz"])
         """
         ds, df = self._cached_execute(
             lambda_func=lambda: self._convert(file_paths),
@@ -221,7 +383,17 @@ class CSVToVaexConverter(BaseConverter):
                 self._true_values,
                 self._false_values,
                 self._downcast_float,
-                (file_paths, CSVFingerprinter(n_rows=100_000 // len(file_paths))),
+                self._dictionary_encode_threshold,
+                self._downcast_numeric,
+                self._compaction_target_file_size_mb,
+                self._compaction_row_group_size,
+                self._split_file_size_mb,
+                self._filter_expression,
+                (
+                    [file_path for file_path in file_paths if not is_s3_uri(file_path)],
+                    CSVFingerprinter(n_rows=100_000 // len(file_paths)),
+                ),
+                self._get_s3_object_fingerprints(file_paths),
             ],
             cache_group=cache_group,
             force_recompute=force_recompute,
@@ -229,7 +401,7 @@ class CSVToVaexConverter(BaseConverter):
                 JOBLIB_CACHE_HANDLER,
                 CacheHandler(
                     writer=write_vaex_dataframe_with_cleanup,
-                    reader=read_vaex_dataframe,
+                    reader=read_vaex_dataframe_with_dtypes,
                     suffix=VAEX_DATAFRAME_CACHE_HANDLER.suffix,
                     can_handle_none=False,
                 ),
@@ -238,6 +410,224 @@ class CSVToVaexConverter(BaseConverter):
         )
         return ds, df
 
+    def _get_s3_filesystem(self) -> arrow_fs.S3FileSystem:
+        """Gets the `pyarrow` S3 filesystem used to stream objects given as S3 URIs.
+
+        Returns:
+            The `pyarrow` S3 filesystem of the S3 client.
+        """
+        if self._s3_client is None:
+            self._s3_client = S3Client()
+        return self._s3_client.get_arrow_filesystem()
+
+    def _get_s3_object_fingerprints(self, file_paths: list[Path] | list[str]) -> tuple[tuple[str, int, str], ...]:
+        """Gets the size and last modified date of each object given as an S3 URI, to be used in the cache key.
+
+        Args:
+            file_paths: A list of file paths or S3 URIs.
+
+        Returns:
+            A sorted tuple of `(s3_uri, size, last_modified)` tuples, empty if there are no S3 URIs.
+        """
+        s3_uris = sorted(str(file_path) for file_path in file_paths if is_s3_uri(file_path))
+        if len(s3_uris) == 0:
+            return ()
+
+        file_infos = self._get_s3_filesystem().get_file_info([s3_uri[len("s3://") :] for s3_uri in s3_uris])
+        return tuple((s3_uri, file_info.size, str(file_info.mtime)) for s3_uri, file_info in zip(s3_uris, file_infos))
+
+    def _open_input_file(self, file_path: Path | str) -> BinaryIO:
+        """Opens a local file, or an object given as an S3 URI, for sequential reading of the decompressed bytes.
+
+        Args:
+            file_path: The file path or S3 URI.
+
+        Returns:
+            A binary file object yielding the decompressed contents of the file.
+        """
+        if is_s3_uri(file_path):
+            path = str(file_path)[len("s3://") :]
+            return open_compressed_stream(
+                self._get_s3_filesystem().open_input_stream(path, compression=None), path  # type: ignore
+            )
+        return open_compressed_file(file_path)
+
+    @staticmethod
+    def _get_convert_options(
+        forced_numerical_columns: tuple[str, ...],
+        forced_categorical_columns: tuple[str, ...],
+        forced_boolean_columns: tuple[str, ...],
+        na_values: tuple[str, ...],
+        true_values: tuple[str, ...],
+        false_values: tuple[str, ...],
+        downcast_float: bool,
+        dictionary_columns: tuple[str, ...] | tuple[()] = (),
+        column_types: dict[str, pa.DataType] | None = None,
+    ) -> arrow_csv.ConvertOptions:
+        """Builds the Arrow CSV conversion options shared by type inference and conversion.
+
+        Args:
+            forced_numerical_columns: A sequence of column names to be forced to numerical type.
+            forced_categorical_columns: A sequence of column names to be forced to categorical type.
+            forced_boolean_columns: A sequence of column names to be forced to boolean type.
+            na_values: A sequence of values to be considered as NaN.
+            true_values: A sequence of values to be considered as True.
+            false_values: A sequence of values to be considered as False.
+            downcast_float: If set to True, downcasts float64 to float32.
+            dictionary_columns: A sequence of column names to be read as dictionary-encoded strings.
+            column_types: Column types to use instead of inference, overridden by all of the above.
+
+        Returns:
+            The Arrow CSV conversion options.
+        """
+        float_type = "float64"
+        if downcast_float:
+            float_type = "float32"
+
+        dtypes: dict[str, str | pa.DataType] = dict(column_types or {})
+        for col in forced_numerical_columns:
+            dtypes[col] = float_type
+        for col in forced_categorical_columns:
+            dtypes[col] = "string"
+        for col in forced_boolean_columns:
+            dtypes[col] = "boolean"
+        for col in dictionary_columns:
+            dtypes[col] = pa.dictionary(pa.int32(), pa.string())
+
+        return arrow_csv.ConvertOptions(
+            column_types=dtypes,
+            null_values=na_values,
+            true_values=true_values,
+            false_values=false_values,
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=True,
+            timestamp_parsers=[
+                arrow_csv.ISO8601,
+                "%Y-%m-%d %H:%M:%S",
+                "%Y-%m-%d %H:%M:%S.%f",
+                "%Y-%m-%dT%H:%M:%S",
+                "%Y-%m-%dT%H:%M:%S.%f",
+            ],
+        )
+
+    def _infer_dictionary_columns(self, file_paths: list[Path] | list[str]) -> tuple[str, ...]:
+        """Selects the string columns to dictionary-encode based on their cardinality in the inference sample.
+
+        The sample consists of the first block of each file, read in order until `DICTIONARY_ENCODING_SAMPLE_ROWS`
+        rows have been collected. Only the first block is read from each file, since it is the block Arrow uses
+        for type inference. Files without rows are skipped.
+
+        Args:
+            file_paths: A list of file paths to be converted.
+
+        Returns:
+            Names of the columns that should be dictionary-encoded.
+        """
+        if self._dictionary_encode_threshold is None:
+            return ()
+
+        convert_options = CSVToVaexConverter._get_convert_options(
+            self._forced_numerical_columns,
+            self._forced_categorical_columns,
+            self._forced_boolean_columns,
+            self._na_values,
+            self._true_values,
+            self._false_values,
+            self._downcast_float,
+        )
+        distinct_values: dict[str, set[str]] = {}
+        excluded_columns: set[str] = set(self._drop_columns)
+        n_sampled_rows = 0
+        for file_path in file_paths:
+            with self._open_input_file(file_path) as file, arrow_csv.open_csv(
+                file,
+                parse_options=arrow_csv.ParseOptions(newlines_in_values=True),
+                convert_options=convert_options,
+            ) as reader:
+                try:
+                    batch = reader.read_next_batch()
+                except StopIteration:
+                    continue
+
+            for column_name, column in zip(batch.schema.names, batch.columns):
+                if column_name in excluded_columns or pa.types.is_null(column.type):
+                    continue
+                if not pa.types.is_string(column.type):
+                    excluded_columns.add(column_name)
+                    continue
+                values = distinct_values.setdefault(column_name, set())
+                values.update(pc.unique(column.drop_null()).to_pylist())
+                if len(values) > self._dictionary_encode_threshold:
+                    excluded_columns.add(column_name)
+
+            n_sampled_rows += batch.num_rows
+            if n_sampled_rows >= DICTIONARY_ENCODING_SAMPLE_ROWS:
+                break
+
+        dictionary_columns = tuple(sorted(set(distinct_values) - excluded_columns))
+        logger.info(f"Dictionary-encoding ({len(dictionary_columns)}) low-cardinality columns: {dictionary_columns}.")
+        return dictionary_columns
+
+    def _downcast_numeric_columns(self, df: vaex.DataFrame) -> vaex.DataFrame:
+        """Casts each numeric column to the narrowest type that represents all of its values exactly.
+
+        All statistics (min, max, NaN counts, fractional and float32 round trip mismatches) are computed in a single
+        pass over the data using delayed evaluation.
+
+        Args:
+            df: The DataFrame whose numeric columns should be downcast.
+
+        Returns:
+            The DataFrame with downcast numeric columns.
+        """
+        stats: dict[str, dict[str, vaex.promise.Promise]] = {}
+        for column_name in df.get_column_names():
+            column = get_column(df, column_name)
+            if column.dtype.is_integer:
+                stats[column_name] = {
+                    "min": column.min(delay=True),
+                    "max": column.max(delay=True),
+                }
+            elif column.dtype.is_float:
+                stats[column_name] = {
+                    "min": column.min(delay=True),
+                    "max": column.max(delay=True),
+                    "missing": column.isna().sum(delay=True),
+                    "fractional": (column % 1 != 0).sum(delay=True),
+                    "float32_mismatch": (
+                        (column.astype("float32").astype("float64") != column) & ~column.isnan()
+                    ).sum(delay=True),
+                }
+        df.execute()
+
+        dtypes: dict[str, str] = {}
+        for column_name, column_stats in stats.items():
+            values = {name: promise.get() for name, promise in column_stats.items()}
+            column_dtype = get_column(df, column_name).dtype
+            if not np.isfinite(values["min"]) or not np.isfinite(values["max"]):
+                continue
+
+            if column_dtype.is_integer or (values["missing"] == 0 and values["fractional"] == 0):
+                dtype = next(
+                    (
+                        integer_type
+                        for integer_type in INTEGER_DOWNCAST_TYPES
+                        if np.iinfo(integer_type).min <= values["min"] and values["max"] <= np.iinfo(integer_type).max
+                    ),
+                    None,
+                )
+            elif column_dtype == "float64" and values["float32_mismatch"] == 0:
+                dtype = "float32"
+            else:
+                dtype = None
+
+            if dtype is not None and dtype != column_dtype:
+                df[column_name] = get_column(df, column_name).astype(dtype)
+                dtypes[column_name] = dtype
+
+        logger.info(f"Downcast ({len(dtypes)}) numeric columns: {dtypes}.")
+        return df
+
     @staticmethod
     def _convert_csv_file_to_arrow(
         file_path: Path | str,
@@ -250,11 +640,21 @@ class CSVToVaexConverter(BaseConverter):
         true_values: tuple[str, ...],
         false_values: tuple[str, ...],
         downcast_float: bool,
+        dictionary_columns: tuple[str, ...],
+        filter_expression: str | None = None,
+        byte_range: CSVByteRange | None = None,
+        decompression_threads: int = 1,
+        filesystem: arrow_fs.FileSystem | None = None,
     ) -> None:
         """Converts a single CSV file to Arrow format using the provided options and saves it to the output directory.
 
         This operation is done in chunks to optimize parallel processing. The resulting dataframe is saved in the
-        output directory with the given suffix.
+        output directory with the given suffix. If a byte range is given, only that part of the file is converted
+        and the range index is appended to the suffix. If a filter expression is given, only the matching rows are
+        written. Compressed files are decompressed while being parsed, with the next blocks decompressed ahead in
+        parallel if the file consists of independently compressed blocks (BGZF gzip or multi-frame Zstandard), so
+        the decompressed file is never held in memory as a whole. S3 URIs are streamed from the
+        `filesystem` and written record batch by record batch, see `_stream_csv_file_to_arrow`.
 
         Args:
             file_path: The path of the CSV file to be converted.
@@ -267,80 +667,728 @@ class CSVToVaexConverter(BaseConverter):
             true_values: A sequence of values to be considered as True.
             false_values: A sequence of values to be considered as False.
             downcast_float: If set to True, downcasts float64 to float32.
+            dictionary_columns: A sequence of column names to be read as dictionary-encoded strings.
+            filter_expression: A `vaex` expression selecting the rows to keep, or None to keep all rows.
+            byte_range: The byte range of the file to convert, or None to convert the whole file.
+            decompression_threads: Number of threads used to decompress a compressed file.
+            filesystem: The `pyarrow` filesystem used to stream S3 URIs.
         """
+        read_options = arrow_csv.ReadOptions(use_threads=True)
+        parse_options = arrow_csv.ParseOptions(newlines_in_values=True)
+        convert_options = CSVToVaexConverter._get_convert_options(
+            forced_numerical_columns,
+            forced_categorical_columns,
+            forced_boolean_columns,
+            na_values,
+            true_values,
+            false_values,
+            downcast_float,
+            dictionary_columns,
+            byte_range.column_types if byte_range is not None else None,
+        )
+
+        if is_s3_uri(file_path):
+            CSVToVaexConverter._stream_csv_file_to_arrow(
+                str(file_path),
+                output_directory,
+                filesystem,  # type: ignore
+                parse_options,
+                convert_options,
+                drop_columns,
+                filter_expression,
+            )
+            return
+
         file_path = Path(file_path)
+        if byte_range is None and file_path.suffix not in COMPRESSED_FILE_SUFFIXES:
+            output_path = output_directory / f"df_chunk_{file_path.stem}.arrow"
+            df_chunk = vaex.from_csv_arrow(
+                file_path, read_options=read_options, parse_options=parse_options, convert_options=convert_options
+            )
+        elif byte_range is None:
+            output_path = output_directory / f"df_chunk_{file_path.stem}.arrow"
+            with open_parallel_compressed_file(file_path, num_threads=decompression_threads) as file:
+                df_chunk = vaex.from_arrow_table(
+                    arrow_csv.read_csv(
+                        file, read_options=read_options, parse_options=parse_options, convert_options=convert_options
+                    )
+                )
+        else:
+            output_path = output_directory / f"df_chunk_{file_path.stem}_{byte_range.index:05d}.arrow"
+            with open(file_path, "rb") as file:
+                file.seek(byte_range.start)
+                data = byte_range.header + file.read(byte_range.end - byte_range.start)
+            df_chunk = vaex.from_arrow_table(
+                arrow_csv.read_csv(
+                    pa.BufferReader(data),
+                    read_options=read_options,
+                    parse_options=parse_options,
+                    convert_options=convert_options,
+                )
+            )
 
-        float_type = "float64"
-        if downcast_float:
-            float_type = "float32"
+        df_chunk = CSVToVaexConverter._prepare_chunk(df_chunk, drop_columns, filter_expression)
+        df_chunk.export(output_path, chunk_size=100_000, parallel=False)
+        df_chunk.close()
 
-        dtypes = {}
-        for col in forced_numerical_columns:
-            dtypes[col] = float_type
-        for col in forced_categorical_columns:
-            dtypes[col] = "string"
-        for col in forced_boolean_columns:
-            dtypes[col] = "boolean"
+    @staticmethod
+    def _stream_csv_file_to_arrow(
+        s3_uri: str,
+        output_directory: Path,
+        filesystem: arrow_fs.FileSystem,
+        parse_options: arrow_csv.ParseOptions,
+        convert_options: arrow_csv.ConvertOptions,
+        drop_columns: tuple[str, ...],
+        filter_expression: str | None,
+    ) -> None:
+        """Streams a CSV object from S3 and writes it to an Arrow file without landing the raw object on disk.
 
-        df_chunk = vaex.from_csv_arrow(
-            file_path,
-            read_options=arrow_csv.ReadOptions(use_threads=True),
-            parse_options=arrow_csv.ParseOptions(newlines_in_values=True),
-            convert_options=arrow_csv.ConvertOptions(
-                column_types=dtypes,
-                null_values=na_values,
-                true_values=true_values,
-                false_values=false_values,
-                strings_can_be_null=True,
-                quoted_strings_can_be_null=True,
-                timestamp_parsers=[
-                    arrow_csv.ISO8601,
-                    "%Y-%m-%d %H:%M:%S",
-                    "%Y-%m-%d %H:%M:%S.%f",
-                    "%Y-%m-%dT%H:%M:%S",
-                    "%Y-%m-%dT%H:%M:%S.%f",
-                ],
-            ),
-        ).drop(drop_columns)
+        The object is parsed in blocks of `S3_STREAM_BLOCK_SIZE` bytes using Arrow's streaming CSV reader, which
+        reads ahead in the background, so the transfer of the next blocks overlaps with parsing the current one.
+        Each parsed record batch is prepared like a whole-file chunk and appended to a `.part` file next to the
+        output file, which is only renamed into place once the whole object has been written, and deleted if
+        streaming or writing fails. The column types are inferred from the first block, and columns without values
+        in the first block are read as strings.
 
+        Args:
+            s3_uri: The S3 URI of the object, `s3://bucket/key`.
+            output_directory: The directory where the converted file should be saved.
+            filesystem: The `pyarrow` filesystem used to stream the object.
+            parse_options: The Arrow CSV parse options.
+            convert_options: The Arrow CSV conversion options.
+            drop_columns: A sequence of column names to be dropped from the dataframe.
+            filter_expression: A `vaex` expression selecting the rows to keep, or None to keep all rows.
+        """
+        path = s3_uri[len("s3://") :]
+        output_path = (
+            output_directory / f"df_chunk_{Path(path).stem}_{hashlib.md5(s3_uri.encode()).hexdigest()[:8]}.arrow"
+        )
+        part_path = output_path.with_name(output_path.name + ".part")
+        read_options = arrow_csv.ReadOptions(use_threads=True, block_size=S3_STREAM_BLOCK_SIZE)
+        writer: pa.ipc.RecordBatchStreamWriter | None = None
+        try:
+            stream = open_compressed_stream(filesystem.open_input_stream(path, compression=None), path)  # type: ignore
+            try:
+                reader = arrow_csv.open_csv(
+                    stream, read_options=read_options, parse_options=parse_options, convert_options=convert_options
+                )
+                null_columns = [field.name for field in reader.schema if pa.types.is_null(field.type)]
+                if null_columns:
+                    stream.close()
+                    convert_options.column_types = {
+                        **convert_options.column_types,
+                        **{column_name: pa.string() for column_name in null_columns},
+                    }
+                    stream = open_compressed_stream(
+                        filesystem.open_input_stream(path, compression=None), path  # type: ignore
+                    )
+                    reader = arrow_csv.open_csv(
+                        stream, read_options=read_options, parse_options=parse_options, convert_options=convert_options
+                    )
+
+                for batch in reader:
+                    df_chunk = CSVToVaexConverter._prepare_chunk(
+                        vaex.from_arrow_table(pa.Table.from_batches([batch])), drop_columns, filter_expression
+                    )
+                    table = df_chunk.to_arrow_table()
+                    if writer is None:
+                        writer = pa.ipc.new_stream(str(part_path), table.schema)
+                    writer.write_table(table)
+            finally:
+                stream.close()
+                if writer is not None:
+                    writer.close()
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+        if writer is None:
+            logger.warning(f"No rows found in {s3_uri!r}, skipping.")
+            return
+        os.replace(part_path, output_path)
+
+    @staticmethod
+    def _prepare_chunk(
+        df_chunk: vaex.DataFrame, drop_columns: tuple[str, ...], filter_expression: str | None
+    ) -> vaex.DataFrame:
+        """Converts dates to `datetime64[s]`, filters the rows and drops the columns of a converted chunk.
+
+        Args:
+            df_chunk: The DataFrame of the converted chunk.
+            drop_columns: A sequence of column names to be dropped from the dataframe.
+            filter_expression: A `vaex` expression selecting the rows to keep, or None to keep all rows.
+
+        Returns:
+            The prepared DataFrame.
+        """
         for column_name in df_chunk.get_column_names():
             if get_column(df_chunk, column_name).dtype in (pa.date32(), pa.date64()):
                 df_chunk[column_name] = get_column(df_chunk, column_name).astype("datetime64[s]")
 
-        output_path = output_directory / f"df_chunk_{file_path.stem}.arrow"
-        df_chunk.export(output_path, chunk_size=100_000, parallel=False)
-        df_chunk.close()
+        if filter_expression is not None:
+            df_chunk = df_chunk.filter(f"({filter_expression})")
+        return df_chunk.drop(drop_columns)
 
-    def _convert(self, file_paths: list[Path] | list[str]) -> tuple[DataSchema, vaex.DataFrame]:
-        """Converts a list of CSV files to Arrow format using parallel processing.
+    def _get_conversion_tasks(self, file_paths: list[Path] | list[str]) -> list[tuple[Path | str, CSVByteRange | None]]:
+        """Lists the units of work for the conversion, either whole files or byte ranges of large files.
+
+        Args:
+            file_paths: A list of file paths or S3 URIs to be converted.
+
+        Returns:
+            A list of `(file_path, byte_range)` tuples, where `byte_range` is None for files converted as a whole.
+            S3 URIs are kept as strings and are never split.
+        """
+        tasks: list[tuple[Path | str, CSVByteRange | None]] = []
+        for file_path in file_paths:
+            if is_s3_uri(file_path):
+                tasks.append((str(file_path), None))
+                continue
+
+            file_path = Path(file_path)
+            byte_ranges = self._split_csv_file(file_path) if self._split_file_size_mb is not None else []
+            tasks.extend((file_path, byte_range) for byte_range in byte_ranges or [None])
+        return tasks
 
-        Chunks of files are processed in parallel and saved in the output directory.
+    @staticmethod
+    def _estimate_task_memory(task: tuple[Path | str, CSVByteRange | None]) -> int:
+        """Estimates the peak memory in bytes needed to convert a file or a byte range of a file.
+
+        Objects streamed from S3 are parsed block by block, so their memory is bounded by the block size rather
+        than the object size.
 
         Args:
-            file_paths: A list of file paths to be converted.
+            task: A `(file_path, byte_range)` tuple, where `byte_range` is None for a whole file.
 
         Returns:
-            A DataFrame containing the merged chunks.
+            The estimated peak memory in bytes.
+        """
+        file_path, byte_range = task
+        if is_s3_uri(file_path):
+            return int(S3_STREAM_BLOCK_SIZE * CSV_PARSE_MEMORY_FACTOR)
+
+        file_path = Path(file_path)
+        if byte_range is not None:
+            uncompressed_size = byte_range.end - byte_range.start
+        else:
+            uncompressed_size = file_path.stat().st_size * COMPRESSION_RATIO_ESTIMATES.get(file_path.suffix, 1.0)
+        return int(uncompressed_size * CSV_PARSE_MEMORY_FACTOR)
+
+    def _schedule_conversion_tasks(
+        self, tasks: list[tuple[Path | str, CSVByteRange | None]]
+    ) -> list[tuple[int, list[tuple[Path | str, CSVByteRange | None]]]]:
+        """Orders the conversion tasks largest-first and packs small tasks into batches.
+
+        Starting the largest tasks first avoids a long tail where a single large file is converted after all
+        others have finished, while batching small files amortizes the per-task overhead of the process pool.
+        Objects streamed from S3 are never batched, so that their transfers run concurrently.
+
+        Args:
+            tasks: A list of `(file_path, byte_range)` tuples.
+
+        Returns:
+            A list of `(estimated_memory, tasks)` batches, ordered by decreasing estimated memory.
+        """
+        batches: list[tuple[int, list[tuple[Path | str, CSVByteRange | None]]]] = []
+        small_tasks: list[tuple[Path | str, CSVByteRange | None]] = []
+        small_tasks_memory = 0
+        for memory, task in sorted(
+            ((CSVToVaexConverter._estimate_task_memory(task), task) for task in tasks),
+            key=lambda sized_task: sized_task[0],
+            reverse=True,
+        ):
+            if memory >= SMALL_TASK_BATCH_SIZE or is_s3_uri(task[0]):
+                batches.append((memory, [task]))
+                continue
+
+            if small_tasks and small_tasks_memory + memory > SMALL_TASK_BATCH_SIZE:
+                batches.append((small_tasks_memory, small_tasks))
+                small_tasks, small_tasks_memory = [], 0
+            small_tasks.append(task)
+            small_tasks_memory += memory
+
+        if small_tasks:
+            batches.append((small_tasks_memory, small_tasks))
+        return batches
+
+    def _run_conversion_batches(
+        self,
+        batches: list[tuple[int, list[tuple[Path | str, CSVByteRange | None]]]],
+        convert_file: Callable[..., None],
+    ) -> None:
+        """Runs the conversion batches in a process pool, bounded by the number of workers and `max_memory_gb`.
+
+        Batches are submitted in order, skipping ahead to the next batch that fits into the remaining memory budget
+        whenever the next one does not. A batch is always submitted if nothing else is running.
+
+        Args:
+            batches: A list of `(estimated_memory, tasks)` batches, see `_schedule_conversion_tasks`.
+            convert_file: Function converting a single task, called as `convert_file(file_path, byte_range=...)`.
+        """
+        memory_budget = self._max_memory_gb * 1024**3 if self._max_memory_gb is not None else math.inf
+        max_workers = max(1, min(self._num_workers, len(batches)))
+        pending = list(batches)
+        running: dict[futures.Future, tuple[int, int]] = {}
+        running_memory = 0
+
+        with tqdm(total=sum(len(tasks) for _, tasks in batches), desc="Converting CSV files") as pbar:
+            with futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                while pending or running:
+                    while pending and len(running) < max_workers:
+                        index = next(
+                            (
+                                i
+                                for i, (memory, _) in enumerate(pending)
+                                if not running or running_memory + memory <= memory_budget
+                            ),
+                            None,
+                        )
+                        if index is None:
+                            break
+                        memory, tasks = pending.pop(index)
+                        future = executor.submit(CSVToVaexConverter._convert_csv_file_batch, convert_file, tasks)
+                        running[future] = (memory, len(tasks))
+                        running_memory += memory
+
+                    done, _ = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                        memory, n_tasks = running.pop(future)
+                        running_memory -= memory
+                        pbar.update(n_tasks)
+
+    @staticmethod
+    def _convert_csv_file_batch(
+        convert_file: Callable[..., None], tasks: list[tuple[Path | str, CSVByteRange | None]]
+    ) -> None:
+        """Converts a batch of files or byte ranges sequentially within a single worker process.
+
+        Args:
+            convert_file: Function converting a single task, called as `convert_file(file_path, byte_range=...)`.
+            tasks: A list of `(file_path, byte_range)` tuples.
+        """
+        for file_path, byte_range in tasks:
+            convert_file(file_path, byte_range=byte_range)
+
+    def _split_csv_file(self, file_path: Path) -> list[CSVByteRange]:
+        """Splits an uncompressed CSV file into byte ranges that each start and end on a record boundary.
+
+        A newline is a record boundary only if it is preceded by an even number of quote characters, since with
+        `newlines_in_values=True` a quoted field may contain newlines (escaped quotes are doubled and do not change
+        the parity). The quotes in each tentative range are counted in parallel, after which every tentative
+        boundary is moved forward to the first newline with an even quote count.
+
+        Quote characters inside unquoted fields break the parity, so each boundary is validated by parsing the first
+        record of its range, which must have as many fields as the header. If any boundary fails the check, the file
+        is not split. The column types inferred from the first block of the file are shared by all ranges, with
+        columns that have no values in the first block read as strings.
+
+        Args:
+            file_path: Path of the CSV file to split.
+
+        Returns:
+            The byte ranges of the file, or an empty list if the file is too small, compressed, has no records after
+            the header, or its record boundaries cannot be located.
+        """
+        file_size = file_path.stat().st_size
+        range_size = int(self._split_file_size_mb * 1024**2)  # type: ignore
+        if file_size <= range_size or file_path.suffix in COMPRESSION_RATIO_ESTIMATES:
+            return []
+
+        tentative_boundaries = list(range(0, file_size, range_size)) + [file_size]
+        with futures.ThreadPoolExecutor(max_workers=self._num_workers) as executor:
+            quote_counts = list(
+                executor.map(
+                    CSVToVaexConverter._count_quotes,
+                    repeat(file_path),
+                    tentative_boundaries[:-1],
+                    tentative_boundaries[1:],
+                )
+            )
+
+        header_end = CSVToVaexConverter._find_record_boundary(file_path, 0, 0)
+        with open(file_path, "rb") as file:
+            header = file.read(header_end)
+
+        boundaries = [header_end]
+        n_quotes = 0
+        for start, quote_count in zip(tentative_boundaries[1:-1], quote_counts):
+            n_quotes += quote_count
+            boundary = CSVToVaexConverter._find_record_boundary(file_path, start, n_quotes)
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+        if file_size > boundaries[-1]:
+            boundaries.append(file_size)
+        if len(boundaries) < 2:
+            return []
+
+        with arrow_csv.open_csv(
+            file_path,
+            parse_options=arrow_csv.ParseOptions(newlines_in_values=True),
+            convert_options=CSVToVaexConverter._get_convert_options(
+                self._forced_numerical_columns,
+                self._forced_categorical_columns,
+                self._forced_boolean_columns,
+                self._na_values,
+                self._true_values,
+                self._false_values,
+                self._downcast_float,
+            ),
+        ) as reader:
+            column_types = {
+                column.name: pa.string() if pa.types.is_null(column.type) else column.type for column in reader.schema
+            }
+            n_columns = len(reader.schema)
+
+        if not all(CSVToVaexConverter._is_record_start(file_path, start, n_columns) for start in boundaries[:-1]):
+            logger.warning(f"Not splitting {file_path.name!r}, its record boundaries could not be located.")
+            return []
+
+        logger.info(f"Splitting {file_path.name!r} into {len(boundaries) - 1} byte ranges.")
+        return [
+            CSVByteRange(index=i, start=start, end=end, header=header, column_types=column_types)
+            for i, (start, end) in enumerate(zip(boundaries[:-1], boundaries[1:]))
+        ]
+
+    @staticmethod
+    def _is_record_start(file_path: Path, start: int, n_columns: int) -> bool:
+        """Checks whether an offset is the start of a record by parsing the record that follows it.
+
+        Args:
+            file_path: Path of the file.
+            start: Offset of the first byte of the record.
+            n_columns: Number of columns of the file.
+
+        Returns:
+            True if the bytes up to the next record boundary parse as a single record of `n_columns` fields.
+        """
+        end = CSVToVaexConverter._find_record_boundary(file_path, start, 0)
+        with open(file_path, "rb") as file:
+            file.seek(start)
+            record = file.read(end - start)
+
+        try:
+            table = arrow_csv.read_csv(
+                pa.BufferReader(record),
+                read_options=arrow_csv.ReadOptions(use_threads=False, autogenerate_column_names=True),
+                parse_options=arrow_csv.ParseOptions(newlines_in_values=True),
+            )
+        except pa.ArrowInvalid:
+            return False
+        return table.num_rows == 1 and table.num_columns == n_columns
+
+    @staticmethod
+    def _count_quotes(file_path: Path, start: int, end: int) -> int:
+        """Counts the quote characters in a byte range of a file.
+
+        Args:
+            file_path: Path of the file.
+            start: Offset of the first byte to scan.
+            end: Offset one past the last byte to scan.
+
+        Returns:
+            The number of quote characters in the range.
+        """
+        n_quotes = 0
+        with open(file_path, "rb") as file:
+            file.seek(start)
+            while start < end:
+                block = file.read(min(CSV_SCAN_BLOCK_SIZE, end - start))
+                if not block:
+                    break
+                n_quotes += block.count(b'"')
+                start += len(block)
+        return n_quotes
+
+    @staticmethod
+    def _find_record_boundary(file_path: Path, start: int, n_quotes: int) -> int:
+        """Finds the offset just past the first newline at or after `start` that ends a record.
+
+        Args:
+            file_path: Path of the file.
+            start: Offset to start scanning from.
+            n_quotes: Number of quote characters in the file before `start`.
+
+        Returns:
+            The offset of the first byte of the next record, or the file size if there is none.
         """
-        with tqdm(total=len(file_paths), desc="Converting CSV files") as pbar:
-            with futures.ProcessPoolExecutor(max_workers=min(self._num_workers, len(file_paths))) as executor:
+        with open(file_path, "rb") as file:
+            file.seek(start)
+            while block := file.read(CSV_SCAN_BLOCK_SIZE):
+                position = 0
+                while (newline := block.find(b"\n", position)) != -1:
+                    n_quotes += block.count(b'"', position, newline)
+                    if n_quotes % 2 == 0:
+                        return start + newline + 1
+                    position = newline + 1
+                n_quotes += block.count(b'"', position)
+                start += len(block)
+        return start
+
+    def _compact_chunks(self) -> str:
+        """Compacts the converted per-file chunks into evenly-sized, row-grouped Arrow files.
+
+        The chunk schemas are unified first, so that columns inferred as `null` or `int64` in some chunks and as
+        `string` or `double` in others are promoted to a common type. If the schemas cannot be unified, the chunks
+        are left as they are, with their dictionaries unified by `_unify_chunk_dictionaries`.
+
+        Returns:
+            The glob pattern of the files to open, relative to the cache directory.
+        """
+        chunk_paths = sorted(self._cache_directory.glob("df_chunk_*.arrow"))
+        schemas: list[pa.Schema] = []
+        row_counts: list[int] = []
+        for chunk_path in chunk_paths:
+            table = pa.ipc.open_stream(pa.memory_map(str(chunk_path))).read_all()
+            schemas.append(table.schema)
+            row_counts.append(table.num_rows)
+        dictionaries = self._get_unified_dictionaries(chunk_paths)
+
+        total_rows = sum(row_counts)
+        if total_rows == 0:
+            return "df_chunk_*.arrow"
+
+        try:
+            schema = pa.unify_schemas(schemas, promote_options="permissive")
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"Skipping compaction, the chunk schemas could not be unified: {e}")
+            self._unify_chunk_dictionaries(chunk_paths, dictionaries)
+            return "df_chunk_*.arrow"
+
+        total_size_mb = sum(chunk_path.stat().st_size for chunk_path in chunk_paths) / 1024**2
+        target_size_mb: float = self._compaction_target_file_size_mb  # type: ignore
+        n_files = min(max(1, math.ceil(total_size_mb / target_size_mb)), total_rows)
+        row_boundaries = [round(i * total_rows / n_files) for i in range(n_files + 1)]
+        output_paths = [self._cache_directory / f"df_compacted_{i:05d}.arrow" for i in range(n_files)]
+        logger.info(f"Compacting {len(chunk_paths)} chunks ({total_rows} rows) into {n_files} Arrow files.")
+
+        clear_directory(self._cache_directory, pattern="df_compacted_*.arrow")
+        with tqdm(total=n_files, desc="Compacting chunks") as pbar:
+            with futures.ProcessPoolExecutor(max_workers=min(self._num_workers, n_files)) as executor:
                 for _ in executor.map(
-                    CSVToVaexConverter._convert_csv_file_to_arrow,
-                    file_paths,
-                    repeat(self._cache_directory),
-                    repeat(self._forced_numerical_columns),
-                    repeat(self._forced_categorical_columns),
-                    repeat(self._forced_boolean_columns),
-                    repeat(self._drop_columns),
-                    repeat(self._na_values),
-                    repeat(self._true_values),
-                    repeat(self._false_values),
-                    repeat(self._downcast_float),
+                    CSVToVaexConverter._write_compacted_arrow_file,
+                    output_paths,
+                    row_boundaries[:-1],
+                    row_boundaries[1:],
+                    repeat(chunk_paths),
+                    repeat(row_counts),
+                    repeat(schema),
+                    repeat(dictionaries),
+                    repeat(self._compaction_row_group_size),
                 ):
                     pbar.update(1)
 
+        clear_directory(self._cache_directory, pattern="df_chunk_*.arrow")
+        return "df_compacted_*.arrow"
+
+    @staticmethod
+    def _write_compacted_arrow_file(
+        output_path: Path,
+        start_row: int,
+        end_row: int,
+        chunk_paths: list[Path],
+        row_counts: list[int],
+        schema: pa.Schema,
+        dictionaries: dict[str, pa.Array],
+        row_group_size: int,
+    ) -> None:
+        """Streams the rows `[start_row, end_row)` of the concatenated chunks into a single row-grouped Arrow file.
+
+        Chunks, which are Arrow IPC streams as written by `vaex`, are read through memory maps one at a time and
+        buffered until a full row group is available. Dictionary-encoded columns are re-encoded batch by batch with
+        the unified dictionaries of all chunks, so that all compacted files share a single dictionary per column.
+
+        Args:
+            output_path: Path of the compacted Arrow file to write.
+            start_row: Index of the first row, in the concatenation of all chunks, to write.
+            end_row: Index one past the last row, in the concatenation of all chunks, to write.
+            chunk_paths: Paths of all chunk files, in order.
+            row_counts: Number of rows in each chunk file.
+            schema: The unified schema of the chunks.
+            dictionaries: The unified dictionary of each dictionary-encoded column, see `_get_unified_dictionaries`.
+            row_group_size: Number of rows per written record batch.
+        """
+
+        def write_table(writer: pa.ipc.RecordBatchFileWriter, table: pa.Table) -> None:
+            for batch in table.combine_chunks().to_batches(max_chunksize=row_group_size):
+                writer.write_batch(CSVToVaexConverter._encode_batch_dictionaries(batch, dictionaries))
+
+        buffer: list[pa.Table] = []
+        n_buffered_rows = 0
+        chunk_start_row = 0
+        with pa.ipc.new_file(output_path, schema) as writer:
+            for chunk_path, n_rows in zip(chunk_paths, row_counts):
+                chunk_end_row = chunk_start_row + n_rows
+                if chunk_end_row > start_row and chunk_start_row < end_row:
+                    table = pa.ipc.open_stream(pa.memory_map(str(chunk_path))).read_all()
+                    offset = max(start_row - chunk_start_row, 0)
+                    table = table.slice(offset, min(end_row, chunk_end_row) - chunk_start_row - offset)
+                    buffer.append(
+                        pa.Table.from_arrays(
+                            [
+                                (
+                                    table.column(field.name).cast(field.type)
+                                    if field.name in table.column_names
+                                    else pa.nulls(table.num_rows, type=field.type)
+                                )
+                                for field in schema
+                            ],
+                            schema=schema,
+                        )
+                    )
+                    n_buffered_rows += table.num_rows
+
+                    if n_buffered_rows >= row_group_size:
+                        table = pa.concat_tables(buffer)
+                        n_full_rows = n_buffered_rows - n_buffered_rows % row_group_size
+                        write_table(writer, table.slice(0, n_full_rows))
+                        buffer = [table.slice(n_full_rows)]
+                        n_buffered_rows -= n_full_rows
+
+                chunk_start_row = chunk_end_row
+
+            if n_buffered_rows > 0:
+                write_table(writer, pa.concat_tables(buffer))
+
+    @staticmethod
+    def _get_unified_dictionaries(chunk_paths: list[Path]) -> dict[str, pa.Array]:
+        """Collects the union of the dictionaries of each dictionary-encoded column across all chunk files.
+
+        The chunks are read through memory maps and only their dictionaries, which are small for the low-cardinality
+        columns that are dictionary-encoded, are accessed. Values are kept in order of their first occurrence.
+
+        Args:
+            chunk_paths: Paths of all chunk files, in order.
+
+        Returns:
+            The unified dictionary of each dictionary-encoded column.
+        """
+        dictionaries: dict[str, pa.Array] = {}
+        for chunk_path in chunk_paths:
+            table = pa.ipc.open_stream(pa.memory_map(str(chunk_path))).read_all()
+            for schema_field, column in zip(table.schema, table.columns):
+                if not pa.types.is_dictionary(schema_field.type):
+                    continue
+                dictionary = dictionaries.get(schema_field.name, pa.array([], type=schema_field.type.value_type))
+                for chunk in column.chunks:
+                    new_values = pc.filter(
+                        chunk.dictionary, pc.invert(pc.is_in(chunk.dictionary, value_set=dictionary))
+                    )
+                    if len(new_values) > 0:
+                        dictionary = pa.concat_arrays([dictionary, pc.unique(new_values)])
+                dictionaries[schema_field.name] = dictionary
+        return dictionaries
+
+    @staticmethod
+    def _encode_batch_dictionaries(batch: pa.RecordBatch, dictionaries: dict[str, pa.Array]) -> pa.RecordBatch:
+        """Re-encodes the dictionary-encoded columns of a record batch with the given dictionaries.
+
+        Only the dictionary of each column is looked up in the new dictionary, and the positions are taken at the
+        indices of the column, see `get_value_positions`.
+
+        Args:
+            batch: The record batch to re-encode.
+            dictionaries: The dictionary of each dictionary-encoded column, containing all of its values.
+
+        Returns:
+            The record batch with the dictionary-encoded columns sharing the given dictionaries.
+        """
+        columns = batch.columns
+        for i, schema_field in enumerate(batch.schema):
+            dictionary = dictionaries.get(schema_field.name)
+            if dictionary is not None and pa.types.is_dictionary(schema_field.type):
+                indices = get_value_positions(columns[i], dictionary).cast(schema_field.type.index_type)
+                columns[i] = pa.DictionaryArray.from_arrays(indices, dictionary)
+        return pa.record_batch(columns, schema=batch.schema)
+
+    def _unify_chunk_dictionaries(self, chunk_paths: list[Path], dictionaries: dict[str, pa.Array]) -> None:
+        """Rewrites the chunk files whose dictionaries differ from the unified dictionaries, batch by batch.
+
+        Args:
+            chunk_paths: Paths of all chunk files.
+            dictionaries: The unified dictionary of each dictionary-encoded column, see `_get_unified_dictionaries`.
+        """
+        if len(dictionaries) == 0:
+            return
+
+        with futures.ProcessPoolExecutor(max_workers=max(1, min(self._num_workers, len(chunk_paths)))) as executor:
+            list(executor.map(CSVToVaexConverter._rewrite_chunk_dictionaries, chunk_paths, repeat(dictionaries)))
+
+    @staticmethod
+    def _rewrite_chunk_dictionaries(chunk_path: Path, dictionaries: dict[str, pa.Array]) -> None:
+        """Re-encodes the dictionary-encoded columns of a chunk file with the unified dictionaries.
+
+        The chunk is streamed batch by batch into a `.part` file that replaces the chunk once complete. Chunks whose
+        batches already use the unified dictionaries are left untouched.
+
+        Args:
+            chunk_path: Path of the chunk file.
+            dictionaries: The unified dictionary of each dictionary-encoded column.
+        """
+        with pa.ipc.open_stream(pa.memory_map(str(chunk_path))) as reader:
+            table = reader.read_all()
+        if all(
+            chunk.dictionary.equals(dictionaries[name])
+            for name in table.column_names
+            if name in dictionaries
+            for chunk in table.column(name).chunks
+        ):
+            return
+
+        part_path = chunk_path.with_name(chunk_path.name + ".part")
+        with pa.ipc.new_stream(str(part_path), table.schema) as writer:
+            for batch in table.to_batches():
+                writer.write_batch(CSVToVaexConverter._encode_batch_dictionaries(batch, dictionaries))
+        del table
+        os.replace(part_path, chunk_path)
+
+    def _convert(self, file_paths: list[Path] | list[str]) -> tuple[DataSchema, vaex.DataFrame]:
+        """Converts a list of CSV files to Arrow format using parallel processing.
+
+        Chunks of files are processed in parallel and saved in the output directory. Large uncompressed files are
+        split into byte ranges that are processed in parallel as well, and S3 URIs are streamed from S3.
+        Dictionary-encoded columns are re-encoded batch by batch to share a single dictionary across all chunks, so
+        that their integer codes are consistent, without loading the columns into memory.
+
+        Args:
+            file_paths: A list of file paths or S3 URIs to be converted.
+
+        Returns:
+            A DataFrame containing the merged chunks.
+        """
+        dictionary_columns = self._infer_dictionary_columns(file_paths)
+        batches = self._schedule_conversion_tasks(self._get_conversion_tasks(file_paths))
+        decompression_threads = max(1, V_CPU_COUNT // max(1, min(self._num_workers, len(batches))))
+        self._run_conversion_batches(
+            batches,
+            partial(
+                CSVToVaexConverter._convert_csv_file_to_arrow,
+                output_directory=self._cache_directory,
+                forced_numerical_columns=self._forced_numerical_columns,
+                forced_categorical_columns=self._forced_categorical_columns,
+                forced_boolean_columns=self._forced_boolean_columns,
+                drop_columns=self._drop_columns,
+                na_values=self._na_values,
+                true_values=self._true_values,
+                false_values=self._false_values,
+                downcast_float=self._downcast_float,
+                dictionary_columns=dictionary_columns,
+                filter_expression=self._filter_expression,
+                decompression_threads=decompression_threads,
+                filesystem=self._get_s3_filesystem() if any(map(is_s3_uri, file_paths)) else None,
+            ),
+        )
+
         logger.info("Finished converting CSV files to Vaex format.")
-        df: vaex.DataFrame = vaex.open(self._cache_directory / "df_chunk_*.arrow")
+        chunk_pattern = "df_chunk_*.arrow"
+        if self._compaction_target_file_size_mb is not None:
+            chunk_pattern = self._compact_chunks()
+        elif len(dictionary_columns) > 0:
+            chunk_paths = sorted(self._cache_directory.glob(chunk_pattern))
+            self._unify_chunk_dictionaries(chunk_paths, self._get_unified_dictionaries(chunk_paths))
+
+        df: vaex.DataFrame = vaex.open(self._cache_directory / chunk_pattern)
+
         logger.info("Renaming columns with non-compatible names or reserved keywords.")
         for column_name in df.get_column_names():
             if column_name in RESERVED_KEYWORDS:
@@ -357,6 +1405,9 @@ class CSVToVaexConverter(BaseConverter):
         if self._drop_rows_with_na_columns:
             df = df.dropna(column_names=self._drop_rows_with_na_columns)
 
+        if self._downcast_numeric:
+            df = self._downcast_numeric_columns(df)
+
         ds = DataSchema(
             numerical=df.get_column_names(dtype="numeric"),
             categorical=df.get_column_names(dtype="string"),
@@ -0,0 +1,574 @@
+"""The module contains the `SQLToVaexConverter`, which streams the results of a SQL query into a `vaex` DataFrame."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import vaex
+
+from mleko.cache.handlers import CacheHandler
+from mleko.cache.handlers.joblib_cache_handler import JOBLIB_CACHE_HANDLER
+from mleko.cache.handlers.vaex_cache_handler import VAEX_DATAFRAME_CACHE_HANDLER
+from mleko.dataset.data_schema import DataSchema
+from mleko.utils.custom_logger import CustomLogger
+from mleko.utils.decorators import auto_repr
+from mleko.utils.file_helpers import clear_directory
+from mleko.utils.vaex_helpers import get_column
+
+from .base_converter import BaseConverter
+from .csv_to_vaex_converter import (
+    RESERVED_KEYWORDS,
+    read_vaex_dataframe_with_dtypes,
+    write_vaex_dataframe_with_cleanup,
+)
+
+
+logger = CustomLogger()
+"""A module-level logger instance."""
+
+SQLParameters = Union[Sequence[Any], Dict[str, Any], None]
+"""Type alias for the parameters of a SQL query, a sequence for positional and a dictionary for named placeholders."""
+
+SQL_FETCH_QUEUE_SIZE = 2
+"""A module-level constant representing the number of fetched batches buffered ahead of the Arrow conversion."""
+
+WATERMARK_PARAMETER_NAME = "mleko_watermark"
+"""A module-level constant representing the name of the query parameter holding the watermark of an incremental
+query, if the connection uses named parameters."""
+
+
+class SQLToVaexConverter(BaseConverter):
+    """A class that streams the results of a SQL query into a random-access `vaex` compatible format.
+
+    The query is executed through a DB-API 2.0 connection (e.g. `sqlite3`, `psycopg2`) or a SQLAlchemy connection,
+    and the cursor is fetched in batches of `batch_size` rows that are converted into Arrow record batches and written
+    to an Arrow IPC file while the next batch is being fetched, so the result set is never held in memory at once.
+    """
+
+    @auto_repr
+    def __init__(
+        self,
+        connection_factory: Callable[[], Any],
+        query: str,
+        parameters: SQLParameters = None,
+        watermark_column: str | None = None,
+        forced_numerical_columns: list[str] | tuple[str, ...] | tuple[()] = (),
+        forced_categorical_columns: list[str] | tuple[str, ...] | tuple[()] = (),
+        forced_boolean_columns: list[str] | tuple[str, ...] | tuple[()] = (),
+        meta_columns: list[str] | tuple[str, ...] | tuple[()] = (),
+        batch_size: int = 100_000,
+        cache_directory: str | Path = "data/sql-to-vaex-converter",
+        cache_size: int = 1,
+    ) -> None:
+        """Initializes the `SQLToVaexConverter` with the connection, the query and the type configuration.
+
+        Column types are taken from the first batch of rows. Columns without any value in the first batch are read
+        as strings, decimals are read as float64 and dates as timestamps. Columns whose values do not fit the type
+        inferred from the first batch, which can happen with dynamically typed databases like SQLite, should be
+        forced to a type with `forced_numerical_columns` or `forced_categorical_columns`.
+
+        If `watermark_column` is set, the converter works incrementally: the first conversion loads the full result
+        set and records the maximum value of the watermark column, and every later conversion only fetches the rows
+        whose watermark is strictly greater than the recorded one, by wrapping the query as
+        `SELECT * FROM (<query>) WHERE <watermark_column> > <watermark>`, and appends them to the previously fetched
+        rows. The watermark column should therefore only ever increase for new rows, e.g. an auto-incremented id or
+        an insertion timestamp, rows that are updated or deleted after they were fetched are not picked up.
+
+        Args:
+            connection_factory: A callable returning a new connection, either a DB-API 2.0 connection, e.g.
+                `lambda: sqlite3.connect("data.db")`, or a SQLAlchemy connection, e.g. `engine.connect`. The
+                connection is opened and closed by the converter, on a separate thread used for fetching.
+            query: The SQL query to execute.
+            parameters: Parameters bound to the placeholders of the query, using the parameter style of the
+                connection, or named `:name` placeholders for SQLAlchemy connections.
+            watermark_column: Name of a monotonically increasing column of the result set, enabling incremental
+                conversion, see above.
+            forced_numerical_columns: A sequence of column names to force as numerical (float64) type.
+            forced_categorical_columns: A sequence of column names to force as categorical (string) type.
+            forced_boolean_columns: A sequence of column names to force as boolean type.
+            meta_columns: A sequence of column names to be considered as metadata (e.g. ID or target columns).
+            batch_size: Number of rows fetched from the cursor and written per Arrow record batch.
+            cache_directory: The directory where the converted files will be saved.
+            cache_size: Maximum number of cache entries for the LRUCacheMixin.
+
+        Examples:
+            >>> import sqlite3
+            >>> from mleko.dataset.convert import SQLToVaexConverter
+            >>> converter = SQLToVaexConverter(
+            ...     connection_factory=lambda: sqlite3.connect("events.db"),
+            ...     query="SELECT id, user, amount, created_at FROM events WHERE country = ?",
+            ...     parameters=["NL"],
+            ...     watermark_column="id",
+            ...     meta_columns=["id"],
+            ... )
+            >>> ds, df = converter.convert()
+        """
+        super().__init__(cache_directory, cache_size)
+        self._connection_factory = connection_factory
+        self._query = query
+        self._parameters = parameters
+        self._watermark_column = watermark_column
+        self._forced_numerical_columns = tuple(forced_numerical_columns)
+        self._forced_categorical_columns = tuple(forced_categorical_columns)
+        self._forced_boolean_columns = tuple(forced_boolean_columns)
+        self._meta_columns = tuple(meta_columns)
+        self._batch_size = batch_size
+
+    def convert(
+        self,
+        file_paths: list[Path] | list[str] | None = None,
+        cache_group: str | None = None,
+        force_recompute: bool = False,
+        disable_cache: bool = False,
+    ) -> tuple[DataSchema, vaex.DataFrame]:
+        """Executes the query and converts its result set to Arrow format, returning a `vaex` dataframe.
+
+        Without a watermark column, the result is cached on a fingerprint of the query, its parameters and the type
+        configuration, so the database is only queried again if one of them changes or `force_recompute` is set.
+        With a watermark column, the database is queried on every call for the rows added since the previous call,
+        and `force_recompute` discards the previously fetched rows and reloads the full result set.
+
+        Args:
+            file_paths: Not used, the data is read with the configured query. Accepted so that the converter can be
+                used in place of a file-based converter, e.g. in a `ConvertStep`.
+            cache_group: The cache group to use.
+            force_recompute: If set to True, forces recomputation and ignores the cache.
+            disable_cache: If set to True, disables the cache.
+
+        Returns:
+            The data schema and the resulting dataframe.
+        """
+        if self._watermark_column is not None:
+            return self._convert_incremental(force_recompute)
+
+        ds, df = self._cached_execute(
+            lambda_func=lambda: self._convert(),
+            cache_key_inputs=[
+                self._query,
+                self._get_hashable_parameters(),
+                self._forced_numerical_columns,
+                self._forced_categorical_columns,
+                self._forced_boolean_columns,
+                self._meta_columns,
+            ],
+            cache_group=cache_group,
+            force_recompute=force_recompute,
+            cache_handlers=[
+                JOBLIB_CACHE_HANDLER,
+                CacheHandler(
+                    writer=write_vaex_dataframe_with_cleanup,
+                    reader=read_vaex_dataframe_with_dtypes,
+                    suffix=VAEX_DATAFRAME_CACHE_HANDLER.suffix,
+                    can_handle_none=False,
+                ),
+            ],
+            disable_cache=disable_cache,
+        )
+        return ds, df
+
+    def _convert(self) -> tuple[DataSchema, vaex.DataFrame]:
+        """Streams the full result set of the query into an Arrow file in the cache directory.
+
+        Returns:
+            The data schema and the resulting dataframe.
+        """
+        chunk_path = self._cache_directory / "df_chunk_sql.arrow"
+        self._write_query_to_arrow(chunk_path, self._query, self._parameters)
+        return self._get_schema_and_dataframe(vaex.open(chunk_path))
+
+    def _convert_incremental(self, force_recompute: bool) -> tuple[DataSchema, vaex.DataFrame]:
+        """Fetches the rows added since the previous conversion and appends them to the previously fetched rows.
+
+        Each conversion writes its rows to a new Arrow file in a directory dedicated to the query, together with
+        a `watermark.json` file holding the maximum value of the watermark column fetched so far and the names of
+        the Arrow files holding the rows up to it. The state file is replaced atomically once the new Arrow file is
+        complete, so it is the single commit point of a conversion: files it does not list, left behind by a failed
+        or interrupted conversion, are deleted and their rows fetched again by the next conversion.
+
+        Args:
+            force_recompute: If set to True, discards the previously fetched rows and reloads the full result set.
+
+        Returns:
+            The data schema and the resulting dataframe.
+        """
+        incremental_directory = self._cache_directory / f"sql_incremental_{self._get_query_fingerprint()}"
+        incremental_directory.mkdir(parents=True, exist_ok=True)
+        if force_recompute:
+            clear_directory(incremental_directory)
+
+        state_path = incremental_directory / "watermark.json"
+        state = self._read_state(state_path)
+        chunk_names: list[str] = state["chunks"] if state is not None else []
+        if (
+            state is None
+            or len(chunk_names) == 0
+            or not all((incremental_directory / name).exists() for name in chunk_names)
+        ):
+            clear_directory(incremental_directory)
+            chunk_names = []
+            query, parameters, schema = self._query, self._parameters, None
+            logger.info(f"Loading the full result set, no previous watermark of {self._watermark_column!r} found.")
+        else:
+            for path in incremental_directory.iterdir():
+                if path.name not in chunk_names and path != state_path:
+                    logger.debug(f"Deleting {path.name!r} left behind by an incomplete conversion.")
+                    path.unlink()
+            with pa.ipc.open_stream(incremental_directory / chunk_names[0]) as reader:
+                schema = reader.schema
+            watermark = self._parse_watermark(state["watermark"], schema.field(self._watermark_column).type)
+            query, parameters = self._get_incremental_query(watermark)
+            logger.info(f"Loading rows with {self._watermark_column!r} greater than {watermark!r}.")
+
+        chunk_path = incremental_directory / f"df_chunk_{len(chunk_names):06d}.arrow"
+        watermark = self._write_query_to_arrow(chunk_path, query, parameters, schema)
+        if watermark is not None:
+            part_path = state_path.with_name(state_path.name + ".part")
+            with open(part_path, "w") as state_file:
+                json.dump(
+                    {
+                        "watermark": watermark.isoformat() if isinstance(watermark, datetime) else watermark,
+                        "chunks": [*chunk_names, chunk_path.name],
+                    },
+                    state_file,
+                )
+            os.replace(part_path, state_path)
+        elif len(chunk_names) > 0:
+            chunk_path.unlink()
+            logger.info("\033[32mCache Hit\033[0m: No new rows found, using the previously fetched rows.")
+        return self._get_schema_and_dataframe(vaex.open(incremental_directory / "df_chunk_*.arrow"))
+
+    def _write_query_to_arrow(
+        self, chunk_path: Path, query: str, parameters: SQLParameters, schema: pa.Schema | None = None
+    ) -> Any:
+        """Executes a query and writes its result set to an Arrow IPC file, batch by batch.
+
+        Rows are fetched on a separate thread and handed over through a bounded queue, so the next batch is fetched
+        from the database while the previous one is being converted and written. The rows are written to a `.part`
+        file next to `chunk_path`, which is only renamed into place once the whole result set has been written, and
+        deleted if fetching or writing fails.
+
+        Args:
+            chunk_path: Path of the Arrow file to write.
+            query: The SQL query to execute.
+            parameters: Parameters bound to the placeholders of the query.
+            schema: The schema of the rows, or None to infer it from the first batch.
+
+        Raises:
+            ValueError: If the values of a column do not fit the type of the column.
+
+        Returns:
+            The maximum value of the watermark column among the written rows, or None if no rows were written or no
+            watermark column is configured.
+        """
+        part_path = chunk_path.with_name(chunk_path.name + ".part")
+        writer: pa.ipc.RecordBatchStreamWriter | None = None
+        watermark = None
+        n_rows = 0
+        try:
+            try:
+                for column_names, rows in self._fetch_batches(query, parameters):
+                    if schema is None:
+                        schema = self._infer_schema(column_names, rows)
+                    if writer is None:
+                        writer = pa.ipc.new_stream(str(part_path), schema)
+
+                    batch = self._rows_to_record_batch(schema, rows)
+                    writer.write_batch(batch)
+                    n_rows += batch.num_rows
+                    if self._watermark_column is not None:
+                        batch_watermark = pc.max(batch.column(self._watermark_column)).as_py()
+                        if watermark is None or (batch_watermark is not None and batch_watermark > watermark):
+                            watermark = batch_watermark
+            finally:
+                if writer is not None:
+                    writer.close()
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+        os.replace(part_path, chunk_path)
+        logger.info(f"Fetched {n_rows} rows from the database.")
+        return watermark
+
+    def _fetch_batches(self, query: str, parameters: SQLParameters) -> Iterator[tuple[list[str], list[Sequence]]]:
+        """Executes a query on a fetching thread and yields its rows in batches of `batch_size` rows.
+
+        The connection is created, used and closed on the fetching thread, as some drivers (e.g. `sqlite3`) do not
+        allow connections to be shared between threads. An empty result set yields a single empty batch, so that
+        the column names are always known.
+
+        Args:
+            query: The SQL query to execute.
+            parameters: Parameters bound to the placeholders of the query.
+
+        Raises:
+            Exception: Any exception raised by the driver while executing the query or fetching rows.
+
+        Yields:
+            The column names of the result set and a batch of rows.
+        """
+        batches: queue.Queue = queue.Queue(maxsize=SQL_FETCH_QUEUE_SIZE)
+        stop_event = threading.Event()
+
+        def fetch() -> None:
+            try:
+                connection = self._connection_factory()
+                try:
+                    column_names, fetchmany = self._execute(connection, query, parameters)
+                    rows = list(fetchmany(self._batch_size))
+                    batches.put((column_names, rows))
+                    while len(rows) > 0 and not stop_event.is_set():
+                        rows = list(fetchmany(self._batch_size))
+                        if len(rows) > 0:
+                            batches.put((column_names, rows))
+                finally:
+                    connection.close()
+                batches.put(None)
+            except Exception as e:
+                batches.put(e)
+
+        fetch_thread = threading.Thread(target=fetch, daemon=True)
+        fetch_thread.start()
+        try:
+            while (item := batches.get()) is not None:
+                if isinstance(item, Exception):
+                    logger.error(f"Failed to fetch the result set of the query: {item}")
+                    raise item
+                yield item
+        finally:
+            stop_event.set()
+            while fetch_thread.is_alive():
+                try:
+                    batches.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    @staticmethod
+    def _execute(connection: Any, query: str, parameters: SQLParameters) -> tuple[list[str], Callable[[int], Any]]:
+        """Executes a query on a DB-API 2.0 or SQLAlchemy connection.
+
+        SQLAlchemy connections are executed with `stream_results=True`, which uses a server-side cursor on drivers
+        supporting it, so the rows are not buffered by the driver before they are fetched.
+
+        Args:
+            connection: A DB-API 2.0 or SQLAlchemy connection.
+            query: The SQL query to execute.
+            parameters: Parameters bound to the placeholders of the query.
+
+        Returns:
+            The column names of the result set and the `fetchmany` function of the cursor or result.
+        """
+        if type(connection).__module__.startswith("sqlalchemy"):
+            import sqlalchemy
+
+            result = connection.execution_options(stream_results=True).execute(sqlalchemy.text(query), parameters or {})
+            return [str(key) for key in result.keys()], result.fetchmany
+
+        cursor = connection.cursor()
+        if parameters is None:
+            cursor.execute(query)
+        else:
+            cursor.execute(query, parameters)
+        return [str(description[0]) for description in cursor.description], cursor.fetchmany
+
+    def _infer_schema(self, column_names: list[str], rows: list[Sequence]) -> pa.Schema:
+        """Infers the Arrow schema of the result set from its first batch of rows and the forced column types.
+
+        Args:
+            column_names: The column names of the result set.
+            rows: The first batch of rows.
+
+        Returns:
+            The Arrow schema used for all batches of the result set.
+        """
+        columns = list(zip(*rows)) if len(rows) > 0 else [()] * len(column_names)
+        fields = []
+        for column_name, values in zip(column_names, columns):
+            if column_name in self._forced_numerical_columns:
+                column_type = pa.float64()
+            elif column_name in self._forced_categorical_columns:
+                column_type = pa.string()
+            elif column_name in self._forced_boolean_columns:
+                column_type = pa.bool_()
+            else:
+                column_type = pa.array(values).type
+                if pa.types.is_null(column_type) or pa.types.is_large_string(column_type):
+                    column_type = pa.string()
+                elif pa.types.is_decimal(column_type):
+                    column_type = pa.float64()
+                elif pa.types.is_date(column_type):
+                    column_type = pa.timestamp("s")
+            fields.append(pa.field(column_name, column_type))
+        return pa.schema(fields)
+
+    @staticmethod
+    def _rows_to_record_batch(schema: pa.Schema, rows: list[Sequence]) -> pa.RecordBatch:
+        """Converts a batch of rows to an Arrow record batch with the given schema.
+
+        Args:
+            schema: The Arrow schema of the result set.
+            rows: A batch of rows.
+
+        Raises:
+            ValueError: If the values of a column do not fit the type of the column.
+
+        Returns:
+            The record batch.
+        """
+        columns = list(zip(*rows)) if len(rows) > 0 else [()] * len(schema)
+        arrays = []
+        for schema_field, values in zip(schema, columns):
+            try:
+                array = pa.array(values, type=schema_field.type)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+                try:
+                    array = pa.array(values).cast(schema_field.type)
+                except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                    msg = (
+                        f"Values of column {schema_field.name!r} do not fit its type {schema_field.type} inferred from "
+                        f"the first batch, force the type of the column instead: {e}"
+                    )
+                    logger.error(msg)
+                    raise ValueError(msg) from e
+            arrays.append(array)
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def _get_incremental_query(self, watermark: Any) -> tuple[str, SQLParameters]:
+        """Wraps the query with a predicate selecting the rows with a watermark greater than the given one.
+
+        The placeholder of the watermark follows the parameter style of the connection's driver module and the shape
+        of the query parameters. Positional parameters get a positional placeholder, e.g. `?` for `sqlite3` or `%s`
+        for `psycopg2`, while named parameters, or no parameters with a driver supporting named placeholders, get the
+        named `mleko_watermark` placeholder, e.g. `%(mleko_watermark)s` for `psycopg2` or `:mleko_watermark` for
+        SQLAlchemy connections.
+
+        Args:
+            watermark: The maximum value of the watermark column fetched so far.
+
+        Returns:
+            The incremental query and its parameters.
+        """
+        connection = self._connection_factory()
+        try:
+            module_name = type(connection).__module__.split(".")[0]
+            paramstyle = "named" if module_name == "sqlalchemy" else sys.modules[module_name].paramstyle
+        finally:
+            connection.close()
+
+        parameters: SQLParameters
+        if isinstance(self._parameters, dict) or (self._parameters is None and paramstyle in ("named", "pyformat")):
+            placeholder = f":{WATERMARK_PARAMETER_NAME}" if paramstyle == "named" else f"%({WATERMARK_PARAMETER_NAME})s"
+            parameters = {**(self._parameters or {}), WATERMARK_PARAMETER_NAME: watermark}
+        else:
+            positional_parameters = list(self._parameters or ())
+            placeholder = {"qmark": "?", "format": "%s", "pyformat": "%s"}.get(
+                paramstyle, f":{len(positional_parameters) + 1}"
+            )
+            parameters = [*positional_parameters, watermark]
+        # The query and the watermark column are part of the converter configuration rather than untrusted input,
+        # and the watermark value itself is always bound as a query parameter.
+        query = (
+            f"SELECT * FROM ({self._query}) AS mleko_incremental "  # noqa: S608
+            f"WHERE {self._watermark_column} > {placeholder}"
+        )
+        return query, parameters
+
+    @staticmethod
+    def _read_state(state_path: Path) -> dict[str, Any] | None:
+        """Reads the state recorded by the previous incremental conversion.
+
+        Args:
+            state_path: Path to the `watermark.json` file.
+
+        Returns:
+            The watermark and the names of the Arrow files of the previously fetched rows, or None if there is no
+            readable state file.
+        """
+        try:
+            with open(state_path) as state_file:
+                state = json.load(state_file)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return state if "watermark" in state and "chunks" in state else None
+
+    @staticmethod
+    def _parse_watermark(watermark: Any, watermark_type: pa.DataType) -> Any:
+        """Converts a watermark read from the state file to the type of the watermark column.
+
+        Args:
+            watermark: The watermark as stored in the `watermark.json` file.
+            watermark_type: The Arrow type of the watermark column.
+
+        Returns:
+            The maximum value of the watermark column fetched so far.
+        """
+        if pa.types.is_timestamp(watermark_type) and isinstance(watermark, str):
+            return datetime.fromisoformat(watermark)
+        return watermark
+
+    def _get_hashable_parameters(self) -> tuple:
+        """Gets a hashable representation of the query parameters, used as part of the cache key.
+
+        Returns:
+            The parameters as a tuple of values, or of sorted key and value pairs for named parameters.
+        """
+        if isinstance(self._parameters, dict):
+            return tuple((key, repr(value)) for key, value in sorted(self._parameters.items()))
+        return tuple(repr(value) for value in (self._parameters or ()))
+
+    def _get_query_fingerprint(self) -> str:
+        """Gets a fingerprint of the query, its parameters and the type configuration.
+
+        Returns:
+            The MD5 hash identifying the rows fetched by the converter.
+        """
+        return hashlib.md5(
+            repr(
+                (
+                    self._query,
+                    self._get_hashable_parameters(),
+                    self._watermark_column,
+                    self._forced_numerical_columns,
+                    self._forced_categorical_columns,
+                    self._forced_boolean_columns,
+                )
+            ).encode()
+        ).hexdigest()
+
+    def _get_schema_and_dataframe(self, df: vaex.DataFrame) -> tuple[DataSchema, vaex.DataFrame]:
+        """Renames incompatible columns, builds the data schema and casts boolean columns to integers.
+
+        Args:
+            df: The DataFrame read from the converted Arrow files.
+
+        Returns:
+            The data schema and the resulting dataframe.
+        """
+        for column_name in df.get_column_names():
+            if column_name in RESERVED_KEYWORDS:
+                logger.warning(f"Renaming column {column_name!r} to '_{column_name}'")
+                df.rename(column_name, f"_{column_name}")
+
+        ds = DataSchema(
+            numerical=df.get_column_names(dtype="numeric"),
+            categorical=df.get_column_names(dtype="string"),
+            boolean=df.get_column_names(dtype="bool"),
+            datetime=df.get_column_names(dtype="datetime"),
+            timedelta=df.get_column_names(dtype="timedelta"),
+        )
+        ds.drop_features(self._meta_columns)
+
+        for column_name in df.get_column_names(dtype="bool"):
+            df[column_name] = get_column(df, column_name).astype("int8")
+
+        return ds, df
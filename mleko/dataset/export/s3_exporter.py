@@ -52,6 +52,7 @@ class S3Exporter(BaseExporter):
         workers_per_file: int = 1,
         aws_profile_name: str | None = None,
         aws_region_name: str = "eu-west-1",
+        max_bandwidth_mb: float | None = None,
     ) -> None:
         """Initializes the `S3Exporter` class and creates the S3 client.
 
@@ -71,7 +72,8 @@ class S3Exporter(BaseExporter):
             number of concurrent upload and parts upload per file, respectively. These parameters should be
             set based on the available system resources and the S3 bucket's performance limits. The total number of
             concurrent threads is the product of these two parameters
-            (i.e., `max_concurrent_files * workers_per_file`).
+            (i.e., `max_concurrent_files * workers_per_file`), while the number of concurrent requests is capped at
+            the connection pool size of the S3 client, `S3_MAX_CONNECTIONS`.
 
         Args:
             manifest_file_name: Name of the manifest file to store the S3 file metadata.
@@ -80,6 +82,8 @@ class S3Exporter(BaseExporter):
                 upload large files faster, as it allows for parallel upload of different parts of the file.
             aws_profile_name: AWS profile name to use.
             aws_region_name: AWS region name where the S3 bucket is located.
+            max_bandwidth_mb: Maximum total bandwidth in MB per second shared by all concurrent uploads, or None
+                for no limit.
 
         Examples:
             >>> from mleko.dataset.export import S3Exporter
@@ -93,7 +97,7 @@ class S3Exporter(BaseExporter):
         self._workers_per_file = workers_per_file
         self._aws_profile_name = aws_profile_name
         self._aws_region_name = aws_region_name
-        self._s3_client = S3Client(self._aws_profile_name, self._aws_region_name)
+        self._s3_client = S3Client(self._aws_profile_name, self._aws_region_name, max_bandwidth_mb=max_bandwidth_mb)
 
     def export(  # pyright: ignore [reportIncompatibleMethodOverride]
         self, data: list[Path] | list[str], config: S3ExporterConfig, force_recompute: bool = False
@@ -122,6 +126,7 @@ class S3Exporter(BaseExporter):
             key_prefix=key_prefix,
             manifest_file_name=self._manifest_file_name,
             file_pattern="*",
+            num_workers=self._max_concurrent_files,
         )
 
         s3_path_string = f"s3://{Path(bucket_name) / key_prefix}/"
@@ -118,7 +118,8 @@ class CompositeFeatureSelector(BaseFeatureSelector):
                 f"{feature_selector.__class__.__name__}."
             )
             data_schema, dataframe = feature_selector.transform(data_schema, dataframe, disable_cache=True)
-            dataframe = dataframe.extract()
+            if dataframe.filtered:
+                dataframe = dataframe.extract()
             logger.info(f"Finished composite feature selection step {i+1}/{len(self._feature_selectors)}.")
         return data_schema, dataframe
 
@@ -144,7 +145,8 @@ class CompositeFeatureSelector(BaseFeatureSelector):
                 data_schema, dataframe, disable_cache=True
             )
             feature_selectors.append(feature_selector)
-            dataframe = dataframe.extract()
+            if dataframe.filtered:
+                dataframe = dataframe.extract()
             logger.info(
                 "Finished fitting and transforming composite feature "
                 f"selection step {i+1}/{len(self._feature_selectors)}."
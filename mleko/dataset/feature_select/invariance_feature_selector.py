@@ -12,7 +12,7 @@ from mleko.dataset.data_schema import DataSchema
 from mleko.dataset.feature_select.base_feature_selector import BaseFeatureSelector
 from mleko.utils.custom_logger import CustomLogger
 from mleko.utils.decorators import auto_repr
-from mleko.utils.vaex_helpers import get_column, get_columns
+from mleko.utils.vaex_helpers import get_column, get_columns, get_dictionary_codes, is_dictionary_encoded
 
 
 logger = CustomLogger()
@@ -85,7 +85,11 @@ class InvarianceFeatureSelector(BaseFeatureSelector):
 
         cardinality = {}
         for feature in tqdm(features, desc="Calculating invariance of features"):
-            column = get_column(dataframe, feature)
+            column = (
+                get_dictionary_codes(dataframe, feature)
+                if is_dictionary_encoded(dataframe, feature)
+                else get_column(dataframe, feature)
+            )
             cardinality[feature] = column.nunique(limit=2, limit_raise=False)
 
         self._feature_selector = {feature for feature in features if cardinality[feature] == 1}
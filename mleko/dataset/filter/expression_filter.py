@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Literal
 
 import vaex
 
@@ -11,6 +12,7 @@ from mleko.cache.handlers.vaex_cache_handler import VAEX_DATAFRAME_CACHE_HANDLER
 from mleko.dataset.data_schema import DataSchema
 from mleko.utils.custom_logger import CustomLogger
 from mleko.utils.decorators import auto_repr
+from mleko.utils.vaex_helpers import jit_expression
 
 from .base_filter import BaseFilter
 
@@ -26,6 +28,7 @@ class ExpressionFilter(BaseFilter):
     def __init__(
         self,
         expression: str,
+        jit: Literal["numba", "pythran"] | None = None,
         cache_directory: str | Path = "data/expression-filter",
         cache_size: int = 1,
     ) -> None:
@@ -40,6 +43,8 @@ class ExpressionFilter(BaseFilter):
 
         Args:
             expression: The expression to be used for filtering.
+            jit: Optional JIT backend used to compile the expression into a single kernel, see `jit_expression`.
+                If the expression cannot be compiled, it is evaluated without compilation.
             cache_directory: The target directory where the filtered dataframes are to be saved.
             cache_size: The maximum number of cache entries.
 
@@ -56,6 +61,7 @@ class ExpressionFilter(BaseFilter):
         """
         super().__init__(cache_directory, cache_size)
         self._expression = expression
+        self._jit: Literal["numba", "pythran"] | None = jit
 
     def filter(
         self,
@@ -100,9 +106,29 @@ class ExpressionFilter(BaseFilter):
             The filtered dataframe.
         """
         logger.info(f"Filtering dataframe based on expression {self._expression!r}.")
-        filtered_df = dataframe.filter(f"({self._expression})").extract()
+        df = dataframe.copy()
+        filtered_df = df.filter(self._get_filter_expression(df)).extract()
         logger.info(
             f"Filtered dataframe into shape {filtered_df.shape}, "
             f"dropped {dataframe.shape[0] - filtered_df.shape[0]} rows."
         )
         return filtered_df
+
+    def _get_filter_expression(self, dataframe: vaex.DataFrame) -> str | vaex.Expression:
+        """Returns the filter expression, JIT-compiled if a backend is configured and the expression can be compiled.
+
+        Args:
+            dataframe: The dataframe to be filtered.
+
+        Returns:
+            The compiled or the original expression.
+        """
+        if self._jit is not None:
+            try:
+                return jit_expression(dataframe, self._expression, self._jit)
+            except Exception as e:
+                logger.warning(
+                    f"Could not JIT-compile expression {self._expression!r} using {self._jit}, "
+                    f"evaluating it without compilation: {e}"
+                )
+        return f"({self._expression})"
@@ -8,13 +8,17 @@ The following ingester classes are provided by the subpackage:
     - `BaseIngester`: The abstract base class for all ingesters.
     - `S3Ingester`: An ingester for fetching data from AWS S3.
     - `KaggleIngester`: An ingester for fetching data from Kaggle.
+    - `HTTPIngester`: An ingester for fetching data from HTTP(S) URLs.
+    - `LocalIngester`: An ingester for staging data from a local or shared filesystem.
 """
 
 from __future__ import annotations
 
 from .base_ingester import BaseIngester
+from .http_ingester import HTTPIngester
 from .kaggle_ingester import KaggleIngester
+from .local_ingester import LocalIngester
 from .s3_ingester import S3Ingester
 
 
-__all__ = ["BaseIngester", "S3Ingester", "KaggleIngester"]
+__all__ = ["BaseIngester", "S3Ingester", "KaggleIngester", "LocalIngester", "HTTPIngester"]
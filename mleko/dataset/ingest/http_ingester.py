@@ -0,0 +1,239 @@
+"""Module for downloading files over HTTP(S) and storing them locally using the `HTTPIngester` class."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent import futures
+from pathlib import Path
+from typing import Tuple, Union
+from urllib.parse import unquote, urlparse
+
+import requests
+from tqdm.auto import tqdm
+
+from mleko.utils import (
+    CustomLogger,
+    LocalFileEntry,
+    LocalManifestHandler,
+    auto_repr,
+    create_http_session,
+    download_http_file,
+    download_http_file_segments,
+)
+from mleko.utils.http_helpers import HTTP_SEGMENT_SIZE
+
+from .base_ingester import BaseIngester
+
+
+logger = CustomLogger()
+"""A module-level custom logger."""
+
+HTTPTimeout = Union[float, Tuple[float, float]]
+"""Type alias for a `requests` timeout, either a single timeout or a tuple of connect and read timeouts in seconds."""
+
+
+class HTTPIngester(BaseIngester):
+    """`HTTPIngester` downloads files from HTTP(S) URLs and stores them locally.
+
+    Large files on servers supporting range requests are downloaded in segments over parallel connections, and
+    interrupted downloads are resumed. It supports manifest-based caching: the `ETag` and `Last-Modified` headers of
+    every file are recorded, and on later runs a conditional request tells whether the file has changed, so only new
+    or changed files are downloaded again.
+    """
+
+    @auto_repr
+    def __init__(
+        self,
+        urls: str | list[str],
+        dataset_id: str | None = None,
+        destination_directory: str | Path = "data/http-ingester",
+        max_concurrent_files: int = 8,
+        workers_per_file: int = 4,
+        segment_size: int = HTTP_SEGMENT_SIZE,
+        headers: dict[str, str] | None = None,
+        timeout: HTTPTimeout = (10, 60),
+    ) -> None:
+        """Initializes the `HTTPIngester` with the URLs to download and the transfer configuration.
+
+        Warning:
+            The total number of concurrent connections is the product of `max_concurrent_files` and
+            `workers_per_file`, some servers throttle or block clients opening too many connections.
+
+        Args:
+            urls: URL or list of URLs of the files to download. The files are stored under the last segment of the
+                URL path, which must be unique across the URLs.
+            dataset_id: Id of the dataset to be used instead of the default fingerprint (MD5 hash of the URLs).
+                Note that this will overwrite any existing dataset with the same name in the destination directory,
+                so make sure to use a unique name.
+            destination_directory: Directory to store the downloaded files.
+            max_concurrent_files: Maximum number of files to download concurrently.
+            workers_per_file: Number of segments to download concurrently for each file larger than `segment_size`,
+                if the server supports range requests.
+            segment_size: Size in bytes of the segments of a segmented download.
+            headers: Optional headers sent with every request, e.g. an `Authorization` header.
+            timeout: Connect and read timeouts of each request in seconds. The read timeout applies to each read of
+                a response stream rather than to the whole download.
+
+        Raises:
+            ValueError: If a URL has no file name or multiple URLs share the same file name.
+
+        Examples:
+            >>> from mleko.dataset.ingest import HTTPIngester
+            >>> http_ingester = HTTPIngester(
+            ...     urls=["https://example.com/data/train.csv", "https://example.com/data/test.csv"],
+            ...     dataset_id="example", # Optional, but will store the data in "./data/example/" instead of
+            ...                           # "./data/<fingerprint>/".
+            ... )
+            >>> http_ingester.fetch_data()
+            [PosixPath('data/example/train.csv'), PosixPath('data/example/test.csv')]
+        """
+        if isinstance(urls, str):
+            urls = [urls]
+        dataset_id = dataset_id if dataset_id is not None else hashlib.md5("".join(urls).encode()).hexdigest()
+        super().__init__(destination_directory, dataset_id)
+        self._local_manifest_handler = LocalManifestHandler(
+            self._destination_directory / f"{self._fingerprint}.manifest.json"
+        )
+        self._urls = urls
+        self._file_names = [unquote(urlparse(url).path).rsplit("/", 1)[-1] for url in urls]
+        self._max_concurrent_files = max_concurrent_files
+        self._workers_per_file = workers_per_file
+        self._segment_size = segment_size
+        self._headers = headers if headers is not None else {}
+        self._timeout = timeout
+        self._session = create_http_session(pool_size=max_concurrent_files * max(1, workers_per_file))
+
+        if "" in self._file_names or len(set(self._file_names)) != len(self._file_names):
+            msg = f"Each URL must end with a unique file name, got {self._file_names}."
+            logger.error(msg)
+            raise ValueError(msg)
+
+    def fetch_data(self, force_recompute: bool = False) -> list[Path]:
+        """Downloads the files from the URLs and stores them in the 'destination_directory'.
+
+        If 'force_recompute' is False, each file recorded in the local manifest is checked with a conditional `HEAD`
+        request (`If-None-Match` and `If-Modified-Since`) and only downloaded again if it has changed on the server.
+        Files of servers that provide neither an `ETag` nor a `Last-Modified` header are always downloaded again.
+
+        Args:
+            force_recompute: Whether to force the data source to recompute its output, even if it already exists.
+
+        Raises:
+            HTTPError: If there is an error in the HTTP response of any of the requests.
+
+        Returns:
+            A list of Path objects pointing to the downloaded data files.
+        """
+        previous_entries = {entry.name: entry for entry in self._local_manifest_handler.get_files()}
+        if force_recompute:
+            logger.info(
+                f"\033[33mForce Cache Refresh\033[0m: Downloading {len(self._urls)} files "
+                f"to {self._destination_directory}."
+            )
+            self._delete_local_files(list(previous_entries))
+            previous_entries = {}
+        else:
+            files_to_delete = [name for name in previous_entries if name not in self._file_names]
+            if len(files_to_delete) > 0:
+                logger.info(
+                    f"Deleting {len(files_to_delete)} files from "
+                    f"{self._destination_directory} that are no longer part of the URLs."
+                )
+                self._delete_local_files(files_to_delete)
+
+        results: list[tuple[LocalFileEntry, bool]] = []
+        max_workers = max(1, min(self._max_concurrent_files, len(self._urls)))
+        with tqdm(total=len(self._urls), desc="Downloading files over HTTP") as pbar:
+            with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for result in executor.map(
+                    self._fetch_file,
+                    self._urls,
+                    self._file_names,
+                    [previous_entries.get(file_name) for file_name in self._file_names],
+                ):
+                    results.append(result)
+                    pbar.update(1)
+
+        n_downloaded = sum(downloaded for _, downloaded in results)
+        if n_downloaded == 0:
+            logger.info("\033[32mCache Hit\033[0m: Local dataset is up to date with the URLs, skipping download.")
+        else:
+            logger.info(f"Finished downloading {n_downloaded} of {len(self._urls)} new or changed files.")
+
+        self._local_manifest_handler.set_files([entry for entry, _ in results])
+        return self._get_full_file_paths(self._local_manifest_handler.get_file_names())
+
+    def _fetch_file(
+        self, url: str, file_name: str, previous_entry: LocalFileEntry | None
+    ) -> tuple[LocalFileEntry, bool]:
+        """Downloads a single file unless the local copy is still up to date with the server.
+
+        Args:
+            url: URL of the file to download.
+            file_name: Name of the file in the destination directory.
+            previous_entry: Manifest entry of the file from the previous run, if any.
+
+        Raises:
+            HTTPError: If there is an error in the HTTP response.
+
+        Returns:
+            The manifest entry of the file and whether it was downloaded.
+        """
+        file_path = self._destination_directory / file_name
+        conditional_headers: dict[str, str] = {}
+        if previous_entry is not None and file_path.exists():
+            if previous_entry.hash is not None:
+                conditional_headers["If-None-Match"] = previous_entry.hash
+            if previous_entry.last_modified is not None:
+                conditional_headers["If-Modified-Since"] = previous_entry.last_modified
+
+        response = self._session.head(
+            url, headers={**self._headers, **conditional_headers}, allow_redirects=True, timeout=self._timeout
+        )
+        if response.status_code == 304 and previous_entry is not None:
+            return previous_entry, False
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            logger.error(e)
+            raise requests.HTTPError(e) from e
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        content_length = response.headers.get("Content-Length")
+        file_size = int(content_length) if content_length is not None else None
+        if (
+            previous_entry is not None
+            and conditional_headers
+            and (etag is not None or last_modified is not None)
+            and (etag, last_modified) == (previous_entry.hash, previous_entry.last_modified)
+            and file_size in (None, previous_entry.size)
+        ):
+            return previous_entry, False
+
+        if (
+            self._workers_per_file > 1
+            and file_size is not None
+            and file_size > self._segment_size
+            and response.headers.get("Accept-Ranges") == "bytes"
+        ):
+            validator = etag if etag is not None and not etag.startswith("W/") else last_modified
+            download_http_file_segments(
+                response.url,
+                file_path,
+                file_size,
+                validator,
+                session=self._session,
+                num_workers=self._workers_per_file,
+                segment_size=self._segment_size,
+                headers=self._headers,
+                timeout=self._timeout,
+            )
+        else:
+            download_http_file(
+                response.url, file_path, session=self._session, headers=self._headers, timeout=self._timeout
+            )
+
+        entry = LocalFileEntry(name=file_name, size=os.path.getsize(file_path), hash=etag, last_modified=last_modified)
+        return entry, True
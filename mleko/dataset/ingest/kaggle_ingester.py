@@ -8,12 +8,10 @@ from __future__ import annotations
 import hashlib
 import json
 import os
-import shutil
 from concurrent import futures
 from dataclasses import dataclass
 from datetime import datetime
 from fnmatch import fnmatch
-from itertools import repeat
 from pathlib import Path
 from typing import NamedTuple
 
@@ -21,7 +19,17 @@ import requests
 from requests.auth import HTTPBasicAuth
 from tqdm.auto import tqdm
 
-from mleko.utils import CustomLogger, LocalFileEntry, LocalManifestHandler, auto_repr
+from mleko.utils import (
+    CustomLogger,
+    LocalFileEntry,
+    LocalManifestHandler,
+    auto_repr,
+    create_http_session,
+    download_http_file,
+    extract_zip_member,
+    get_zip_members,
+    is_zip_file,
+)
 
 from .base_ingester import BaseIngester
 
@@ -185,6 +193,14 @@ class KaggleIngester(BaseIngester):
     _KAGGLE_DATASET_URL = f"https://www.kaggle.com/api/{_KAGGLE_API_VERSION}/datasets"
     """The base URL for Kaggle dataset API requests."""
 
+    _KAGGLE_TIMEOUT = (10, 60)
+    """The connect and read timeouts in seconds, the read timeout applies to each read of a response stream rather
+    than to the whole download, so large files are not cut off."""
+
+    _KAGGLE_MAX_RETRIES = 5
+    """The number of times a failed request is retried, with exponential backoff, on connection errors and on
+    throttling or server error responses."""
+
     @auto_repr
     def __init__(
         self,
@@ -230,7 +246,9 @@ class KaggleIngester(BaseIngester):
                 the latest version will be fetched.
             kaggle_api_credentials_file: Path to a Kaggle API credentials JSON file. If not
                 provided, environment variables or the default file location will be used.
-            num_workers: Number of concurrent threads to use when downloading files.
+            num_workers: Number of concurrent threads to use when downloading files, also used as the size of the
+                connection pool shared by all downloads. Downloaded zip files are extracted in parallel by up to
+                the number of CPUs threads, while the remaining files are still downloading.
 
         Examples:
             >>> from mleko.dataset.sources import KaggleIngester
@@ -259,6 +277,7 @@ class KaggleIngester(BaseIngester):
         self._dataset_version = dataset_version
         self._kaggle_config = KaggleCredentialsManager.get_kaggle_credentials(kaggle_api_credentials_file)
         self._num_workers = num_workers
+        self._session = create_http_session(pool_size=num_workers, max_retries=self._KAGGLE_MAX_RETRIES)
 
         if isinstance(file_pattern, str):
             file_pattern = [file_pattern]
@@ -293,9 +312,14 @@ class KaggleIngester(BaseIngester):
         else:
             if self._is_local_dataset_fresh(kaggle_manifest):
                 logger.info("\033[32mCache Hit\033[0m: Local dataset is up to date with Kaggle, skipping download.")
-                local_file_names = set(self._local_manifest_handler.get_file_names())
-                kaggle_file_names: set[str] = {kaggle_file.name for kaggle_file in kaggle_manifest}
-                files_to_delete = list(local_file_names.difference(kaggle_file_names))
+                kaggle_file_names = {kaggle_file.name for kaggle_file in kaggle_manifest}
+                kaggle_files = self._local_manifest_handler.get_metadata()["kaggle_files"]
+                files_to_delete = [
+                    local_file_name
+                    for kaggle_file_name, kaggle_file in kaggle_files.items()
+                    if kaggle_file_name not in kaggle_file_names
+                    for local_file_name in kaggle_file["files"]
+                ]
 
                 if len(files_to_delete) > 0:
                     logger.info(
@@ -305,6 +329,9 @@ class KaggleIngester(BaseIngester):
 
                 self._delete_local_files(files_to_delete)
                 self._local_manifest_handler.remove_files(files_to_delete)
+                self._local_manifest_handler.set_metadata(
+                    {"kaggle_files": {name: kaggle_files[name] for name in kaggle_files if name in kaggle_file_names}}
+                )
                 return self._get_full_file_paths(self._local_manifest_handler.get_file_names())
 
             logger.info(
@@ -313,18 +340,35 @@ class KaggleIngester(BaseIngester):
             )
 
         self._delete_local_files(self._local_manifest_handler.get_file_names())
-        kaggle_file_paths = [f"{dataset_path}/{file_metadata.name}" for file_metadata in kaggle_manifest]
-        if len(kaggle_file_paths) > 0:
-            self._kaggle_fetch_files(kaggle_file_paths, params)
+        kaggle_file_names = [file_metadata.name for file_metadata in kaggle_manifest]
+        if len(kaggle_file_names) > 0:
+            local_file_paths = self._kaggle_fetch_files(dataset_path, kaggle_file_names, params)
             self._local_manifest_handler.set_files(
                 [
                     LocalFileEntry(
-                        name=Path(kaggle_file_paths[0]).name,
-                        size=os.path.getsize(self._destination_directory / Path(kaggle_file_paths[0]).name),
+                        name=local_file_path.relative_to(self._destination_directory).as_posix(),
+                        size=os.path.getsize(local_file_path),
                     )
+                    for kaggle_file_local_paths in local_file_paths.values()
+                    for local_file_path in kaggle_file_local_paths
                 ]
             )
-            logger.info(f"Finished downloading {len(kaggle_file_paths)} files from Kaggle.")
+            self._local_manifest_handler.set_metadata(
+                {
+                    "kaggle_files": {
+                        kaggle_file.name: {
+                            "total_bytes": kaggle_file.total_bytes,
+                            "creation_timestamp": kaggle_file.creation_timestamp,
+                            "files": [
+                                local_file_path.relative_to(self._destination_directory).as_posix()
+                                for local_file_path in local_file_paths[kaggle_file.name]
+                            ],
+                        }
+                        for kaggle_file in kaggle_manifest
+                    }
+                }
+            )
+            logger.info(f"Finished downloading {len(kaggle_file_names)} files from Kaggle.")
 
         return self._get_full_file_paths(self._local_manifest_handler.get_file_names())
 
@@ -343,11 +387,11 @@ class KaggleIngester(BaseIngester):
         Returns:
             A list of KaggleFileManifest objects containing the metadata of the files in the dataset.
         """
-        list_files_response = requests.get(
+        list_files_response = self._session.get(
             f"{self._KAGGLE_DATASET_URL}/list/{self._owner_slug}/{self._dataset_slug}",
             params=params,
             auth=HTTPBasicAuth(self._kaggle_config.username, self._kaggle_config.key),
-            timeout=5,
+            timeout=self._KAGGLE_TIMEOUT,
         )
 
         try:
@@ -377,65 +421,97 @@ class KaggleIngester(BaseIngester):
 
         return kaggle_manifest
 
-    def _kaggle_fetch_file(self, kaggle_file_path: str, params: dict[str, str]) -> None:
+    def _kaggle_fetch_file(self, dataset_path: str, kaggle_file_name: str, params: dict[str, str]) -> Path:
         """Downloads a single Kaggle dataset file and saves it in the destination directory.
 
+        The file is saved under its full Kaggle file name, keeping the folders of files nested in the dataset. It is
+        downloaded to a temporary file and only moved into place once complete, an interrupted download is resumed
+        from where it stopped on the next attempt, see `mleko.utils.http_helpers.download_http_file`.
+
         Args:
-            kaggle_file_path: The Kaggle file path to download.
+            dataset_path: The path of the dataset on Kaggle, `owner_slug/dataset_slug`.
+            kaggle_file_name: The name of the Kaggle file to download, relative to the dataset, e.g. `folder/file.csv`.
             params: The request parameters containing the dataset version number, if applicable.
 
         Raises:
             HTTPError: If there is an error in the HTTP response while downloading file from Kaggle.
+
+        Returns:
+            Path of the downloaded file, which may still be a zip archive to extract.
         """
-        local_file_path = self._destination_directory / Path(kaggle_file_path).name
-        response = requests.get(
-            f"{self._KAGGLE_DATASET_URL}/download/{kaggle_file_path}",
+        local_file_path = self._destination_directory / kaggle_file_name
+        local_file_path.parent.mkdir(parents=True, exist_ok=True)
+        return download_http_file(
+            f"{self._KAGGLE_DATASET_URL}/download/{dataset_path}/{kaggle_file_name}",
+            local_file_path,
+            session=self._session,
             params=params,
             auth=HTTPBasicAuth(self._kaggle_config.username, self._kaggle_config.key),
-            timeout=5,
-            stream=True,
+            timeout=self._KAGGLE_TIMEOUT,
         )
 
-        try:
-            response.raise_for_status()
-        except requests.HTTPError as e:
-            logger.error(e)
-            raise requests.HTTPError(e) from e
-
-        with open(local_file_path, "wb") as f:
-            shutil.copyfileobj(response.raw, f)
-
-        file_signature = None
-        with open(local_file_path, "rb") as f:
-            file_signature = f.read(4)
+    def _kaggle_fetch_files(
+        self, dataset_path: str, kaggle_file_names: list[str], params: dict[str, str]
+    ) -> dict[str, list[Path]]:
+        """Downloads multiple Kaggle dataset files concurrently, extracting zip files as soon as they arrive.
 
-        # Check if file is a zip file and unzip it if it is.
-        if file_signature == b"PK\x03\x04":
-            local_file_path = local_file_path.rename(local_file_path.with_name(local_file_path.name + ".zip"))
-            shutil.unpack_archive(local_file_path, local_file_path.parent)
-            local_file_path.unlink()
-
-    def _kaggle_fetch_files(self, kaggle_file_paths: list[str], params: dict[str, str]) -> None:
-        """Downloads multiple Kaggle dataset files concurrently.
+        Kaggle serves large files as zip archives. Every downloaded archive is renamed with a `.zip` suffix and its
+        members are extracted in parallel on a separate thread pool, overlapping with the downloads still in
+        progress, next to the archive. The archives are removed once all of their members have been extracted.
 
         Args:
-            kaggle_file_paths: A list of Kaggle file paths to download.
+            dataset_path: The path of the dataset on Kaggle, `owner_slug/dataset_slug`.
+            kaggle_file_names: A list of names of the Kaggle files to download, relative to the dataset.
             params: The request parameters containing the dataset version number, if applicable.
+
+        Returns:
+            Paths of the downloaded or extracted files, by the name of the Kaggle file they originate from.
         """
-        with tqdm(total=len(kaggle_file_paths), desc="Downloading files from Kaggle") as pbar:
-            with futures.ThreadPoolExecutor(max_workers=min(self._num_workers, len(kaggle_file_paths))) as executor:
-                for _ in executor.map(
-                    self._kaggle_fetch_file,
-                    kaggle_file_paths,
-                    repeat(params),
-                ):
+        local_file_paths: dict[str, list[Path]] = {}
+        archive_futures: dict[str, tuple[Path, list[futures.Future[Path]]]] = {}
+        download_workers = max(1, min(self._num_workers, len(kaggle_file_names)))
+        extract_workers = max(1, min(self._num_workers, os.cpu_count() or 1))
+        with futures.ThreadPoolExecutor(max_workers=download_workers) as download_executor, futures.ThreadPoolExecutor(
+            max_workers=extract_workers
+        ) as extract_executor:
+            download_futures = {
+                download_executor.submit(self._kaggle_fetch_file, dataset_path, kaggle_file_name, params): (
+                    kaggle_file_name
+                )
+                for kaggle_file_name in kaggle_file_names
+            }
+            with tqdm(total=len(kaggle_file_names), desc="Downloading files from Kaggle") as pbar:
+                for download_future in futures.as_completed(download_futures):
+                    kaggle_file_name = download_futures[download_future]
+                    local_file_path = download_future.result()
+                    if is_zip_file(local_file_path):
+                        archive_path = local_file_path.rename(local_file_path.with_name(local_file_path.name + ".zip"))
+                        archive_futures[kaggle_file_name] = (
+                            archive_path,
+                            [
+                                extract_executor.submit(
+                                    extract_zip_member, archive_path, member_name, archive_path.parent
+                                )
+                                for member_name in get_zip_members(archive_path)
+                            ],
+                        )
+                    else:
+                        local_file_paths[kaggle_file_name] = [local_file_path]
                     pbar.update(1)
 
+                for kaggle_file_name, (archive_path, member_futures) in archive_futures.items():
+                    local_file_paths[kaggle_file_name] = [member_future.result() for member_future in member_futures]
+                    archive_path.unlink()
+
+        return local_file_paths
+
     def _is_local_dataset_fresh(self, files_metadata: list[KaggleFileManifest]) -> bool:
         """Checks if the local dataset files are up to date with the Kaggle dataset files.
 
-        Comparing file size and modification timestamp, this method determines if the local files are up to date and
-        if they match the remote Kaggle dataset files.
+        Each Kaggle file is compared against the size and creation timestamp recorded in the local manifest when it
+        was downloaded, since files served as zip archives are stored as their extracted members, which differ in
+        name and size from the Kaggle file. The local files a Kaggle file was downloaded or extracted to must still
+        be present with their recorded sizes.
 
         Args:
             files_metadata: A list containing the metadata of the files in the Kaggle dataset.
@@ -443,12 +519,19 @@ class KaggleIngester(BaseIngester):
         Returns:
             True if the local dataset files are up to date, False otherwise.
         """
+        kaggle_files = self._local_manifest_handler.get_metadata().get("kaggle_files", {})
+        local_file_sizes = {entry.name: entry.size for entry in self._local_manifest_handler.get_files()}
         for file in files_metadata:
-            local_file_path = self._destination_directory / file.name
-            if (
-                not local_file_path.exists()
-                or file.total_bytes != os.path.getsize(local_file_path)
-                or file.creation_timestamp > os.path.getmtime(local_file_path)
+            kaggle_file = kaggle_files.get(file.name)
+            if kaggle_file is None or (kaggle_file["total_bytes"], kaggle_file["creation_timestamp"]) != (
+                file.total_bytes,
+                file.creation_timestamp,
             ):
                 return False
+            for local_file_name in kaggle_file["files"]:
+                local_file_path = self._destination_directory / local_file_name
+                if not local_file_path.exists() or local_file_sizes.get(local_file_name) != os.path.getsize(
+                    local_file_path
+                ):
+                    return False
         return True
@@ -0,0 +1,314 @@
+"""Module for ingesting data from a local or shared filesystem, e.g. NFS or Lustre, using the `LocalIngester` class."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import sys
+from concurrent import futures
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Literal
+
+from tqdm.auto import tqdm
+
+from mleko.utils import CustomLogger, LocalFileEntry, LocalManifestHandler, auto_repr
+
+from .base_ingester import BaseIngester
+
+
+logger = CustomLogger()
+"""A module-level custom logger."""
+
+StagingMode = Literal["hardlink", "reflink", "symlink", "copy"]
+"""Type alias for the supported ways of staging source files into the destination directory."""
+
+LOCAL_HASH_BLOCK_SIZE = 8 * 1024**2
+"""A module-level constant representing the block size in bytes used when hashing source files."""
+
+FICLONE = 0x40049409
+"""A module-level constant representing the Linux `FICLONE` ioctl request, which clones a file by reflink."""
+
+
+class LocalIngester(BaseIngester):
+    """`LocalIngester` stages files from a local or shared filesystem into the destination directory.
+
+    Datasets that already sit on a filesystem reachable from the machine, e.g. NFS or Lustre mounts, do not need to be
+    downloaded. The matching files are staged into the destination directory as hard links, reflinks or symbolic
+    links, so large files are never physically copied. It supports manifest-based caching, so only the files that are
+    new or have changed since the last run are staged again.
+    """
+
+    @auto_repr
+    def __init__(
+        self,
+        source_directory: str | Path,
+        file_pattern: str | list[str] = "*",
+        dataset_id: str | None = None,
+        destination_directory: str | Path = "data/local-ingester",
+        staging_mode: StagingMode = "hardlink",
+        hash_files: bool = False,
+        num_workers: int = 8,
+    ) -> None:
+        """Initializes the `LocalIngester` with the source directory and the staging configuration.
+
+        Note:
+            Hard links and reflinks only work within a single filesystem, and reflinks additionally require a
+            filesystem with copy-on-write support (e.g. Btrfs or XFS). If a file cannot be staged with the requested
+            mode, it falls back to a symbolic link, which never copies the file. Use `staging_mode="copy"` to
+            physically copy the files instead.
+
+        Warning:
+            Hard links and symbolic links share their contents with the source file, so modifying a staged file in
+            place also modifies the source file. Staged files are always replaced rather than modified by
+            `LocalIngester` itself.
+
+        Args:
+            source_directory: Directory containing the source files, e.g. a path on an NFS or Lustre mount.
+            file_pattern: Pattern to match the files to ingest, relative to the source directory, e.g. `*.csv` or
+                [`*.csv`, `*.json`], etc. For more information, see https://docs.python.org/3/library/fnmatch.html.
+            dataset_id: Id of the dataset to be used instead of the default fingerprint (MD5 hash of the resolved
+                source directory). Note that this will overwrite any existing dataset with the same name in the
+                destination directory, so make sure to use a unique name.
+            destination_directory: Directory where the source files are staged.
+            staging_mode: How to stage the source files into the destination directory, one of "hardlink",
+                "reflink", "symlink" or "copy".
+            hash_files: Whether to record the MD5 hash of the source files in the manifest. If enabled, a file whose
+                size is unchanged but whose modification time differs is only staged again if its hash changed,
+                which avoids restaging datasets that were copied or touched without changing their contents.
+            num_workers: Number of concurrent threads to use when hashing and staging files.
+
+        Examples:
+            >>> from mleko.dataset.ingest import LocalIngester
+            >>> local_ingester = LocalIngester(
+            ...     source_directory="/mnt/lustre/datasets/indian-food-101",
+            ...     file_pattern="*.csv",
+            ...     dataset_id="indian_food", # Optional, but will store the data in "./data/indian_food/" instead of
+            ...                               # "./data/<fingerprint>/".
+            ... )
+            >>> local_ingester.fetch_data()
+            [PosixPath('data/indian_food/indian_food.csv')]
+        """
+        self._source_directory = Path(source_directory)
+        dataset_id = (
+            dataset_id
+            if dataset_id is not None
+            else hashlib.md5(str(self._source_directory.resolve()).encode()).hexdigest()
+        )
+        super().__init__(destination_directory, dataset_id)
+        self._local_manifest_handler = LocalManifestHandler(
+            self._destination_directory / f"{self._fingerprint}.manifest.json"
+        )
+        self._staging_mode = staging_mode
+        self._hash_files = hash_files
+        self._num_workers = num_workers
+
+        if isinstance(file_pattern, str):
+            file_pattern = [file_pattern]
+        self._file_pattern = file_pattern
+
+    def fetch_data(self, force_recompute: bool = False) -> list[Path]:
+        """Stages the matching source files into the 'destination_directory'.
+
+        If 'force_recompute' is False, the destination directory is reconciled with the source directory file by
+        file, based on the local manifest file. Only new files, or files whose size or modification time (or hash,
+        if `hash_files` is enabled) differ from the local manifest, are staged, and staged files no longer present in
+        the source directory are deleted.
+
+        Args:
+            force_recompute: Whether to force the data source to recompute its output, even if it already exists.
+
+        Raises:
+            FileNotFoundError: If no files matching the file pattern are found in the source directory.
+
+        Returns:
+            A list of Path objects pointing to the staged data files.
+        """
+        source_files = self._list_source_files()
+        previous_entries = {entry.name: entry for entry in self._local_manifest_handler.get_files()}
+        if force_recompute:
+            logger.info(
+                f"\033[33mForce Cache Refresh\033[0m: Staging files matching {self._file_pattern} from "
+                f"{self._source_directory} to {self._destination_directory}."
+            )
+            self._delete_local_files(list(previous_entries))
+            previous_entries = {}
+        else:
+            files_to_delete = [name for name in previous_entries if name not in source_files]
+            if len(files_to_delete) > 0:
+                logger.info(
+                    f"Deleting {len(files_to_delete)} files from "
+                    f"{self._destination_directory} that are no longer present in the source or filtered out."
+                )
+                self._delete_local_files(files_to_delete)
+
+        with futures.ThreadPoolExecutor(max_workers=max(1, min(self._num_workers, len(source_files)))) as executor:
+            entries = list(
+                executor.map(
+                    lambda name: self._get_file_entry(name, previous_entries.get(name)), list(source_files.keys())
+                )
+            )
+            files_to_stage = [
+                entry.name for entry in entries if not self._is_file_up_to_date(entry, previous_entries.get(entry.name))
+            ]
+
+            if len(files_to_stage) == 0:
+                logger.info("\033[32mCache Hit\033[0m: Local dataset is up to date with the source, skipping staging.")
+            else:
+                if not force_recompute:
+                    logger.info(
+                        f"\033[31mCache Miss\033[0m: Staging {len(files_to_stage)} of {len(source_files)} new or "
+                        f"changed files matching {self._file_pattern} from {self._source_directory} to "
+                        f"{self._destination_directory}."
+                    )
+                with tqdm(total=len(files_to_stage), desc=f"Staging files ({self._staging_mode})") as pbar:
+                    for _ in executor.map(self._stage_file, files_to_stage):
+                        pbar.update(1)
+                logger.info(f"Finished staging {len(files_to_stage)} files.")
+
+        self._local_manifest_handler.set_files(entries)
+        return self._get_full_file_paths(self._local_manifest_handler.get_file_names())
+
+    def _list_source_files(self) -> dict[str, Path]:
+        """Lists the files in the source directory matching the file pattern.
+
+        Raises:
+            FileNotFoundError: If no files matching the file pattern are found in the source directory.
+
+        Returns:
+            A dictionary mapping the relative POSIX path of each matching file to its path, sorted by name.
+        """
+        source_files = {
+            file_path.relative_to(self._source_directory).as_posix(): file_path
+            for file_path in sorted(self._source_directory.rglob("*"))
+            if file_path.is_file()
+            and any(
+                fnmatch(file_path.relative_to(self._source_directory).as_posix(), pattern)
+                for pattern in self._file_pattern
+            )
+        }
+        if len(source_files) == 0:
+            msg = f"No files matching {self._file_pattern} found in source directory {self._source_directory}."
+            logger.error(msg)
+            raise FileNotFoundError(msg)
+        logger.info(f"Found {len(source_files)} file(s) matching any of {self._file_pattern} in source directory.")
+        return source_files
+
+    def _get_file_entry(self, name: str, previous_entry: LocalFileEntry | None) -> LocalFileEntry:
+        """Builds the manifest entry of a source file from its size, modification time and optionally its hash.
+
+        The hash is only computed if `hash_files` is enabled and the size or modification time differ from the
+        previous entry, otherwise the previously recorded hash is reused.
+
+        Args:
+            name: Relative POSIX path of the source file.
+            previous_entry: Manifest entry of the file from the previous run, if any.
+
+        Returns:
+            The manifest entry of the source file.
+        """
+        stat = (self._source_directory / name).stat()
+        last_modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat()
+        file_hash = None
+        if self._hash_files:
+            if (
+                previous_entry is not None
+                and previous_entry.size == stat.st_size
+                and previous_entry.last_modified == last_modified
+            ):
+                file_hash = previous_entry.hash
+            if file_hash is None:
+                file_hash = self._hash_file(self._source_directory / name)
+        return LocalFileEntry(name=name, size=stat.st_size, hash=file_hash, last_modified=last_modified)
+
+    def _is_file_up_to_date(self, entry: LocalFileEntry, previous_entry: LocalFileEntry | None) -> bool:
+        """Checks whether the staged copy of a source file is up to date with the source file.
+
+        Args:
+            entry: Current manifest entry of the source file.
+            previous_entry: Manifest entry of the file from the previous run, if any.
+
+        Returns:
+            True if the file is staged and its size and modification time, or its hash, match the previous entry.
+        """
+        if previous_entry is None or not (self._destination_directory / entry.name).exists():
+            return False
+        if previous_entry.size != entry.size:
+            return False
+        if previous_entry.last_modified == entry.last_modified:
+            return True
+        return self._hash_files and previous_entry.hash is not None and previous_entry.hash == entry.hash
+
+    def _stage_file(self, name: str) -> None:
+        """Stages a single source file into the destination directory using the configured staging mode.
+
+        The file is staged under a temporary name and then renamed into place, replacing any previously staged file
+        without ever writing through a link into the source file.
+
+        Args:
+            name: Relative POSIX path of the source file.
+        """
+        source_path = self._source_directory / name
+        target_path = self._destination_directory / name
+        temporary_path = target_path.with_name(target_path.name + ".part")
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path.unlink(missing_ok=True)
+
+        try:
+            if self._staging_mode == "hardlink":
+                os.link(source_path, temporary_path)
+            elif self._staging_mode == "reflink":
+                self._reflink_file(source_path, temporary_path)
+            elif self._staging_mode == "symlink":
+                os.symlink(source_path.resolve(), temporary_path)
+            else:
+                shutil.copy2(source_path, temporary_path)
+        except OSError as e:
+            if self._staging_mode in ("symlink", "copy"):
+                raise
+            logger.warning(f"Cannot {self._staging_mode} {str(source_path)!r} ({e}), falling back to a symlink.")
+            temporary_path.unlink(missing_ok=True)
+            os.symlink(source_path.resolve(), temporary_path)
+        os.replace(temporary_path, target_path)
+
+    @staticmethod
+    def _reflink_file(source_path: Path, target_path: Path) -> None:
+        """Clones a file by reflink, sharing its data blocks copy-on-write without copying them.
+
+        Args:
+            source_path: Path of the file to clone.
+            target_path: Path of the clone.
+
+        Raises:
+            OSError: If the platform or filesystem does not support reflinks.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError(f"Reflinks are not supported on {sys.platform}.")
+
+        import fcntl
+
+        with open(source_path, "rb") as source_file, open(target_path, "wb") as target_file:
+            try:
+                fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+            except OSError:
+                target_file.close()
+                target_path.unlink()
+                raise
+
+    @staticmethod
+    def _hash_file(file_path: Path) -> str:
+        """Computes the MD5 hash of a file, reading it in blocks of `LOCAL_HASH_BLOCK_SIZE` bytes.
+
+        Args:
+            file_path: Path of the file to hash.
+
+        Returns:
+            The hexadecimal MD5 hash of the file contents.
+        """
+        file_hash = hashlib.md5()
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(LOCAL_HASH_BLOCK_SIZE), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 import hashlib
-import os
+import json
+import math
 from concurrent import futures
-from itertools import repeat
 from pathlib import Path
+from typing import Any
 
 from tqdm.auto import tqdm
 
-from mleko.utils import CustomLogger, LocalFileEntry, LocalManifestHandler, S3Client, auto_repr
+from mleko.utils import CustomLogger, LocalFileEntry, LocalManifestHandler, S3Client, S3FileManifest, auto_repr
+from mleko.utils.compression_helpers import COMPRESSED_FILE_SUFFIXES
 
 from .base_ingester import BaseIngester
 
@@ -23,8 +25,12 @@ class S3Ingester(BaseIngester):
     """`S3Ingester` provides a convenient interface for fetching data from AWS S3 buckets and storing it locally.
 
     This class interacts with AWS S3 to download specified data from an S3 bucket.
-    It supports manifest-based caching, enabling more efficient data fetching by verifying if the
-    local dataset is up-to-date before downloading.
+    It supports manifest-based caching, enabling more efficient data fetching by only downloading the files that
+    are new or have changed since the local dataset was last fetched.
+
+    For development runs, a sampling mode fetches a deterministic, seeded subset of the objects and/or only the
+    leading bytes of each object, trimmed to whole lines. The sampling configuration is part of the dataset
+    fingerprint and recorded in the local manifest, so sampled datasets are cached separately from the full dataset.
     """
 
     @auto_repr
@@ -41,6 +47,10 @@ class S3Ingester(BaseIngester):
         workers_per_file: int = 1,
         manifest_file_name: str | None = "manifest",
         s3_timestamp_tolerance: int = -1,
+        max_bandwidth_mb: float | None = None,
+        sample_fraction: float | None = None,
+        sample_bytes: int | None = None,
+        sample_seed: int = 0,
     ) -> None:
         """Initializes the S3 bucket client, configures the cache directory, and sets client-related parameters.
 
@@ -55,7 +65,8 @@ class S3Ingester(BaseIngester):
             number of concurrent downloads and parts downloaded per file, respectively. These parameters should be
             set based on the available system resources and the S3 bucket's performance limits. The total number of
             concurrent threads is the product of these two parameters
-            (i.e., `max_concurrent_files * workers_per_file`).
+            (i.e., `max_concurrent_files * workers_per_file`), while the number of concurrent requests is capped at
+            the connection pool size of the S3 client, `S3_MAX_CONNECTIONS`.
 
         Args:
             s3_bucket_name: Name of the S3 bucket containing the data.
@@ -64,7 +75,8 @@ class S3Ingester(BaseIngester):
                 For more information, see https://docs.python.org/3/library/fnmatch.html.
             dataset_id: Id of the dataset to be used instead of the default fingerprint (MD5 hash of the bucket
                 name, key prefix, and region name). Note that this will overwrite any existing dataset with the same
-                name in the cache directory, so make sure to use a unique name.
+                name in the cache directory, so make sure to use a unique name. If sampling is enabled, a suffix
+                derived from the sampling configuration is appended to the dataset id.
             destination_directory: Directory to store the fetched data locally.
             aws_profile_name: AWS profile name to use.
             aws_region_name: AWS region name where the S3 bucket is located.
@@ -76,6 +88,19 @@ class S3Ingester(BaseIngester):
             s3_timestamp_tolerance: Tolerance in hours for the difference in last modified timestamps of files in the S3
                 bucket. If the difference is greater than this value, an exception will be raised. If set to -1, no
                 check will be performed.
+            max_bandwidth_mb: Maximum total bandwidth in MB per second shared by all concurrent downloads, or None
+                for no limit.
+            sample_fraction: Fraction in (0, 1] of the matching objects to fetch, or None to fetch all objects. The
+                objects are ranked by a hash of `sample_seed` and their key, and the first
+                `ceil(sample_fraction * n_objects)` objects are selected, so the subset is reproducible and mostly
+                stable when objects are added or removed.
+            sample_bytes: Maximum number of leading bytes to fetch of each object, or None to fetch whole objects.
+                Larger objects are trimmed to the last complete line, so they must be line-delimited, e.g. CSV or
+                JSON Lines files. Compressed objects are always fetched whole.
+            sample_seed: Seed of the object subset selected by `sample_fraction`.
+
+        Raises:
+            ValueError: If `sample_fraction` is not in (0, 1] or `sample_bytes` is not positive.
 
         Examples:
             >>> from mleko.dataset.sources import S3Ingester
@@ -92,11 +117,25 @@ class S3Ingester(BaseIngester):
             >>> s3_ingester.fetch_data()
             [PosixPath('data/indian_food/indian_food.csv')]
         """
+        if sample_fraction is not None and not 0 < sample_fraction <= 1:
+            msg = f"The sample fraction must be in (0, 1], got {sample_fraction}."
+            logger.error(msg)
+            raise ValueError(msg)
+        if sample_bytes is not None and sample_bytes <= 0:
+            msg = f"The number of sampled bytes must be positive, got {sample_bytes}."
+            logger.error(msg)
+            raise ValueError(msg)
+
         dataset_id = (
             dataset_id
             if dataset_id is not None
             else hashlib.md5((s3_bucket_name + s3_key_prefix + aws_region_name).encode()).hexdigest()
         )
+        self._sampling: dict[str, Any] | None = None
+        if sample_fraction is not None or sample_bytes is not None:
+            self._sampling = {"fraction": sample_fraction, "bytes": sample_bytes, "seed": sample_seed}
+            sampling_hash = hashlib.md5(json.dumps(self._sampling, sort_keys=True).encode()).hexdigest()
+            dataset_id = f"{dataset_id}-sample-{sampling_hash[:8]}"
         super().__init__(destination_directory, dataset_id)
         self._local_manifest_handler = LocalManifestHandler(
             self._destination_directory / f"{self._fingerprint}.manifest.json"
@@ -105,11 +144,14 @@ class S3Ingester(BaseIngester):
         self._s3_key_prefix = s3_key_prefix
         self._aws_profile_name = aws_profile_name
         self._aws_region_name = aws_region_name
-        self._s3_client = S3Client(self._aws_profile_name, self._aws_region_name)
+        self._s3_client = S3Client(self._aws_profile_name, self._aws_region_name, max_bandwidth_mb=max_bandwidth_mb)
         self._max_concurrent_files = max_concurrent_files
         self._workers_per_file = workers_per_file
         self._manifest_file_name = manifest_file_name
         self._s3_timestamp_tolerance = s3_timestamp_tolerance
+        self._sample_fraction = sample_fraction
+        self._sample_bytes = sample_bytes
+        self._sample_seed = sample_seed
 
         if isinstance(file_pattern, str):
             file_pattern = [file_pattern]
@@ -118,8 +160,11 @@ class S3Ingester(BaseIngester):
     def fetch_data(self, force_recompute: bool = False) -> list[Path]:
         """Downloads the data from the S3 bucket and stores it in the 'destination_directory'.
 
-        If 'force_recompute' is False, verifies whether the data in the local 'destination_directory' is current
-        with the S3 bucket contents based on the manifest file, and skips downloading if it is up to date.
+        If 'force_recompute' is False, the local 'destination_directory' is reconciled with the S3 bucket contents
+        file by file, based on the local manifest file. Only new files, or files whose size, ETag or last modified
+        date differ from the local manifest, are downloaded, and local files no longer present in S3 are deleted.
+        If sampling is enabled, only the sampled objects are considered and the sampling configuration is recorded
+        in the local manifest.
 
         Args:
             force_recompute: Whether to force the data source to recompute its output, even if it already exists.
@@ -132,12 +177,104 @@ class S3Ingester(BaseIngester):
         Returns:
             A list of Path objects pointing to the downloaded data files.
         """
+        s3_manifest = self._get_s3_manifest()
+        s3_path_string = f"s3://{Path(self._s3_bucket_name) / self._s3_key_prefix}/"
+        s3_file_names: set[str] = {s3_file.key.name for s3_file in s3_manifest}
+        if self._local_manifest_handler.get_metadata().get("sample") != self._sampling:
+            force_recompute = True
+        if force_recompute:
+            logger.info(
+                f"\033[33mForce Cache Refresh\033[0m: Downloading files matching {self._file_pattern} from "
+                f"{s3_path_string} to {self._destination_directory}."
+            )
+            self._delete_local_files(self._local_manifest_handler.get_file_names())
+            files_to_download = s3_manifest
+        else:
+            files_to_delete = list(set(self._local_manifest_handler.get_file_names()).difference(s3_file_names))
+            if len(files_to_delete) > 0:
+                logger.info(
+                    f"Deleting {len(files_to_delete)} files from "
+                    f"{self._destination_directory} that are no longer present in S3 or filtered out."
+                )
+                self._delete_local_files(files_to_delete)
+
+            files_to_download = self._get_outdated_files(s3_manifest)
+            if len(files_to_download) == 0:
+                logger.info(
+                    "\033[32mCache Hit\033[0m: Local dataset is up to date with S3 bucket contents, "
+                    "skipping download."
+                )
+            else:
+                logger.info(
+                    f"\033[31mCache Miss\033[0m: Downloading {len(files_to_download)} of {len(s3_manifest)} new or "
+                    f"changed files matching {self._file_pattern} from {s3_path_string} to "
+                    f"{self._destination_directory}."
+                )
+
+        if len(files_to_download) > 0:
+            self._s3_fetch_all(files_to_download)
+            logger.info(f"Finished downloading {len(files_to_download)} files from S3.")
+
+        self._local_manifest_handler.set_files(
+            [
+                LocalFileEntry(
+                    name=s3_file.key.name,
+                    size=(
+                        s3_file.size
+                        if self._sample_bytes is None
+                        else (self._destination_directory / s3_file.key.name).stat().st_size
+                    ),
+                    hash=s3_file.etag,
+                    last_modified=s3_file.last_modified.isoformat(),
+                )
+                for s3_file in s3_manifest
+            ]
+        )
+        self._local_manifest_handler.set_metadata({"sample": self._sampling} if self._sampling is not None else {})
+        return self._get_full_file_paths(self._local_manifest_handler.get_file_names())
+
+    def get_s3_uris(self) -> list[str]:
+        """Lists the S3 URIs of the files to ingest, without downloading them.
+
+        The URIs can be passed to `CSVToVaexConverter.convert` to stream the files directly into the conversion,
+        which avoids storing the raw files on disk, e.g. on training nodes with small ephemeral disks.
+
+        Raises:
+            Exception: If files in the S3 bucket have different last modified dates, indicating potential corruption
+                       or duplication.
+            FileNotFoundError: If no files matching the file pattern are found in the S3 bucket.
+
+        Returns:
+            A list of `s3://bucket/key` URIs of the files matching the file pattern, sorted by key. If
+            `sample_fraction` is set, only the URIs of the sampled objects are listed.
+
+        Examples:
+            >>> from mleko.dataset.convert import CSVToVaexConverter
+            >>> from mleko.utils import S3Client
+            >>> s3_ingester = S3Ingester(s3_bucket_name="mleko-datasets", s3_key_prefix="data", file_pattern="*.csv")
+            >>> converter = CSVToVaexConverter(s3_client=S3Client(aws_region_name="eu-west-1"))
+            >>> ds, df = converter.convert(s3_ingester.get_s3_uris())
+        """
+        return [f"s3://{self._s3_bucket_name}/{s3_file.key}" for s3_file in self._get_s3_manifest()]
+
+    def _get_s3_manifest(self) -> list[S3FileManifest]:
+        """Lists the files in the S3 bucket matching the file pattern and checks their last modified timestamps.
+
+        Raises:
+            Exception: If files in the S3 bucket have different last modified dates, indicating potential corruption
+                       or duplication.
+            FileNotFoundError: If no files matching the file pattern are found in the S3 bucket.
+
+        Returns:
+            The S3 manifest of the files matching the file pattern.
+        """
         self._s3_client.refresh_client()
         s3_manifest = self._s3_client.get_s3_manifest(
             bucket_name=self._s3_bucket_name,
             key_prefix=self._s3_key_prefix,
             manifest_file_name=self._manifest_file_name,
             file_pattern=self._file_pattern,
+            num_workers=self._max_concurrent_files,
         )
         if len(s3_manifest) == 0:
             msg = (
@@ -161,65 +298,91 @@ class S3Ingester(BaseIngester):
                 logger.error(error_msg)
                 raise Exception(error_msg)
 
-        if force_recompute:
-            logger.info(
-                f"\033[33mForce Cache Refresh\033[0m: Downloading files matching {self._file_pattern} from "
-                f"{s3_path_string} to {self._destination_directory}."
-            )
-        else:
-            if self._s3_client.is_local_dataset_up_to_date(self._destination_directory, s3_manifest):
-                logger.info(
-                    "\033[32mCache Hit\033[0m: Local dataset is up to date with S3 bucket contents, "
-                    "skipping download."
-                )
-                local_file_names = set(self._local_manifest_handler.get_file_names())
-                s3_file_names: set[str] = {s3_file.key.name for s3_file in s3_manifest}
-                files_to_delete = list(local_file_names.difference(s3_file_names))
+        if self._sample_fraction is not None:
+            s3_manifest = self._sample_s3_manifest(s3_manifest)
+            logger.info(f"Sampled {len(s3_manifest)} file(s) with fraction {self._sample_fraction}.")
+        return s3_manifest
 
-                if len(files_to_delete) > 0:
-                    logger.info(
-                        f"Deleting {len(files_to_delete)} files from "
-                        f"{self._destination_directory} that are no longer present in S3 or filtered out."
-                    )
+    def _sample_s3_manifest(self, s3_manifest: list[S3FileManifest]) -> list[S3FileManifest]:
+        """Selects a deterministic subset of the S3 manifest based on the sample fraction and seed.
 
-                self._delete_local_files(files_to_delete)
-                self._local_manifest_handler.remove_files(files_to_delete)
-                return self._get_full_file_paths(self._local_manifest_handler.get_file_names())
+        Args:
+            s3_manifest: The S3 manifest of the files matching the file pattern.
 
-            logger.info(
-                f"\033[31mCache Miss\033[0m: Downloading files matching {self._file_pattern} from "
-                f"{s3_path_string} to {self._destination_directory}."
-            )
+        Returns:
+            The sampled entries of the S3 manifest, in their original order.
+        """
+        n_samples = max(1, math.ceil(len(s3_manifest) * self._sample_fraction))  # type: ignore
+        ranked_keys = sorted(
+            (hashlib.md5(f"{self._sample_seed}:{s3_file.key}".encode()).hexdigest(), str(s3_file.key))
+            for s3_file in s3_manifest
+        )
+        sampled_keys = {key for _, key in ranked_keys[:n_samples]}
+        return [s3_file for s3_file in s3_manifest if str(s3_file.key) in sampled_keys]
+
+    def _get_outdated_files(self, s3_manifest: list[S3FileManifest]) -> list[S3FileManifest]:
+        """Gets the S3 files that are missing or outdated in the local dataset.
+
+        If `sample_bytes` is set, the local files are truncated, so instead of comparing their size to the size of
+        the S3 objects, they are compared to the size recorded in the local manifest.
+
+        Args:
+            s3_manifest: The S3 manifest of the files to fetch.
+
+        Returns:
+            The entries of the S3 manifest that need to be downloaded.
+        """
+        local_files = self._local_manifest_handler.get_files()
+        if self._sample_bytes is None:
+            return self._s3_client.get_outdated_files(self._destination_directory, local_files, s3_manifest)
 
-        self._delete_local_files(self._local_manifest_handler.get_file_names())
-        keys_to_download: list[str] = [str(s3_file.key) for s3_file in s3_manifest]
-        if len(keys_to_download) > 0:
-            self._s3_fetch_all(keys_to_download)
-            self._local_manifest_handler.set_files(
-                [
-                    LocalFileEntry(
-                        name=Path(key).name, size=os.path.getsize(self._destination_directory / Path(key).name)
-                    )
-                    for key in keys_to_download
-                ]
+        local_entries = {local_file.name: local_file for local_file in local_files}
+
+        def is_up_to_date(s3_file: S3FileManifest) -> bool:
+            local_file = local_entries.get(s3_file.key.name)
+            local_path = self._destination_directory / s3_file.key.name
+            return (
+                local_file is not None
+                and local_path.exists()
+                and local_path.stat().st_size == local_file.size
+                and local_file.hash == s3_file.etag
+                and local_file.last_modified == s3_file.last_modified.isoformat()
             )
-            logger.info(f"Finished downloading {len(keys_to_download)} files from S3.")
 
-        return self._get_full_file_paths(self._local_manifest_handler.get_file_names())
+        return [s3_file for s3_file in s3_manifest if not is_up_to_date(s3_file)]
 
-    def _s3_fetch_all(self, keys: list[str]) -> None:
+    def _s3_fetch_all(self, s3_files: list[S3FileManifest]) -> None:
         """Downloads all specified files from the S3 bucket to the local directory concurrently.
 
         Args:
-            keys: List of S3 keys for the files to download.
+            s3_files: Entries of the S3 manifest for the files to download.
         """
-        with tqdm(total=len(keys), desc="Downloading files from S3") as pbar:
-            with futures.ThreadPoolExecutor(max_workers=min(len(keys), self._max_concurrent_files)) as executor:
-                for _ in executor.map(
-                    self._s3_client.download_file,
-                    repeat(self._destination_directory),
-                    repeat(self._s3_bucket_name),
-                    keys,
-                    repeat(self._workers_per_file),
-                ):
+        with tqdm(total=len(s3_files), desc="Downloading files from S3") as pbar:
+            with futures.ThreadPoolExecutor(max_workers=min(len(s3_files), self._max_concurrent_files)) as executor:
+                for _ in executor.map(self._s3_fetch_file, s3_files):
                     pbar.update(1)
+
+    def _s3_fetch_file(self, s3_file: S3FileManifest) -> Path:
+        """Downloads a single file from the S3 bucket, or only its leading bytes if `sample_bytes` is set.
+
+        Args:
+            s3_file: Entry of the S3 manifest for the file to download.
+
+        Returns:
+            Path where the file is saved.
+        """
+        key = str(s3_file.key)
+        if self._sample_bytes is not None and s3_file.size > self._sample_bytes:
+            if s3_file.key.suffix not in COMPRESSED_FILE_SUFFIXES:
+                return self._s3_client.download_file_head(
+                    self._destination_directory, self._s3_bucket_name, key, self._sample_bytes
+                )
+            logger.warning(f"Cannot sample the leading bytes of compressed file {key!r}, downloading it whole.")
+        return self._s3_client.download_file(
+            self._destination_directory,
+            self._s3_bucket_name,
+            key,
+            self._workers_per_file,
+            etag=s3_file.etag,
+            size=s3_file.size,
+        )
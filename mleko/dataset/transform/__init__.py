@@ -10,18 +10,26 @@ The following feature transformers are provided by the subpackage:
         transformer.
     - `ExpressionTransformer`: A feature transformer for creating new features using expressions.
     - `FrequencyEncoderTransformer`: A feature transformer for encoding categorical features using frequency encoding.
+    - `HashingEncoderTransformer`: A feature transformer for encoding categorical features using feature hashing.
     - `LabelEncoderTransformer`: A feature transformer for encoding categorical features using label encoding.
     - `MaxAbsScalerTransformer`: A feature transformer for scaling features using maximum absolute scaling.
+    - `MedianImputerTransformer`: A feature transformer for imputing missing values using the median.
     - `MinMaxScalerTransformer`: A feature transformer for scaling features using min-max scaling.
+    - `QuantileBinningTransformer`: A feature transformer for discretizing features into quantile bins.
+    - `TargetEncoderTransformer`: A feature transformer for encoding categorical features using target encoding.
 """
 
 from .base_transformer import BaseTransformer
 from .composite_transformer import CompositeTransformer
 from .expression_transformer import ExpressionTransformer
 from .frequency_encoder_transformer import FrequencyEncoderTransformer
+from .hashing_encoder_transformer import HashingEncoderTransformer
 from .label_encoder_transformer import LabelEncoderTransformer
 from .max_abs_scaler_transformer import MaxAbsScalerTransformer
+from .median_imputer_transformer import MedianImputerTransformer
 from .min_max_scaler_transformer import MinMaxScalerTransformer
+from .quantile_binning_transformer import QuantileBinningTransformer
+from .target_encoder_transformer import TargetEncoderTransformer
 
 
 __all__ = [
@@ -29,7 +37,11 @@ __all__ = [
     "CompositeTransformer",
     "ExpressionTransformer",
     "FrequencyEncoderTransformer",
+    "HashingEncoderTransformer",
     "LabelEncoderTransformer",
     "MaxAbsScalerTransformer",
+    "MedianImputerTransformer",
     "MinMaxScalerTransformer",
+    "QuantileBinningTransformer",
+    "TargetEncoderTransformer",
 ]
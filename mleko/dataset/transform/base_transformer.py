@@ -13,6 +13,7 @@ from mleko.cache.handlers.joblib_cache_handler import JOBLIB_CACHE_HANDLER
 from mleko.cache.handlers.vaex_cache_handler import VAEX_DATAFRAME_CACHE_HANDLER
 from mleko.cache.lru_cache_mixin import LRUCacheMixin
 from mleko.dataset.data_schema import DataSchema
+from mleko.serving.scorer import BaseScorer
 from mleko.utils.custom_logger import CustomLogger
 
 
@@ -181,6 +182,59 @@ class BaseTransformer(LRUCacheMixin, ABC):
         ds, df = self._transform(data_schema, dataframe)
         return ds, transformer, df
 
+    def get_features(self) -> tuple[str, ...]:
+        """Returns the names of the features used by the transformer.
+
+        Returns:
+            The names of the features.
+        """
+        return self._features
+
+    def get_scorer(self) -> BaseScorer:
+        """Exports the fitted transformer as a scorer for single records or small batches, see `BaseScorer`.
+
+        The scorer applies the fitted transformation with plain Python and `numpy` operations instead of `vaex`,
+        which avoids the fixed overhead of building and evaluating a DataFrame and is intended for low-latency
+        online scoring. Its output is identical to the output of `transform` for the same rows.
+
+        Raises:
+            RuntimeError: If the transformer has not been fitted.
+
+        Returns:
+            The scorer of the fitted transformer.
+
+        Examples:
+            >>> import vaex
+            >>> from mleko.dataset.data_schema import DataSchema
+            >>> from mleko.dataset.transform import MaxAbsScalerTransformer
+            >>> df = vaex.from_arrays(a=[1.0, -4.0, 2.0])
+            >>> transformer = MaxAbsScalerTransformer(features=["a"])
+            >>> _ = transformer.fit(DataSchema(numerical=["a"]), df)
+            >>> scorer = transformer.get_scorer()
+            >>> scorer({"a": 3.0, "id": "x"})
+            {'a': 0.75, 'id': 'x'}
+            >>> scorer({"a": [1.0, -2.0]})["a"].tolist()
+            [0.25, -0.5]
+        """
+        if self._transformer is None:
+            msg = "Transformer must be fitted before it can be exported as a scorer."
+            logger.error(msg)
+            raise RuntimeError(msg)
+
+        return self._get_scorer()
+
+    def _get_scorer(self) -> BaseScorer:
+        """Returns the scorer of the fitted transformer.
+
+        Can be overridden by subclasses that support scoring without `vaex`.
+
+        Raises:
+            NotImplementedError: If the transformer does not support scoring without `vaex`.
+        """
+        msg = f"{self.__class__.__name__} does not support scoring records without `vaex`."
+        logger.error(msg)
+        raise NotImplementedError(msg)
+
     def _assign_transformer(self, transformer: Any) -> None:
         """Assigns the specified transformer to the transformer attribute.
 
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import shutil
+import time
+import uuid
+import weakref
 from pathlib import Path
 from typing import Any, Hashable
 
 import vaex
 
 from mleko.dataset.data_schema import DataSchema
+from mleko.serving.scorer import CompositeScorer
 from mleko.utils.custom_logger import CustomLogger
 from mleko.utils.decorators import auto_repr
+from mleko.utils.vaex_helpers import get_expression_depth, materialize_columns
 
 from .base_transformer import BaseTransformer
 
@@ -17,18 +23,27 @@ from .base_transformer import BaseTransformer
 logger = CustomLogger()
 """A module-level logger for the module."""
 
+STALE_MATERIALIZATION_AGE = 7 * 24 * 60 * 60
+"""Age in seconds after which leftover materialized files of previous transformations are deleted."""
+
 
 class CompositeTransformer(BaseTransformer):
     """A transformer that combines multiple transformers.
 
     It is possible to combine multiple transformers into a single transformer. This can be useful when multiple
     transformers need to be applied to a DataFrame and storing the intermediate DataFrames is not desired.
+
+    The transformations are fused into a single lazy expression graph of virtual columns, which is only evaluated
+    when the final DataFrame is used. Since every pass over the DataFrame re-evaluates the virtual columns, a
+    cost-based policy materializes expensive virtual columns into temporary memory-mapped Arrow files between steps.
     """
 
     @auto_repr
     def __init__(
         self,
         transformers: list[BaseTransformer] | tuple[BaseTransformer, ...],
+        materialization_threshold: int | None = 16,
+        materialize_after_steps: list[int] | tuple[int, ...] = (),
         cache_directory: str | Path = "data/composite-transformer",
         cache_size: int = 1,
     ) -> None:
@@ -38,8 +53,22 @@ class CompositeTransformer(BaseTransformer):
         applied to the DataFrame in the order they are specified. Caching of the intermediate DataFrames is disabled
         and will only be performed on the final DataFrame.
 
+        After each step, filtered DataFrames are extracted, so filters are evaluated only once, while virtual columns
+        are kept lazy unless their estimated cost reaches the `materialization_threshold`. The cost of a virtual
+        column is its expression depth, see `get_expression_depth`, multiplied by the number of times it will be
+        evaluated: once by the final DataFrame and once by every later step that lists it among its features.
+        Materialized columns are written to memory-mapped Arrow files in a new subdirectory of the `materialized`
+        subdirectory of the cache directory for every transformation, so that concurrent transformations and
+        instances sharing the cache directory never overwrite each other's files. The subdirectory is deleted once the
+        returned DataFrame, and every DataFrame derived from it, is garbage collected. Subdirectories left over by
+        interrupted processes are deleted once they are older than `STALE_MATERIALIZATION_AGE`.
+
         Args:
             transformers: List of transformers to be combined.
+            materialization_threshold: Minimum cost of a virtual column to be materialized after a step, or None to
+                only materialize after the steps in `materialize_after_steps`.
+            materialize_after_steps: Zero-based indices of the steps after which all virtual columns are
+                materialized, regardless of their cost, e.g. right before an expensive fitting step.
             cache_directory: Directory where the cache will be stored locally.
             cache_size: The maximum number of entries to keep in the cache.
 
@@ -75,6 +104,9 @@ class CompositeTransformer(BaseTransformer):
         """
         super().__init__([], cache_directory, cache_size)
         self._transformers = tuple(transformers)
+        self._materialization_threshold = materialization_threshold
+        self._materialize_after_steps = tuple(materialize_after_steps)
+        self._materialization_directory = self._cache_directory / "materialized"
         self._transformer: list[Any] = []
 
     def _fit(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, list[Any]]:
@@ -108,15 +140,16 @@ class CompositeTransformer(BaseTransformer):
         Returns:
             Updated data schema and transformed DataFrame.
         """
+        materialization_directory = self._create_materialization_directory()
         for i, transformer in enumerate(self._transformers):
             logger.info(
                 f"Executing composite feature transformation step {i+1}/{len(self._transformers)}: "
                 f"{transformer.__class__.__name__}."
             )
             data_schema, dataframe = transformer.transform(data_schema, dataframe, disable_cache=True)
-            dataframe = dataframe.extract()
+            dataframe = self._materialize(i, dataframe, materialization_directory)
             logger.info(f"Finished composite transformation step {i+1}/{len(self._transformers)}.")
-        return data_schema, dataframe
+        return data_schema, self._release_on_collection(dataframe, materialization_directory)
 
     def _fit_transform(
         self, data_schema: DataSchema, dataframe: vaex.DataFrame
@@ -130,6 +163,7 @@ class CompositeTransformer(BaseTransformer):
         Returns:
             Tuple of updated data schema, fitted transformer and transformed DataFrame.
         """
+        materialization_directory = self._create_materialization_directory()
         fitted_transformers: list[Any] = []
         for i, transformer in enumerate(self._transformers):
             logger.info(
@@ -140,11 +174,93 @@ class CompositeTransformer(BaseTransformer):
                 data_schema, dataframe, disable_cache=True
             )
             fitted_transformers.append(fitted_transformer)
-            dataframe = dataframe.extract()
+            dataframe = self._materialize(i, dataframe, materialization_directory)
             logger.info(
                 "Finished fitting and transforming composite transformation " f"step {i+1}/{len(self._transformers)}."
             )
-        return data_schema, fitted_transformers, dataframe
+        return data_schema, fitted_transformers, self._release_on_collection(dataframe, materialization_directory)
+
+    def _materialize(self, step: int, dataframe: vaex.DataFrame, materialization_directory: Path) -> vaex.DataFrame:
+        """Materializes the filter and the expensive virtual columns of the DataFrame after a step.
+
+        Args:
+            step: Zero-based index of the step that produced the DataFrame.
+            dataframe: The DataFrame produced by the step.
+            materialization_directory: Directory of the materialized files of the current transformation.
+
+        Returns:
+            The DataFrame with the filter and the selected virtual columns materialized.
+        """
+        if dataframe.filtered:
+            dataframe = dataframe.extract()
+
+        virtual_columns = [column for column in dataframe.get_column_names() if column in dataframe.virtual_columns]
+        if step in self._materialize_after_steps:
+            columns = virtual_columns
+        elif self._materialization_threshold is not None:
+            columns = [
+                column
+                for column in virtual_columns
+                if self._get_materialization_cost(step, dataframe, column) >= self._materialization_threshold
+            ]
+        else:
+            columns = []
+
+        if len(columns) > 0:
+            logger.info(f"Materializing {len(columns)} virtual column(s) after composite transformation step {step+1}.")
+            materialization_directory.mkdir(parents=True, exist_ok=True)
+            dataframe = materialize_columns(
+                dataframe, columns, materialization_directory / f"{dataframe.fingerprint()}.arrow"
+            )
+        return dataframe
+
+    def _get_materialization_cost(self, step: int, dataframe: vaex.DataFrame, column: str) -> int:
+        """Estimates the cost of keeping a virtual column lazy after a step.
+
+        Args:
+            step: Zero-based index of the step that produced the DataFrame.
+            dataframe: The DataFrame produced by the step.
+            column: Name of the virtual column.
+
+        Returns:
+            The expression depth of the column multiplied by the number of times it will be evaluated.
+        """
+        n_evaluations = 1 + sum(column in transformer.get_features() for transformer in self._transformers[step + 1 :])
+        return get_expression_depth(dataframe, column) * n_evaluations
+
+    def _create_materialization_directory(self) -> Path:
+        """Returns a new directory for the materialized files of a transformation and deletes stale directories.
+
+        Directories of previous transformations are normally deleted when their DataFrames are garbage collected,
+        see `_release_on_collection`. Directories older than `STALE_MATERIALIZATION_AGE`, left over by interrupted
+        processes or still locked when their DataFrames were collected, are deleted here. The new directory is only
+        created once a column is materialized.
+
+        Returns:
+            Path of the directory of the materialized files of the transformation.
+        """
+        if self._materialization_directory.exists():
+            for directory in self._materialization_directory.iterdir():
+                if directory.is_dir() and time.time() - directory.stat().st_mtime > STALE_MATERIALIZATION_AGE:
+                    shutil.rmtree(directory, ignore_errors=True)
+        return self._materialization_directory / uuid.uuid4().hex
+
+    def _release_on_collection(self, dataframe: vaex.DataFrame, materialization_directory: Path) -> vaex.DataFrame:
+        """Deletes the materialized files of a transformation once they can no longer be used.
+
+        The materialized files are memory-mapped by the dataset of the returned DataFrame, which is shared by all
+        DataFrames derived from it, so the directory is deleted when that dataset is garbage collected.
+
+        Args:
+            dataframe: The DataFrame returned by the transformation.
+            materialization_directory: Directory of the materialized files of the transformation.
+
+        Returns:
+            The DataFrame returned by the transformation.
+        """
+        if materialization_directory.exists():
+            weakref.finalize(dataframe.dataset, shutil.rmtree, materialization_directory, ignore_errors=True)
+        return dataframe
 
     def _assign_transformer(self, transformer: Any) -> None:
         """Assigns the specified transformer to the transformer attribute.
@@ -158,6 +274,17 @@ class CompositeTransformer(BaseTransformer):
         for transformer_obj, fitted_transformer in zip(self._transformers, transformer):
             transformer_obj._transformer = fitted_transformer
 
+    def _get_scorer(self) -> CompositeScorer:
+        """Returns the scorer applying the scorers of all transformers in order.
+
+        Raises:
+            NotImplementedError: If any of the transformers does not support scoring without `vaex`.
+
+        Returns:
+            The scorer of the fitted transformer.
+        """
+        return CompositeScorer(scorers=[transformer.get_scorer() for transformer in self._transformers])
+
     def _fingerprint(self) -> Hashable:
         """Returns the fingerprint of the transformer.
 
@@ -3,14 +3,15 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Hashable
+from typing import Hashable, Literal
 
 import vaex
 from typing_extensions import TypedDict
 
 from mleko.cache.fingerprinters.json_fingerprinter import JsonFingerprinter
 from mleko.dataset.data_schema import DataSchema, DataType
-from mleko.utils import CustomLogger, auto_repr, get_column
+from mleko.serving.scorer import ExpressionScorer
+from mleko.utils import CustomLogger, auto_repr, get_column, jit_expression
 
 from .base_transformer import BaseTransformer
 
@@ -39,6 +40,7 @@ class ExpressionTransformer(BaseTransformer):
     def __init__(
         self,
         expressions: dict[str, ExpressionTransformerConfig],
+        jit: Literal["numba", "pythran"] | None = None,
         cache_directory: str | Path = "data/expression-transformer",
         cache_size: int = 1,
     ) -> None:
@@ -56,6 +58,9 @@ class ExpressionTransformer(BaseTransformer):
             expressions: A dictionary where the key is the name of the new feature and the value is a dictionary
                 containing the expression, the data type and a boolean indicating if the feaature is a metadata feature.
                 The expression must be a valid `vaex` expression that can be evaluated on the DataFrame.
+            jit: Optional JIT backend used to compile each expression into a single kernel, fusing the chain of
+                virtual columns it depends on, see `jit_expression`. Expressions that cannot be compiled, e.g. string
+                expressions, are evaluated without compilation.
             cache_directory: The directory where the cache will be stored locally.
             cache_size: The maximum number of cache entries to keep in the cache.
 
@@ -81,6 +86,7 @@ class ExpressionTransformer(BaseTransformer):
             DataSchema(numerical=['a', 'b', 'sum', 'product'])
         """
         super().__init__([], cache_directory, cache_size)
+        self._jit: Literal["numba", "pythran"] | None = jit
         self._transformer = expressions
 
     def _fit(
@@ -113,11 +119,43 @@ class ExpressionTransformer(BaseTransformer):
             logger.info(
                 f"Creating new {config['type']!r} feature {feature!r} using expression {config['expression']!r}."
             )
-            df[feature] = get_column(df, config["expression"]).as_arrow()
+            df[feature] = self._get_expression(df, config["expression"]).as_arrow()
             if not config["is_meta"]:
                 ds.add_feature(feature, config["type"])
         return ds, df
 
+    def _get_expression(self, dataframe: vaex.DataFrame, expression: str) -> vaex.Expression:
+        """Returns the expression, JIT-compiled if a backend is configured and the expression can be compiled.
+
+        Args:
+            dataframe: The DataFrame the expression belongs to.
+            expression: The expression to evaluate.
+
+        Returns:
+            The compiled or the original expression.
+        """
+        if self._jit is not None:
+            try:
+                return jit_expression(dataframe, expression, self._jit)
+            except Exception as e:
+                logger.warning(
+                    f"Could not JIT-compile expression {expression!r} using {self._jit}, "
+                    f"evaluating it without compilation: {e}"
+                )
+        return get_column(dataframe, expression)
+
+    def _get_scorer(self) -> ExpressionScorer:
+        """Returns the scorer evaluating the expressions with `numpy`.
+
+        The expressions are always evaluated without JIT compilation, which only pays off for large DataFrames.
+
+        Returns:
+            The scorer of the transformer.
+        """
+        return ExpressionScorer(
+            expressions={feature: config["expression"] for feature, config in self._transformer.items()}
+        )
+
     def _fingerprint(self) -> Hashable:
         """Returns the fingerprint of the transformer.
 
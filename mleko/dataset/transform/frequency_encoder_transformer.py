@@ -3,14 +3,23 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Hashable, Literal
+from typing import Any, Hashable, Literal
 
+import numpy as np
 import vaex
 import vaex.ml
 
 from mleko.dataset.data_schema import DataSchema
+from mleko.serving.scorer import FrequencyEncoderScorer
 from mleko.utils.custom_logger import CustomLogger
 from mleko.utils.decorators import auto_repr
+from mleko.utils.vaex_helpers import (
+    get_column,
+    get_dictionary_codes,
+    get_dictionary_labels,
+    is_dictionary_encoded,
+    map_dictionary_encoded,
+)
 
 from .base_transformer import BaseTransformer
 
@@ -76,6 +85,9 @@ class FrequencyEncoderTransformer(BaseTransformer):
     def _fit(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, vaex.ml.FrequencyEncoder]:
         """Fits the transformer on the input data.
 
+        The value counts of all features are computed as delayed tasks, which `vaex` executes in a single pass over
+        the DataFrame, instead of fitting the `vaex.ml.FrequencyEncoder` one feature at a time.
+
         Args:
             data_schema: The DataSchema of the DataFrame.
             dataframe: The DataFrame to fit the transformer on.
@@ -84,7 +96,28 @@ class FrequencyEncoderTransformer(BaseTransformer):
             Updated DataSchema and the fitted transformer.
         """
         logger.info(f"Fitting frequency encoder transformer ({len(self._features)}): {self._features}.")
-        self._transformer.fit(dataframe)
+        dictionary_encoded_features = self._get_dictionary_encoded_features(dataframe)
+        value_counts: dict[str, Any] = {
+            feature: (
+                get_dictionary_codes(dataframe, feature)
+                if feature in dictionary_encoded_features
+                else get_column(dataframe, feature)
+            ).value_counts(delay=True)
+            for feature in self._features
+        }
+        dataframe.execute()
+
+        n_samples = len(dataframe)
+        mappings: dict[str, dict[Hashable, float]] = {}
+        for feature, counts in value_counts.items():
+            if feature in dictionary_encoded_features:
+                labels = get_dictionary_labels(dataframe, feature)
+                mappings[feature] = {
+                    labels[code]: count / n_samples for code, count in counts.get().items() if code != -1
+                }
+            else:
+                mappings[feature] = dict(counts.get() / n_samples)
+        self._transformer.mappings_ = mappings
 
         ds = data_schema.copy()
         for feature in self._features:
@@ -103,7 +136,22 @@ class FrequencyEncoderTransformer(BaseTransformer):
             Updated DataSchema and the transformed DataFrame.
         """
         logger.info(f"Transforming features using frequency encoding ({len(self._features)}): {self._features}.")
+        dictionary_encoded_features = self._get_dictionary_encoded_features(dataframe)
+        self._transformer.features = [
+            feature for feature in self._features if feature not in dictionary_encoded_features
+        ]
         transformed_df = self._transformer.transform(dataframe)
+        self._transformer.features = list(self._features)
+
+        default_value = {"zero": 0.0, "nan": np.nan}[self._transformer.unseen]
+        for feature in dictionary_encoded_features:
+            transformed_df[feature] = map_dictionary_encoded(
+                transformed_df,
+                feature,
+                self._transformer.mappings_[feature],
+                default_value=default_value,
+                missing_value=np.nan,
+            )
 
         ds = data_schema.copy()
         for feature in self._features:
@@ -111,6 +159,42 @@ class FrequencyEncoderTransformer(BaseTransformer):
 
         return ds, transformed_df
 
+    def _get_scorer(self) -> FrequencyEncoderScorer:
+        """Returns the scorer looking up the fitted frequencies of the values.
+
+        Returns:
+            The scorer of the fitted transformer.
+        """
+        mappings: dict[str, dict[Hashable, float]] = {}
+        nan_frequencies: dict[str, float] = {}
+        for feature in self._features:
+            mappings[feature] = {}
+            for value, frequency in self._transformer.mappings_[feature].items():
+                if value != value:
+                    nan_frequencies[feature] = frequency
+                else:
+                    mappings[feature][value] = frequency
+
+        return FrequencyEncoderScorer(
+            mappings=mappings,
+            unseen_value={"zero": 0.0, "nan": np.nan}[self._transformer.unseen],
+            nan_frequencies=nan_frequencies,
+        )
+
+    def _get_dictionary_encoded_features(self, dataframe: vaex.DataFrame) -> list[str]:
+        """Returns the features that are dictionary-encoded in the DataFrame.
+
+        Dictionary-encoded features are encoded using their integer codes instead of the `vaex.ml.FrequencyEncoder`,
+        which only supports plain string columns.
+
+        Args:
+            dataframe: The DataFrame containing the features.
+
+        Returns:
+            List of dictionary-encoded features.
+        """
+        return [feature for feature in self._features if is_dictionary_encoded(dataframe, feature)]
+
     def _fingerprint(self) -> Hashable:
         """Returns the fingerprint of the transformer.
 
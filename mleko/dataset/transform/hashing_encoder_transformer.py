@@ -0,0 +1,279 @@
+"""Module for the hashing encoder transformer."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Hashable
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import vaex
+import vaex.array_types
+
+from mleko.cache.fingerprinters import JsonFingerprinter
+from mleko.dataset.data_schema import DataSchema
+from mleko.utils.custom_logger import CustomLogger
+from mleko.utils.decorators import auto_repr
+from mleko.utils.vaex_helpers import get_column
+
+from .base_transformer import BaseTransformer
+
+
+logger = CustomLogger()
+"""A module-level logger for the module."""
+
+FNV_OFFSET_BASIS = np.uint64(0xCBF29CE484222325)
+"""Initial state of the 64-bit FNV-1a hash."""
+
+FNV_PRIME = np.uint64(0x100000001B3)
+"""Multiplier of the 64-bit FNV-1a hash."""
+
+
+@dataclass
+class FeatureHasher:
+    """Stable, seedable hashing of values into a fixed number of buckets, vectorized over Arrow arrays.
+
+    Values are converted to strings and hashed with the 64-bit FNV-1a hash directly on the Arrow data buffer, one
+    byte position at a time for all values at once, followed by the SplitMix64 finalizer to spread the hashes evenly
+    over the buckets. The hash only depends on the string representation of the value and the seed, so it is stable
+    across processes, platforms and chunkings. Dictionary-encoded values are hashed by their dictionary only.
+    """
+
+    n_buckets: int
+    """Number of buckets the values are hashed into."""
+
+    seed: int
+    """Seed of the hash, different seeds give independent hashes. Negative seeds are taken modulo 2**64."""
+
+    def encode(self, *columns: pa.Array | pa.ChunkedArray | np.ndarray) -> pa.Array:
+        """Hashes the values, or the crosses of the values of multiple columns, into buckets.
+
+        Intended to be registered as a `vaex` function that is applied chunk by chunk.
+
+        Args:
+            columns: The columns to hash, crossed in the given order if more than one column is given.
+
+        Returns:
+            The bucket of each row, null if any of the values is null.
+        """
+        hashes, is_null = self._hash_column(columns[0])
+        for column in columns[1:]:
+            column_hashes, column_is_null = self._hash_column(column)
+            hashes = _mix((hashes * FNV_PRIME) ^ column_hashes)
+            is_null |= column_is_null
+        buckets = (hashes % np.uint64(self.n_buckets)).astype(np.int64)
+        return pa.array(buckets, mask=is_null if is_null.any() else None)
+
+    def _hash_column(self, values: pa.Array | pa.ChunkedArray | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Hashes the values of a single column.
+
+        Args:
+            values: Plain or dictionary-encoded values of any type.
+
+        Returns:
+            The 64-bit hash of each value and whether the value is null.
+        """
+        arrow_values: pa.Array | pa.ChunkedArray = vaex.array_types.to_arrow(values)
+        if isinstance(arrow_values, pa.ChunkedArray):
+            chunk_hashes = [self._hash_column(chunk) for chunk in arrow_values.chunks]
+            return (
+                np.concatenate([hashes for hashes, _ in chunk_hashes] or [np.zeros(0, np.uint64)]),
+                np.concatenate([is_null for _, is_null in chunk_hashes] or [np.zeros(0, bool)]),
+            )
+        if pa.types.is_dictionary(arrow_values.type):
+            dictionary_hashes, dictionary_is_null = self._hash_column(arrow_values.dictionary)
+            indices = np.asarray(pc.fill_null(arrow_values.indices, 0), dtype=np.int64)
+            is_null = np.asarray(arrow_values.is_null())
+            if len(dictionary_hashes) == 0:
+                return np.zeros(len(arrow_values), np.uint64), np.ones(len(arrow_values), bool)
+            return dictionary_hashes[indices], is_null | dictionary_is_null[indices]
+
+        strings = (
+            arrow_values
+            if pa.types.is_large_string(arrow_values.type)
+            else pc.cast(arrow_values, pa.large_string())
+        )
+        return self._hash_strings(strings), np.asarray(arrow_values.is_null())
+
+    def _hash_strings(self, strings: pa.LargeStringArray) -> np.ndarray:
+        """Hashes strings with the 64-bit FNV-1a hash, vectorized over the Arrow data buffer.
+
+        The strings are sorted by length once, so that the strings that are still being hashed at each byte position
+        are a prefix of the sorted strings and are updated with a single vectorized operation.
+
+        Args:
+            strings: The strings to hash.
+
+        Returns:
+            The 64-bit hash of each string.
+        """
+        _, offsets_buffer, data_buffer = strings.buffers()
+        offsets = np.frombuffer(offsets_buffer, dtype=np.int64)[strings.offset : strings.offset + len(strings) + 1]
+        data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None else np.zeros(0, np.uint8)
+        lengths = np.diff(offsets)
+        order = np.argsort(-lengths, kind="stable")
+        starts, sorted_lengths = offsets[:-1][order], lengths[order]
+
+        seed = np.array([self.seed & 0xFFFFFFFFFFFFFFFF], dtype=np.uint64)
+        hashes = np.full(len(strings), FNV_OFFSET_BASIS ^ _mix(seed)[0])
+        for position in range(int(sorted_lengths[0]) if len(sorted_lengths) > 0 else 0):
+            n_active = int(np.searchsorted(-sorted_lengths, -position, side="left"))
+            hashes[:n_active] = (hashes[:n_active] ^ data[starts[:n_active] + position]) * FNV_PRIME
+
+        result = np.empty_like(hashes)
+        result[order] = _mix(hashes)
+        return result
+
+
+class HashingEncoderTransformer(BaseTransformer):
+    """Transforms features using feature hashing."""
+
+    @auto_repr
+    def __init__(
+        self,
+        features: list[str] | tuple[str, ...],
+        n_buckets: int = 2**20,
+        crosses: dict[str, list[str] | tuple[str, ...]] | None = None,
+        seed: int = 0,
+        cache_directory: str | Path = "data/hashing-encoder-transformer",
+        cache_size: int = 1,
+    ) -> None:
+        """Initializes the transformer.
+
+        Each value is hashed into one of `n_buckets` buckets, see `FeatureHasher`, which is an alternative to label
+        encoding for features with an unbounded number of categories, such as user or device identifiers. The
+        transformer requires no fitting and its memory does not depend on the number of categories, values never
+        seen before are simply hashed into a bucket. Missing values are kept as missing.
+
+        Optionally, crosses of two or more features are hashed into new categorical features, e.g. the cross of a
+        user and a merchant identifier. The crosses are computed from the original values, before the features are
+        hashed, and a cross is missing if any of its values is missing.
+
+        Warning:
+            Distinct values can be hashed into the same bucket. The number of buckets should be large compared to the
+            number of categories to keep the collisions rare.
+
+        Args:
+            features: List of feature names to be hashed in place.
+            n_buckets: Number of buckets the values are hashed into.
+            crosses: Optional mapping of the names of new features to the features that are crossed to create them.
+            seed: Seed of the hash, different seeds give independent hashes.
+            cache_directory: Directory where the cache will be stored locally.
+            cache_size: The maximum number of entries to keep in the cache.
+
+        Raises:
+            ValueError: If the number of buckets is not positive, a cross has less than two features, or the name of
+                a cross is one of the features.
+
+        Examples:
+            >>> import vaex
+            >>> from mleko.dataset.data_schema import DataSchema
+            >>> from mleko.dataset.transform import HashingEncoderTransformer
+            >>> df = vaex.from_arrays(user=["u1", "u2", "u1", None], merchant=["m1", "m1", "m2", "m1"])
+            >>> ds = DataSchema(categorical=["user", "merchant"])
+            >>> ds, _, df = HashingEncoderTransformer(
+            ...     features=["user"],
+            ...     n_buckets=16,
+            ...     crosses={"user_merchant": ["user", "merchant"]},
+            ... ).fit_transform(ds, df)
+            >>> df["user"].tolist()
+            [15, 0, 15, None]
+            >>> df["user_merchant"].tolist()
+            [4, 11, 12, None]
+        """
+        super().__init__(features, cache_directory, cache_size)
+        self._crosses = {name: tuple(columns) for name, columns in (crosses or {}).items()}
+        if n_buckets < 1:
+            msg = f"Number of buckets must be positive, got {n_buckets}."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        invalid_crosses = [
+            name for name, columns in self._crosses.items() if len(columns) < 2 or name in self._features
+        ]
+        if len(invalid_crosses) > 0:
+            msg = f"Crosses must combine at least two features and not replace a hashed feature: {invalid_crosses}."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        self._transformer = FeatureHasher(n_buckets=n_buckets, seed=seed)
+
+    def _fit(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, FeatureHasher]:
+        """No fitting is required for the hashing encoder transformer.
+
+        Args:
+            data_schema: The DataSchema of the DataFrame.
+            dataframe: The DataFrame to fit the transformer on.
+
+        Returns:
+            The DataSchema and the transformer.
+        """
+        return data_schema, self._transformer
+
+    def _transform(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, vaex.DataFrame]:
+        """Transforms the features in the DataFrame using feature hashing.
+
+        The hashes are computed lazily by a `vaex` function, chunk by chunk.
+
+        Args:
+            data_schema: The DataSchema of the DataFrame.
+            dataframe: The DataFrame to transform.
+
+        Returns:
+            Updated DataSchema and the transformed DataFrame.
+        """
+        logger.info(
+            f"Transforming features using feature hashing into {self._transformer.n_buckets} buckets "
+            f"({len(self._features)}): {self._features}, crosses: {list(self._crosses)}."
+        )
+        df = dataframe.copy()
+        ds = data_schema.copy()
+        function_name = f"hash_encode_{self._transformer.n_buckets}_{self._transformer.seed}".replace("-", "m")
+        df.add_function(function_name, self._transformer.encode)
+        hash_encode = getattr(df.func, function_name)
+
+        crosses = {
+            name: hash_encode(*[get_column(df, column) for column in columns])
+            for name, columns in self._crosses.items()
+        }
+        for feature in self._features:
+            df[feature] = hash_encode(get_column(df, feature))
+        for name, expression in crosses.items():
+            df[name] = expression
+            if name not in ds.get_features():
+                ds.add_feature(name, "categorical")
+
+        return ds, df
+
+    def _fingerprint(self) -> Hashable:
+        """Returns the fingerprint of the transformer.
+
+        Append the number of buckets, the seed and the crosses to the fingerprint.
+
+        Returns:
+            A hashable object that uniquely identifies the transformer.
+        """
+        return (
+            super()._fingerprint(),
+            self._transformer.n_buckets,
+            self._transformer.seed,
+            JsonFingerprinter().fingerprint(self._crosses),
+        )
+
+
+def _mix(hashes: np.ndarray) -> np.ndarray:
+    """Applies the SplitMix64 finalizer to 64-bit hashes, so that every bit of the input affects every output bit.
+
+    Args:
+        hashes: The hashes to mix.
+
+    Returns:
+        The mixed hashes.
+    """
+    hashes = hashes ^ (hashes >> np.uint64(30))
+    hashes = hashes * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = hashes ^ (hashes >> np.uint64(27))
+    hashes = hashes * np.uint64(0x94D049BB133111EB)
+    return hashes ^ (hashes >> np.uint64(31))
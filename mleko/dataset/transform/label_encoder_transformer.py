@@ -2,18 +2,32 @@
 
 from __future__ import annotations
 
-import re
+import functools
+import hashlib
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Hashable
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import vaex
 import vaex.array_types
 
 from mleko.cache.fingerprinters import JsonFingerprinter
 from mleko.dataset.data_schema import DataSchema
+from mleko.serving.scorer import LabelEncoderScorer
 from mleko.utils.custom_logger import CustomLogger
 from mleko.utils.decorators import auto_repr
-from mleko.utils.vaex_helpers import get_column
+from mleko.utils.vaex_helpers import (
+    EVALUATION_CHUNK_SIZE,
+    get_column,
+    get_dictionary_codes,
+    get_dictionary_labels,
+    get_unique_values,
+    get_value_positions,
+    is_dictionary_encoded,
+)
 
 from .base_transformer import BaseTransformer
 
@@ -22,6 +36,110 @@ logger = CustomLogger()
 """A module-level logger for the module."""
 
 
+@dataclass
+class LabelEncoding:
+    """Fitted label encoding of a single feature, stored as Arrow arrays.
+
+    Values are encoded with the hash-based Arrow `index_in` kernel, which looks up the position of each value in
+    `labels`, followed by a `take` of the `codes` at those positions. Dictionary-encoded values are encoded by
+    looking up their dictionary only, and taking the encoded dictionary at their indices.
+    """
+
+    labels: pa.Array
+    """Unique non-null labels of the feature."""
+
+    codes: pa.Array
+    """Integer codes of the labels, aligned with `labels`, null for labels encoded as null."""
+
+    null_code: int | None
+    """Code of the null values, either `-1` or None to keep them as null."""
+
+    @classmethod
+    def from_dict(cls, mapping: dict[str | None, int | None]) -> LabelEncoding:
+        """Creates a label encoding from a mapping of labels to codes.
+
+        Args:
+            mapping: Mapping of labels to codes, the code of the `None` key is used for null values.
+
+        Returns:
+            The label encoding.
+        """
+        labels = [label for label in mapping if label is not None]
+        return cls(
+            labels=pa.array(labels, pa.string()),
+            codes=pa.array([mapping[label] for label in labels], pa.int64()),
+            null_code=mapping.get(None),
+        )
+
+    def to_dict(self) -> dict[str | None, int | None]:
+        """Converts the label encoding to a mapping of labels to codes.
+
+        Warning:
+            Converts every label to a Python object, which is slow and memory intensive for high-cardinality features.
+
+        Returns:
+            Mapping of labels to codes, including the code of null values under the `None` key.
+        """
+        mapping: dict[str | None, int | None] = dict(zip(self.labels.to_pylist(), self.codes.to_pylist()))
+        mapping[None] = self.null_code
+        return mapping
+
+    def fingerprint(self) -> str:
+        """Computes a fingerprint of the label encoding from the Arrow buffers of the labels and codes.
+
+        Returns:
+            MD5 hex digest of the label encoding.
+        """
+        digest = hashlib.md5(str(self.null_code).encode())
+        for array in (self.labels, self.codes):
+            for buffer in array.buffers():
+                if buffer is not None:
+                    digest.update(buffer)
+        return digest.hexdigest()
+
+    def get_positions(self, values: pa.Array | pa.ChunkedArray) -> pa.Array | pa.ChunkedArray:
+        """Gets the positions of the values in the labels.
+
+        Args:
+            values: Plain or dictionary-encoded string values.
+
+        Returns:
+            Position of each value in `labels`, null for null and unseen values.
+        """
+        return get_value_positions(values, self.labels)
+
+    def count_unseen(self, values: pa.Array | pa.ChunkedArray) -> int:
+        """Counts the non-null values that are not among the labels.
+
+        Args:
+            values: Plain or dictionary-encoded string values.
+
+        Returns:
+            Number of unseen values.
+        """
+        return pc.sum(pc.and_(pc.is_valid(values), pc.is_null(self.get_positions(values)))).as_py() or 0
+
+    def encode(self, values: pa.Array | pa.ChunkedArray, unseen_code: int | None = None) -> pa.Array:
+        """Encodes the values, intended to be registered as a `vaex` function that is applied chunk by chunk.
+
+        Args:
+            values: Plain or dictionary-encoded string values.
+            unseen_code: Code of the unseen values, or None to encode them as null.
+
+        Returns:
+            The integer codes of the values.
+        """
+        values = vaex.array_types.to_arrow(values)
+        positions = self.get_positions(values)
+        codes = pc.take(self.codes, positions)
+        if unseen_code is not None:
+            is_unseen = pc.and_(pc.is_valid(values), pc.is_null(positions))
+            codes = pc.if_else(is_unseen, pa.scalar(unseen_code, pa.int64()), codes)
+        if self.null_code is not None:
+            codes = pc.if_else(pc.is_null(values), pa.scalar(self.null_code, pa.int64()), codes)
+        return codes
+
+
 class LabelEncoderTransformer(BaseTransformer):
     """Transforms features using label encoding."""
 
@@ -43,7 +161,8 @@ class LabelEncoderTransformer(BaseTransformer):
         `None`.
 
         Warning:
-            Should only be used with categorical features of string type.
+            Should only be used with categorical features of string type. Dictionary-encoded string features are
+            encoded using their integer codes, without materializing the string values.
 
         Note:
             If `label_dict` is not provided, during fitting, the transformer will assign label mappings from the data
@@ -118,7 +237,7 @@ class LabelEncoderTransformer(BaseTransformer):
             else:
                 logger.warning("Null values will be kept as `None`.")
 
-        self._transformer = {}
+        self._transformer: dict[str, LabelEncoding] = {}
         if label_dict is not None:
             missing_features = [feature for feature in features if feature not in label_dict]
             if missing_features:
@@ -128,13 +247,15 @@ class LabelEncoderTransformer(BaseTransformer):
                 )
                 logger.warning(msg)
 
-            self._transformer = label_dict
+            self._transformer = {feature: LabelEncoding.from_dict(mapping) for feature, mapping in label_dict.items()}
 
-    def _fit(
-        self, data_schema: DataSchema, dataframe: vaex.DataFrame
-    ) -> tuple[DataSchema, dict[str, dict[str | None, int | None]] | dict[str, dict[str | None, int]]]:
+    def _fit(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, dict[str, LabelEncoding]]:
         """Fits the transformer on the given DataFrame.
 
+        The unique values of all features are gathered in a single pass over the DataFrame, see `get_unique_values`,
+        and stored as Arrow arrays. Labels are assigned codes in order of their first occurrence, for plain and
+        dictionary-encoded features alike.
+
         Args:
             data_schema: The data schema of the DataFrame.
             dataframe: The DataFrame to fit the transformer on.
@@ -145,48 +266,103 @@ class LabelEncoderTransformer(BaseTransformer):
         logger.info(f"Fitting label encoder transformer ({len(self._features)}): {self._features}.")
         for feature in self._features:
             self._ensure_valid_feature_type(feature, data_schema, dataframe)
-            labels: list[str] = [
-                label
-                for label in get_column(dataframe, feature).to_arrow().unique().to_pylist()  # type: ignore
-                if label is not None
-            ]
+
+        dictionary_encoded_features = {
+            feature for feature in self._features if is_dictionary_encoded(dataframe, feature)
+        }
+        unique_values = get_unique_values(
+            dataframe,
+            [
+                (
+                    get_dictionary_codes(dataframe, feature)
+                    if feature in dictionary_encoded_features
+                    else get_column(dataframe, feature)
+                ).expression
+                for feature in self._features
+            ],
+        )
+        for feature, values in zip(self._features, unique_values):
+            if feature in dictionary_encoded_features:
+                codes = pc.filter(values, pc.not_equal(values, -1))
+                labels = pa.array(get_dictionary_labels(dataframe, feature), pa.string()).take(codes)
+            else:
+                labels = pc.drop_null(values)
 
             if not self._fit_using_label_dict(feature, labels):
-                logger.info(f"Assigning mappings for feature {feature!r}: {labels}.")
-                self._transformer[feature] = {label: i for i, label in enumerate(labels)}
-                self._transformer[feature][None] = -1 if self._encode_null else None
+                logger.info(f"Assigning mappings for feature {feature!r}: {len(labels)} labels.")
+                self._transformer[feature] = LabelEncoding(
+                    labels=labels,
+                    codes=pa.array(np.arange(len(labels), dtype=np.int64)),
+                    null_code=-1 if self._encode_null else None,
+                )
 
         return data_schema, self._transformer
 
     def _transform(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, vaex.DataFrame]:
         """Transforms the features of the given DataFrame using label encoding.
 
+        Each feature is encoded lazily by a `vaex` function applying `LabelEncoding.encode` chunk by chunk. If unseen
+        values are not allowed, all features are checked for unseen values in a single pass beforehand.
+
         Args:
             data_schema: The data schema of the DataFrame.
             dataframe: The DataFrame to transform.
 
+        Raises:
+            ValueError: If unseen values are present and `allow_unseen` is False.
+
         Returns:
             Updated data schema and transformed DataFrame.
         """
         logger.info(f"Transforming features using label encoding ({len(self._features)}): {self._features}.")
+        if not self._allow_unseen:
+            self._ensure_no_unseen_values(dataframe)
+
         df = dataframe.copy()
+        unseen_code = -2 if self._allow_unseen else None
         for feature in self._features:
-            try:
-                df[feature] = get_column(df, feature).map(
-                    self._transformer[feature],
-                    default_value=-2 if self._allow_unseen else None,
-                )
-            except ValueError as e:
-                if not self._allow_unseen and re.search(r"Missing \d values in mapper", str(e)):
+            label_encoding = self._transformer[feature]
+            function_name = f"label_encode_{label_encoding.fingerprint()}_{unseen_code}".replace("-", "m")
+            df.add_function(function_name, functools.partial(label_encoding.encode, unseen_code=unseen_code))
+            df[feature] = getattr(df.func, function_name)(get_column(df, feature))
+
+        return data_schema, df
+
+    def _ensure_no_unseen_values(self, dataframe: vaex.DataFrame) -> None:
+        """Checks all features for values that were not seen during fitting in a single pass over the DataFrame.
+
+        Args:
+            dataframe: The DataFrame to check.
+
+        Raises:
+            ValueError: If any feature contains unseen values.
+        """
+        if len(dataframe) == 0:
+            return
+
+        expressions = [get_column(dataframe, feature).expression for feature in self._features]
+        for _, _, chunks in dataframe.evaluate_iterator(
+            expressions, chunk_size=EVALUATION_CHUNK_SIZE, array_type="arrow"
+        ):
+            for feature, chunk in zip(self._features, chunks):
+                if self._transformer[feature].count_unseen(chunk) > 0:
                     msg = (
                         f"Unseen values encountered during transformation for feature {feature!r}. "
                         "Set `allow_unseen` to True to convert unseen values to -1 instead of raising an error."
                     )
                     logger.error(msg)
-                    raise ValueError(msg) from e
-                raise e  # pragma: no cover
+                    raise ValueError(msg)
 
-        return data_schema, df
+    def _get_scorer(self) -> LabelEncoderScorer:
+        """Returns the scorer looking up the fitted codes of the labels in dictionaries.
+
+        Returns:
+            The scorer of the fitted transformer.
+        """
+        return LabelEncoderScorer(
+            mappings={feature: self._transformer[feature].to_dict() for feature in self._features},
+            unseen_code=-2 if self._allow_unseen else None,
+        )
 
     def _fingerprint(self) -> Hashable:
         """Returns the fingerprint of the transformer.
@@ -203,7 +379,7 @@ class LabelEncoderTransformer(BaseTransformer):
             JsonFingerprinter().fingerprint(self._label_dict),
         )
 
-    def _fit_using_label_dict(self, feature: str, observed_labels: list[str]) -> bool:
+    def _fit_using_label_dict(self, feature: str, observed_labels: pa.Array) -> bool:
         """Attempts to fit the label dictionary for the specified feature.
 
         If the label dictionary is not provided or the feature is not in the label dictionary, the function will
@@ -211,7 +387,7 @@ class LabelEncoderTransformer(BaseTransformer):
 
         Args:
             feature: The feature to fit the label dictionary for.
-            observed_labels: The observed labels for the feature.
+            observed_labels: The observed non-null labels for the feature.
 
         Raises:
             ValueError: If the label dictionary contains invalid mappings.
@@ -222,29 +398,37 @@ class LabelEncoderTransformer(BaseTransformer):
         if self._label_dict is None or feature not in self._label_dict:
             return False
 
-        self._transformer[feature] = self._label_dict[feature]
-        if any(encoding is not None and encoding < 0 for encoding in self._transformer[feature].values()):
+        mapping = self._label_dict[feature]
+        if any(encoding is not None and encoding < 0 for encoding in mapping.values()):
             msg = (
                 f"Label dictionary for feature {feature!r} must contain non-negative integers or None. "
-                f"Found: {self._transformer[feature]}."
+                f"Found: {mapping}."
             )
             logger.error(msg)
             raise ValueError(msg)
 
-        missing_labels = set(observed_labels) - set(self._transformer[feature].keys())
-        if missing_labels:
+        label_encoding = LabelEncoding.from_dict(mapping)
+        missing_labels = pc.filter(
+            observed_labels, pc.invert(pc.is_in(observed_labels, value_set=label_encoding.labels))
+        )
+        if len(missing_labels) > 0:
             logger.warning(
-                f"Label dictionary for feature {feature!r} is missing labels: {missing_labels}. "
+                f"Label dictionary for feature {feature!r} is missing {len(missing_labels)} labels: "
+                f"{missing_labels[:10].to_pylist()}{'...' if len(missing_labels) > 10 else ''}. "
                 "Assigning mappings during fitting."
             )
-            max_label = max((value for value in self._transformer[feature].values() if value is not None), default=-1)
-            self._transformer[feature].update({label: i for i, label in enumerate(missing_labels, start=max_label + 1)})
+            max_label = max((value for value in mapping.values() if value is not None), default=-1)
+            label_encoding.labels = pa.concat_arrays([label_encoding.labels, missing_labels.cast(pa.string())])
+            label_encoding.codes = pa.concat_arrays(
+                [label_encoding.codes, pa.array(np.arange(len(missing_labels), dtype=np.int64) + max_label + 1)]
+            )
 
-        null_mapping = self._transformer[feature].get(None, -1 if self._encode_null else None)
+        null_mapping = mapping.get(None, -1 if self._encode_null else None)
         if isinstance(null_mapping, int) and null_mapping != -1 and self._encode_null:
             logger.warning(f"Null values for feature {feature!r} will be encoded as `-1`, not {null_mapping}.")
             null_mapping = -1
-        self._transformer[feature][None] = null_mapping
+        label_encoding.null_code = null_mapping
+        self._transformer[feature] = label_encoding
         return True
 
     def _ensure_valid_feature_type(self, feature: str, data_schema: DataSchema, dataframe: vaex.DataFrame) -> None:
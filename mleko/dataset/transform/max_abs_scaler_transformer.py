@@ -9,6 +9,7 @@ import vaex
 import vaex.ml
 
 from mleko.dataset.data_schema import DataSchema
+from mleko.serving.scorer import MaxAbsScalerScorer
 from mleko.utils.custom_logger import CustomLogger
 from mleko.utils.decorators import auto_repr
 
@@ -94,6 +95,14 @@ class MaxAbsScalerTransformer(BaseTransformer):
 
         return data_schema, transformed_df
 
+    def _get_scorer(self) -> MaxAbsScalerScorer:
+        """Returns the scorer scaling the features with the fitted maximum absolute values.
+
+        Returns:
+            The scorer of the fitted transformer.
+        """
+        return MaxAbsScalerScorer(maximums=dict(zip(self._features, self._transformer.absmax_)))
+
     def _fingerprint(self) -> Hashable:
         """Returns the fingerprint of the transformer.
 
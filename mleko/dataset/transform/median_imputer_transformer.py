@@ -0,0 +1,113 @@
+"""Module for the median imputer transformer."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Hashable
+
+import vaex
+
+from mleko.dataset.data_schema import DataSchema
+from mleko.utils.custom_logger import CustomLogger
+from mleko.utils.decorators import auto_repr
+from mleko.utils.quantile_helpers import get_quantile_sketches
+from mleko.utils.vaex_helpers import get_column
+
+from .base_transformer import BaseTransformer
+
+
+logger = CustomLogger()
+"""A module-level logger for the module."""
+
+
+class MedianImputerTransformer(BaseTransformer):
+    """Imputes missing values of features using their median."""
+
+    @auto_repr
+    def __init__(
+        self,
+        features: list[str] | tuple[str, ...],
+        relative_error: float = 0.001,
+        cache_directory: str | Path = "data/median-imputer-transformer",
+        cache_size: int = 1,
+    ) -> None:
+        """Initializes the median imputer transformer.
+
+        Missing and nan values of each feature are replaced by the median of the feature. The medians are computed
+        approximately with streaming quantile sketches of all features in a single pass over the DataFrame, see
+        `get_quantile_sketches`, and imputed lazily with a `fillna` expression.
+
+        Warning:
+            Should only be used with numerical features. Features without any non-missing values are imputed with nan,
+            and integer features keep their type, so their median is truncated to an integer.
+
+        Args:
+            features: List of feature names to be used by the transformer.
+            relative_error: Target relative rank error of the approximate medians.
+            cache_directory: Directory where the cache will be stored locally.
+            cache_size: The maximum number of entries to keep in the cache.
+
+        Examples:
+            >>> import vaex
+            >>> from mleko.dataset.data_schema import DataSchema
+            >>> from mleko.dataset.transform import MedianImputerTransformer
+            >>> df = vaex.from_arrays(a=[1.0, float("nan"), 3.0, 10.0, float("nan")])
+            >>> ds = DataSchema(numerical=["a"])
+            >>> _, _, df = MedianImputerTransformer(
+            ...     features=["a"],
+            ... ).fit_transform(ds, df)
+            >>> df["a"].tolist()
+            [1.0, 3.0, 3.0, 10.0, 3.0]
+        """
+        super().__init__(features, cache_directory, cache_size)
+        self._relative_error = relative_error
+        self._transformer: dict[str, float] = {}
+
+    def _fit(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, dict[str, float]]:
+        """Fits the transformer on the given DataFrame.
+
+        Args:
+            data_schema: The data schema of the DataFrame.
+            dataframe: The DataFrame to fit the transformer on.
+
+        Returns:
+            Updated data schema and fitted transformer, the median of each feature.
+        """
+        logger.info(f"Fitting median imputer transformer ({len(self._features)}): {self._features}.")
+        sketches = get_quantile_sketches(
+            dataframe,
+            [get_column(dataframe, feature).expression for feature in self._features],
+            relative_error=self._relative_error,
+        )
+        self._transformer = {
+            feature: float(sketch.quantiles([0.5])[0]) for feature, sketch in zip(self._features, sketches)
+        }
+
+        return data_schema, self._transformer
+
+    def _transform(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, vaex.DataFrame]:
+        """Transforms the features in the DataFrame by imputing missing values with the medians.
+
+        Args:
+            data_schema: The data schema of the DataFrame.
+            dataframe: The DataFrame to transform.
+
+        Returns:
+            Updated data schema and transformed DataFrame.
+        """
+        logger.info(f"Imputing missing values using the median ({len(self._features)}): {self._features}.")
+        df = dataframe.copy()
+        for feature in self._features:
+            df[feature] = get_column(df, feature).fillna(self._transformer[feature])
+
+        return data_schema, df
+
+    def _fingerprint(self) -> Hashable:
+        """Returns the fingerprint of the transformer.
+
+        Appends the relative error to the fingerprint.
+
+        Returns:
+            A hashable object that uniquely identifies the transformer.
+        """
+        return super()._fingerprint(), self._relative_error
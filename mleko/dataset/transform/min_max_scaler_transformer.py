@@ -9,6 +9,7 @@ import vaex
 import vaex.ml
 
 from mleko.dataset.data_schema import DataSchema
+from mleko.serving.scorer import MinMaxScalerScorer
 from mleko.utils.custom_logger import CustomLogger
 from mleko.utils.decorators import auto_repr
 
@@ -102,6 +103,18 @@ class MinMaxScalerTransformer(BaseTransformer):
 
         return data_schema, transformed_df
 
+    def _get_scorer(self) -> MinMaxScalerScorer:
+        """Returns the scorer scaling the features with the fitted minimum and maximum values.
+
+        Returns:
+            The scorer of the fitted transformer.
+        """
+        return MinMaxScalerScorer(
+            minimums=dict(zip(self._features, self._transformer.fmin_)),
+            maximums=dict(zip(self._features, self._transformer.fmax_)),
+            feature_range=(self._min_value, self._max_value),
+        )
+
     def _fingerprint(self) -> Hashable:
         """Returns the fingerprint of the transformer.
 
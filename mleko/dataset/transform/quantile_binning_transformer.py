@@ -0,0 +1,160 @@
+"""Module for the quantile binning transformer."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+from pathlib import Path
+from typing import Hashable
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import vaex
+import vaex.array_types
+
+from mleko.dataset.data_schema import DataSchema
+from mleko.utils.custom_logger import CustomLogger
+from mleko.utils.decorators import auto_repr
+from mleko.utils.quantile_helpers import get_quantile_sketches
+from mleko.utils.vaex_helpers import get_column
+
+from .base_transformer import BaseTransformer
+
+
+logger = CustomLogger()
+"""A module-level logger for the module."""
+
+
+class QuantileBinningTransformer(BaseTransformer):
+    """Transforms features by discretizing them into quantile bins."""
+
+    @auto_repr
+    def __init__(
+        self,
+        features: list[str] | tuple[str, ...],
+        n_bins: int = 10,
+        relative_error: float = 0.001,
+        cache_directory: str | Path = "data/quantile-binning-transformer",
+        cache_size: int = 1,
+    ) -> None:
+        """Initializes the quantile binning transformer.
+
+        Each feature is discretized into `n_bins` bins holding about the same number of samples, and replaced by the
+        ordinal index of its bin, similar to the `KBinsDiscretizer` of `scikit-learn` with the quantile strategy.
+        The bin edges are the approximate quantiles of the features, computed with streaming quantile sketches of all
+        features in a single pass over the DataFrame, see `get_quantile_sketches`. Values outside of the fitted range
+        are assigned to the first or last bin, and missing values are kept as missing.
+
+        Note:
+            Bins with equal edges, e.g. of features with few distinct values, are merged, so a feature can have
+            fewer than `n_bins` bins.
+
+        Args:
+            features: List of feature names to be used by the transformer.
+            n_bins: Number of bins of each feature.
+            relative_error: Target relative rank error of the approximate quantiles, lower values give more accurate
+                bin edges at the cost of memory.
+            cache_directory: Directory where the cache will be stored locally.
+            cache_size: The maximum number of entries to keep in the cache.
+
+        Raises:
+            ValueError: If the number of bins is not positive.
+
+        Examples:
+            >>> import vaex
+            >>> from mleko.dataset.data_schema import DataSchema
+            >>> from mleko.dataset.transform import QuantileBinningTransformer
+            >>> df = vaex.from_arrays(a=[1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, float("nan")])
+            >>> ds = DataSchema(numerical=["a"])
+            >>> _, _, df = QuantileBinningTransformer(
+            ...     features=["a"],
+            ...     n_bins=4,
+            ... ).fit_transform(ds, df)
+            >>> df["a"].tolist()
+            [0, 0, 1, 1, 2, 2, 3, 3, None]
+        """
+        super().__init__(features, cache_directory, cache_size)
+        if n_bins < 1:
+            msg = f"Number of bins must be positive, got {n_bins}."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        self._n_bins = n_bins
+        self._relative_error = relative_error
+        self._transformer: dict[str, np.ndarray] = {}
+
+    def _fit(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, dict[str, np.ndarray]]:
+        """Fits the transformer on the given DataFrame.
+
+        Args:
+            data_schema: The data schema of the DataFrame.
+            dataframe: The DataFrame to fit the transformer on.
+
+        Returns:
+            Updated data schema and fitted transformer, the bin edges of each feature.
+        """
+        logger.info(f"Fitting quantile binning transformer ({len(self._features)}): {self._features}.")
+        sketches = get_quantile_sketches(
+            dataframe,
+            [get_column(dataframe, feature).expression for feature in self._features],
+            relative_error=self._relative_error,
+        )
+        for feature, sketch in zip(self._features, sketches):
+            edges = np.unique(sketch.quantiles(np.linspace(0, 1, self._n_bins + 1)))
+            if len(edges) < self._n_bins + 1:
+                logger.warning(
+                    f"Feature {feature!r} has {max(len(edges) - 1, 1)} distinct quantile bins, "
+                    f"merging bins with equal edges."
+                )
+            self._transformer[feature] = edges
+
+        return data_schema, self._transformer
+
+    def _transform(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, vaex.DataFrame]:
+        """Transforms the features in the DataFrame using quantile binning.
+
+        The bins are assigned lazily by a `vaex` function using a vectorized binary search over the bin edges.
+
+        Args:
+            data_schema: The data schema of the DataFrame.
+            dataframe: The DataFrame to transform.
+
+        Returns:
+            Updated data schema and transformed DataFrame.
+        """
+        logger.info(f"Transforming features using quantile binning ({len(self._features)}): {self._features}.")
+        df = dataframe.copy()
+        for feature in self._features:
+            edges = self._transformer[feature]
+            function_name = f"quantile_bin_{hashlib.md5(edges.tobytes()).hexdigest()}"
+            df.add_function(function_name, functools.partial(_digitize, inner_edges=edges[1:-1]))
+            df[feature] = getattr(df.func, function_name)(get_column(df, feature))
+
+        return data_schema, df
+
+    def _fingerprint(self) -> Hashable:
+        """Returns the fingerprint of the transformer.
+
+        Appends the number of bins and the relative error to the fingerprint.
+
+        Returns:
+            A hashable object that uniquely identifies the transformer.
+        """
+        return super()._fingerprint(), self._n_bins, self._relative_error
+
+
+def _digitize(values: np.ndarray | pa.Array | pa.ChunkedArray, inner_edges: np.ndarray) -> pa.Array:
+    """Assigns each value the index of its bin.
+
+    Args:
+        values: The numerical values.
+        inner_edges: The bin edges, without the lowest and highest edge.
+
+    Returns:
+        The bin index of each value, null for missing and nan values.
+    """
+    values = np.asarray(pc.fill_null(pc.cast(vaex.array_types.to_arrow(values), pa.float64()), np.nan))
+    is_missing = np.isnan(values)
+    bins = np.searchsorted(inner_edges, values, side="right").astype(np.int64)
+    return pa.array(bins, mask=is_missing if is_missing.any() else None)
@@ -0,0 +1,484 @@
+"""Module for the target encoder transformer."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Hashable, Literal
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import vaex
+import vaex.array_types
+
+from mleko.dataset.data_schema import DataSchema
+from mleko.utils.custom_logger import CustomLogger
+from mleko.utils.decorators import auto_repr
+from mleko.utils.vaex_helpers import EVALUATION_CHUNK_SIZE, get_column, get_value_positions, is_dictionary_encoded
+
+from .base_transformer import BaseTransformer
+
+
+logger = CustomLogger()
+"""A module-level logger for the module."""
+
+MAX_PARTIAL_STATISTICS = 64
+"""Number of partial per-chunk statistics tables of a feature that are kept before they are combined."""
+
+
+@dataclass
+class TargetEncoding:
+    """Fitted target encoding of a single feature, stored as Arrow arrays.
+
+    Values are encoded by looking up their position in `labels` with the hash-based Arrow `index_in` kernel, see
+    `get_value_positions`, and taking the smoothed target mean at that position.
+    """
+
+    labels: pa.Array
+    """Unique non-null categories of the feature."""
+
+    encodings: pa.Array
+    """Smoothed target means of the categories, aligned with `labels`."""
+
+    null_encoding: float | None
+    """Smoothed target mean of the null values, or None if there were no null values during fitting."""
+
+    prior: float
+    """Mean of the target over all samples, used for unseen categories."""
+
+    fold_labels: pa.Array | None = None
+    """Unique non-null values of the fold column, if fitted with folds."""
+
+    out_of_fold_encodings: pa.Array | None = None
+    """Smoothed target means computed without the samples of each fold, if fitted with folds.
+
+    Flattened matrix with a row per label, followed by a row for the null values, and a column per fold.
+    """
+
+    def fingerprint(self) -> str:
+        """Computes a fingerprint of the target encoding from the Arrow buffers of its arrays.
+
+        Returns:
+            MD5 hex digest of the target encoding.
+        """
+        digest = hashlib.md5(f"{self.null_encoding}:{self.prior}".encode())
+        for array in (self.labels, self.encodings, self.fold_labels, self.out_of_fold_encodings):
+            for buffer in array.buffers() if array is not None else []:
+                if buffer is not None:
+                    digest.update(buffer)
+        return digest.hexdigest()
+
+    def encode(self, values: pa.Array | pa.ChunkedArray, unseen_value: float) -> np.ndarray:
+        """Encodes the values, intended to be registered as a `vaex` function that is applied chunk by chunk.
+
+        Args:
+            values: Plain or dictionary-encoded categorical values.
+            unseen_value: Encoding of the categories that were not seen during fitting.
+
+        Returns:
+            The encoded values.
+        """
+        values = vaex.array_types.to_arrow(values)
+        encoded = pc.take(self.encodings, get_value_positions(values, self.labels))
+        if self.null_encoding is not None:
+            encoded = pc.if_else(pc.is_null(values), pa.scalar(self.null_encoding, pa.float64()), encoded)
+        return np.array(pc.fill_null(encoded, pa.scalar(unseen_value, pa.float64())), dtype=np.float64)
+
+    def encode_out_of_fold(
+        self, values: pa.Array | pa.ChunkedArray, folds: pa.Array | pa.ChunkedArray, unseen_value: float
+    ) -> np.ndarray:
+        """Encodes the values with the statistics computed without the fold of each sample.
+
+        Samples with a null or unknown fold are encoded with the statistics of all samples, see `encode`.
+
+        Args:
+            values: Plain or dictionary-encoded categorical values.
+            folds: The fold of each value.
+            unseen_value: Encoding of the categories that were not seen during fitting.
+
+        Returns:
+            The encoded values.
+        """
+        values, folds = vaex.array_types.to_arrow(values), vaex.array_types.to_arrow(folds)
+        encoded = self.encode(values, unseen_value)
+        if self.fold_labels is None or self.out_of_fold_encodings is None:
+            return encoded
+
+        rows = np.asarray(pc.fill_null(get_value_positions(values, self.labels), -1))
+        rows = np.where(np.asarray(pc.is_null(values)), len(self.labels), rows)
+        fold_rows = np.asarray(pc.fill_null(get_value_positions(folds, self.fold_labels), -1))
+        mask = (rows >= 0) & (fold_rows >= 0)
+        out_of_fold_encodings = np.asarray(self.out_of_fold_encodings)
+        encoded[mask] = out_of_fold_encodings[rows[mask] * len(self.fold_labels) + fold_rows[mask]]
+        return encoded
+
+
+class TargetEncoderTransformer(BaseTransformer):
+    """Transforms features using smoothed target encoding."""
+
+    @auto_repr
+    def __init__(
+        self,
+        features: list[str] | tuple[str, ...],
+        target: str,
+        smoothing: float = 10.0,
+        fold_column: str | None = None,
+        unseen_strategy: Literal["prior", "nan"] = "prior",
+        cache_directory: str | Path = "data/target-encoder-transformer",
+        cache_size: int = 1,
+    ) -> None:
+        """Initializes the transformer.
+
+        Each category is encoded by the mean of the target over its samples, smoothed towards the mean of the target
+        over all samples (the prior) as `(sum + smoothing * prior) / (count + smoothing)`, so that rare categories
+        are encoded close to the prior. Null values are treated as a category of their own, and categories that are
+        not seen during fitting are encoded as the prior or nan, depending on the `unseen_strategy` parameter.
+
+        The per-category sums and counts of the target are aggregated for all features in a single pass over the
+        DataFrame, chunk by chunk with the hash-based Arrow `group_by` kernel, so the memory used only depends on the
+        number of categories. The mappings are stored as Arrow arrays and applied lazily with a hash lookup, so the
+        transformation also works on DataFrames that do not fit in memory.
+
+        If a `fold_column` is given, `fit_transform` encodes each sample using the statistics of all other folds
+        (out-of-fold encoding), which prevents the target of a sample from leaking into its own encoding. The
+        `transform` method always uses the statistics of all samples.
+
+        Warning:
+            Should only be used with categorical features. Without a `fold_column`, the training data is encoded
+            using its own target, which can lead to overfitting on high cardinality features.
+
+        Args:
+            features: List of feature names to be used by the transformer.
+            target: Name of the numerical or boolean target column.
+            smoothing: Weight of the prior in the encoding of each category, in number of samples.
+            fold_column: Optional name of the column assigning each sample to a fold for out-of-fold encoding.
+            unseen_strategy: Strategy to use for unseen values once the transformer is fitted.
+            cache_directory: Directory where the cache will be stored locally.
+            cache_size: The maximum number of entries to keep in the cache.
+
+        Raises:
+            ValueError: If the smoothing is negative or the target is one of the features.
+
+        Examples:
+            >>> import vaex
+            >>> from mleko.dataset.data_schema import DataSchema
+            >>> from mleko.dataset.transform import TargetEncoderTransformer
+            >>> df = vaex.from_arrays(
+            ...     a=["x", "x", "x", "y", "y", None],
+            ...     target=[1, 1, 0, 0, 0, 1],
+            ... )
+            >>> ds = DataSchema(categorical=["a"], numerical=["target"])
+            >>> _, _, df = TargetEncoderTransformer(
+            ...     features=["a"],
+            ...     target="target",
+            ...     smoothing=1.0,
+            ... ).fit_transform(ds, df)
+            >>> [round(value, 3) for value in df["a"].tolist()]
+            [0.625, 0.625, 0.625, 0.167, 0.167, 0.75]
+        """
+        super().__init__(features, cache_directory, cache_size)
+        if smoothing < 0:
+            msg = f"Smoothing must be non-negative, got {smoothing}."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        if target in self._features or (fold_column is not None and fold_column in self._features):
+            msg = f"Target {target!r} and fold column {fold_column!r} cannot be encoded features."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        self._target = target
+        self._smoothing = smoothing
+        self._fold_column = fold_column
+        self._unseen_strategy = unseen_strategy
+        self._transformer: dict[str, TargetEncoding] = {}
+
+    def _fit(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, dict[str, TargetEncoding]]:
+        """Fits the transformer on the input data.
+
+        Args:
+            data_schema: The DataSchema of the DataFrame.
+            dataframe: The DataFrame to fit the transformer on.
+
+        Raises:
+            ValueError: If the target is not numerical or boolean, or has no non-null values.
+
+        Returns:
+            Updated DataSchema and the fitted transformer.
+        """
+        logger.info(f"Fitting target encoder transformer ({len(self._features)}): {self._features}.")
+        target_dtype = get_column(dataframe, self._target).dtype
+        if is_dictionary_encoded(dataframe, self._target) or not (target_dtype.is_numeric or target_dtype.kind == "b"):
+            msg = f"Target {self._target!r} must be numerical or boolean, got dtype {target_dtype}."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        statistics = self._aggregate_target_statistics(dataframe)
+        sums = np.asarray(statistics[self._features[0]]["sum"]) if len(self._features) > 0 else np.zeros(0)
+        counts = np.asarray(statistics[self._features[0]]["count"]) if len(self._features) > 0 else np.zeros(0)
+        if len(self._features) > 0 and counts.sum() == 0:
+            msg = f"Target {self._target!r} has no non-null values to compute the target encoding from."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        prior = float(sums.sum() / counts.sum()) if counts.sum() > 0 else np.nan
+        fold_labels, fold_priors = None, None
+        if self._fold_column is not None and len(self._features) > 0:
+            fold_labels, fold_priors = self._get_fold_priors(statistics[self._features[0]], prior)
+
+        self._transformer = {
+            feature: self._build_encoding(statistics[feature], prior, fold_labels, fold_priors)
+            for feature in self._features
+        }
+        return self._get_data_schema(data_schema), self._transformer
+
+    def _transform(self, data_schema: DataSchema, dataframe: vaex.DataFrame) -> tuple[DataSchema, vaex.DataFrame]:
+        """Transforms the features in the DataFrame using target encoding.
+
+        Args:
+            data_schema: The DataSchema of the DataFrame.
+            dataframe: The DataFrame to transform.
+
+        Returns:
+            Updated DataSchema and the transformed DataFrame.
+        """
+        logger.info(f"Transforming features using target encoding ({len(self._features)}): {self._features}.")
+        return self._get_data_schema(data_schema), self._encode(dataframe, out_of_fold=False)
+
+    def _fit_transform(
+        self, data_schema: DataSchema, dataframe: vaex.DataFrame
+    ) -> tuple[DataSchema, dict[str, TargetEncoding], vaex.DataFrame]:
+        """Fits the transformer and transforms the features, out-of-fold if a `fold_column` is given.
+
+        Args:
+            data_schema: The DataSchema of the DataFrame.
+            dataframe: The DataFrame used for fitting and transformation.
+
+        Returns:
+            Updated DataSchema, the fitted transformer and the transformed DataFrame.
+        """
+        ds, transformer = self._fit(data_schema, dataframe)
+        logger.info(
+            f"Transforming features using {'out-of-fold ' if self._fold_column is not None else ''}target encoding "
+            f"({len(self._features)}): {self._features}."
+        )
+        return ds, transformer, self._encode(dataframe, out_of_fold=self._fold_column is not None)
+
+    def _encode(self, dataframe: vaex.DataFrame, out_of_fold: bool) -> vaex.DataFrame:
+        """Encodes the features lazily using `vaex` functions applying the fitted encodings chunk by chunk.
+
+        Args:
+            dataframe: The DataFrame to transform.
+            out_of_fold: Whether to encode each sample without the statistics of its own fold.
+
+        Returns:
+            The transformed DataFrame.
+        """
+        df = dataframe.copy()
+        for feature in self._features:
+            target_encoding = self._transformer[feature]
+            unseen_value = target_encoding.prior if self._unseen_strategy == "prior" else np.nan
+            function_name = f"target_encode_{target_encoding.fingerprint()}_{self._unseen_strategy}"
+            if out_of_fold:
+                function_name = f"{function_name}_out_of_fold"
+                df.add_function(
+                    function_name,
+                    functools.partial(target_encoding.encode_out_of_fold, unseen_value=unseen_value),
+                )
+                df[feature] = getattr(df.func, function_name)(
+                    get_column(df, feature), get_column(df, str(self._fold_column))
+                )
+            else:
+                df.add_function(function_name, functools.partial(target_encoding.encode, unseen_value=unseen_value))
+                df[feature] = getattr(df.func, function_name)(get_column(df, feature))
+
+        return df
+
+    def _aggregate_target_statistics(self, dataframe: vaex.DataFrame) -> dict[str, pa.Table]:
+        """Aggregates the sum and count of the target per category of every feature in a single pass.
+
+        All features are evaluated chunk by chunk by a shared iterator, and each chunk is grouped with the Arrow
+        `group_by` kernel. The partial statistics of the chunks are combined regularly, so that the memory used only
+        depends on the number of categories.
+
+        Args:
+            dataframe: The DataFrame to aggregate the statistics of.
+
+        Returns:
+            For each feature, a table with the `category`, the `fold` if a `fold_column` is given, and the `sum` and
+            `count` of the non-null target values.
+        """
+        keys = ["category"] if self._fold_column is None else ["category", "fold"]
+        expressions = [get_column(dataframe, column).expression for column in self._features + (self._target,)]
+        if self._fold_column is not None:
+            expressions.append(get_column(dataframe, self._fold_column).expression)
+
+        partial_statistics: dict[str, list[pa.Table]] = {feature: [] for feature in self._features}
+        if len(self._features) > 0 and len(dataframe) > 0:
+            for _, _, chunks in dataframe.evaluate_iterator(
+                expressions, chunk_size=EVALUATION_CHUNK_SIZE, array_type="arrow"
+            ):
+                target = pc.cast(chunks[len(self._features)], pa.float64())
+                is_valid = pc.and_(pc.is_valid(target), pc.invert(pc.is_nan(target)))
+                columns = {
+                    "sum": pc.if_else(is_valid, target, pa.scalar(0.0)),
+                    "count": pc.cast(is_valid, pa.int64()),
+                }
+                if self._fold_column is not None:
+                    columns["fold"] = chunks[-1]
+
+                for feature, values in zip(self._features, chunks):
+                    if pa.types.is_dictionary(values.type):
+                        values = pc.cast(values, values.type.value_type)
+                    feature_statistics = partial_statistics[feature]
+                    feature_statistics.append(_group_statistics(pa.table({"category": values, **columns}), keys))
+                    if len(feature_statistics) >= MAX_PARTIAL_STATISTICS:
+                        partial_statistics[feature] = [_group_statistics(pa.concat_tables(feature_statistics), keys)]
+
+        return {
+            feature: _group_statistics(pa.concat_tables(tables), keys) if len(tables) > 0 else _empty_statistics(keys)
+            for feature, tables in partial_statistics.items()
+        }
+
+    def _get_fold_priors(self, statistics: pa.Table, prior: float) -> tuple[pa.Array, np.ndarray]:
+        """Computes the mean of the target over all samples outside of each fold.
+
+        Args:
+            statistics: The statistics of any feature, grouped by category and fold.
+            prior: The mean of the target over all samples.
+
+        Returns:
+            The unique non-null folds and the out-of-fold prior of each fold.
+        """
+        fold_labels = pc.unique(pc.drop_null(statistics["fold"])).sort()
+        fold_rows = np.asarray(pc.fill_null(get_value_positions(statistics["fold"], fold_labels), -1))
+        mask = fold_rows >= 0
+        fold_sums = np.bincount(fold_rows[mask], np.asarray(statistics["sum"])[mask], minlength=len(fold_labels))
+        fold_counts = np.bincount(fold_rows[mask], np.asarray(statistics["count"])[mask], minlength=len(fold_labels))
+        total_sum, total_count = np.asarray(statistics["sum"]).sum(), np.asarray(statistics["count"]).sum()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fold_priors = np.where(
+                total_count > fold_counts, (total_sum - fold_sums) / (total_count - fold_counts), prior
+            )
+        return fold_labels, fold_priors
+
+    def _build_encoding(
+        self,
+        statistics: pa.Table,
+        prior: float,
+        fold_labels: pa.Array | None,
+        fold_priors: np.ndarray | None,
+    ) -> TargetEncoding:
+        """Builds the target encoding of a feature from its aggregated statistics.
+
+        Args:
+            statistics: The statistics of the feature, see `_aggregate_target_statistics`.
+            prior: The mean of the target over all samples.
+            fold_labels: The unique non-null folds, if a `fold_column` is given.
+            fold_priors: The out-of-fold prior of each fold, if a `fold_column` is given.
+
+        Returns:
+            The target encoding of the feature.
+        """
+        categories = statistics["category"]
+        labels = pc.unique(pc.drop_null(categories))
+        rows = np.asarray(pc.fill_null(get_value_positions(categories, labels), len(labels)))
+        sums, counts = np.asarray(statistics["sum"]), np.asarray(statistics["count"])
+        total_sums = np.bincount(rows, sums, minlength=len(labels) + 1)
+        total_counts = np.bincount(rows, counts, minlength=len(labels) + 1)
+        encodings = self._smooth(total_sums, total_counts, prior)
+        target_encoding = TargetEncoding(
+            labels=labels,
+            encodings=pa.array(encodings[: len(labels)], pa.float64()),
+            null_encoding=float(encodings[-1]) if categories.null_count > 0 else None,
+            prior=prior,
+        )
+
+        if fold_labels is not None and fold_priors is not None:
+            fold_rows = np.asarray(pc.fill_null(get_value_positions(statistics["fold"], fold_labels), -1))
+            mask = fold_rows >= 0
+            fold_sums = np.zeros((len(labels) + 1, len(fold_labels)))
+            fold_counts = np.zeros((len(labels) + 1, len(fold_labels)))
+            np.add.at(fold_sums, (rows[mask], fold_rows[mask]), sums[mask])
+            np.add.at(fold_counts, (rows[mask], fold_rows[mask]), counts[mask])
+            out_of_fold_encodings = self._smooth(
+                total_sums[:, np.newaxis] - fold_sums, total_counts[:, np.newaxis] - fold_counts, fold_priors
+            )
+            target_encoding.fold_labels = fold_labels
+            target_encoding.out_of_fold_encodings = pa.array(out_of_fold_encodings.ravel(), pa.float64())
+
+        return target_encoding
+
+    def _smooth(self, sums: np.ndarray, counts: np.ndarray, prior: float | np.ndarray) -> np.ndarray:
+        """Computes the smoothed target means, falling back to the prior for categories without samples.
+
+        Args:
+            sums: The sums of the target per category.
+            counts: The counts of the non-null target values per category.
+            prior: The mean of the target the categories are smoothed towards.
+
+        Returns:
+            The smoothed target means.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            encodings = (sums + self._smoothing * prior) / (counts + self._smoothing)
+        return np.where(counts + self._smoothing > 0, encodings, prior)
+
+    def _get_data_schema(self, data_schema: DataSchema) -> DataSchema:
+        """Returns the DataSchema with the encoded features changed to numerical.
+
+        Args:
+            data_schema: The DataSchema of the DataFrame.
+
+        Returns:
+            The updated DataSchema.
+        """
+        ds = data_schema.copy()
+        for feature in self._features:
+            ds = ds.change_feature_type(feature, "numerical")
+        return ds
+
+    def _fingerprint(self) -> Hashable:
+        """Returns the fingerprint of the transformer.
+
+        Append the target, smoothing, fold column and `unseen_strategy` to the fingerprint.
+
+        Returns:
+            A hashable object that uniquely identifies the transformer.
+        """
+        return super()._fingerprint(), self._target, self._smoothing, self._fold_column, self._unseen_strategy
+
+
+def _group_statistics(table: pa.Table, keys: list[str]) -> pa.Table:
+    """Sums the `sum` and `count` columns of a statistics table per group of the keys.
+
+    Args:
+        table: The table with the keys and the `sum` and `count` columns.
+        keys: The columns to group by.
+
+    Returns:
+        The table with a row per group.
+    """
+    grouped = table.group_by(keys).aggregate([("sum", "sum"), ("count", "sum")])
+    return pa.table({**{key: grouped[key] for key in keys}, "sum": grouped["sum_sum"], "count": grouped["count_sum"]})
+
+
+def _empty_statistics(keys: list[str]) -> pa.Table:
+    """Creates an empty statistics table.
+
+    Args:
+        keys: The key columns of the table.
+
+    Returns:
+        The empty table with the keys and the `sum` and `count` columns.
+    """
+    return pa.table(
+        {
+            **{key: pa.array([], pa.string()) for key in keys},
+            "sum": pa.array([], pa.float64()),
+            "count": pa.array([], pa.int64()),
+        }
+    )
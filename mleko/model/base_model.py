@@ -15,7 +15,7 @@ from mleko.cache.handlers import JOBLIB_CACHE_HANDLER, VAEX_DATAFRAME_CACHE_HAND
 from mleko.cache.lru_cache_mixin import LRUCacheMixin
 from mleko.dataset.data_schema import DataSchema
 from mleko.utils.custom_logger import CustomLogger
-from mleko.utils.vaex_helpers import HashableVaexDataFrame, get_columns
+from mleko.utils.vaex_helpers import HashableVaexDataFrame, get_column, get_columns, is_dictionary_encoded
 
 
 logger = CustomLogger()
@@ -352,9 +352,16 @@ class BaseModel(LRUCacheMixin, ABC):
         Returns:
             A pandas DataFrame with the loaded data.
         """
-        feature_names = self._feature_set(data_schema)
-        df = get_columns(dataframe, feature_names + (additional_features if additional_features else [])).to_pandas_df()
-        return df  # type: ignore
+        feature_names = self._feature_set(data_schema) + (additional_features if additional_features else [])
+        dictionary_encoded_features = [
+            feature for feature in feature_names if is_dictionary_encoded(dataframe, feature)
+        ]
+        df = get_columns(
+            dataframe, [feature for feature in feature_names if feature not in dictionary_encoded_features]
+        ).to_pandas_df()
+        for feature in dictionary_encoded_features:
+            df[feature] = get_column(dataframe, feature).to_arrow().to_pandas()
+        return df[feature_names]  # type: ignore
 
     def _memoized_load_dataset(
         self,
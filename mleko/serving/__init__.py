@@ -0,0 +1,37 @@
+"""The subpackage provides functionality for applying fitted transformers to single records or small batches.
+
+The scorers are exported by fitted transformers using `BaseTransformer.get_scorer`. The subpackage only depends on
+`numpy` and `pyarrow`, so scorers can be unpickled in a serving process without importing `vaex`.
+
+The following scorers are provided by the subpackage:
+    - `BaseScorer`: The abstract base class for all scorers.
+    - `CompositeScorer`: A scorer applying the scorers of the transformers of a `CompositeTransformer` in order.
+    - `ExpressionScorer`: A scorer evaluating the expressions of an `ExpressionTransformer`.
+    - `FrequencyEncoderScorer`: A scorer of a `FrequencyEncoderTransformer`.
+    - `LabelEncoderScorer`: A scorer of a `LabelEncoderTransformer`.
+    - `MaxAbsScalerScorer`: A scorer of a `MaxAbsScalerTransformer`.
+    - `MinMaxScalerScorer`: A scorer of a `MinMaxScalerTransformer`.
+"""
+
+from __future__ import annotations
+
+from .scorer import (
+    BaseScorer,
+    CompositeScorer,
+    ExpressionScorer,
+    FrequencyEncoderScorer,
+    LabelEncoderScorer,
+    MaxAbsScalerScorer,
+    MinMaxScalerScorer,
+)
+
+
+__all__ = [
+    "BaseScorer",
+    "CompositeScorer",
+    "ExpressionScorer",
+    "FrequencyEncoderScorer",
+    "LabelEncoderScorer",
+    "MaxAbsScalerScorer",
+    "MinMaxScalerScorer",
+]
@@ -0,0 +1,331 @@
+"""Module for the scorers applying fitted transformers to single records or small batches without `vaex`.
+
+Transforming a handful of rows with `vaex` pays a fixed overhead of milliseconds for creating the DataFrame,
+building the expression graph and evaluating it, which dominates the latency of online scoring. The scorers in this
+module are exported by fitted transformers using `BaseTransformer.get_scorer`. They only hold the fitted parameters
+as plain Python and `numpy` objects and apply them with `numpy` operations, so a record is transformed in
+microseconds. Each scorer applies the same operations in the same order as the `vaex` transformation, so the output is
+identical to the output of `transform`.
+
+The module lives outside of `mleko.dataset` and only imports `numpy` and `pyarrow`, so unpickling a scorer in a serving
+process does not import the transformers, `vaex` or `vaex.ml`. Only the `ExpressionScorer` imports `vaex`, when it is
+first used, for the functions expressions can call.
+"""
+
+from __future__ import annotations
+
+import functools
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from types import CodeType
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pyarrow as pa
+
+
+if TYPE_CHECKING:
+    from mleko.utils.custom_logger import CustomLogger
+
+
+class BaseScorer(ABC):
+    """Abstract class for scorers applying a fitted transformer to a single record or a small batch of records.
+
+    A record is a dictionary mapping column names to scalar values, a batch is a dictionary mapping column names to
+    equally long lists or 1-dimensional `numpy` arrays. Missing values are given as None, or as masked values of
+    `numpy` masked arrays. The scorer returns a new dictionary with the transformed and created columns replaced or
+    added, and all other columns passed through. Records are returned as records with scalar values and batches as
+    batches of `numpy` arrays, masked if any value is missing.
+
+    Scorers do not depend on `vaex` DataFrames, and can be pickled and shipped to a serving process on their own.
+    """
+
+    def __call__(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Transforms a record or a batch of records.
+
+        Args:
+            data: A record or a batch of records.
+
+        Returns:
+            The transformed record or batch of records.
+        """
+        is_record = all(np.ndim(values) == 0 for values in data.values())
+        scored = self.score_batch({column: to_array(values) for column, values in data.items()})
+        if is_record:
+            return {column: to_scalar(values) for column, values in scored.items()}
+        return scored
+
+    @abstractmethod
+    def score_batch(self, batch: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Transforms a batch of records given as `numpy` arrays.
+
+        Args:
+            batch: Mapping of column names to 1-dimensional `numpy` arrays, masked arrays for missing values.
+
+        Raises:
+            NotImplementedError: Must be implemented by subclasses.
+        """
+        raise NotImplementedError
+
+
+@dataclass
+class CompositeScorer(BaseScorer):
+    """Scorer applying the scorers of the transformers of a `CompositeTransformer` in order."""
+
+    scorers: list[BaseScorer]
+    """The scorers to apply, in the order of the transformers."""
+
+    def score_batch(self, batch: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Transforms a batch of records by applying all scorers in order.
+
+        Args:
+            batch: Mapping of column names to 1-dimensional `numpy` arrays.
+
+        Returns:
+            The transformed batch.
+        """
+        for scorer in self.scorers:
+            batch = scorer.score_batch(batch)
+        return batch
+
+
+@dataclass
+class ExpressionScorer(BaseScorer):
+    """Scorer evaluating the expressions of an `ExpressionTransformer` with `numpy`.
+
+    The expressions are byte-compiled once and evaluated in the same namespace of functions `vaex` uses to evaluate
+    expressions chunk by chunk, with the columns wrapped the same way, string columns being passed as Arrow arrays.
+    Expressions are evaluated in order, so an expression can use the columns created by the previous ones. `vaex` is
+    imported on the first call, so it is only required by processes scoring expressions.
+    """
+
+    expressions: dict[str, str]
+    """Mapping of the names of the new columns to their `vaex` expressions."""
+
+    def score_batch(self, batch: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Transforms a batch of records by evaluating the expressions.
+
+        Args:
+            batch: Mapping of column names to 1-dimensional `numpy` arrays.
+
+        Returns:
+            The batch with the new columns added.
+        """
+        from vaex.arrow.numpy_dispatch import unwrap, wrap
+        from vaex.expression import expression_namespace
+
+        batch = dict(batch)
+        for column, expression in self.expressions.items():
+            code = _compile_expression(expression)
+            scope = {
+                name: wrap(pa.array(batch[name].tolist()) if batch[name].dtype.kind in "OSU" else batch[name])
+                for name in code.co_names
+                if name in batch
+            }
+            # The expressions are part of the fitted transformer, evaluated in the `vaex` namespace like `vaex` does.
+            result = unwrap(eval(code, expression_namespace, scope))  # noqa: S307
+            if isinstance(result, (pa.Array, pa.ChunkedArray)):
+                result = to_array(result.to_pylist())
+            batch[column] = result
+        return batch
+
+
+@dataclass
+class FrequencyEncoderScorer(BaseScorer):
+    """Scorer of a `FrequencyEncoderTransformer`, looking up the fitted frequencies in dictionaries."""
+
+    mappings: dict[str, dict[Any, float]]
+    """Mapping of each feature to the frequencies of its values."""
+
+    unseen_value: float
+    """Frequency of the values not seen during fitting."""
+
+    nan_frequencies: dict[str, float]
+    """Mapping of the features with NaN values during fitting to the frequency of NaN, which cannot be looked up in
+    the mappings since NaN is not equal to itself."""
+
+    def score_batch(self, batch: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Transforms a batch of records by encoding the values with their frequencies, nan for missing values.
+
+        Args:
+            batch: Mapping of column names to 1-dimensional `numpy` arrays.
+
+        Returns:
+            The transformed batch.
+        """
+        batch = dict(batch)
+        for feature, mapping in self.mappings.items():
+            nan_frequency = self.nan_frequencies.get(feature, self.unseen_value)
+            batch[feature] = np.array(
+                [
+                    (
+                        np.nan
+                        if value is None
+                        else nan_frequency if value != value else mapping.get(value, self.unseen_value)
+                    )
+                    for value in batch[feature].tolist()
+                ],
+                dtype=np.float64,
+            )
+        return batch
+
+
+@dataclass
+class LabelEncoderScorer(BaseScorer):
+    """Scorer of a `LabelEncoderTransformer`, looking up the fitted codes in dictionaries."""
+
+    mappings: dict[str, dict[str | None, int | None]]
+    """Mapping of each feature to the codes of its labels, including the code of null values under None."""
+
+    unseen_code: int | None
+    """Code of the labels not seen during fitting, or None to raise an error for unseen labels."""
+
+    def score_batch(self, batch: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Transforms a batch of records by encoding the labels with their codes.
+
+        Args:
+            batch: Mapping of column names to 1-dimensional `numpy` arrays.
+
+        Raises:
+            ValueError: If a feature contains unseen labels and unseen labels are not allowed.
+
+        Returns:
+            The transformed batch.
+        """
+        batch = dict(batch)
+        for feature, mapping in self.mappings.items():
+            labels = batch[feature].tolist()
+            if self.unseen_code is None and any(label not in mapping for label in labels):
+                msg = (
+                    f"Unseen values encountered during transformation for feature {feature!r}. "
+                    "Set `allow_unseen` to True to convert unseen values to -1 instead of raising an error."
+                )
+                _get_logger().error(msg)
+                raise ValueError(msg)
+            batch[feature] = from_list([mapping.get(label, self.unseen_code) for label in labels], np.int64)
+        return batch
+
+
+@dataclass
+class MaxAbsScalerScorer(BaseScorer):
+    """Scorer of a `MaxAbsScalerTransformer`, dividing the features by their fitted maximum absolute values."""
+
+    maximums: dict[str, float]
+    """Mapping of each feature to its maximum absolute value."""
+
+    def score_batch(self, batch: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Transforms a batch of records by scaling the features.
+
+        Args:
+            batch: Mapping of column names to 1-dimensional `numpy` arrays.
+
+        Returns:
+            The transformed batch.
+        """
+        batch = dict(batch)
+        for feature, maximum in self.maximums.items():
+            batch[feature] = batch[feature] / maximum
+        return batch
+
+
+@dataclass
+class MinMaxScalerScorer(BaseScorer):
+    """Scorer of a `MinMaxScalerTransformer`, scaling the features from their fitted range to the target range."""
+
+    minimums: dict[str, float]
+    """Mapping of each feature to its minimum value."""
+
+    maximums: dict[str, float]
+    """Mapping of each feature to its maximum value."""
+
+    feature_range: tuple[float, float]
+    """The target range of the scaled features."""
+
+    def score_batch(self, batch: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Transforms a batch of records by scaling the features.
+
+        The operations are applied in the order of the `vaex.ml.MinMaxScaler` expression.
+
+        Args:
+            batch: Mapping of column names to 1-dimensional `numpy` arrays.
+
+        Returns:
+            The transformed batch.
+        """
+        batch = dict(batch)
+        a, b = self.feature_range
+        for feature, minimum in self.minimums.items():
+            batch[feature] = (b - a) * (batch[feature] - minimum) / (self.maximums[feature] - minimum) + a
+        return batch
+
+
+def to_array(values: Any) -> np.ndarray:
+    """Converts a scalar or a sequence of values to a 1-dimensional `numpy` array, masked if any value is None.
+
+    Args:
+        values: A scalar, a sequence of values or a `numpy` array, which is returned as is.
+
+    Returns:
+        The values as a `numpy` array.
+    """
+    if isinstance(values, np.ndarray):
+        return values.reshape(1) if values.ndim == 0 else values
+    values = [values] if np.ndim(values) == 0 else list(values)
+    mask = [value is None for value in values]
+    if not any(mask):
+        return np.asarray(values)
+    fill_value = next((value for value in values if value is not None), 0)
+    return np.ma.array([fill_value if is_missing else value for value, is_missing in zip(values, mask)], mask=mask)
+
+
+def from_list(values: list[Any], dtype: np.dtype | type) -> np.ndarray:
+    """Converts a list of Python values to a `numpy` array, masked if any value is None.
+
+    Args:
+        values: The values to convert.
+        dtype: The data type of the array.
+
+    Returns:
+        The values as a `numpy` array.
+    """
+    mask = [value is None for value in values]
+    if not any(mask):
+        return np.array(values, dtype=dtype)
+    return np.ma.array([0 if is_missing else value for value, is_missing in zip(values, mask)], mask=mask, dtype=dtype)
+
+
+def to_scalar(values: np.ndarray) -> Any:
+    """Converts the first value of a `numpy` array to a Python scalar, None if the value is masked.
+
+    Args:
+        values: The array to convert.
+
+    Returns:
+        The first value as a Python scalar.
+    """
+    return to_array(values)[:1].tolist()[0]
+
+
+@functools.lru_cache(maxsize=None)
+def _get_logger() -> CustomLogger:
+    """Gets the logger of the module, created on first use since importing `mleko.utils` imports `vaex`.
+
+    Returns:
+        The logger of the module.
+    """
+    from mleko.utils.custom_logger import CustomLogger
+
+    return CustomLogger()
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_expression(expression: str) -> CodeType:
+    """Byte-compiles an expression, caching the code object since code objects cannot be pickled with the scorer.
+
+    Args:
+        expression: The expression to compile.
+
+    Returns:
+        The compiled expression.
+    """
+    return compile(expression, "<expression>", "eval")
@@ -1,17 +1,41 @@
 """Subpackage with utility functions and classes.
 
 This subpackage contains utility functions and classes that are used throughout the project. These include a custom
-logger, decorators, and helper functions for working with `vaex` DataFrames and `tqdm` progress bars.
+logger, decorators, and helper functions for working with `vaex` DataFrames, approximate quantiles and `tqdm`
+progress bars.
 """
 
 from __future__ import annotations
 
+from .compression_helpers import (
+    extract_zip_member,
+    get_zip_members,
+    is_zip_file,
+    open_compressed_file,
+    read_compressed_file,
+)
 from .custom_logger import CustomLogger
 from .decorators import auto_repr, timing
 from .file_helpers import LocalFileEntry, LocalManifest, LocalManifestHandler, clear_directory
+from .http_helpers import create_http_session, download_http_file, download_http_file_segments
+from .quantile_helpers import QuantileSketch, get_quantile_sketches
 from .s3_helpers import S3Client, S3FileManifest
 from .tqdm_helpers import set_tqdm_percent_wrapper
-from .vaex_helpers import get_column, get_columns, get_filtered_df, get_indices
+from .vaex_helpers import (
+    get_column,
+    get_columns,
+    get_dictionary_codes,
+    get_dictionary_labels,
+    get_expression_depth,
+    get_filtered_df,
+    get_indices,
+    get_unique_values,
+    get_value_positions,
+    is_dictionary_encoded,
+    jit_expression,
+    map_dictionary_encoded,
+    materialize_columns,
+)
 
 
 __all__ = [
@@ -19,14 +43,33 @@ __all__ = [
     "auto_repr",
     "timing",
     "clear_directory",
+    "open_compressed_file",
+    "read_compressed_file",
+    "is_zip_file",
+    "get_zip_members",
+    "extract_zip_member",
     "LocalFileEntry",
     "LocalManifest",
     "LocalManifestHandler",
+    "create_http_session",
+    "download_http_file",
+    "download_http_file_segments",
     "set_tqdm_percent_wrapper",
     "get_column",
     "get_columns",
     "get_filtered_df",
     "get_indices",
+    "is_dictionary_encoded",
+    "get_dictionary_codes",
+    "get_dictionary_labels",
+    "map_dictionary_encoded",
+    "get_unique_values",
+    "get_value_positions",
+    "get_expression_depth",
+    "materialize_columns",
+    "jit_expression",
+    "QuantileSketch",
+    "get_quantile_sketches",
     "S3Client",
     "S3FileManifest",
 ]
@@ -0,0 +1,429 @@
+"""This module provides helper functions for reading compressed files, including parallel decompression."""
+
+from __future__ import annotations
+
+import bz2
+import collections
+import gzip
+import io
+import lzma
+import os
+import shutil
+import struct
+import zipfile
+from concurrent import futures
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import pyarrow as pa
+
+from .custom_logger import CustomLogger
+
+
+logger = CustomLogger()
+"""A module-level custom logger."""
+
+COMPRESSED_FILE_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+"""A module-level constant representing the suffixes of the supported compressed file formats."""
+
+PARALLEL_DECOMPRESSION_SPAN_SIZE = 4 * 1024**2
+"""A module-level constant representing the maximum size in compressed bytes of the spans of a file that are
+decompressed in parallel, which bounds the memory held by spans decompressed ahead of the reader."""
+
+ZIP_EXTRACT_BLOCK_SIZE = 1024**2
+"""A module-level constant representing the block size in bytes used when streaming zip members to disk."""
+
+ZSTD_FRAME_MAGIC = 0xFD2FB528
+"""A module-level constant representing the magic number of a Zstandard frame."""
+
+ZSTD_SKIPPABLE_FRAME_MAGIC_RANGE = range(0x184D2A50, 0x184D2A60)
+"""A module-level constant representing the range of magic numbers of Zstandard skippable frames."""
+
+
+def open_compressed_file(file_path: str | Path) -> BinaryIO:
+    """Opens a raw or compressed file for sequential reading of the decompressed bytes.
+
+    The compression format is determined by the file suffix, see `COMPRESSED_FILE_SUFFIXES`. Files with any other
+    suffix are opened as raw files.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        A binary file object yielding the decompressed contents of the file.
+
+    Examples:
+        >>> with open_compressed_file("data.csv.zst") as file:
+        ...     header = file.readline()
+    """
+    file_path = Path(file_path)
+    if file_path.suffix == ".gz":
+        return gzip.open(file_path, "rb")  # type: ignore
+    if file_path.suffix == ".bz2":
+        return bz2.open(file_path, "rb")  # type: ignore
+    if file_path.suffix == ".xz":
+        return lzma.open(file_path, "rb")  # type: ignore
+    if file_path.suffix == ".zst":
+        return io.BufferedReader(pa.input_stream(str(file_path), compression="zstd"))  # type: ignore
+    return open(file_path, "rb")
+
+
+def open_compressed_stream(stream: BinaryIO, file_name: str | Path) -> BinaryIO:
+    """Wraps a raw binary stream for sequential reading of the decompressed bytes.
+
+    The compression format is determined by the suffix of `file_name`, in the same way as in `open_compressed_file`,
+    so remote objects support exactly the same formats as local files. Streams of files with any other suffix are
+    returned unchanged. Closing the returned stream also closes the wrapped stream.
+
+    Args:
+        stream: The raw binary stream, e.g. an S3 object opened without automatic decompression.
+        file_name: Name or path of the file the stream reads from.
+
+    Returns:
+        A binary file object yielding the decompressed contents of the stream.
+
+    Examples:
+        >>> raw_stream = filesystem.open_input_stream("mleko-datasets/data.csv.xz", compression=None)
+        >>> with open_compressed_stream(raw_stream, "data.csv.xz") as file:
+        ...     header = file.readline()
+    """
+    suffix = Path(file_name).suffix
+    if suffix == ".gz":
+        decompressed_stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    elif suffix == ".bz2":
+        decompressed_stream = bz2.BZ2File(stream, "rb")
+    elif suffix == ".xz":
+        decompressed_stream = lzma.LZMAFile(stream, "rb")
+    elif suffix == ".zst":
+        decompressed_stream = pa.input_stream(stream, compression="zstd")
+    else:
+        return stream
+    return _DecompressedStream(decompressed_stream, stream)  # type: ignore
+
+
+class _DecompressedStream(io.BufferedReader):
+    """A buffered decompressing reader that closes the underlying raw stream when it is closed."""
+
+    def __init__(self, decompressed_stream: Any, raw_stream: BinaryIO) -> None:
+        """Initializes the reader.
+
+        Args:
+            decompressed_stream: The stream yielding the decompressed bytes.
+            raw_stream: The raw stream read by `decompressed_stream`.
+        """
+        super().__init__(decompressed_stream)
+        self._raw_stream = raw_stream
+
+    def close(self) -> None:
+        """Closes the decompressing reader and the underlying raw stream."""
+        try:
+            super().close()
+        finally:
+            self._raw_stream.close()
+
+
+def get_bgzf_block_offsets(file_path: str | Path) -> list[int] | None:
+    """Returns the offsets of the blocks of a BGZF file, a gzip file made of independent gzip members.
+
+    Each BGZF block is a gzip member whose header contains a `BC` extra subfield with the size of the block, which
+    allows the blocks to be located without decompressing them. Files compressed with `bgzip` have this layout.
+
+    Args:
+        file_path: Path to the gzip file.
+
+    Returns:
+        The offsets of all blocks followed by the file size, or None if the file is not BGZF-compressed.
+    """
+    file_size = Path(file_path).stat().st_size
+    offsets: list[int] = []
+    with open(file_path, "rb") as file:
+        offset = 0
+        while offset < file_size:
+            file.seek(offset)
+            header = file.read(12)
+            if len(header) < 12 or header[:3] != b"\x1f\x8b\x08" or not header[3] & 0x04:
+                return None
+
+            extra = file.read(struct.unpack("<H", header[10:12])[0])
+            block_size = None
+            position = 0
+            while position + 4 <= len(extra):
+                subfield_id = extra[position : position + 2]
+                subfield_length = struct.unpack("<H", extra[position + 2 : position + 4])[0]
+                if subfield_id == b"BC" and subfield_length == 2:
+                    block_size = struct.unpack("<H", extra[position + 4 : position + 6])[0] + 1
+                    break
+                position += 4 + subfield_length
+
+            if block_size is None:
+                return None
+            offsets.append(offset)
+            offset += block_size
+
+    return offsets + [file_size] if offset == file_size else None
+
+
+def get_zstd_frame_offsets(file_path: str | Path) -> list[int] | None:
+    """Returns the offsets of the frames of a Zstandard file.
+
+    Zstandard frames are independent, so a file written as multiple frames (e.g. by `zstd -T0` or `pzstd`) can be
+    decompressed in parallel. Frames are located by walking the frame and block headers without decompressing.
+
+    Args:
+        file_path: Path to the Zstandard file.
+
+    Returns:
+        The offsets of all frames followed by the file size, or None if the file is not a valid Zstandard file.
+    """
+    file_size = Path(file_path).stat().st_size
+    offsets: list[int] = []
+    with open(file_path, "rb") as file:
+        offset = 0
+        while offset < file_size:
+            file.seek(offset)
+            header = file.read(5)
+            if len(header) < 5:
+                return None
+
+            magic = struct.unpack("<I", header[:4])[0]
+            if magic in ZSTD_SKIPPABLE_FRAME_MAGIC_RANGE:
+                file.seek(offset + 4)
+                offsets.append(offset)
+                offset += 8 + struct.unpack("<I", file.read(4))[0]
+                continue
+            if magic != ZSTD_FRAME_MAGIC:
+                return None
+
+            descriptor = header[4]
+            single_segment = (descriptor >> 5) & 1
+            content_size_bytes = (1 if single_segment else 0, 2, 4, 8)[descriptor >> 6]
+            dictionary_id_bytes = (0, 1, 2, 4)[descriptor & 0x03]
+            has_checksum = (descriptor >> 2) & 1
+            block_offset = offset + 5 + (1 - single_segment) + dictionary_id_bytes + content_size_bytes
+
+            last_block = False
+            while not last_block:
+                file.seek(block_offset)
+                block_header = file.read(3)
+                if len(block_header) < 3:
+                    return None
+                block_header_value = int.from_bytes(block_header, "little")
+                last_block = bool(block_header_value & 1)
+                block_type = (block_header_value >> 1) & 0x03
+                if block_type == 3:
+                    return None
+                block_offset += 3 + (1 if block_type == 1 else block_header_value >> 3)
+
+            offsets.append(offset)
+            offset = block_offset + 4 * has_checksum
+
+    return offsets + [file_size] if offset == file_size else None
+
+
+def open_parallel_compressed_file(file_path: str | Path, num_threads: int = 1) -> BinaryIO:
+    """Opens a raw or compressed file for sequential reading of the decompressed bytes, decompressing in parallel.
+
+    BGZF gzip files and Zstandard files with multiple frames are split into spans of whole blocks or frames of at
+    most `PARALLEL_DECOMPRESSION_SPAN_SIZE` compressed bytes, which are decompressed ahead of the reader in order
+    using `num_threads` threads, both `zlib` and the Arrow Zstandard codec release the GIL while decompressing. At
+    most `2 * num_threads` decompressed spans are held in memory at once. All other files are decompressed
+    sequentially while being read, see `open_compressed_file`.
+
+    Args:
+        file_path: Path to the file.
+        num_threads: Number of threads to use for decompression.
+
+    Returns:
+        A binary file object yielding the decompressed contents of the file.
+
+    Examples:
+        >>> with open_parallel_compressed_file("data.csv.zst", num_threads=8) as file:
+        ...     table = pyarrow.csv.read_csv(file)
+    """
+    file_path = Path(file_path)
+    offsets = None
+    if num_threads > 1 and file_path.suffix == ".gz":
+        offsets = get_bgzf_block_offsets(file_path)
+    elif num_threads > 1 and file_path.suffix == ".zst":
+        offsets = get_zstd_frame_offsets(file_path)
+
+    if offsets is None or len(offsets) <= 2:
+        return open_compressed_file(file_path)
+
+    target_span_size = min(offsets[-1] / (4 * num_threads), PARALLEL_DECOMPRESSION_SPAN_SIZE)
+    spans: list[tuple[int, int]] = []
+    span_start = offsets[0]
+    for offset in offsets[1:]:
+        if offset - span_start >= target_span_size or offset == offsets[-1]:
+            spans.append((span_start, offset))
+            span_start = offset
+
+    logger.debug(f"Decompressing {file_path.name!r} in {len(spans)} spans using {num_threads} threads.")
+    return io.BufferedReader(_ParallelDecompressedStream(file_path, spans, num_threads))  # type: ignore
+
+
+def read_compressed_file(file_path: str | Path, num_threads: int = 1) -> bytes:
+    """Reads and decompresses the entire contents of a raw or compressed file.
+
+    Files are decompressed in parallel where possible, see `open_parallel_compressed_file`.
+
+    Args:
+        file_path: Path to the file.
+        num_threads: Number of threads to use for decompression.
+
+    Returns:
+        The decompressed contents of the file.
+
+    Examples:
+        >>> data = read_compressed_file("data.csv.zst", num_threads=8)
+    """
+    with open_parallel_compressed_file(file_path, num_threads) as file:
+        return file.read()
+
+
+class _ParallelDecompressedStream(io.RawIOBase):
+    """A raw stream yielding the decompressed spans of a file in order, decompressing the next spans ahead."""
+
+    def __init__(self, file_path: Path, spans: list[tuple[int, int]], num_threads: int) -> None:
+        """Initializes the stream and starts decompressing the first spans.
+
+        Args:
+            file_path: Path to the `.gz` or `.zst` file.
+            spans: The start and end offsets of the spans, consisting of whole gzip members or Zstandard frames.
+            num_threads: Number of threads to use for decompression.
+        """
+        super().__init__()
+        self._file_path = file_path
+        self._spans = collections.deque(spans)
+        self._executor = futures.ThreadPoolExecutor(max_workers=num_threads)
+        self._pending: collections.deque[futures.Future[bytes]] = collections.deque()
+        self._max_pending = 2 * num_threads
+        self._buffer = memoryview(b"")
+        self._submit_spans()
+
+    def readable(self) -> bool:
+        """Returns True, the stream is readable.
+
+        Returns:
+            True.
+        """
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Reads decompressed bytes into a pre-allocated buffer.
+
+        Args:
+            buffer: The buffer to read into.
+
+        Returns:
+            The number of bytes read, 0 at the end of the file.
+        """
+        while len(self._buffer) == 0:
+            if len(self._pending) == 0:
+                return 0
+            self._buffer = memoryview(self._pending.popleft().result())
+            self._submit_spans()
+
+        size = min(len(buffer), len(self._buffer))
+        memoryview(buffer).cast("B")[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        """Closes the stream and cancels the decompression of the spans not read yet."""
+        if not self.closed:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._pending.clear()
+            self._buffer = memoryview(b"")
+        super().close()
+
+    def _submit_spans(self) -> None:
+        """Submits the next spans for decompression, keeping at most `2 * num_threads` spans pending."""
+        while len(self._spans) > 0 and len(self._pending) < self._max_pending:
+            self._pending.append(self._executor.submit(_decompress_span, self._file_path, self._spans.popleft()))
+
+
+def _decompress_span(file_path: Path, span: tuple[int, int]) -> bytes:
+    """Decompresses a span of a file consisting of whole gzip members or Zstandard frames.
+
+    Args:
+        file_path: Path to the `.gz` or `.zst` file.
+        span: The start and end offsets of the span.
+
+    Returns:
+        The decompressed contents of the span.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(span[0])
+        data = file.read(span[1] - span[0])
+
+    if file_path.suffix == ".gz":
+        return gzip.decompress(data)
+    return pa.input_stream(pa.BufferReader(data), compression="zstd").read()
+
+
+def is_zip_file(file_path: str | Path) -> bool:
+    """Checks whether a file is a zip archive by its signature, regardless of the file suffix.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        True if the file starts with the zip local file header signature, False otherwise.
+    """
+    with open(file_path, "rb") as file:
+        return file.read(4) == b"PK\x03\x04"
+
+
+def get_zip_members(file_path: str | Path) -> list[str]:
+    """Returns the names of the files in a zip archive, excluding directories.
+
+    Args:
+        file_path: Path to the zip archive.
+
+    Returns:
+        The names of the files in the archive.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        return [member.filename for member in archive.infolist() if not member.is_dir()]
+
+
+def extract_zip_member(file_path: str | Path, member_name: str, destination_directory: str | Path) -> Path:
+    """Extracts a single file from a zip archive, streaming it to disk in blocks of `ZIP_EXTRACT_BLOCK_SIZE` bytes.
+
+    Each call opens its own handle to the archive, so members of the same archive can be extracted in parallel from
+    different threads, `zlib` releases the GIL while inflating. The member is written to a temporary `.part` file and
+    only renamed into place once complete.
+
+    Args:
+        file_path: Path to the zip archive.
+        member_name: Name of the member to extract, as returned by `get_zip_members`.
+        destination_directory: Directory to extract the member into, keeping its relative path in the archive.
+
+    Raises:
+        ValueError: If the member would be extracted outside of the destination directory.
+
+    Returns:
+        Path of the extracted file.
+
+    Examples:
+        >>> for member_name in get_zip_members("data.zip"):
+        ...     extract_zip_member("data.zip", member_name, "data")
+        PosixPath('data/train.csv')
+    """
+    destination_directory = Path(destination_directory)
+    target_path = destination_directory / member_name
+    resolved_directory = str(destination_directory.resolve())
+    if os.path.commonpath([resolved_directory, str(target_path.resolve())]) != resolved_directory:
+        msg = f"Zip member {member_name!r} of {str(file_path)!r} would be extracted outside of the destination."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = target_path.with_name(target_path.name + ".part")
+    with zipfile.ZipFile(file_path) as archive, archive.open(member_name) as source, open(part_path, "wb") as target:
+        shutil.copyfileobj(source, target, ZIP_EXTRACT_BLOCK_SIZE)
+    os.replace(part_path, target_path)
+    return target_path
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import dataclasses
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 from .custom_logger import CustomLogger
 
@@ -39,6 +40,10 @@ class LocalFileEntry:
     """Size of the file in bytes."""
 
     hash: str | None = None
+    """Optional hash of the file contents, e.g. the ETag of the file it was downloaded from."""
+
+    last_modified: str | None = None
+    """Optional ISO 8601 last modified timestamp of the file it was downloaded from."""
 
 
 @dataclass
@@ -48,6 +53,9 @@ class LocalManifest:
     files: list[LocalFileEntry]
     """List of files in the local dataset."""
 
+    metadata: dict[str, Any] = field(default_factory=dict)
+    """Optional metadata describing how the local dataset was produced, e.g. the sampling configuration."""
+
 
 class LocalManifestHandler:
     """`LocalManifestHandler` provides a convenient interface for reading and writing local manifest files."""
@@ -93,6 +101,32 @@ class LocalManifestHandler:
         manifest_data.files = [file for file in manifest_data.files if file.name not in file_names]
         self._write_manifest(manifest_data)
 
+    def set_metadata(self, metadata: dict[str, Any]) -> None:
+        """Sets the metadata of the manifest, replacing any existing metadata.
+
+        Args:
+            metadata: JSON serializable metadata describing the local dataset.
+        """
+        manifest_data = self._read_manifest()
+        manifest_data.metadata = metadata
+        self._write_manifest(manifest_data)
+
+    def get_metadata(self) -> dict[str, Any]:
+        """Gets the metadata of the manifest.
+
+        Returns:
+            Metadata of the manifest, empty if none was set.
+        """
+        return self._read_manifest().metadata
+
+    def get_files(self) -> list[LocalFileEntry]:
+        """Gets the list of file entries in the manifest.
+
+        Returns:
+            List of file entries in the manifest.
+        """
+        return self._read_manifest().files
+
     def get_file_names(self) -> list[str]:
         """Gets the list of file names in the manifest.
 
@@ -138,4 +172,4 @@ class LocalManifestHandler:
             Deserialized manifest.
         """
         files = [LocalFileEntry(**file_dict) for file_dict in manifest_dict.get("files", [])]
-        return LocalManifest(files=files)
+        return LocalManifest(files=files, metadata=manifest_dict.get("metadata", {}))
@@ -0,0 +1,342 @@
+"""This module contains helper functions for downloading files over HTTP."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from concurrent import futures
+from pathlib import Path
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .custom_logger import CustomLogger
+
+
+logger = CustomLogger()
+"""A module-level custom logger."""
+
+HTTP_SEGMENT_SIZE = 16 * 1024**2
+"""A module-level constant representing the default size in bytes of the segments of a segmented download."""
+
+HTTP_TRANSFER_BLOCK_SIZE = 1024**2
+"""A module-level constant representing the block size in bytes used when writing a segment to disk."""
+
+HTTP_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+"""A module-level constant representing the HTTP status codes of responses that are retried."""
+
+
+def create_http_session(pool_size: int = 10, max_retries: int = 5, backoff_factor: float = 0.5) -> requests.Session:
+    """Creates a `requests.Session` with a pool of reusable connections that retries failed requests.
+
+    Connection errors and responses with a status code in `HTTP_RETRY_STATUS_CODES` are retried with exponential
+    backoff. Once the retries are exhausted the last response is returned, so `raise_for_status` reports the error.
+
+    Args:
+        pool_size: Maximum number of connections kept open per host, should match the number of threads sharing
+            the session.
+        max_retries: Maximum number of retries of a failed request.
+        backoff_factor: Factor of the exponential backoff between retries, in seconds.
+
+    Returns:
+        A `requests.Session` with pooled and retrying HTTP and HTTPS adapters.
+
+    Examples:
+        >>> session = create_http_session(pool_size=16)
+        >>> download_http_file("https://example.com/data.csv", "data/data.csv", session=session)
+        PosixPath('data/data.csv')
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=HTTP_RETRY_STATUS_CODES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=max(1, pool_size), max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def download_http_file(
+    url: str, file_path: str | Path, session: requests.Session | None = None, **request_kwargs: Any
+) -> Path:
+    r"""Downloads a file over HTTP, resuming a previously interrupted download of the same file if possible.
+
+    The file is downloaded to a temporary `.part` file next to `file_path` and only renamed into place once the
+    number of received bytes matches the size announced by the server. The `ETag` (or `Last-Modified`) validator of
+    the response is stored in a `.part.json` file, so that a subsequent call can request only the missing bytes with
+    an HTTP `Range` request. The validator is sent in an `If-Range` header, so a server whose file has changed
+    responds with the full file instead of the missing range. The file is requested with `Accept-Encoding: identity`,
+    since the raw response body is written to disk and sizes and ranges refer to the unencoded file.
+
+    Args:
+        url: URL of the file to download.
+        file_path: Destination path of the downloaded file.
+        session: Optional `requests.Session` used for the request, allowing connections (and retry policies) to be
+            shared between downloads. If None, a new connection is opened with `requests.get`.
+        \*\*request_kwargs: Additional keyword arguments passed to the `get` request, e.g. `params`, `auth` or
+            `timeout`.
+
+    Raises:
+        HTTPError: If there is an error in the HTTP response.
+        ConnectionError: If the connection ended before the whole file was received, the partial file is kept so
+            that the download can be resumed.
+
+    Returns:
+        Path of the downloaded file.
+
+    Examples:
+        >>> download_http_file("https://example.com/data.csv", "data/data.csv", timeout=5)
+        PosixPath('data/data.csv')
+    """
+    file_path = Path(file_path)
+    part_path = file_path.with_name(file_path.name + ".part")
+    state_path = file_path.with_name(file_path.name + ".part.json")
+    file_path.with_name(file_path.name + ".segments.json").unlink(missing_ok=True)
+
+    headers: dict[str, str] = dict(request_kwargs.pop("headers", None) or {})
+    headers["Accept-Encoding"] = "identity"
+    validator = _read_validator(state_path, url)
+    offset = part_path.stat().st_size if validator is not None and part_path.exists() else 0
+    if offset > 0:
+        logger.debug(f"Resuming download of {file_path.name!r} from byte {offset}.")
+        headers.update({"Range": f"bytes={offset}-", "If-Range": validator})  # type: ignore
+
+    get = session.get if session is not None else requests.get
+    response = get(url, headers=headers, stream=True, **request_kwargs)
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as e:
+        logger.error(e)
+        raise requests.HTTPError(e) from e
+
+    if response.status_code != 206:
+        offset = 0
+    expected_size = _get_expected_size(response.headers, offset)
+    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+    if validator is not None:
+        with open(state_path, "w") as state_file:
+            json.dump({"url": url, "validator": validator}, state_file)
+    else:
+        state_path.unlink(missing_ok=True)
+
+    with open(part_path, "ab" if offset > 0 else "wb") as part_file:
+        shutil.copyfileobj(response.raw, part_file)
+
+    if expected_size is not None and part_path.stat().st_size != expected_size:
+        msg = (
+            f"Incomplete download of {url}: received {part_path.stat().st_size} of {expected_size} bytes, "
+            "the download will be resumed on the next attempt."
+        )
+        logger.error(msg)
+        raise requests.ConnectionError(msg)
+
+    os.replace(part_path, file_path)
+    state_path.unlink(missing_ok=True)
+    return file_path
+
+
+def download_http_file_segments(
+    url: str,
+    file_path: str | Path,
+    file_size: int,
+    validator: str | None,
+    session: requests.Session | None = None,
+    num_workers: int = 4,
+    segment_size: int = HTTP_SEGMENT_SIZE,
+    **request_kwargs: Any,
+) -> Path:
+    r"""Downloads a file in segments of `segment_size` bytes with concurrent HTTP `Range` requests.
+
+    The server must support range requests, i.e. announce `Accept-Ranges: bytes`, and the size and validator of the
+    file must be known up front, e.g. from a `HEAD` request. The segments are written into a preallocated `.part`
+    file and the completed segments are recorded in a `.segments.json` file, so an interrupted download only fetches
+    the missing segments on the next call, as long as the validator of the file is unchanged. Each request carries
+    the validator in an `If-Range` header, a server whose file has changed responds with the full file instead, in
+    which case the download is discarded.
+
+    Args:
+        url: URL of the file to download.
+        file_path: Destination path of the downloaded file.
+        file_size: Size of the file in bytes.
+        validator: Strong `ETag` or `Last-Modified` validator of the file, or None if the server provides neither,
+            in which case an interrupted download is restarted from scratch.
+        session: Optional `requests.Session` used for the requests, should be created with a connection pool of at
+            least `num_workers` connections, see `create_http_session`.
+        num_workers: Number of segments to download concurrently.
+        segment_size: Size of each segment in bytes.
+        \*\*request_kwargs: Additional keyword arguments passed to the `get` requests, e.g. `auth` or `timeout`.
+
+    Raises:
+        HTTPError: If there is an error in the HTTP response.
+        ConnectionError: If a segment ended before all of its bytes were received, the completed segments are kept
+            so that the download can be resumed.
+        ValueError: If the file changed on the server during the download, or the server ignored the range requests.
+
+    Returns:
+        Path of the downloaded file.
+
+    Examples:
+        >>> download_http_file_segments("https://example.com/data.csv", "data/data.csv", 10**9, '"etag"', num_workers=8)
+        PosixPath('data/data.csv')
+    """
+    file_path = Path(file_path)
+    part_path = file_path.with_name(file_path.name + ".part")
+    state_path = file_path.with_name(file_path.name + ".segments.json")
+    file_path.with_name(file_path.name + ".part.json").unlink(missing_ok=True)
+
+    segments = [(start, min(start + segment_size, file_size) - 1) for start in range(0, file_size, segment_size)]
+    state: dict[str, Any] = {
+        "url": url,
+        "validator": validator,
+        "size": file_size,
+        "segment_size": segment_size,
+        "completed": [],
+    }
+    previous_state = _read_segments_state(state_path)
+    if (
+        validator is not None
+        and part_path.exists()
+        and previous_state is not None
+        and all(previous_state.get(key) == state[key] for key in ("url", "validator", "size", "segment_size"))
+    ):
+        state["completed"] = previous_state.get("completed", [])
+        logger.debug(f"Resuming download of {file_path.name!r}, {len(state['completed'])} segments already done.")
+    else:
+        with open(part_path, "wb") as part_file:
+            part_file.truncate(file_size)
+
+    headers: dict[str, str] = dict(request_kwargs.pop("headers", None) or {})
+    headers["Accept-Encoding"] = "identity"
+    if validator is not None:
+        headers["If-Range"] = validator
+    get = session.get if session is not None else requests.get
+    state_lock = threading.Lock()
+
+    def download_segment(index: int) -> None:
+        _download_segment(get, url, part_path, segments[index], headers, request_kwargs)
+        with state_lock:
+            state["completed"].append(index)
+            with open(state_path, "w") as state_file:
+                json.dump(state, state_file)
+
+    completed_segments = set(state["completed"])
+    pending_segments = [index for index in range(len(segments)) if index not in completed_segments]
+    try:
+        with futures.ThreadPoolExecutor(max_workers=max(1, min(num_workers, len(pending_segments)))) as executor:
+            list(executor.map(download_segment, pending_segments))
+    except ValueError as e:
+        part_path.unlink(missing_ok=True)
+        state_path.unlink(missing_ok=True)
+        msg = f"Discarding the download of {url}, the file changed during the download: {e}"
+        logger.error(msg)
+        raise ValueError(msg) from e
+
+    os.replace(part_path, file_path)
+    state_path.unlink(missing_ok=True)
+    return file_path
+
+
+def _download_segment(
+    get: Any,
+    url: str,
+    part_path: Path,
+    segment: tuple[int, int],
+    headers: dict[str, str],
+    request_kwargs: dict[str, Any],
+) -> None:
+    """Downloads a single segment of a file with a `Range` request and writes it at its offset in the `.part` file.
+
+    Args:
+        get: The `get` function of the session, or `requests.get`.
+        url: URL of the file to download.
+        part_path: Path to the preallocated `.part` file.
+        segment: The first and last byte of the segment, inclusive.
+        headers: Headers sent with the request, including the `If-Range` validator.
+        request_kwargs: Additional keyword arguments passed to the `get` request.
+
+    Raises:
+        HTTPError: If there is an error in the HTTP response.
+        ConnectionError: If the response ended before the whole segment was received.
+        ValueError: If the server did not respond with the requested range, e.g. because the file has changed.
+    """
+    start, end = segment
+    response = get(url, headers={**headers, "Range": f"bytes={start}-{end}"}, stream=True, **request_kwargs)
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as e:
+        logger.error(e)
+        raise requests.HTTPError(e) from e
+
+    if response.status_code != 206:
+        raise ValueError(f"The server responded to a range request for {url} with status {response.status_code}.")
+
+    received = 0
+    with open(part_path, "r+b") as part_file:
+        part_file.seek(start)
+        for block in iter(lambda: response.raw.read(HTTP_TRANSFER_BLOCK_SIZE), b""):
+            part_file.write(block)
+            received += len(block)
+    if received != end - start + 1:
+        msg = f"Incomplete segment of {url}: received {received} of {end - start + 1} bytes at offset {start}."
+        logger.error(msg)
+        raise requests.ConnectionError(msg)
+
+
+def _read_segments_state(state_path: Path) -> dict[str, Any] | None:
+    """Reads the state of a segmented download from its state file.
+
+    Args:
+        state_path: Path to the `.segments.json` state file.
+
+    Returns:
+        The state of the download, or None if there is no readable state file.
+    """
+    try:
+        with open(state_path) as state_file:
+            return json.load(state_file)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _read_validator(state_path: Path, url: str) -> str | None:
+    """Reads the validator of a partial download from its state file.
+
+    Args:
+        state_path: Path to the `.part.json` state file.
+        url: URL of the file being downloaded, the validator is only returned if it belongs to the same URL.
+
+    Returns:
+        The `ETag` or `Last-Modified` validator of the partial download, or None if the download cannot be resumed.
+    """
+    try:
+        with open(state_path) as state_file:
+            state = json.load(state_file)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return state.get("validator") if state.get("url") == url else None
+
+
+def _get_expected_size(response_headers: Any, offset: int) -> int | None:
+    """Gets the total size of the file being downloaded from the response headers.
+
+    Args:
+        response_headers: Headers of the HTTP response.
+        offset: Offset in bytes at which the response body starts.
+
+    Returns:
+        The total size of the file in bytes, or None if the server did not announce it.
+    """
+    content_range = response_headers.get("Content-Range")
+    if content_range is not None and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[-1])
+    content_length = response_headers.get("Content-Length")
+    if content_length is not None:
+        return offset + int(content_length)
+    return None
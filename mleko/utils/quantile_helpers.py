@@ -0,0 +1,204 @@
+"""Helper functions and classes for computing approximate quantiles of large DataFrames in a single pass."""
+
+from __future__ import annotations
+
+import math
+import os
+from concurrent import futures
+from dataclasses import dataclass, field
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import vaex
+
+from .custom_logger import CustomLogger
+from .vaex_helpers import EVALUATION_CHUNK_SIZE
+
+
+logger = CustomLogger()
+"""A module-level logger for the module."""
+
+KLL_ERROR_CONSTANT = 2.3
+"""Constant relating the size `k` of the top level of a KLL sketch to its relative rank error, about `2.3 / k`."""
+
+KLL_CAPACITY_DECAY = 2 / 3
+"""Factor by which the capacity of each level of a KLL sketch decreases from the top level down."""
+
+
+@dataclass
+class QuantileSketch:
+    """Streaming KLL sketch for approximate quantiles of a numerical feature with bounded memory.
+
+    The sketch keeps a hierarchy of levels of sampled values, the values of level `i` representing `2 ** i` values
+    each. Values are added to the lowest level, and a level that exceeds its capacity is compacted by sorting it and
+    promoting every other value to the next level. Compactions are vectorized with `numpy`, so adding a chunk of
+    millions of values costs about two sorts of the chunk. Sketches of different parts of the data can be merged,
+    and the memory used only grows logarithmically with the number of values.
+
+    The rank of the returned quantiles is within about `relative_error` times the number of values of the exact
+    rank, with high probability. The minimum and maximum are tracked exactly.
+    """
+
+    relative_error: float = 0.001
+    """Target relative rank error of the quantiles."""
+
+    seed: int = 0
+    """Seed of the random offsets of the compactions, making the sketch deterministic."""
+
+    count: int = 0
+    """Number of non-missing values added to the sketch."""
+
+    min_value: float = math.inf
+    """Minimum of the values added to the sketch."""
+
+    max_value: float = -math.inf
+    """Maximum of the values added to the sketch."""
+
+    levels: list[np.ndarray] = field(default_factory=list)
+    """Sampled values of each level, the values of level `i` having a weight of `2 ** i`."""
+
+    def __post_init__(self) -> None:
+        """Validates the relative error and initializes the random number generator of the compactions.
+
+        Raises:
+            ValueError: If the relative error is not between 0 and 1.
+        """
+        if not 0 < self.relative_error < 1:
+            msg = f"Relative error must be between 0 and 1, got {self.relative_error}."
+            logger.error(msg)
+            raise ValueError(msg)
+        self._k = math.ceil(KLL_ERROR_CONSTANT / self.relative_error)
+        self._rng = np.random.default_rng(self.seed)
+
+    def update(self, values: np.ndarray | pa.Array | pa.ChunkedArray) -> None:
+        """Adds values to the sketch, ignoring missing and nan values.
+
+        Args:
+            values: The values to add.
+        """
+        if isinstance(values, (pa.Array, pa.ChunkedArray)):
+            values = np.asarray(pc.drop_null(values), dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.count += len(values)
+        self.min_value = min(self.min_value, float(values.min()))
+        self.max_value = max(self.max_value, float(values.max()))
+        self._add_to_level(0, values)
+        self._compress()
+
+    def merge(self, other: QuantileSketch) -> None:
+        """Merges another sketch into the sketch.
+
+        Args:
+            other: The sketch to merge, it is not modified.
+        """
+        if other.count == 0:
+            return
+
+        self.count += other.count
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+        for level, values in enumerate(other.levels):
+            self._add_to_level(level, values)
+        self._compress()
+
+    def quantiles(self, quantiles: list[float] | np.ndarray) -> np.ndarray:
+        """Returns the approximate quantiles of the values added to the sketch.
+
+        Args:
+            quantiles: The quantiles to compute, between 0 and 1.
+
+        Returns:
+            The approximate quantiles, nan if the sketch is empty.
+        """
+        quantiles = np.asarray(quantiles, dtype=np.float64)
+        if self.count == 0:
+            return np.full(quantiles.shape, np.nan)
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0**i) for i, level in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        ranks = np.cumsum(weights) - weights / 2
+        result = np.interp(quantiles * weights.sum(), ranks, values)
+        result = np.where(quantiles <= 0, self.min_value, np.where(quantiles >= 1, self.max_value, result))
+        return np.clip(result, self.min_value, self.max_value)
+
+    def _add_to_level(self, level: int, values: np.ndarray) -> None:
+        """Appends values to a level, creating the level if needed.
+
+        Args:
+            level: The level to add the values to.
+            values: The values to add.
+        """
+        while len(self.levels) <= level:
+            self.levels.append(np.zeros(0, dtype=np.float64))
+        self.levels[level] = np.concatenate([self.levels[level], values])
+
+    def _capacity(self, level: int) -> int:
+        """Returns the capacity of a level, decreasing geometrically from `k` at the top level.
+
+        Args:
+            level: The level.
+
+        Returns:
+            The maximum number of values of the level.
+        """
+        return max(2, math.ceil(self._k * KLL_CAPACITY_DECAY ** (len(self.levels) - 1 - level)))
+
+    def _compress(self) -> None:
+        """Compacts the levels that exceed their capacity, from the lowest level up."""
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) <= self._capacity(level):
+                level += 1
+                continue
+
+            values = np.sort(values)
+            kept, values = (values[-1:], values[:-1]) if len(values) % 2 == 1 else (values[:0], values)
+            self.levels[level] = kept
+            self._add_to_level(level + 1, values[self._rng.integers(2) :: 2])
+
+
+def get_quantile_sketches(
+    df: vaex.DataFrame,
+    expressions: list[str],
+    relative_error: float = 0.001,
+    chunk_size: int = EVALUATION_CHUNK_SIZE,
+) -> list[QuantileSketch]:
+    """Computes a quantile sketch of each expression in a single pass over the DataFrame.
+
+    All expressions are evaluated chunk by chunk by a shared iterator, which prefetches the next chunk in parallel,
+    and the chunks of the expressions are added to their sketches concurrently by a thread pool, see
+    `QuantileSketch`.
+
+    Args:
+        df: The input DataFrame.
+        expressions: The names of the numerical columns or the expressions to sketch.
+        relative_error: Target relative rank error of the quantiles.
+        chunk_size: Number of rows to evaluate at once.
+
+    Returns:
+        The quantile sketch of each expression.
+
+    Examples:
+        >>> import vaex
+        >>> from mleko.utils import get_quantile_sketches
+        >>> df = vaex.from_arrays(x=[1.0, 2.0, 3.0, None, 5.0])
+        >>> get_quantile_sketches(df, ["x"])[0].quantiles([0.0, 0.5, 1.0]).tolist()
+        [1.0, 2.5, 5.0]
+    """
+    sketches = [QuantileSketch(relative_error=relative_error) for _ in expressions]
+    if len(expressions) == 0 or len(df) == 0:
+        return sketches
+
+    with futures.ThreadPoolExecutor(max_workers=min(len(expressions), os.cpu_count() or 1)) as executor:
+        for _, _, chunks in df.evaluate_iterator(list(expressions), chunk_size=chunk_size, array_type="arrow"):
+            list(executor.map(QuantileSketch.update, sketches, chunks))
+
+    return sketches
@@ -3,22 +3,262 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
 import json
+import math
+import os
+import threading
+import time
+from concurrent import futures
+from contextlib import contextmanager
 from dataclasses import dataclass
 from fnmatch import fnmatch
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+from urllib.parse import urlparse
 
 import boto3
 from boto3.s3.transfer import TransferConfig as BotoTransferConfig
 from botocore.config import Config as BotoConfig
+from pyarrow import fs as arrow_fs
 
 from .custom_logger import CustomLogger
+from .file_helpers import LocalFileEntry
 
 
 logger = CustomLogger()
 """A module-level custom logger."""
 
+S3_DOWNLOAD_PART_SIZE = 8 * 1024**2
+"""A module-level constant representing the minimum size in bytes of the byte ranges in which S3 objects are
+downloaded, unless the object was uploaded using multipart upload, in which case its part size is used."""
+
+S3_MAX_DOWNLOAD_PART_SIZE = 64 * 1024**2
+"""A module-level constant representing the maximum size in bytes of the byte ranges in which S3 objects are
+downloaded, which bounds the amount of data downloaded again when resuming an interrupted download."""
+
+S3_UPLOAD_PART_SIZE = 8 * 1024**2
+"""A module-level constant representing the minimum size in bytes of the parts of a multipart upload."""
+
+S3_MIN_UPLOAD_PART_SIZE = 5 * 1024**2
+"""A module-level constant representing the minimum size in bytes allowed by S3 for all but the last part of a
+multipart upload."""
+
+S3_MAX_UPLOAD_PART_SIZE = 512 * 1024**2
+"""A module-level constant representing the maximum size in bytes of the parts of a multipart upload, unless more
+are needed to stay within the `S3_MAX_UPLOAD_PARTS` limit."""
+
+S3_MAX_UPLOAD_PARTS = 10_000
+"""A module-level constant representing the maximum number of parts of a multipart upload allowed by S3."""
+
+S3_TRANSFER_BLOCK_SIZE = 1024**2
+"""A module-level constant representing the size in bytes of the blocks in which transferred data is accounted
+against the bandwidth budget."""
+
+S3_PARTS_PER_WORKER = 4
+"""A module-level constant representing the targeted number of parts per worker when sizing the parts of a transfer,
+so that workers finishing early can pick up remaining parts."""
+
+S3_MAX_CONNECTIONS = 100
+"""A module-level constant representing the default size of the connection pool of the S3 clients, and the default
+number of concurrent requests across all transfers of an `S3Client`."""
+
+S3_LISTING_FANOUT_DEPTH = 3
+"""A module-level constant representing the maximum number of `/`-delimited levels below the key prefix that are
+expanded to find sub-prefixes to list concurrently."""
+
+
+_S3_CLIENTS: dict[tuple[str | None, str, str | None, int], tuple[tuple[str, str, str | None], Any]] = {}
+"""A module-level cache of S3 clients, shared by all `S3Client` instances with the same profile, region, endpoint and
+client configuration, along with the credentials they were created with."""
+
+_S3_CLIENTS_LOCK = threading.Lock()
+"""A module-level lock guarding `_S3_CLIENTS`."""
+
+
+def get_adaptive_part_size(size: int, num_workers: int, min_part_size: int, max_part_size: int) -> int:
+    """Chooses the part size of a transfer based on the object size and the number of workers.
+
+    The part size aims for `S3_PARTS_PER_WORKER` parts per worker, so that large objects are transferred in fewer,
+    larger requests, while it stays within the given bounds and never exceeds `S3_MAX_UPLOAD_PARTS` parts.
+
+    Args:
+        size: Size of the object in bytes.
+        num_workers: Number of workers transferring the parts concurrently.
+        min_part_size: Minimum part size in bytes.
+        max_part_size: Maximum part size in bytes, exceeded only if required by the part count limit.
+
+    Returns:
+        The part size in bytes.
+
+    Examples:
+        >>> get_adaptive_part_size(10 * 1024**3, 8, 8 * 1024**2, 512 * 1024**2) // 1024**2
+        320
+    """
+    part_size = min(max(math.ceil(size / (S3_PARTS_PER_WORKER * max(1, num_workers))), min_part_size), max_part_size)
+    return max(part_size, math.ceil(size / S3_MAX_UPLOAD_PARTS))
+
+
+class S3TransferBudget:
+    """Connection and bandwidth budget shared by the concurrent transfers of an `S3Client`.
+
+    The connection budget caps the number of concurrent requests across all files, while the bandwidth budget is a
+    token bucket refilled at `max_bandwidth_mb` MB per second, which throttles the transfers consuming from it.
+    """
+
+    def __init__(self, max_connections: int = S3_MAX_CONNECTIONS, max_bandwidth_mb: float | None = None) -> None:
+        """Initializes the transfer budget.
+
+        Args:
+            max_connections: Maximum number of concurrent requests.
+            max_bandwidth_mb: Maximum total bandwidth in MB per second, or None for no limit.
+        """
+        self._max_connections = max_connections
+        self._available_connections = max_connections
+        self._connections_condition = threading.Condition()
+        self._bytes_per_second = max_bandwidth_mb * 1024**2 if max_bandwidth_mb is not None else None
+        self._available_bytes = 0.0
+        self._last_refill = time.monotonic()
+        self._bandwidth_lock = threading.Lock()
+
+    @contextmanager
+    def connections(self, n_connections: int = 1) -> Iterator[None]:
+        """Reserves a number of connections for the duration of the context, waiting until they are available.
+
+        The connections are reserved atomically, so transfers reserving several connections cannot deadlock.
+
+        Args:
+            n_connections: Number of connections to reserve, capped at the maximum number of connections.
+        """
+        n_connections = max(1, min(n_connections, self._max_connections))
+        with self._connections_condition:
+            self._connections_condition.wait_for(lambda: self._available_connections >= n_connections)
+            self._available_connections -= n_connections
+        try:
+            yield
+        finally:
+            with self._connections_condition:
+                self._available_connections += n_connections
+                self._connections_condition.notify_all()
+
+    def consume(self, n_bytes: int) -> None:
+        """Consumes bandwidth for a number of transferred bytes, sleeping if the bandwidth budget is exhausted.
+
+        Args:
+            n_bytes: Number of transferred bytes.
+        """
+        if self._bytes_per_second is None:
+            return
+
+        with self._bandwidth_lock:
+            now = time.monotonic()
+            self._available_bytes = min(
+                self._bytes_per_second, self._available_bytes + (now - self._last_refill) * self._bytes_per_second
+            )
+            self._last_refill = now
+            self._available_bytes -= n_bytes
+            delay = -self._available_bytes / self._bytes_per_second
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limits the number of concurrent parts of a transfer, adapting the limit to the observed throughput.
+
+    The limit starts at 2 and is adjusted by hill climbing: after each round of completed parts, the limit is
+    increased if the throughput improved by more than 10% and decreased if it dropped by more than 20%, so that
+    concurrency only grows while it actually speeds up the transfer.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        """Initializes the limiter.
+
+        Args:
+            max_concurrency: Maximum number of concurrent parts.
+        """
+        self._max_concurrency = max(1, max_concurrency)
+        self._limit = min(2, self._max_concurrency)
+        self._active = 0
+        self._condition = threading.Condition()
+        self._round_bytes = 0
+        self._round_parts = 0
+        self._round_start = time.monotonic()
+        self._previous_throughput: float | None = None
+
+    @contextmanager
+    def slot(self, n_bytes: int) -> Iterator[None]:
+        """Waits for a free slot and holds it while a part is transferred.
+
+        Args:
+            n_bytes: Size of the part in bytes, recorded when the part completes successfully.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+        completed = False
+        try:
+            yield
+            completed = True
+        finally:
+            with self._condition:
+                self._active -= 1
+                if completed:
+                    self._record(n_bytes)
+                self._condition.notify_all()
+
+    def _record(self, n_bytes: int) -> None:
+        """Records a completed part and adjusts the limit at the end of each round, must hold the condition.
+
+        Args:
+            n_bytes: Size of the completed part in bytes.
+        """
+        self._round_bytes += n_bytes
+        self._round_parts += 1
+        if self._round_parts < self._limit:
+            return
+
+        now = time.monotonic()
+        throughput = self._round_bytes / max(now - self._round_start, 1e-9)
+        if self._previous_throughput is None or throughput > 1.1 * self._previous_throughput:
+            self._limit = min(self._limit + 1, self._max_concurrency)
+        elif throughput < 0.8 * self._previous_throughput:
+            self._limit = max(self._limit - 1, 1)
+        self._previous_throughput = throughput
+        self._round_bytes, self._round_parts, self._round_start = 0, 0, now
+
+
+def get_etag_part_count(etag: str) -> int:
+    """Gets the number of parts of an S3 object from its ETag.
+
+    Args:
+        etag: ETag of the object, with or without surrounding quotes.
+
+    Returns:
+        The number of parts of an object uploaded using multipart upload, or 0 for single-part objects.
+    """
+    etag = etag.strip('"')
+    return int(etag.rsplit("-", 1)[-1]) if "-" in etag else 0
+
+
+def get_multipart_etag(part_digests: list[str]) -> str:
+    """Reconstructs the ETag of a multipart upload from the MD5 digests of its parts.
+
+    The ETag of a multipart upload is the MD5 digest of the concatenated binary MD5 digests of the parts, followed by
+    a dash and the number of parts.
+
+    Args:
+        part_digests: Hexadecimal MD5 digests of the parts, in part order.
+
+    Returns:
+        The ETag of the multipart upload, without surrounding quotes.
+
+    Examples:
+        >>> get_multipart_etag([hashlib.md5(b"a").hexdigest(), hashlib.md5(b"b").hexdigest()])
+        '96e024ba2074fe77e8e965ba43a704be-2'
+    """
+    digest = hashlib.md5(b"".join(bytes.fromhex(part_digest) for part_digest in part_digests)).hexdigest()
+    return f"{digest}-{len(part_digests)}"
+
 
 @dataclass
 class S3FileManifest:
@@ -33,6 +273,9 @@ class S3FileManifest:
     last_modified: datetime.datetime
     """Last modified date of the file."""
 
+    etag: str | None = None
+    """Entity tag of the file, changes whenever the contents of the file are rewritten."""
+
 
 class S3Client:
     """Helper class for working with AWS S3."""
@@ -41,28 +284,120 @@ class S3Client:
         self,
         aws_profile_name: str | None = None,
         aws_region_name: str = "eu-west-1",
+        aws_endpoint_url: str | None = None,
+        max_connections: int = S3_MAX_CONNECTIONS,
+        max_bandwidth_mb: float | None = None,
     ) -> None:
         """Initializes an S3 client with the specified AWS profile and region.
 
+        The underlying `boto3` client and its connection pool are shared by all `S3Client` instances with the same
+        profile, region, endpoint and number of connections. All transfers of this instance share a budget of
+        `max_connections` concurrent requests and `max_bandwidth_mb` MB per second, see `S3TransferBudget`.
+
         Args:
             aws_profile_name: AWS profile name to use. Defaults to None.
             aws_region_name: AWS region name where the S3 bucket is located.
+            aws_endpoint_url: Optional URL of an S3-compatible endpoint to use instead of AWS S3, e.g. a local
+                MinIO or moto server.
+            max_connections: Maximum number of concurrent requests across all transfers, also used as the size of
+                the connection pool.
+            max_bandwidth_mb: Maximum total bandwidth in MB per second across all transfers, or None for no limit.
         """
         self._aws_profile_name = aws_profile_name
         self._aws_region_name = aws_region_name
-        self._client = S3Client.get_s3_client(self._aws_profile_name, self._aws_region_name)
+        self._aws_endpoint_url = aws_endpoint_url
+        self._max_connections = max_connections
+        self._transfer_budget = S3TransferBudget(max_connections, max_bandwidth_mb)
+        self._client = S3Client.get_s3_client(
+            self._aws_profile_name, self._aws_region_name, self._aws_endpoint_url, self._max_connections
+        )
 
     @staticmethod
-    def get_s3_client(aws_profile_name: str | None, aws_region_name: str):
-        """Creates an S3 client using the provided AWS profile and region.
+    def get_s3_client(
+        aws_profile_name: str | None,
+        aws_region_name: str,
+        aws_endpoint_url: str | None = None,
+        max_connections: int = S3_MAX_CONNECTIONS,
+        refresh: bool = False,
+    ):
+        """Gets a pooled S3 client for the provided AWS profile and region.
+
+        Clients are cached per profile, region, endpoint and client configuration, i.e. the number of connections.
+        Resolving the credentials builds a `boto3.Session`, which reads the AWS configuration files, so on a cache hit
+        the credentials are only resolved again if `refresh` is set, and the client is only recreated if they have
+        changed since the cached client was created.
 
         Args:
             aws_profile_name: AWS profile name to use.
             aws_region_name: AWS region name where the S3 bucket is located.
+            aws_endpoint_url: Optional URL of an S3-compatible endpoint to use instead of AWS S3.
+            max_connections: Size of the connection pool of the client.
+            refresh: Whether to check the credentials of a cached client and recreate it if they have changed.
 
         Returns:
             An S3 client configured with the specified profile and region.
         """
+        client_key = (aws_profile_name, aws_region_name, aws_endpoint_url, max_connections)
+        with _S3_CLIENTS_LOCK:
+            cached_credentials_key, client = _S3_CLIENTS.get(client_key, (None, None))
+            if client is not None and not refresh:
+                return client
+
+            credentials = S3Client._get_credentials(aws_profile_name, aws_region_name)
+            credentials_key = (credentials.access_key, credentials.secret_key, credentials.token)
+            if client is None or cached_credentials_key != credentials_key:
+                client = boto3.client(
+                    "s3",  # type: ignore
+                    aws_access_key_id=credentials.access_key,
+                    aws_secret_access_key=credentials.secret_key,
+                    aws_session_token=credentials.token,
+                    region_name=aws_region_name,
+                    endpoint_url=aws_endpoint_url,
+                    config=BotoConfig(max_pool_connections=max_connections),
+                )
+                _S3_CLIENTS[client_key] = (credentials_key, client)
+        return client
+
+    def get_arrow_filesystem(self) -> arrow_fs.S3FileSystem:
+        """Creates a `pyarrow` S3 filesystem with the same profile, region and endpoint as the client.
+
+        Unlike the `boto3` client, the filesystem can be pickled and passed to worker processes, and its input
+        streams can be read directly by the `pyarrow` readers, e.g. `pyarrow.csv.open_csv`.
+
+        Returns:
+            A `pyarrow` S3 filesystem, its paths have the form `bucket/key`.
+        """
+        credentials = S3Client._get_credentials(self._aws_profile_name, self._aws_region_name)
+        endpoint = urlparse(self._aws_endpoint_url) if self._aws_endpoint_url is not None else None
+        return arrow_fs.S3FileSystem(
+            access_key=credentials.access_key,
+            secret_key=credentials.secret_key,
+            session_token=credentials.token,
+            region=self._aws_region_name,
+            endpoint_override=endpoint.netloc if endpoint is not None else None,
+            scheme=endpoint.scheme if endpoint is not None and endpoint.scheme else "https",
+        )
+
+    def refresh_client(self) -> None:
+        """Refreshes the S3 client in case the credentials have changed, otherwise the pooled client is kept."""
+        self._client = S3Client.get_s3_client(
+            self._aws_profile_name, self._aws_region_name, self._aws_endpoint_url, self._max_connections, refresh=True
+        )
+
+    @staticmethod
+    def _get_credentials(aws_profile_name: str | None, aws_region_name: str):
+        """Gets the AWS credentials of the provided profile and region.
+
+        Args:
+            aws_profile_name: AWS profile name to use.
+            aws_region_name: AWS region name where the S3 bucket is located.
+
+        Raises:
+            ValueError: If no AWS credentials are found.
+
+        Returns:
+            The AWS credentials.
+        """
         credentials = boto3.Session(
             region_name=aws_region_name,
             profile_name=aws_profile_name,
@@ -72,20 +407,7 @@ class S3Client:
             msg = "AWS credentials not found. Please ensure that your AWS credentials are correctly set up."
             logger.error(msg)
             raise ValueError(msg)
-
-        client_config = BotoConfig(max_pool_connections=100)
-        return boto3.client(
-            "s3",  # type: ignore
-            aws_access_key_id=credentials.access_key,
-            aws_secret_access_key=credentials.secret_key,
-            aws_session_token=credentials.token,
-            region_name=aws_region_name,
-            config=client_config,
-        )
-
-    def refresh_client(self) -> None:
-        """Refreshes the S3 client in case the credentials have changed."""
-        self._client = S3Client.get_s3_client(self._aws_profile_name, self._aws_region_name)
+        return credentials
 
     def download_file(
         self,
@@ -94,29 +416,278 @@ class S3Client:
         key: str,
         num_workers: int = 1,
         multipart_threshold_gb: float = 0.5,
+        etag: str | None = None,
+        size: int | None = None,
     ) -> Path:
         """Downloads a file from S3 and saves it to the destination directory.
 
+        The file is downloaded in byte ranges sized by `get_adaptive_part_size` (or the part size the object was
+        presumably uploaded with, for multipart uploads) to a temporary `.part` file. The number of ranges downloaded
+        concurrently adapts to the observed throughput, see `AdaptiveConcurrencyLimiter`, and all requests draw from
+        the connection and bandwidth budget of the client. The MD5 digests of the completed ranges
+        are recorded in a `.part.json` state file, so an interrupted download is resumed on the next call by only
+        downloading the missing ranges, as long as the ETag of the object has not changed. Once all ranges are
+        downloaded, the file is verified against the ETag of the object and renamed into place.
+
+        Note:
+            The ETag is only verified if it is an MD5 digest of the contents, i.e. for objects that are not encrypted
+            with SSE-KMS or SSE-C. Multipart ETags are reconstructed from the MD5 digests of the downloaded ranges,
+            assuming all parts but the last one have the same size. A mismatching multipart ETag only logs a
+            warning, since the parts may have been uploaded with different sizes.
+
         Args:
             destination_directory: Destination directory where the file should be saved.
             bucket_name: Name of the S3 bucket.
             key: Key of the file to fetch.
             num_workers: Number of workers to use for downloading the file. Set to 1 for single-threaded download.
             multipart_threshold_gb: Threshold in GB for multipart transfer. If the file size is greater than this
-                threshold, the file will be downloaded using multipart transfer.
+                threshold, the byte ranges of the file will be downloaded concurrently using `num_workers` threads.
+            etag: ETag of the object, e.g. from its `S3FileManifest` entry. If None, the ETag and size of the object
+                are requested with a `HEAD` request.
+            size: Size of the object in bytes, e.g. from its `S3FileManifest` entry. If None, the ETag and size of
+                the object are requested with a `HEAD` request.
+
+        Raises:
+            ValueError: If the downloaded file does not match the single-part ETag of the object, the partial
+                download is discarded.
 
         Returns:
             Path where the file is saved.
         """
         file_path = destination_directory / Path(key).name
-        self._client.download_file(
-            Bucket=bucket_name,
-            Key=key,
-            Filename=str(file_path),
-            Config=self._get_boto_transfer_config(num_workers, multipart_threshold_gb),
-        )
+        part_path = file_path.with_name(file_path.name + ".part")
+        state_path = file_path.with_name(file_path.name + ".part.json")
+
+        if etag is None or size is None:
+            head = self._client.head_object(Bucket=bucket_name, Key=key)
+            object_etag, object_size = head["ETag"], head["ContentLength"]
+        else:
+            object_etag, object_size = etag, size
+        object_etag = object_etag.strip('"')
+        max_workers = num_workers if object_size > multipart_threshold_gb * 1024**3 else 1
+        part_size = self._get_download_part_size(object_etag, object_size, max_workers)
+        part_ranges = [(start, min(start + part_size, object_size)) for start in range(0, object_size, part_size)]
+        part_digests = self._load_download_state(part_path, state_path, object_etag, object_size, part_size)
+
+        missing_parts = [index for index in range(len(part_ranges)) if index not in part_digests]
+        if len(part_digests) > 0:
+            logger.debug(f"Resuming download of {key!r}, {len(missing_parts)} of {len(part_ranges)} parts missing.")
+
+        state_lock = threading.Lock()
+        limiter = AdaptiveConcurrencyLimiter(max_workers)
+
+        def download_part(index: int) -> None:
+            start, end = part_ranges[index]
+            with limiter.slot(end - start), self._transfer_budget.connections():
+                digest = self._download_part(bucket_name, key, object_etag, part_path, part_ranges[index])
+            with state_lock:
+                part_digests[index] = digest
+                with open(state_path, "w") as state_file:
+                    json.dump(
+                        {"etag": object_etag, "size": object_size, "part_size": part_size, "parts": part_digests},
+                        state_file,
+                    )
+
+        with futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing_parts)))) as executor:
+            list(executor.map(download_part, missing_parts))
+
+        if not self._is_download_valid(bucket_name, key, object_etag, part_path, part_digests):
+            part_path.unlink()
+            state_path.unlink()
+            msg = (
+                f"Downloaded file {file_path.name!r} does not match the ETag {object_etag} of "
+                f"s3://{bucket_name}/{key}."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        os.replace(part_path, file_path)
+        state_path.unlink(missing_ok=True)
         return file_path
 
+    def download_file_head(self, destination_directory: Path, bucket_name: str, key: str, max_bytes: int) -> Path:
+        """Downloads the leading bytes of a line-delimited file from S3, trimmed to whole lines.
+
+        Only the byte range `[0, max_bytes)` of the object is requested. If the object is larger than `max_bytes`,
+        the downloaded bytes are cut after the last newline, so the file ends with a complete line, e.g. the header
+        and the first rows of a CSV file. Objects no larger than `max_bytes` are downloaded in full.
+
+        Args:
+            destination_directory: Destination directory where the file should be saved.
+            bucket_name: Name of the S3 bucket.
+            key: Key of the file to fetch.
+            max_bytes: Maximum number of leading bytes to download.
+
+        Raises:
+            ValueError: If the leading `max_bytes` bytes of the object do not contain a complete line.
+
+        Returns:
+            Path where the file is saved.
+        """
+        file_path = destination_directory / Path(key).name
+        part_path = file_path.with_name(file_path.name + ".part")
+
+        with self._transfer_budget.connections():
+            response = self._client.get_object(Bucket=bucket_name, Key=key, Range=f"bytes=0-{max_bytes - 1}")
+            blocks: list[bytes] = []
+            for block in response["Body"].iter_chunks(S3_TRANSFER_BLOCK_SIZE):
+                self._transfer_budget.consume(len(block))
+                blocks.append(block)
+        body = b"".join(blocks)
+
+        size = int(response.get("ContentRange", f"/{len(body)}").rsplit("/", 1)[-1])
+        if size > len(body):
+            line_end = body.rfind(b"\n")
+            if line_end == -1:
+                msg = f"The first {max_bytes} bytes of s3://{bucket_name}/{key} do not contain a complete line."
+                logger.error(msg)
+                raise ValueError(msg)
+            body = body[: line_end + 1]
+
+        part_path.write_bytes(body)
+        os.replace(part_path, file_path)
+        return file_path
+
+    @staticmethod
+    def _get_download_part_size(etag: str, size: int, num_workers: int) -> int:
+        """Gets the size of the byte ranges used to download an object.
+
+        For objects uploaded in multiple parts, the part size is inferred from the number of parts in the ETag as
+        the smallest whole number of MiB, of at least `S3_MIN_UPLOAD_PART_SIZE` bytes, that splits the object into that
+        many parts. This matches uploads with uniform parts of a whole number of MiB, as made by `boto3` and the AWS
+        CLI, so that the MD5 digests of the downloaded ranges can be used to reconstruct the multipart ETag.
+        Otherwise the size is chosen based on the object size and number of workers, between
+        `S3_DOWNLOAD_PART_SIZE` and `S3_MAX_DOWNLOAD_PART_SIZE`.
+
+        Args:
+            etag: ETag of the object.
+            size: Size of the object in bytes.
+            num_workers: Number of workers downloading the byte ranges concurrently.
+
+        Returns:
+            The size of the byte ranges in bytes.
+        """
+        part_count = get_etag_part_count(etag)
+        if part_count > 1:
+            part_size = max(S3_MIN_UPLOAD_PART_SIZE, math.ceil(size / part_count / 1024**2) * 1024**2)
+            if math.ceil(size / part_size) == part_count:
+                return part_size
+        return get_adaptive_part_size(size, num_workers, S3_DOWNLOAD_PART_SIZE, S3_MAX_DOWNLOAD_PART_SIZE)
+
+    def _load_download_state(
+        self, part_path: Path, state_path: Path, etag: str, size: int, part_size: int
+    ) -> dict[int, str]:
+        """Loads the state of a partial download, or prepares a new download if there is nothing to resume.
+
+        The recorded ranges of a partial download of the same object version are verified against their MD5 digests,
+        ranges that do not match are downloaded again.
+
+        Args:
+            part_path: Path to the temporary `.part` file.
+            state_path: Path to the `.part.json` state file.
+            etag: ETag of the object.
+            size: Size of the object in bytes.
+            part_size: Size of the byte ranges in bytes.
+
+        Returns:
+            A dictionary mapping the indices of the already downloaded ranges to their MD5 digests.
+        """
+        try:
+            with open(state_path) as state_file:
+                state = json.load(state_file)
+        except (OSError, json.JSONDecodeError):
+            state = {}
+
+        if (
+            not part_path.exists()
+            or part_path.stat().st_size != size
+            or (state.get("etag"), state.get("size"), state.get("part_size")) != (etag, size, part_size)
+        ):
+            with open(part_path, "wb") as part_file:
+                part_file.truncate(size)
+            return {}
+
+        part_digests: dict[int, str] = {}
+        with open(part_path, "rb") as part_file:
+            for index, digest in state.get("parts", {}).items():
+                part_file.seek(int(index) * part_size)
+                if hashlib.md5(part_file.read(min(part_size, size - int(index) * part_size))).hexdigest() == digest:
+                    part_digests[int(index)] = digest
+        return part_digests
+
+    def _download_part(
+        self, bucket_name: str, key: str, etag: str, part_path: Path, part_range: tuple[int, int]
+    ) -> str:
+        """Downloads a byte range of an object into the temporary `.part` file.
+
+        The body is streamed in blocks that are throttled by the bandwidth budget of the client.
+
+        Args:
+            bucket_name: Name of the S3 bucket.
+            key: Key of the object.
+            etag: ETag of the object, the download fails if the object has changed since the download started.
+            part_path: Path to the temporary `.part` file.
+            part_range: The start (inclusive) and end (exclusive) offsets of the byte range.
+
+        Returns:
+            The MD5 digest of the downloaded byte range.
+        """
+        response = self._client.get_object(
+            Bucket=bucket_name, Key=key, IfMatch='"%s"' % etag, Range=f"bytes={part_range[0]}-{part_range[1] - 1}"
+        )
+        part_hash = hashlib.md5()
+        with open(part_path, "r+b") as part_file:
+            part_file.seek(part_range[0])
+            for block in response["Body"].iter_chunks(S3_TRANSFER_BLOCK_SIZE):
+                self._transfer_budget.consume(len(block))
+                part_hash.update(block)
+                part_file.write(block)
+        return part_hash.hexdigest()
+
+    def _is_download_valid(
+        self, bucket_name: str, key: str, etag: str, part_path: Path, part_digests: dict[int, str]
+    ) -> bool:
+        """Verifies a downloaded file against the ETag of the object.
+
+        The encryption of the object is only requested with a `HEAD` request if the ETag does not match, since the
+        ETags of objects encrypted with SSE-KMS or SSE-C are not MD5 digests of their contents.
+
+        Args:
+            bucket_name: Name of the S3 bucket.
+            key: Key of the object.
+            etag: ETag of the object, without surrounding quotes.
+            part_path: Path to the downloaded `.part` file.
+            part_digests: MD5 digests of the downloaded byte ranges.
+
+        Returns:
+            False if the ETag is a single-part MD5 digest that does not match the file, True otherwise.
+        """
+        part_count = get_etag_part_count(etag)
+        if part_count == 0:
+            file_hash = hashlib.md5()
+            with open(part_path, "rb") as part_file:
+                for block in iter(lambda: part_file.read(S3_DOWNLOAD_PART_SIZE), b""):
+                    file_hash.update(block)
+            if file_hash.hexdigest() == etag:
+                return True
+        elif part_count == len(part_digests):
+            if get_multipart_etag([part_digests[index] for index in range(part_count)]) == etag:
+                return True
+        else:
+            logger.debug(f"Cannot determine the part layout of multipart ETag {etag}, skipping verification.")
+            return True
+
+        head = self._client.head_object(Bucket=bucket_name, Key=key)
+        if head.get("ServerSideEncryption", "").startswith("aws:kms") or "SSECustomerAlgorithm" in head:
+            return True
+        if part_count > 0:
+            logger.warning(
+                f"Downloaded file {part_path.name!r} does not match the multipart ETag {etag}, the parts of "
+                f"s3://{bucket_name}/{key} were presumably uploaded with different sizes, skipping verification."
+            )
+            return True
+        return False
+
     def upload_file(
         self,
         file_path: Path,
@@ -128,6 +699,10 @@ class S3Client:
     ) -> S3FileManifest:
         """Uploads a file to S3.
 
+        Files above the multipart threshold are uploaded in parts sized by `get_adaptive_part_size`, using
+        `num_workers` concurrent requests reserved from the connection budget of the client. The upload is throttled
+        by the bandwidth budget of the client.
+
         Args:
             file_path: Path to the file to upload.
             bucket_name: Name of the S3 bucket.
@@ -142,14 +717,25 @@ class S3Client:
             S3 manifest entry for the uploaded file.
         """
         file_key = Path(key_prefix) / file_path.name
-        self._client.upload_file(
-            Filename=str(file_path),
-            Bucket=bucket_name,
-            Key=str(file_key),
-            ExtraArgs=extra_args,
-            Config=self._get_boto_transfer_config(num_workers, multipart_threshold_gb),
+        size = file_path.stat().st_size
+        transfer_config = self._get_boto_transfer_config(
+            num_workers,
+            multipart_threshold_gb,
+            get_adaptive_part_size(size, num_workers, S3_UPLOAD_PART_SIZE, S3_MAX_UPLOAD_PART_SIZE),
+        )
+        n_requests = (
+            math.ceil(size / transfer_config.multipart_chunksize) if size > transfer_config.multipart_threshold else 1
         )
-        return S3FileManifest(key=file_key, size=file_path.stat().st_size, last_modified=datetime.datetime.now())
+        with self._transfer_budget.connections(min(num_workers, n_requests)):
+            self._client.upload_file(
+                Filename=str(file_path),
+                Bucket=bucket_name,
+                Key=str(file_key),
+                ExtraArgs=extra_args,
+                Config=transfer_config,
+                Callback=self._transfer_budget.consume,
+            )
+        return S3FileManifest(key=file_key, size=size, last_modified=datetime.datetime.now())
 
     def read_object(self, bucket_name: str, key: str) -> bytes:
         """Reads the contents of a object from S3.
@@ -181,9 +767,15 @@ class S3Client:
         key_prefix: str,
         manifest_file_name: str | None = "manifest",
         file_pattern: str | list[str] = "*",
+        num_workers: int = 1,
     ) -> list[S3FileManifest]:
         """Gets the S3 manifest for the files in the S3 bucket.
 
+        The objects are listed using paginated `list_objects_v2` requests, so prefixes with more than 1,000 objects
+        are listed completely. If `num_workers` is greater than 1, the `/`-delimited sub-prefixes of the key prefix
+        are discovered and listed concurrently, see `S3_LISTING_FANOUT_DEPTH`. The listed objects are matched
+        against the file pattern as they arrive, so only matching entries are kept in memory.
+
         Args:
             bucket_name: Name of the S3 bucket.
             key_prefix: Key prefix to the files in the S3 bucket.
@@ -191,50 +783,144 @@ class S3Client:
                 be used to determine the files to include, before applying the file pattern.
             file_pattern: Pattern to match the files to download, e.g. `*.csv` or [`*.csv`, `*.json`], etc.
                 For more information, see https://docs.python.org/3/library/fnmatch.html.
+            num_workers: Number of threads used to list sub-prefixes concurrently.
 
         Raises:
             FileNotFoundError: If no files matching the file pattern are found in the S3 bucket.
 
         Returns:
             A list of `S3FileManifest` objects containing the S3 keys, sizes, and last modified dates of the files in
-            the S3 bucket.
+            the S3 bucket, sorted by key.
         """
         if isinstance(file_pattern, str):
             file_pattern = [file_pattern]
 
-        s3_contents = [
-            entry
-            for entry in self._client.list_objects(
-                Bucket=bucket_name,
-                Prefix=key_prefix,
-            ).get("Contents", [])
-            if "LastModified" in entry and "Key" in entry and "Size" in entry
-        ]
-
-        if manifest_file_name is not None:
-            manifest_file_key = next(
-                (entry["Key"] for entry in s3_contents if entry["Key"].endswith(manifest_file_name)), None
-            )
+        def get_relative_key(key: str) -> str:
+            return key.split(key_prefix)[-1].lstrip("/")
 
-            if manifest_file_key:
-                manifest: set[str] = {
-                    entry["url"].split(key_prefix)[-1].lstrip("/")
-                    for entry in json.loads(S3Client().read_object(bucket_name, manifest_file_key)).get("entries", [])
-                    if "url" in entry
-                }
+        manifest_file_key: str | None = None
+        s3_contents: list[dict[str, Any]] = []
+        for entry in self._list_objects(bucket_name, key_prefix, num_workers):
+            if (
+                manifest_file_name is not None
+                and entry["Key"].endswith(manifest_file_name)
+                and (manifest_file_key is None or entry["Key"] < manifest_file_key)
+            ):
+                manifest_file_key = entry["Key"]
+            if any(fnmatch(get_relative_key(entry["Key"]), pattern) for pattern in file_pattern):
+                s3_contents.append(entry)
 
-                s3_contents = [
-                    entry for entry in s3_contents if entry["Key"].split(key_prefix)[-1].lstrip("/") in manifest
-                ]
+        if manifest_file_key is not None:
+            manifest: set[str] = {
+                get_relative_key(entry["url"])
+                for entry in json.loads(self.read_object(bucket_name, manifest_file_key)).get("entries", [])
+                if "url" in entry
+            }
+            s3_contents = [entry for entry in s3_contents if get_relative_key(entry["Key"]) in manifest]
 
         s3_manifest: list[S3FileManifest] = [
-            S3FileManifest(key=Path(entry["Key"]), size=entry["Size"], last_modified=entry["LastModified"])
-            for entry in s3_contents
-            if any(fnmatch(entry["Key"].split(key_prefix)[-1].lstrip("/"), pattern) for pattern in file_pattern)
+            S3FileManifest(
+                key=Path(entry["Key"]),
+                size=entry["Size"],
+                last_modified=entry["LastModified"],
+                etag=entry["ETag"].strip('"') if "ETag" in entry else None,
+            )
+            for entry in sorted(s3_contents, key=lambda entry: entry["Key"])
         ]
 
         return s3_manifest
 
+    def _list_objects(self, bucket_name: str, key_prefix: str, num_workers: int = 1) -> Iterator[dict[str, Any]]:
+        """Lists all objects under the key prefix, concurrently over its sub-prefixes if `num_workers > 1`.
+
+        Sub-prefixes are discovered level by level with `/`-delimited listings, until there are at least
+        `num_workers` of them or `S3_LISTING_FANOUT_DEPTH` levels have been expanded. Each remaining sub-prefix
+        is then listed completely in its own thread. The objects are yielded in no particular order.
+
+        Args:
+            bucket_name: Name of the S3 bucket.
+            key_prefix: Key prefix to list.
+            num_workers: Number of threads used to list sub-prefixes concurrently.
+
+        Yields:
+            The `list_objects_v2` entries of the objects under the key prefix.
+        """
+        if num_workers <= 1:
+            for contents, _ in self._iterate_object_pages(bucket_name, key_prefix, delimiter=None):
+                yield from contents
+            return
+
+        with futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+            prefixes = [key_prefix]
+            for _ in range(S3_LISTING_FANOUT_DEPTH):
+                if len(prefixes) >= num_workers:
+                    break
+
+                sub_prefixes: list[str] = []
+                for contents, common_prefixes in executor.map(
+                    lambda prefix: self._list_objects_level(bucket_name, prefix, delimiter="/"), prefixes
+                ):
+                    yield from contents
+                    sub_prefixes.extend(common_prefixes)
+                prefixes = sub_prefixes
+                if not prefixes:
+                    return
+
+            for contents, _ in executor.map(
+                lambda prefix: self._list_objects_level(bucket_name, prefix, delimiter=None), prefixes
+            ):
+                yield from contents
+
+    def _list_objects_level(
+        self, bucket_name: str, key_prefix: str, delimiter: str | None
+    ) -> tuple[list[dict[str, Any]], list[str]]:
+        """Lists the objects under the key prefix, following all pages of `list_objects_v2`.
+
+        Args:
+            bucket_name: Name of the S3 bucket.
+            key_prefix: Key prefix to list.
+            delimiter: If set, only the objects directly under the key prefix are listed, and the common prefixes
+                up to the next delimiter are returned as well.
+
+        Returns:
+            A tuple of the object entries and the common prefixes.
+        """
+        contents: list[dict[str, Any]] = []
+        common_prefixes: list[str] = []
+        for page_contents, page_common_prefixes in self._iterate_object_pages(bucket_name, key_prefix, delimiter):
+            contents.extend(page_contents)
+            common_prefixes.extend(page_common_prefixes)
+        return contents, common_prefixes
+
+    def _iterate_object_pages(
+        self, bucket_name: str, key_prefix: str, delimiter: str | None
+    ) -> Iterator[tuple[list[dict[str, Any]], list[str]]]:
+        """Iterates over the pages of a paginated `list_objects_v2` listing of the key prefix.
+
+        Args:
+            bucket_name: Name of the S3 bucket.
+            key_prefix: Key prefix to list.
+            delimiter: If set, only the objects directly under the key prefix are listed, and the common prefixes
+                up to the next delimiter are returned as well.
+
+        Yields:
+            A tuple of the object entries and the common prefixes of each page.
+        """
+        paginator = self._client.get_paginator("list_objects_v2")
+        pagination_kwargs = {"Bucket": bucket_name, "Prefix": key_prefix}
+        if delimiter is not None:
+            pagination_kwargs["Delimiter"] = delimiter
+
+        for page in paginator.paginate(**pagination_kwargs):
+            yield (
+                [
+                    entry
+                    for entry in page.get("Contents", [])
+                    if "LastModified" in entry and "Key" in entry and "Size" in entry
+                ],
+                [entry["Prefix"] for entry in page.get("CommonPrefixes", []) if "Prefix" in entry],
+            )
+
     def put_s3_manifest(self, bucket_name: str, key: str, s3_manifest: list[S3FileManifest]) -> None:
         """Puts a S3 manifest to the specified key in the S3 bucket.
 
@@ -271,6 +957,44 @@ class S3Client:
                 return False
         return True
 
+    def get_outdated_files(
+        self,
+        local_directory: Path | str,
+        local_files: list[LocalFileEntry],
+        s3_manifest: list[S3FileManifest],
+    ) -> list[S3FileManifest]:
+        """Gets the S3 files that are missing or outdated in the local dataset.
+
+        A file is up to date if it exists locally with the size recorded in the local manifest, and the local
+        manifest entry matches the size, ETag (stored as `hash`) and last modified date of the S3 file. The ETag and
+        last modified date are only compared if they are recorded in the local manifest entry.
+
+        Args:
+            local_directory: Local directory where the files are stored.
+            local_files: Entries of the local manifest describing the files in the local directory.
+            s3_manifest: S3 manifest containing the files to compare.
+
+        Returns:
+            The entries of the S3 manifest that need to be downloaded.
+        """
+        local_directory = Path(local_directory)
+        local_entries: dict[str, list[LocalFileEntry]] = {}
+        for local_file in local_files:
+            local_entries.setdefault(local_file.name, []).append(local_file)
+
+        def is_up_to_date(s3_file: S3FileManifest) -> bool:
+            local_path = local_directory / s3_file.key.name
+            if not local_path.exists() or local_path.stat().st_size != s3_file.size:
+                return False
+            return any(
+                local_file.size == s3_file.size
+                and (local_file.hash is None or local_file.hash == s3_file.etag)
+                and (local_file.last_modified is None or local_file.last_modified == s3_file.last_modified.isoformat())
+                for local_file in local_entries.get(s3_file.key.name, [])
+            )
+
+        return [s3_file for s3_file in s3_manifest if not is_up_to_date(s3_file)]
+
     def is_s3_dataset_up_to_date(
         self,
         local_directory: list[Path] | list[str],
@@ -296,12 +1020,14 @@ class S3Client:
         self,
         num_workers: int,
         multipart_threshold_gb: float,
+        multipart_chunksize: int = S3_UPLOAD_PART_SIZE,
     ) -> BotoTransferConfig:
         """Returns a Boto transfer configuration based on the number of workers and multipart threshold.
 
         Args:
-            num_workers: Number of workers to use for downloading the file.
+            num_workers: Number of workers to use for transferring the file.
             multipart_threshold_gb: Threshold in GB for multipart transfer.
+            multipart_chunksize: Size in bytes of the parts of a multipart transfer.
 
         Returns:
             Boto transfer configuration.
@@ -310,4 +1036,5 @@ class S3Client:
             use_threads=True if num_workers > 1 else False,
             max_concurrency=num_workers,
             multipart_threshold=int(multipart_threshold_gb * 1024**3),
+            multipart_chunksize=multipart_chunksize,
         )
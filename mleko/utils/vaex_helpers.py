@@ -2,9 +2,42 @@
 
 from __future__ import annotations
 
+import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Literal
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import vaex
+import vaex.array_types
+import vaex.arrow.dataset
+import vaex.serialize
+from vaex.expression import FunctionSerializableNumba
+
+
+EVALUATION_CHUNK_SIZE = 1_000_000
+"""A module-level constant representing the number of rows per chunk when iterating over a DataFrame."""
+
+MAX_PARTIAL_UNIQUE_VALUES = 64
+"""Number of partial per-chunk unique values of an expression that are kept before they are combined."""
+
+JIT_KERNEL_CACHE_SIZE = 256
+"""Maximum number of compiled `numba` kernels kept in `JIT_KERNEL_CACHE`."""
+
+JIT_KERNEL_CACHE: OrderedDict[tuple[str, ...], Callable[..., np.ndarray]] = OrderedDict()
+"""Compiled `numba` kernels of JIT-compiled expressions, keyed by the expression and the types of its arguments.
+
+The cache is bounded to the `JIT_KERNEL_CACHE_SIZE` most recently used kernels, so long-running processes compiling
+many distinct expressions do not hold on to every kernel. The kernels are built by `vaex` from generated source code,
+which the on-disk cache of `numba` (`cache=True`) cannot persist, so they are only cached in memory.
+"""
+
+_JIT_KERNEL_CACHE_LOCK = threading.Lock()
+"""A module-level lock guarding `JIT_KERNEL_CACHE`, as kernels are compiled from the chunk evaluation threads."""
 
 
 def get_column(df: vaex.DataFrame, column: str) -> vaex.Expression:
@@ -92,6 +125,327 @@ def get_indices(df: vaex.DataFrame, indices: list[int]) -> vaex.DataFrame:
     return selection.extract()
 
 
+def is_dictionary_encoded(df: vaex.DataFrame, column: str) -> bool:
+    """Check whether a column is stored as an Arrow dictionary-encoded array.
+
+    Args:
+        df: The input DataFrame.
+        column: The name of the column to check.
+
+    Returns:
+        True if the column is dictionary-encoded, False otherwise.
+    """
+    return get_column(df, column).dtype.is_encoded
+
+
+def get_dictionary_codes(df: vaex.DataFrame, column: str) -> vaex.Expression:
+    """Get the integer codes of a dictionary-encoded column as an Expression.
+
+    Missing values are given the code `-1`, so that the codes can be used directly in hash-based operations
+    such as `unique`, `nunique` and `map`.
+
+    Warning:
+        The codes are only meaningful if all chunks of the column share the same dictionary, which is the case
+        for DataFrames produced by the `CSVToVaexConverter`.
+
+    Args:
+        df: The input DataFrame.
+        column: The name of the dictionary-encoded column.
+
+    Returns:
+        The integer codes of the column as an Expression.
+
+    Examples:
+        >>> import pyarrow as pa
+        >>> import vaex
+        >>> from mleko.utils import get_dictionary_codes
+        >>> df = vaex.from_arrays(x=pa.array(["a", "b", None, "a"]).dictionary_encode())
+        >>> get_dictionary_codes(df, "x").tolist()
+        [0, 1, -1, 0]
+    """
+    return get_column(df, column).index_values().fillmissing(-1)
+
+
+def get_dictionary_labels(df: vaex.DataFrame, column: str) -> list[str]:
+    """Get the labels of a dictionary-encoded column, ordered by their integer codes.
+
+    Args:
+        df: The input DataFrame.
+        column: The name of the dictionary-encoded column.
+
+    Returns:
+        List of labels, where the label at index `i` corresponds to the code `i`.
+    """
+    return df.category_labels(column)
+
+
+def map_dictionary_encoded(
+    df: vaex.DataFrame,
+    column: str,
+    mapping: dict[Any, Any],
+    default_value: Any = None,
+    missing_value: Any = None,
+) -> vaex.Expression:
+    """Map the labels of a dictionary-encoded column to new values by operating on the integer codes.
+
+    The mapping is translated from labels to codes once per dictionary entry, so the per-row work is an
+    integer lookup rather than a string comparison.
+
+    Args:
+        df: The input DataFrame.
+        column: The name of the dictionary-encoded column.
+        mapping: Mapping from labels to new values.
+        default_value: Value for labels that are not present in the mapping.
+        missing_value: Value for missing entries.
+
+    Returns:
+        The mapped column as an Expression.
+
+    Examples:
+        >>> import pyarrow as pa
+        >>> import vaex
+        >>> from mleko.utils import map_dictionary_encoded
+        >>> df = vaex.from_arrays(x=pa.array(["a", "b", None, "c"]).dictionary_encode())
+        >>> map_dictionary_encoded(df, "x", {"a": 1, "b": 2}, default_value=0, missing_value=-1).tolist()
+        [1, 2, -1, 0]
+    """
+    code_mapping = {
+        code: mapping.get(label, default_value) for code, label in enumerate(get_dictionary_labels(df, column))
+    }
+    code_mapping[-1] = missing_value
+    return get_dictionary_codes(df, column).map(code_mapping)
+
+
+def get_unique_values(
+    df: vaex.DataFrame, expressions: list[str], chunk_size: int = EVALUATION_CHUNK_SIZE
+) -> list[pa.Array]:
+    """Get the unique values of multiple expressions in a single pass over the DataFrame.
+
+    All expressions are evaluated chunk by chunk by a shared iterator, which prefetches the next chunk in parallel,
+    so the data is read once regardless of the number of expressions. The unique values are computed with the
+    hash-based Arrow `unique` kernel, first per chunk and then across chunks, and are kept in order of their first
+    occurrence, without converting them to Python objects. The partial unique values of the chunks are combined
+    every `MAX_PARTIAL_UNIQUE_VALUES` chunks, so memory is bounded by the number of unique values rather than by the
+    number of chunks.
+
+    Args:
+        df: The input DataFrame.
+        expressions: The names of the columns or the expressions to get the unique values of.
+        chunk_size: Number of rows to evaluate at once.
+
+    Returns:
+        For each expression, an Arrow array of its unique values, including a null for missing values.
+
+    Examples:
+        >>> import vaex
+        >>> from mleko.utils import get_unique_values
+        >>> df = vaex.from_arrays(x=["b", "a", "b", None], y=[3, 1, 3, 2])
+        >>> [values.to_pylist() for values in get_unique_values(df, ["x", "y"])]
+        [['b', 'a', None], [3, 1, 2]]
+    """
+    chunk_unique_values: list[list[pa.Array]] = [[] for _ in expressions]
+    if len(expressions) > 0 and len(df) > 0:
+        for _, _, chunks in df.evaluate_iterator(list(expressions), chunk_size=chunk_size, array_type="arrow"):
+            for values, chunk in zip(chunk_unique_values, chunks):
+                values.append(pc.unique(chunk))
+                if len(values) >= MAX_PARTIAL_UNIQUE_VALUES:
+                    values[:] = [pc.unique(pa.chunked_array(values))]
+
+    return [
+        pc.unique(pa.chunked_array(values, type=df[expression].dtype.arrow))
+        for expression, values in zip(expressions, chunk_unique_values)
+    ]
+
+
+def get_value_positions(values: pa.Array | pa.ChunkedArray, value_set: pa.Array) -> pa.Array | pa.ChunkedArray:
+    """Get the position of each value in a set of values using the hash-based Arrow `index_in` kernel.
+
+    Dictionary-encoded values are looked up by their dictionary only, and the positions of the dictionary are taken
+    at their indices, so each distinct value is hashed once per chunk.
+
+    Args:
+        values: Plain or dictionary-encoded values, as an Arrow array or chunked array.
+        value_set: The unique values to look up the values in.
+
+    Returns:
+        Position of each value in `value_set`, null for null values and values that are not in `value_set`.
+
+    Examples:
+        >>> import pyarrow as pa
+        >>> from mleko.utils import get_value_positions
+        >>> get_value_positions(pa.array(["b", None, "c"]).dictionary_encode(), pa.array(["a", "b"])).to_pylist()
+        [1, None, None]
+    """
+    if isinstance(values, pa.ChunkedArray):
+        return pa.chunked_array([get_value_positions(chunk, value_set) for chunk in values.chunks], pa.int32())
+    if pa.types.is_dictionary(values.type):
+        return pc.take(get_value_positions(values.dictionary, value_set), values.indices)
+    return pc.index_in(values, value_set=value_set)
+
+
+def get_expression_depth(df: vaex.DataFrame, column: str) -> int:
+    """Get the depth of the chain of virtual columns that is evaluated to compute a column.
+
+    Real columns have a depth of 0, and a virtual column has a depth of one more than the deepest column its
+    expression refers to. Deep chains are re-evaluated on every pass over the DataFrame, see `materialize_columns`.
+
+    Args:
+        df: The input DataFrame.
+        column: The name of the column.
+
+    Returns:
+        The depth of the column.
+
+    Examples:
+        >>> import vaex
+        >>> from mleko.utils import get_expression_depth
+        >>> df = vaex.from_arrays(x=[1, 2, 3])
+        >>> df["y"] = df.x * 2
+        >>> df["z"] = df.y + df.x
+        >>> get_expression_depth(df, "z")
+        2
+    """
+    depths: dict[str, int] = {}
+
+    def get_depth(name: str) -> int:
+        if name not in df.virtual_columns:
+            return 0
+        if name not in depths:
+            variables = df[df.virtual_columns[name]].variables(expand_virtual=False)
+            depths[name] = 1 + max((get_depth(variable) for variable in variables), default=0)
+        return depths[name]
+
+    return get_depth(column)
+
+
+def materialize_columns(df: vaex.DataFrame, columns: list[str], file_path: str | Path) -> vaex.DataFrame:
+    """Materialize virtual columns into a memory-mapped Arrow file.
+
+    Works like `vaex.DataFrame.materialize`, but the columns are evaluated in a single pass and written to an Arrow
+    IPC file, which is memory-mapped instead of being held in RAM. Filtered DataFrames are extracted first, so the
+    filter is evaluated only once as well.
+
+    Warning:
+        The file must exist for as long as the returned DataFrame, or any DataFrame derived from it, is used.
+
+    Args:
+        df: The input DataFrame.
+        columns: The names of the virtual columns to materialize.
+        file_path: Path of the Arrow file to write the materialized columns to.
+
+    Returns:
+        A new DataFrame in which the specified columns are real, memory-mapped columns.
+
+    Examples:
+        >>> import vaex
+        >>> from mleko.utils import materialize_columns
+        >>> df = vaex.from_arrays(x=[1, 2, 3])
+        >>> df["y"] = df.x * 2
+        >>> df = materialize_columns(df, ["y"], "y.arrow")
+        >>> list(df.virtual_columns), df.y.tolist()
+        ([], [2, 4, 6])
+    """
+    df = df.extract()
+    file_path = Path(file_path)
+    part_path = file_path.with_name(file_path.name + ".part")
+    df[columns].export_arrow(str(part_path))
+    os.replace(part_path, file_path)
+
+    df.dataset = df.dataset.merged(vaex.arrow.dataset.open(str(file_path), fs_options={}, fs=None))
+    for column in columns:
+        del df.virtual_columns[column]
+    return df
+
+
+@vaex.serialize.register
+class MaskedNumbaFunction(FunctionSerializableNumba):
+    """A `numba`-compiled expression that propagates missing values and reuses previously compiled kernels.
+
+    The kernel is a `numba` ufunc evaluated on the data of the arguments, and the result is masked wherever any of
+    the arguments is missing, like the default evaluator. Kernels are stored in `JIT_KERNEL_CACHE`, so the same
+    expression on arguments of the same types is only compiled once per process, unless it has been evicted as one of
+    the least recently used kernels.
+    """
+
+    def compile(self) -> Callable[..., np.ndarray]:
+        """Compiles the expression into a `numba` ufunc, or returns the cached kernel.
+
+        Returns:
+            The compiled kernel.
+        """
+        key = (
+            self.expression,
+            ",".join(self.arguments),
+            ",".join(str(dtype) for dtype in self.argument_dtypes),
+            str(self.return_dtype),
+        )
+        with _JIT_KERNEL_CACHE_LOCK:
+            if key in JIT_KERNEL_CACHE:
+                JIT_KERNEL_CACHE.move_to_end(key)
+                return JIT_KERNEL_CACHE[key]
+
+            kernel = super().compile()
+            JIT_KERNEL_CACHE[key] = kernel
+            while len(JIT_KERNEL_CACHE) > JIT_KERNEL_CACHE_SIZE:
+                JIT_KERNEL_CACHE.popitem(last=False)
+        return kernel
+
+    def __call__(self, *args: Any) -> np.ndarray:
+        """Evaluates the kernel on a chunk of the arguments.
+
+        Args:
+            args: The chunks of the arguments, as `numpy` or Arrow arrays.
+
+        Returns:
+            The result of the expression, masked where any of the arguments is missing. The result is always masked
+            if any of the arguments can contain missing values, as `vaex` infers the type of the result from a sample.
+        """
+        arrays = [vaex.array_types.to_numpy(arg) for arg in args]
+        result = self.f(*[np.ma.getdata(array) for array in arrays])
+        if any(isinstance(arg, (pa.Array, pa.ChunkedArray)) or np.ma.isMaskedArray(arg) for arg in args):
+            return np.ma.array(result, mask=np.logical_or.reduce([np.ma.getmaskarray(array) for array in arrays]))
+        return result
+
+
+def jit_expression(
+    df: vaex.DataFrame, expression: str, backend: Literal["numba", "pythran"] = "numba"
+) -> vaex.Expression:
+    """JIT-compiles an expression into a single kernel.
+
+    Virtual columns referenced by the expression are expanded first, so that a chain of virtual columns is fused
+    into one kernel evaluated on the real columns. The `numba` backend propagates missing values and caches the
+    compiled kernels, see `MaskedNumbaFunction`, while the `pythran` backend uses `vaex.Expression.jit_pythran`.
+
+    Warning:
+        Only numerical and boolean expressions built from arithmetic, comparisons and `numpy` functions can be
+        compiled, any other expression raises an error.
+
+    Args:
+        df: The DataFrame the expression belongs to, the compiled function is registered on it.
+        expression: The expression to compile.
+        backend: The JIT backend to use.
+
+    Raises:
+        Exception: If the expression cannot be compiled by the backend, the type depends on the backend.
+
+    Returns:
+        The expression calling the compiled kernel.
+
+    Examples:
+        >>> import vaex
+        >>> from mleko.utils import jit_expression
+        >>> df = vaex.from_arrays(a=[1.0, 2.0, 4.0], b=[4.0, 1.0, 16.0])
+        >>> jit_expression(df, "a / b + sqrt(b)").tolist()
+        [2.25, 3.0, 4.25]
+    """
+    expanded = get_column(df, expression).expand()
+    if backend == "pythran":
+        return expanded.jit_pythran()
+
+    function = MaskedNumbaFunction.build(expanded.expression, df=df)
+    return df.add_function("_jit", function, unique=True)(*function.arguments)
+
+
 @dataclass(frozen=True)
 class HashableVaexDataFrame:
     """An immutable hashable wrapper around a `vaex.DataFrame`."""
@@ -158,7 +158,7 @@ def tests(session: Session) -> None:
         session: The Session object.
     """
     session.install(".")
-    session.install("coverage[toml]", "pytest", "pytest-mock", "pygments", "moto")
+    session.install("coverage[toml]", "pytest", "pytest-mock", "pygments", "moto[server]")
     try:
         session.run(
             "coverage", "run", "--parallel", "--concurrency=multiprocessing,thread", "-m", "pytest", *session.posargs
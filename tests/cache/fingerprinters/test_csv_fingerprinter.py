@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import bz2
+import lzma
 from pathlib import Path
 
+import pyarrow as pa
 import pytest
 
 from mleko.cache.fingerprinters.csv_fingerprinter import CSVFingerprinter
@@ -54,3 +57,14 @@ class TestCSVFingerprinter:
         except ValueError:
             value_error = True
         assert value_error is True
+
+    def test_compressed_file_types(self, temporary_directory: Path):
+        """Should produce the same fingerprint for raw and compressed copies of the same files."""
+        original_fingerprint = self.csv_fingerprinter.fingerprint(self.file_paths)
+
+        for suffix, compress in [(".bz2", bz2.compress), (".xz", lzma.compress), (".zst", pa.Codec("zstd").compress)]:
+            compressed_file_paths = [file_path.with_suffix(f".csv{suffix}") for file_path in self.file_paths]
+            for file_path, compressed_file_path in zip(self.file_paths, compressed_file_paths):
+                compressed_file_path.write_bytes(compress(file_path.read_bytes()))
+
+            assert self.csv_fingerprinter.fingerprint(compressed_file_paths) == original_fingerprint
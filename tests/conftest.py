@@ -4,8 +4,13 @@ from __future__ import annotations
 
 import csv
 import gzip
+import hashlib
+import os
+import socket
 import tempfile
+import threading
 import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Generator
 
@@ -23,6 +28,126 @@ def temporary_directory() -> Generator[Path, None, None]:
         yield Path(temporary_directory)
 
 
+@pytest.fixture(scope="session")
+def moto_server() -> Generator[str, None, None]:
+    """Start a local moto S3 server, for code that does not go through `boto3`, e.g. the `pyarrow` S3 filesystem.
+
+    The server requires the `server` extra of `moto`, so it is imported lazily and only tests using the fixture need
+    it.
+
+    Yields:
+        str: The endpoint URL of the moto server.
+    """
+    from moto.server import ThreadedMotoServer
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setitem(os.environ, "AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setitem(os.environ, "AWS_SECRET_ACCESS_KEY", "testing")
+        yield f"http://127.0.0.1:{port}"
+    server.stop()
+
+
+class RangeRequestServer(ThreadingHTTPServer):
+    """Local HTTP server serving in-memory files, a stand-in for HTTP(S) servers supporting range requests."""
+
+    def __init__(self) -> None:
+        """Start listening on a free local port."""
+        super().__init__(("127.0.0.1", 0), RangeRequestHandler)
+        self.files: dict[str, bytes] = {}
+        """Contents of the served files by URL path, e.g. `/data.csv`."""
+
+        self.truncated_ranges: dict[int, int] = {}
+        """Number of bytes to send for range requests starting at the given offset, to simulate interruptions."""
+
+        self.request_log: list[tuple[str, str, str | None]] = []
+        """Method, path and `Range` header of every request received."""
+
+        self.compress_responses = False
+        """Whether full responses are gzip-compressed for clients accepting `gzip` content encoding."""
+
+        self.ignore_conditional_requests = False
+        """Whether `If-None-Match` is ignored, like servers answering conditional requests with full responses."""
+
+    def get_url(self, path: str) -> str:
+        """Return the URL of a file served by the server."""
+        return f"http://127.0.0.1:{self.server_port}{path}"
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """Request handler of `RangeRequestServer` supporting `HEAD`, `Range`, `If-Range` and `If-None-Match`."""
+
+    protocol_version = "HTTP/1.1"
+    server: RangeRequestServer
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        """Respond with the headers of a file."""
+        self._respond(send_body=False)
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Respond with a file or a range of a file."""
+        self._respond(send_body=True)
+
+    def log_message(self, format: str, *args) -> None:
+        """Silence the request logging."""
+
+    def _respond(self, send_body: bool) -> None:
+        """Respond to a request, honoring the conditional and range headers."""
+        self.server.request_log.append((self.command, self.path, self.headers.get("Range")))
+        body = self.server.files.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if not self.server.ignore_conditional_requests and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        range_header = self.headers.get("Range")
+        if range_header is not None and self.headers.get("If-Range", etag) == etag:
+            start, end = (int(value) for value in range_header.split("=")[1].split("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+            body = body[start : end + 1][: self.server.truncated_ranges.get(start)]
+        else:
+            self.send_response(200)
+            if self.server.compress_responses and "gzip" in self.headers.get("Accept-Encoding", ""):
+                self.send_header("Content-Encoding", "gzip")
+                body = gzip.compress(body)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+@pytest.fixture
+def http_server() -> Generator[RangeRequestServer, None, None]:
+    """Start a local HTTP server supporting range and conditional requests, see `RangeRequestServer`.
+
+    Yields:
+        RangeRequestServer: The running server, files are served once added to its `files` dictionary.
+    """
+    server = RangeRequestServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
 def generate_csv_files(directory_path: Path, n_files: int, gzipped: bool = False) -> list[Path]:
     """Generate a number CSV sample files to the specified directory.
 
@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+import bz2
+import csv
 import glob
+import json
+import lzma
 from pathlib import Path
 from unittest.mock import patch
 
+import boto3
+import pyarrow as pa
+import pytest
 import vaex
+from pyarrow import csv as arrow_csv
 
-from mleko.dataset.convert.csv_to_vaex_converter import CSVToVaexConverter
+from mleko.dataset.convert.csv_to_vaex_converter import SMALL_TASK_BATCH_SIZE, CSVToVaexConverter
+from mleko.utils.s3_helpers import S3Client
+from mleko.utils.vaex_helpers import get_dictionary_codes, get_dictionary_labels
 from tests.conftest import generate_csv_files
 
 
@@ -111,3 +121,454 @@ class TestCSVToVaexConverter:
         assert ds.get_type("Is_Best") == "boolean"
         assert "Count" not in ds.get_features()
         df.close()
+
+    def test_dictionary_encode_threshold(self, temporary_directory: Path):
+        """Should dictionary-encode string columns with at most `dictionary_encode_threshold` distinct values."""
+        csv_to_arrow_converter = CSVToVaexConverter(
+            cache_directory=temporary_directory, dictionary_encode_threshold=3, num_workers=1
+        )
+
+        n_files = 3
+        file_paths = generate_csv_files(temporary_directory, n_files)
+        ds, df = csv_to_arrow_converter.convert(file_paths)
+
+        assert df["Name"].dtype.is_encoded
+        assert not df["_class"].dtype.is_encoded
+        assert "Name" in ds.get_features(["categorical"])
+        assert df.Name.tolist() == ["Linux", "Windows", None, "MacOS"] * n_files
+        assert sorted(df.category_labels("Name")) == ["Linux", "MacOS", "Windows"]
+        df.close()
+
+    def test_dictionary_encoding_sample(self, temporary_directory: Path):
+        """Should only sample the files needed to reach `DICTIONARY_ENCODING_SAMPLE_ROWS` rows."""
+        file_paths = generate_csv_files(temporary_directory, 3)
+        converter = CSVToVaexConverter(cache_directory=temporary_directory, dictionary_encode_threshold=3)
+
+        with patch("mleko.dataset.convert.csv_to_vaex_converter.DICTIONARY_ENCODING_SAMPLE_ROWS", 1), patch.object(
+            converter, "_open_input_file", wraps=converter._open_input_file
+        ) as mocked_open_input_file:
+            assert "Name" in converter._infer_dictionary_columns(file_paths)
+        mocked_open_input_file.assert_called_once_with(file_paths[0])
+
+    @pytest.mark.parametrize("compaction_target_file_size_mb", [None, 1e-4])
+    def test_dictionaries_shared_across_chunks(
+        self, temporary_directory: Path, compaction_target_file_size_mb: float | None
+    ):
+        """Should re-encode the chunks with a single dictionary per column, so that the codes match the labels."""
+        file_paths = []
+        for i, values in enumerate([["b", "a", "b"], ["c", None, "a"], ["d", "d", "c"]]):
+            file_paths.append(temporary_directory / f"file_{i}.csv")
+            file_paths[-1].write_text("x,y\n" + "".join(f"{value or ''},{i}\n" for value in values))
+
+        _, df = CSVToVaexConverter(
+            cache_directory=temporary_directory / "cache",
+            dictionary_encode_threshold=5,
+            compaction_target_file_size_mb=compaction_target_file_size_mb,
+            num_workers=2,
+        )._convert(file_paths)
+
+        labels = get_dictionary_labels(df, "x")
+        assert df["x"].tolist() == ["b", "a", "b", "c", None, "a", "d", "d", "c"]
+        assert [labels[code] if code >= 0 else None for code in get_dictionary_codes(df, "x").tolist()] == df[
+            "x"
+        ].tolist()
+        assert labels == ["b", "a", "c", "d"]
+        for path in (temporary_directory / "cache").glob("df_*.arrow"):
+            open_ipc = pa.ipc.open_file if path.name.startswith("df_compacted") else pa.ipc.open_stream
+            for chunk in open_ipc(path).read_all().column("x").chunks:
+                assert chunk.dictionary.to_pylist() == labels
+        df.close()
+
+    def test_downcast_numeric(self, temporary_directory: Path):
+        """Should downcast numeric columns to the narrowest type that holds all of their finite values exactly."""
+        file_path = temporary_directory / "numeric.csv"
+        with open(file_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["small", "medium", "large", "whole", "half", "precise", "infinite"])
+            writer.writerow([1, 300, 2**40, 1.0, 0.5, 3.14159265358979, 1.0])
+            writer.writerow([-5, -300, 1, 2.0, 1.25, 2.0, "inf"])
+            writer.writerow(["", 0, 3, 3.0, "", 1.0, 2.0])
+
+        csv_to_arrow_converter = CSVToVaexConverter(
+            cache_directory=temporary_directory, downcast_numeric=True, num_workers=1
+        )
+        ds, df = csv_to_arrow_converter.convert([file_path])
+
+        assert [str(dtype) for dtype in df.dtypes] == [
+            "int8",
+            "int16",
+            "int64",
+            "int8",
+            "float32",
+            "float64",
+            "float64",
+        ]
+        assert df["small"].tolist() == [1, -5, None]
+        assert df["whole"].tolist() == [1, 2, 3]
+        assert df["half"].tolist() == [0.5, 1.25, None]
+        assert ds.get_features(["numerical"]) == ["half", "infinite", "large", "medium", "precise", "small", "whole"]
+        df.close()
+
+    def test_downcast_numeric_with_nan(self, temporary_directory: Path):
+        """Should downcast float columns containing NaN values to float32 if all other values round trip exactly."""
+        file_path = temporary_directory / "numeric.csv"
+        file_path.write_text("exact,precise\n0.25,3.14159265358979\nnan,nan\n0.75,1.0\n")
+
+        _, df = CSVToVaexConverter(
+            cache_directory=temporary_directory, downcast_numeric=True, na_values=[""], num_workers=1
+        ).convert([file_path])
+
+        assert [str(dtype) for dtype in df.dtypes] == ["float32", "float64"]
+        assert df["exact"].isnan().tolist() == [False, True, False]
+        df.close()
+
+    def test_downcast_numeric_cache_hit(self, temporary_directory: Path):
+        """Should record the downcast types next to the cached DataFrame and restore them on a cache hit."""
+        file_path = temporary_directory / "numeric.csv"
+        file_path.write_text("small,half,text\n1,0.5,a\n-5,1.25,b\n")
+        cache_directory = temporary_directory / "cache"
+        _, df = CSVToVaexConverter(cache_directory=cache_directory, downcast_numeric=True, num_workers=1).convert(
+            [file_path]
+        )
+        df.close()
+
+        cache_file_path = next(cache_directory.glob("*.arrow"))
+        dtypes_file_path = cache_file_path.with_suffix(".dtypes.json")
+        assert json.loads(dtypes_file_path.read_text()) == {"small": "int8", "half": "float32"}
+
+        widened_df = vaex.open(cache_file_path)
+        widened_df["small"] = widened_df["small"].astype("int64")
+        widened_df["half"] = widened_df["half"].astype("float64")
+        widened_df.export(temporary_directory / "widened.arrow")
+        widened_df.close()
+        (temporary_directory / "widened.arrow").replace(cache_file_path)
+
+        with patch.object(CSVToVaexConverter, "_convert") as mocked_convert:
+            _, df = CSVToVaexConverter(cache_directory=cache_directory, downcast_numeric=True, num_workers=1).convert(
+                [file_path]
+            )
+            mocked_convert.assert_not_called()
+
+        assert [str(dtype) for dtype in df.dtypes] == ["int8", "float32", "string"]
+        assert df["small"].tolist() == [1, -5]
+        df.close()
+
+    def test_compaction(self, temporary_directory: Path):
+        """Should compact the chunks into evenly-sized Arrow files without changing the data."""
+        n_files = 6
+        file_paths = generate_csv_files(temporary_directory, n_files)
+        _, df = CSVToVaexConverter(
+            cache_directory=temporary_directory / "plain", dictionary_encode_threshold=3, num_workers=2
+        )._convert(file_paths)
+
+        compacted_directory = temporary_directory / "compacted"
+        chunk_size_mb = (
+            sum(path.stat().st_size for path in (temporary_directory / "plain").glob("df_chunk_*.arrow")) / 1024**2
+        )
+        _, compacted_df = CSVToVaexConverter(
+            cache_directory=compacted_directory,
+            dictionary_encode_threshold=3,
+            compaction_target_file_size_mb=chunk_size_mb / 3,
+            compaction_row_group_size=3,
+            num_workers=2,
+        )._convert(file_paths)
+
+        compacted_files = sorted(compacted_directory.glob("df_compacted_*.arrow"))
+        assert len(compacted_files) == 3
+        assert not list(compacted_directory.glob("df_chunk_*.arrow"))
+        assert [vaex.open(path).shape[0] for path in compacted_files] == [8, 8, 8]
+        assert compacted_df.column_names == df.column_names
+        for column_name in df.get_column_names():
+            assert compacted_df[column_name].tolist() == df[column_name].tolist()
+        df.close()
+        compacted_df.close()
+
+    def test_compaction_without_rows(self, temporary_directory: Path):
+        """Should leave the chunks as they are if they contain no rows."""
+        schema = pa.schema([("x", pa.int64())])
+        for i in range(2):
+            with pa.ipc.new_stream(temporary_directory / f"df_chunk_{i}.arrow", schema) as writer:
+                writer.write_table(schema.empty_table())
+
+        converter = CSVToVaexConverter(cache_directory=temporary_directory, compaction_target_file_size_mb=1)
+        assert converter._compact_chunks() == "df_chunk_*.arrow"
+        assert not list(temporary_directory.glob("df_compacted_*.arrow"))
+
+    def test_compaction_incompatible_schemas(self, temporary_directory: Path):
+        """Should skip compaction and keep the chunks if their schemas cannot be unified."""
+        (temporary_directory / "a.csv").write_text("x,y\ntrue,a\nfalse,b\n")
+        (temporary_directory / "b.csv").write_text("x,y\nfoo,c\nbar,d\n")
+        _, df = CSVToVaexConverter(
+            cache_directory=temporary_directory / "cache", compaction_target_file_size_mb=1, num_workers=1
+        )._convert([temporary_directory / "a.csv", temporary_directory / "b.csv"])
+
+        assert sorted(path.name for path in (temporary_directory / "cache").glob("df_*.arrow")) == [
+            "df_chunk_a.arrow",
+            "df_chunk_b.arrow",
+        ]
+        assert sorted(df["y"].tolist()) == ["a", "b", "c", "d"]
+        df.close()
+
+    def test_split_file_with_quoted_newlines(self, temporary_directory: Path):
+        """Should split a large CSV file into record-aligned byte ranges and convert them in order."""
+        file_path = temporary_directory / "large.csv"
+        with open(file_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["id", "text", "value"])
+            for i in range(2_000):
+                writer.writerow([i, 'line "%d"\nnext line, with comma' % i if i % 3 == 0 else f"text {i}", i / 4])
+
+        _, df = CSVToVaexConverter(cache_directory=temporary_directory / "whole", num_workers=2)._convert([file_path])
+        converter = CSVToVaexConverter(
+            cache_directory=temporary_directory / "split", split_file_size_mb=0.01, num_workers=2
+        )
+        byte_ranges = converter._split_csv_file(file_path)
+        with patch("mleko.dataset.convert.csv_to_vaex_converter.CSV_SCAN_BLOCK_SIZE", 7):
+            assert converter._split_csv_file(file_path) == byte_ranges
+        _, split_df = converter._convert([file_path])
+
+        assert len(byte_ranges) > 1
+        assert len(list((temporary_directory / "split").glob("df_chunk_*.arrow"))) == len(byte_ranges)
+        assert split_df.dtypes.tolist() == df.dtypes.tolist()
+        assert split_df["id"].tolist() == list(range(2_000))
+        assert split_df["text"].tolist() == df["text"].tolist()
+        assert split_df["value"].tolist() == df["value"].tolist()
+        df.close()
+        split_df.close()
+
+    def test_split_file_with_unbalanced_quotes(self, temporary_directory: Path):
+        """Should not split a file whose quote parity does not locate the record boundaries."""
+        file_path = temporary_directory / "unbalanced.csv"
+        with open(file_path, "w", newline="") as file:
+            file.write('id,text,value\n0,6" pipe,0.0\n')
+            for i in range(1, 2_000):
+                file.write(f'{i},"first {i}\nsecond {i}",{i / 4}\n' if i % 3 == 0 else f"{i},text {i},{i / 4}\n")
+
+        _, df = CSVToVaexConverter(cache_directory=temporary_directory / "whole", num_workers=2)._convert([file_path])
+        converter = CSVToVaexConverter(
+            cache_directory=temporary_directory / "split", split_file_size_mb=0.01, num_workers=2
+        )
+        assert converter._split_csv_file(file_path) == []
+
+        _, split_df = converter._convert([file_path])
+        assert split_df["id"].tolist() == list(range(2_000))
+        assert split_df["text"].tolist() == df["text"].tolist()
+        df.close()
+        split_df.close()
+
+    def test_split_file_with_empty_first_block_column(self, temporary_directory: Path):
+        """Should read a column without values in the first block as strings in all byte ranges."""
+        file_path = temporary_directory / "sparse.csv"
+        n_rows = 200_000
+        with open(file_path, "w", newline="") as file:
+            file.write("id,sparse\n")
+            file.writelines(f"{i},{f'value {i}' if i >= n_rows - 100 else ''}\n" for i in range(n_rows))
+
+        converter = CSVToVaexConverter(
+            cache_directory=temporary_directory / "split", split_file_size_mb=0.5, num_workers=2
+        )
+        byte_ranges = converter._split_csv_file(file_path)
+        _, split_df = converter._convert([file_path])
+
+        assert len(byte_ranges) > 1
+        assert all(byte_range.column_types["sparse"] == pa.string() for byte_range in byte_ranges)
+        assert split_df["sparse"].tolist() == [None] * (n_rows - 100) + [
+            f"value {i}" for i in range(n_rows - 100, n_rows)
+        ]
+        split_df.close()
+
+    def test_split_file_not_split(self, temporary_directory: Path):
+        """Should not split small or compressed files, or files without records after the header."""
+        converter = CSVToVaexConverter(cache_directory=temporary_directory, split_file_size_mb=1e-4)
+        small_file_path = temporary_directory / "small.csv"
+        small_file_path.write_text("a,b\n1,2\n")
+        compressed_file_path = generate_csv_files(temporary_directory, 1, gzipped=True)[0]
+        header_file_path = temporary_directory / "header.csv"
+        header_file_path.write_text(",".join(f'"column {i}"' for i in range(100)))
+
+        assert converter._split_csv_file(small_file_path) == []
+        assert converter._split_csv_file(compressed_file_path) == []
+        assert converter._split_csv_file(header_file_path) == []
+        assert CSVToVaexConverter._count_quotes(header_file_path, 0, 10**6) == 200
+
+    def test_schedule_conversion_tasks(self, temporary_directory: Path):
+        """Should order the tasks largest-first and batch small files together."""
+        large_file_path = temporary_directory / "large.csv"
+        large_file_path.write_bytes(b"a\n" * (SMALL_TASK_BATCH_SIZE // 2))
+        small_file_paths = generate_csv_files(temporary_directory, 3)
+        small_file_paths.extend(generate_csv_files(temporary_directory, 2, gzipped=True))
+
+        batches = CSVToVaexConverter(cache_directory=temporary_directory)._schedule_conversion_tasks(
+            [(file_path, None) for file_path in [*small_file_paths, large_file_path]]
+        )
+
+        assert len(batches) == 2
+        assert batches[0] == (2 * large_file_path.stat().st_size, [(large_file_path, None)])
+        assert [file_path.suffix for file_path, _ in batches[1][1]] == [".gz", ".gz", ".csv", ".csv", ".csv"]
+
+        csv_file_paths = small_file_paths[:3]
+        small_task_memory = CSVToVaexConverter._estimate_task_memory((csv_file_paths[0], None))
+        with patch("mleko.dataset.convert.csv_to_vaex_converter.SMALL_TASK_BATCH_SIZE", 2 * small_task_memory):
+            batches = CSVToVaexConverter(cache_directory=temporary_directory)._schedule_conversion_tasks(
+                [(file_path, None) for file_path in csv_file_paths]
+            )
+        assert [len(batch_tasks) for _, batch_tasks in batches] == [2, 1]
+
+    def test_max_memory(self, temporary_directory: Path):
+        """Should convert all files when the memory cap only allows a single file at a time."""
+        n_files = 4
+        file_paths = generate_csv_files(temporary_directory, n_files)
+        with patch("mleko.dataset.convert.csv_to_vaex_converter.SMALL_TASK_BATCH_SIZE", 1):
+            _, df = CSVToVaexConverter(cache_directory=temporary_directory, max_memory_gb=1e-9, num_workers=4)._convert(
+                file_paths
+            )
+
+        assert len(list(temporary_directory.glob("df_chunk_*.arrow"))) == n_files
+        assert df.shape == (4 * n_files, 8)
+        df.close()
+
+    def test_filter_expression(self, temporary_directory: Path):
+        """Should only write the rows matching the filter expression, which may use dropped columns."""
+        n_files = 2
+        file_paths = generate_csv_files(temporary_directory, n_files)
+        csv_to_arrow_converter = CSVToVaexConverter(
+            cache_directory=temporary_directory,
+            drop_columns=["Count"],
+            filter_expression="(Count > 2) & (Date >= scalar_datetime('2023-01-01'))",
+            num_workers=1,
+            cache_size=2,
+        )
+        ds, df = csv_to_arrow_converter.convert(file_paths)
+
+        assert df.shape == (2 * n_files, 7)
+        assert df.Name.tolist() == ["Linux", "Windows"] * n_files
+        assert "Count" not in ds.get_features()
+
+        _, df_new = CSVToVaexConverter(
+            cache_directory=temporary_directory,
+            drop_columns=["Count"],
+            filter_expression="Count > 2",
+            num_workers=1,
+            cache_size=2,
+        ).convert(file_paths)
+
+        assert len(glob.glob(str(temporary_directory / "*.arrow"))) == 2
+        df_new.close()
+        df.close()
+
+    def test_compressed_file_types(self, temporary_directory: Path):
+        """Should convert bzip2, xz and Zstandard compressed CSV files like raw ones."""
+        file_paths = generate_csv_files(temporary_directory, 3)
+        _, df = CSVToVaexConverter(cache_directory=temporary_directory / "raw", num_workers=1)._convert(file_paths)
+
+        compressed_file_paths = []
+        for file_path, (suffix, compress) in zip(
+            file_paths, [(".bz2", bz2.compress), (".xz", lzma.compress), (".zst", pa.Codec("zstd").compress)]
+        ):
+            compressed_file_path = file_path.with_suffix(f".csv{suffix}")
+            compressed_file_path.write_bytes(compress(file_path.read_bytes()))
+            compressed_file_paths.append(compressed_file_path)
+        _, compressed_df = CSVToVaexConverter(
+            cache_directory=temporary_directory / "compressed", num_workers=3
+        )._convert(compressed_file_paths)
+
+        assert compressed_df.shape == df.shape
+        assert compressed_df.dtypes.tolist() == df.dtypes.tolist()
+        assert compressed_df.Name.tolist() == df.Name.tolist()
+        df.close()
+        compressed_df.close()
+
+    def test_stream_from_s3(self, moto_server: str, temporary_directory: Path):
+        """Should stream S3 objects into the conversion without downloading them, like local files."""
+        file_paths = generate_csv_files(temporary_directory, 2) + generate_csv_files(temporary_directory, 1, True)
+        s3 = boto3.client("s3", region_name="us-east-1", endpoint_url=moto_server)
+        s3.create_bucket(Bucket="stream-bucket")
+        s3_uris = []
+        for i, file_path in enumerate(file_paths):
+            key = f"data/part={i}/file{file_path.suffix}"
+            s3.upload_file(str(file_path), "stream-bucket", key)
+            s3_uris.append(f"s3://stream-bucket/{key}")
+
+        converter_options = {"drop_columns": ["Time"], "filter_expression": "Count > 0", "num_workers": 2}
+        _, df = CSVToVaexConverter(cache_directory=temporary_directory / "local", **converter_options)._convert(
+            file_paths
+        )
+        s3_client = S3Client(aws_region_name="us-east-1", aws_endpoint_url=moto_server)
+        converter = CSVToVaexConverter(
+            cache_directory=temporary_directory / "s3", s3_client=s3_client, cache_size=2, **converter_options
+        )
+        _, streamed_df = converter.convert(s3_uris)
+
+        assert streamed_df.shape == df.shape == (9, 7)
+        assert streamed_df.dtypes.tolist() == df.dtypes.tolist()
+        assert sorted(streamed_df.Name.tolist()) == sorted(df.Name.tolist())
+        assert not list((temporary_directory / "s3").glob("*.csv*"))
+
+        converter.convert(s3_uris)
+        assert len(list((temporary_directory / "s3").glob("*.arrow"))) == 1
+
+        s3.put_object(Bucket="stream-bucket", Key="data/part=0/file.csv", Body=file_paths[1].read_bytes() + b"\n")
+        converter.convert(s3_uris)
+        assert len(list((temporary_directory / "s3").glob("*.arrow"))) == 2
+        df.close()
+        streamed_df.close()
+
+    def test_stream_compressed_objects_from_s3(self, moto_server: str, temporary_directory: Path):
+        """Should decompress S3 objects based on their suffix, like local files."""
+        file_path = generate_csv_files(temporary_directory, 1)[0]
+        s3 = boto3.client("s3", region_name="us-east-1", endpoint_url=moto_server)
+        s3.create_bucket(Bucket="compressed-bucket")
+        s3.put_object(Bucket="compressed-bucket", Key="data/file.csv.xz", Body=lzma.compress(file_path.read_bytes()))
+        s3.put_object(Bucket="compressed-bucket", Key="data/file.csv.bz2", Body=bz2.compress(file_path.read_bytes()))
+
+        s3_client = S3Client(aws_region_name="us-east-1", aws_endpoint_url=moto_server)
+        _, df = CSVToVaexConverter(
+            cache_directory=temporary_directory / "s3", s3_client=s3_client, dictionary_encode_threshold=3
+        )._convert(["s3://compressed-bucket/data/file.csv.xz", "s3://compressed-bucket/data/file.csv.bz2"])
+
+        assert df.shape == (8, 8)
+        assert df["Name"].dtype.is_encoded
+        assert sorted(df.Name.tolist(), key=str) == sorted(["Linux", "Windows", None, "MacOS"] * 2, key=str)
+        df.close()
+
+    def test_stream_from_s3_empty_object(self, moto_server: str, temporary_directory: Path):
+        """Should sample dictionary columns from S3 objects and skip objects without rows."""
+        file_path = generate_csv_files(temporary_directory, 1)[0]
+        s3 = boto3.client("s3", region_name="us-east-1", endpoint_url=moto_server)
+        s3.create_bucket(Bucket="empty-bucket")
+        s3.upload_file(str(file_path), "empty-bucket", "data/file.csv")
+        s3.put_object(Bucket="empty-bucket", Key="data/empty.csv", Body=file_path.read_bytes().split(b"\n")[0] + b"\n")
+
+        s3_client = S3Client(aws_region_name="us-east-1", aws_endpoint_url=moto_server)
+        with patch("mleko.dataset.convert.csv_to_vaex_converter.S3Client", return_value=s3_client):
+            _, df = CSVToVaexConverter(
+                cache_directory=temporary_directory / "s3", dictionary_encode_threshold=3, num_workers=2
+            )._convert(["s3://empty-bucket/data/file.csv", "s3://empty-bucket/data/empty.csv"])
+
+        assert len(list((temporary_directory / "s3").glob("df_chunk_*.arrow"))) == 1
+        assert df["Name"].dtype.is_encoded
+        assert df.Name.tolist() == ["Linux", "Windows", None, "MacOS"]
+        df.close()
+
+    def test_stream_from_s3_invalid_object(self, moto_server: str, temporary_directory: Path):
+        """Should leave neither the output file nor its partial file behind if streaming an S3 object fails."""
+        s3 = boto3.client("s3", region_name="us-east-1", endpoint_url=moto_server)
+        s3.create_bucket(Bucket="invalid-bucket")
+        body = b"a,b\n" + b"1,2\n" * 1000 + b"1,2,3\n"
+        s3.put_object(Bucket="invalid-bucket", Key="data/file.csv", Body=body)
+
+        s3_client = S3Client(aws_region_name="us-east-1", aws_endpoint_url=moto_server)
+        with patch("mleko.dataset.convert.csv_to_vaex_converter.S3_STREAM_BLOCK_SIZE", 1024), pytest.raises(
+            pa.ArrowInvalid
+        ):
+            CSVToVaexConverter._stream_csv_file_to_arrow(
+                "s3://invalid-bucket/data/file.csv",
+                temporary_directory,
+                s3_client.get_arrow_filesystem(),
+                arrow_csv.ParseOptions(),
+                arrow_csv.ConvertOptions(),
+                (),
+                None,
+            )
+
+        assert not list(temporary_directory.glob("df_chunk_*"))
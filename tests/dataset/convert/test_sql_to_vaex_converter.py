@@ -0,0 +1,305 @@
+"""Test suite for `dataset.convert.sql_to_vaex_converter`."""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+import sqlite3
+import sys
+import time
+import types
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pyarrow as pa
+import pytest
+import sqlalchemy
+
+from mleko.dataset.convert import SQLToVaexConverter
+
+
+def create_events_database(database_path: Path, n_rows: int) -> None:
+    """Create a SQLite database with an `events` table of `n_rows` rows."""
+    with sqlite3.connect(database_path) as connection:
+        connection.execute(
+            "CREATE TABLE events (id INTEGER PRIMARY KEY, user TEXT, amount REAL, is_new INTEGER, comment TEXT)"
+        )
+        insert_events(database_path, range(n_rows), connection)
+
+
+def insert_events(database_path: Path, ids: range, connection: sqlite3.Connection | None = None) -> None:
+    """Insert rows with the given ids into the `events` table."""
+    with connection or sqlite3.connect(database_path) as connection:
+        connection.executemany(
+            "INSERT INTO events VALUES (?, ?, ?, ?, ?)",
+            [(i, f"user_{i % 3}", i * 1.5, i % 2 == 0, None) for i in ids],
+        )
+
+
+class TestSQLToVaexConverter:
+    """Test suite for `dataset.convert.sql_to_vaex_converter.SQLToVaexConverter`."""
+
+    def test_convert(self, temporary_directory: Path):
+        """Should stream the result set in batches into a typed DataFrame and a matching data schema."""
+        database_path = temporary_directory / "events.db"
+        create_events_database(database_path, 25)
+        converter = SQLToVaexConverter(
+            connection_factory=lambda: sqlite3.connect(database_path),
+            query="SELECT id, user, amount, is_new, comment FROM events WHERE amount >= ?",
+            parameters=[3.0],
+            forced_boolean_columns=["is_new"],
+            meta_columns=["id"],
+            batch_size=10,
+            cache_directory=temporary_directory / "cache",
+        )
+        ds, df = converter.convert()
+
+        assert df.shape == (23, 5)
+        assert df["id"].tolist() == list(range(2, 25))
+        assert [str(dtype) for dtype in df.dtypes] == ["int64", "string", "float64", "int8", "string"]
+        assert ds.get_features(["numerical"]) == ["amount"]
+        assert ds.get_features(["categorical"]) == ["comment", "user"]
+        assert ds.get_features(["boolean"]) == ["is_new"]
+        assert df["is_new"].tolist()[:2] == [1, 0]
+
+    def test_cached_on_query(self, temporary_directory: Path):
+        """Should reuse the cache for the same query and parameters and query the database for new parameters."""
+        database_path = temporary_directory / "events.db"
+        create_events_database(database_path, 10)
+        query = "SELECT * FROM events WHERE id < :max_id"
+        converter = SQLToVaexConverter(
+            lambda: sqlite3.connect(database_path),
+            query,
+            {"max_id": 5},
+            cache_directory=temporary_directory / "cache",
+        )
+        converter.convert()
+
+        with patch.object(SQLToVaexConverter, "_convert") as mocked_convert:
+            SQLToVaexConverter(
+                lambda: sqlite3.connect(database_path),
+                query,
+                {"max_id": 5},
+                cache_directory=temporary_directory / "cache",
+            ).convert()
+            mocked_convert.assert_not_called()
+
+        _, df = SQLToVaexConverter(
+            lambda: sqlite3.connect(database_path),
+            query,
+            {"max_id": 8},
+            cache_directory=temporary_directory / "cache",
+        ).convert()
+        assert df.shape == (8, 5)
+
+    def test_incremental(self, temporary_directory: Path):
+        """Should only fetch the rows above the watermark and append them to the previously fetched rows."""
+        database_path = temporary_directory / "events.db"
+        create_events_database(database_path, 10)
+        converter = SQLToVaexConverter(
+            lambda: sqlite3.connect(database_path),
+            "SELECT id, user, amount FROM events",
+            watermark_column="id",
+            batch_size=4,
+            cache_directory=temporary_directory / "cache",
+        )
+        _, df = converter.convert()
+        assert df["id"].tolist() == list(range(10))
+
+        insert_events(database_path, range(10, 15))
+        with patch.object(converter, "_write_query_to_arrow", wraps=converter._write_query_to_arrow) as mocked_write:
+            _, df = converter.convert()
+            assert "mleko_incremental WHERE id > ?" in mocked_write.call_args.args[1]
+            assert mocked_write.call_args.args[2] == [9]
+        assert sorted(df["id"].tolist()) == list(range(15))
+
+        _, df = converter.convert()
+        assert sorted(df["id"].tolist()) == list(range(15))
+        assert len(list((temporary_directory / "cache").rglob("df_chunk_*.arrow"))) == 2
+
+        _, df = converter.convert(force_recompute=True)
+        assert sorted(df["id"].tolist()) == list(range(15))
+        assert len(list((temporary_directory / "cache").rglob("df_chunk_*.arrow"))) == 1
+
+    def test_incremental_failed_conversion(self, temporary_directory: Path):
+        """Should keep the previous rows and watermark if fetching fails and ignore files of incomplete conversions."""
+        database_path = temporary_directory / "events.db"
+        create_events_database(database_path, 10)
+        converter = SQLToVaexConverter(
+            lambda: sqlite3.connect(database_path),
+            "SELECT id, user, amount FROM events",
+            watermark_column="id",
+            batch_size=4,
+            cache_directory=temporary_directory / "cache",
+        )
+        converter.convert()
+        incremental_directory = next((temporary_directory / "cache").glob("sql_incremental_*"))
+        state = (incremental_directory / "watermark.json").read_text()
+
+        insert_events(database_path, range(10, 20))
+        with sqlite3.connect(database_path) as connection:
+            connection.execute("UPDATE events SET amount = 'invalid' WHERE id = 15")
+        with pytest.raises(ValueError, match="force the type"):
+            converter.convert()
+        assert sorted(path.name for path in incremental_directory.iterdir()) == [
+            "df_chunk_000000.arrow",
+            "watermark.json",
+        ]
+        assert (incremental_directory / "watermark.json").read_text() == state
+
+        with sqlite3.connect(database_path) as connection:
+            connection.execute("DELETE FROM events WHERE id = 15")
+        (incremental_directory / "df_chunk_000001.arrow").write_bytes(
+            (incremental_directory / "df_chunk_000000.arrow").read_bytes()
+        )
+        _, df = converter.convert()
+        assert df["id"].tolist() == [i for i in range(20) if i != 15]
+
+    def test_fetch_error(self, temporary_directory: Path):
+        """Should raise the error of the fetching thread and not leave any file behind."""
+        database_path = temporary_directory / "events.db"
+        create_events_database(database_path, 10)
+        converter = SQLToVaexConverter(
+            lambda: sqlite3.connect(database_path),
+            "SELECT * FROM missing_table",
+            cache_directory=temporary_directory / "cache",
+        )
+        with pytest.raises(sqlite3.OperationalError, match="no such table"):
+            converter.convert(disable_cache=True)
+
+        assert list((temporary_directory / "cache").iterdir()) == []
+
+    def test_fetch_stopped_early(self, temporary_directory: Path):
+        """Should stop fetching and close the connection once the consumer stops reading batches."""
+
+        def fetchmany(size: int) -> list[tuple[int]]:
+            time.sleep(0.2)
+            return [(1,)] * size
+
+        connection = MagicMock()
+        connection.cursor.return_value.description = [("id",)]
+        connection.cursor.return_value.fetchmany.side_effect = fetchmany
+        converter = SQLToVaexConverter(
+            lambda: connection, "SELECT id FROM endless", batch_size=2, cache_directory=temporary_directory
+        )
+        batches = converter._fetch_batches("SELECT id FROM endless", None)
+        assert next(batches) == (["id"], [(1,), (1,)])
+
+        batches.close()
+        connection.close.assert_called_once()
+
+    def test_incremental_timestamp_sqlalchemy(self, temporary_directory: Path):
+        """Should keep timestamp watermarks and bind them as named parameters on SQLAlchemy connections."""
+        engine = sqlalchemy.create_engine(f"sqlite:///{temporary_directory / 'events.db'}")
+        with engine.begin() as connection:
+            connection.execute(sqlalchemy.text("CREATE TABLE events (id INTEGER, created_at TEXT)"))
+            connection.execute(
+                sqlalchemy.text("INSERT INTO events VALUES (:id, :created_at)"),
+                [{"id": i, "created_at": f"2024-01-0{i + 1} 00:00:00"} for i in range(3)],
+            )
+
+        converter = SQLToVaexConverter(
+            engine.connect,
+            "SELECT id, created_at FROM events",
+            watermark_column="created_at",
+            cache_directory=temporary_directory / "cache",
+        )
+        _, df = converter.convert()
+        assert df.shape == (3, 2)
+
+        with engine.begin() as connection:
+            connection.execute(sqlalchemy.text("INSERT INTO events VALUES (3, '2024-01-04 00:00:00')"))
+        _, df = converter.convert()
+        assert sorted(df["id"].tolist()) == [0, 1, 2, 3]
+
+    def test_empty_result(self, temporary_directory: Path):
+        """Should write an empty chunk for an empty result set and rename columns named after reserved keywords."""
+        database_path = temporary_directory / "events.db"
+        create_events_database(database_path, 5)
+        ds, df = SQLToVaexConverter(
+            lambda: sqlite3.connect(database_path),
+            'SELECT id, user AS "class" FROM events WHERE id > 10',
+            cache_directory=temporary_directory / "cache",
+        ).convert(disable_cache=True)
+
+        assert df.shape == (0, 2)
+        assert df.column_names == ["id", "_class"]
+        assert ds.get_features(["categorical"]) == ["_class", "id"]
+
+    def test_type_mismatch(self, temporary_directory: Path):
+        """Should raise a `ValueError` if later values do not fit the type inferred from the first batch."""
+        database_path = temporary_directory / "mixed.db"
+        with sqlite3.connect(database_path) as connection:
+            connection.execute("CREATE TABLE mixed (value)")
+            connection.executemany("INSERT INTO mixed VALUES (?)", [(1,), (2,), ("three",)])
+
+        converter = SQLToVaexConverter(
+            lambda: sqlite3.connect(database_path),
+            "SELECT value FROM mixed",
+            batch_size=2,
+            cache_directory=temporary_directory / "cache",
+        )
+        with pytest.raises(ValueError, match="force the type"):
+            converter.convert(disable_cache=True)
+
+        _, df = SQLToVaexConverter(
+            lambda: sqlite3.connect(database_path),
+            "SELECT value FROM mixed",
+            forced_categorical_columns=["value"],
+            batch_size=2,
+            cache_directory=temporary_directory / "cache",
+        ).convert(disable_cache=True)
+        assert df["value"].tolist() == ["1", "2", "three"]
+
+    def test_infer_schema(self, temporary_directory: Path):
+        """Should infer strings for empty columns, floats for decimals and forced columns, and timestamps for dates."""
+        converter = SQLToVaexConverter(
+            lambda: None, "", forced_numerical_columns=["forced"], cache_directory=temporary_directory
+        )
+        schema = converter._infer_schema(
+            ["empty", "decimal", "date", "forced"],
+            [(None, decimal.Decimal("1.5"), datetime.date(2024, 1, 1), "2")],
+        )
+
+        assert schema.types == [pa.string(), pa.float64(), pa.timestamp("s"), pa.float64()]
+
+    @pytest.mark.parametrize(
+        "parameters, expected_placeholder, expected_parameters",
+        [
+            (["NL"], "%s", ["NL", 9]),
+            ({"country": "NL"}, "%(mleko_watermark)s", {"country": "NL", "mleko_watermark": 9}),
+            (None, "%(mleko_watermark)s", {"mleko_watermark": 9}),
+        ],
+    )
+    def test_incremental_query_pyformat(
+        self,
+        temporary_directory: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        parameters: list[str] | dict[str, str] | None,
+        expected_placeholder: str,
+        expected_parameters: list[object] | dict[str, object],
+    ):
+        """Should pick the placeholder of a `pyformat` driver, e.g. `psycopg2`, from the shape of the parameters."""
+        driver = types.ModuleType("fake_pyformat_driver")
+        driver.paramstyle = "pyformat"  # type: ignore
+        monkeypatch.setitem(sys.modules, "fake_pyformat_driver", driver)
+        connection_class = type("Connection", (), {"__module__": "fake_pyformat_driver", "close": lambda self: None})
+        converter = SQLToVaexConverter(
+            connection_class,
+            "SELECT * FROM events WHERE country = ...",
+            parameters=parameters,
+            watermark_column="id",
+            cache_directory=temporary_directory,
+        )
+
+        query, query_parameters = converter._get_incremental_query(9)
+
+        assert query.endswith(f"WHERE id > {expected_placeholder}")
+        assert query_parameters == expected_parameters
+
+    def test_parse_watermark(self):
+        """Should restore timestamp watermarks stored as ISO strings and keep other watermarks as they are."""
+        assert SQLToVaexConverter._parse_watermark("2024-01-02T03:04:05", pa.timestamp("us")) == datetime.datetime(
+            2024, 1, 2, 3, 4, 5
+        )
+        assert SQLToVaexConverter._parse_watermark(42, pa.int64()) == 42
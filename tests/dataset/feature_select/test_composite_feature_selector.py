@@ -113,3 +113,24 @@ class TestCompositeFeatureSelector:
         assert df.shape == (10, 1)
         assert df.column_names == ["a"]
         assert first_cache == second_cache
+
+    def test_filtered_dataframe(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should extract the rows of a filtered DataFrame between the steps and return an unfiltered DataFrame."""
+        filtered_df = example_vaex_dataframe[example_vaex_dataframe.a < 8]
+        composite_feature_selector = CompositeFeatureSelector(
+            [
+                MissingRateFeatureSelector(missing_rate_threshold=0.5, cache_directory=temporary_directory),
+                VarianceFeatureSelector(variance_threshold=0.0, cache_directory=temporary_directory),
+            ],
+            cache_directory=temporary_directory,
+        )
+
+        _, _, df_train = composite_feature_selector.fit_transform(example_data_schema, filtered_df, disable_cache=True)
+        _, df_test = composite_feature_selector.transform(example_data_schema, filtered_df, disable_cache=True)
+
+        for df in [df_train, df_test]:
+            assert not df.filtered
+            assert df.column_names == ["a"]
+            assert df["a"].tolist() == list(range(8))
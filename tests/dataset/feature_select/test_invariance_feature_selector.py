@@ -3,6 +3,7 @@
 from pathlib import Path
 from unittest.mock import patch
 
+import pyarrow as pa
 import pytest
 import vaex
 
@@ -40,6 +41,21 @@ class TestInvarianceFeatureSelector:
         assert df.shape == (5, 3)
         assert df.column_names == ["a", "d", "e"]
 
+    def test_dictionary_encoded_invariant(self, temporary_directory: Path, example_data_schema: DataSchema):
+        """Should drop invariant dictionary-encoded categorical columns."""
+        invariance_feature_selector = InvarianceFeatureSelector(cache_directory=temporary_directory)
+        (_, _, df) = invariance_feature_selector._fit_transform(
+            example_data_schema,
+            vaex.from_arrays(
+                a=[1, 1, 1, 1, 1],
+                b=pa.array(["1", "1", "1", "1", "1"]).dictionary_encode(),
+                c=[True, True, True, True, True],
+                d=[False, False, False, False, True],
+                e=pa.array([None, "1", "1", "1", "1"]).dictionary_encode(),
+            ),
+        )
+        assert df.column_names == ["a", "d", "e"]
+
     def test_invariant_numeric(
         self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
     ):
@@ -76,6 +76,21 @@ class TestExpressionFilter:
             "2020-05-01 00:00:00",
         ]
 
+    def test_filter_jit(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should filter using a JIT-compiled expression and fall back for expressions that cannot be compiled."""
+        df = ExpressionFilter(
+            cache_directory=temporary_directory, expression="(a < 2) | (a * target > 7)", jit="numba"
+        )._filter(example_data_schema, example_vaex_dataframe)
+        assert df["a"].tolist() == [0, 1, 8]  # type: ignore
+        assert not any(name.startswith("_jit") for name in example_vaex_dataframe.functions)
+
+        df = ExpressionFilter(
+            cache_directory=temporary_directory, expression='date < scalar_datetime("2020-03-01 00:00:00")', jit="numba"
+        )._filter(example_data_schema, example_vaex_dataframe)
+        assert df["a"].tolist() == [0, 1]  # type: ignore
+
     def test_filter_cache(
         self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
     ):
@@ -0,0 +1,143 @@
+"""Test suite for the `dataset.ingest.http_ingester` module."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import requests
+
+from mleko.dataset.ingest import HTTPIngester
+from tests.conftest import RangeRequestServer
+
+
+class TestHTTPIngester:
+    """Test suite for `dataset.ingest.http_ingester.HTTPIngester`."""
+
+    def test_segmented_download(self, http_server: RangeRequestServer, temporary_directory: Path):
+        """Should download large files in parallel segments and small files in a single request."""
+        http_server.files["/large.csv"] = b"".join(b"%d,value_%d\n" % (i, i) for i in range(10))
+        http_server.files["/small.csv"] = b"a,b\n1,2\n"
+        ingester = HTTPIngester(
+            urls=[http_server.get_url("/large.csv"), http_server.get_url("/small.csv")],
+            destination_directory=temporary_directory,
+            workers_per_file=4,
+            segment_size=16,
+        )
+        files = ingester.fetch_data()
+
+        assert files == [ingester._destination_directory / "large.csv", ingester._destination_directory / "small.csv"]
+        assert files[0].read_bytes() == http_server.files["/large.csv"]
+        assert files[1].read_bytes() == http_server.files["/small.csv"]
+        range_requests = [log for log in http_server.request_log if log[0] == "GET" and log[1] == "/large.csv"]
+        assert len(range_requests) == 7 and all(log[2] is not None for log in range_requests)
+        assert [log for log in http_server.request_log if log[0] == "GET" and log[1] == "/small.csv"] == [
+            ("GET", "/small.csv", None)
+        ]
+        assert sorted(path.name for path in ingester._destination_directory.iterdir()) == [
+            f"{ingester._fingerprint}.manifest.json",
+            "large.csv",
+            "small.csv",
+        ]
+
+    def test_conditional_requests(self, http_server: RangeRequestServer, temporary_directory: Path):
+        """Should skip unchanged files with conditional requests and download changed files again."""
+        http_server.files["/file1.csv"] = b"a,b\n1,2\n"
+        http_server.files["/file2.csv"] = b"a,b\n3,4\n"
+        ingester = HTTPIngester(
+            urls=[http_server.get_url("/file1.csv"), http_server.get_url("/file2.csv")],
+            destination_directory=temporary_directory,
+        )
+        ingester.fetch_data()
+
+        http_server.request_log.clear()
+        ingester.fetch_data()
+        assert sorted(http_server.request_log) == [("HEAD", "/file1.csv", None), ("HEAD", "/file2.csv", None)]
+
+        http_server.files["/file2.csv"] = b"a,b\n3,4\n5,6\n"
+        http_server.request_log.clear()
+        files = ingester.fetch_data()
+        assert [log for log in http_server.request_log if log[0] == "GET"] == [("GET", "/file2.csv", None)]
+        assert files[1].read_bytes() == b"a,b\n3,4\n5,6\n"
+
+    def test_unchanged_validators_without_not_modified(
+        self, http_server: RangeRequestServer, temporary_directory: Path
+    ):
+        """Should skip files whose validators are unchanged even if the server ignores conditional requests."""
+        http_server.files["/file.csv"] = b"a,b\n1,2\n"
+        http_server.ignore_conditional_requests = True
+        ingester = HTTPIngester(urls=http_server.get_url("/file.csv"), destination_directory=temporary_directory)
+        ingester.fetch_data()
+
+        http_server.request_log.clear()
+        ingester.fetch_data()
+        assert http_server.request_log == [("HEAD", "/file.csv", None)]
+
+    def test_force_recompute(self, http_server: RangeRequestServer, temporary_directory: Path):
+        """Should download all files again if `force_recompute` is True."""
+        http_server.files["/file.csv"] = b"a,b\n1,2\n"
+        ingester = HTTPIngester(urls=http_server.get_url("/file.csv"), destination_directory=temporary_directory)
+        ingester.fetch_data()
+
+        http_server.request_log.clear()
+        files = ingester.fetch_data(force_recompute=True)
+        assert [log for log in http_server.request_log if log[0] == "GET"] == [("GET", "/file.csv", None)]
+        assert files[0].read_bytes() == b"a,b\n1,2\n"
+
+    def test_removed_urls(self, http_server: RangeRequestServer, temporary_directory: Path):
+        """Should delete the local files of URLs that are no longer part of the ingester."""
+        http_server.files["/file1.csv"] = b"a,b\n1,2\n"
+        http_server.files["/file2.csv"] = b"a,b\n3,4\n"
+        HTTPIngester(
+            urls=[http_server.get_url("/file1.csv"), http_server.get_url("/file2.csv")],
+            destination_directory=temporary_directory,
+            dataset_id="dataset",
+        ).fetch_data()
+
+        ingester = HTTPIngester(
+            urls=http_server.get_url("/file1.csv"), destination_directory=temporary_directory, dataset_id="dataset"
+        )
+        files = ingester.fetch_data()
+        assert files == [ingester._destination_directory / "file1.csv"]
+        assert not (ingester._destination_directory / "file2.csv").exists()
+
+    def test_resume_segmented_download(self, http_server: RangeRequestServer, temporary_directory: Path):
+        """Should keep the completed segments of an interrupted download and only fetch the missing ones."""
+        http_server.files["/large.csv"] = bytes(range(100))
+        http_server.truncated_ranges[32] = 5
+        ingester = HTTPIngester(
+            urls=http_server.get_url("/large.csv"),
+            destination_directory=temporary_directory,
+            workers_per_file=3,
+            segment_size=16,
+        )
+        with pytest.raises(requests.ConnectionError):
+            ingester.fetch_data()
+        state = json.loads((ingester._destination_directory / "large.csv.segments.json").read_text())
+        missing_ranges = [
+            f"bytes={index * 16}-{min(index * 16 + 15, 99)}" for index in range(7) if index not in state["completed"]
+        ]
+        assert 2 not in state["completed"]
+
+        http_server.truncated_ranges.clear()
+        http_server.request_log.clear()
+        files = ingester.fetch_data()
+
+        assert files[0].read_bytes() == bytes(range(100))
+        assert sorted(log[2] for log in http_server.request_log if log[0] == "GET") == sorted(missing_ranges)
+        assert not (ingester._destination_directory / "large.csv.segments.json").exists()
+
+    def test_missing_file(self, http_server: RangeRequestServer, temporary_directory: Path):
+        """Should raise an `HTTPError` if a file does not exist."""
+        ingester = HTTPIngester(urls=http_server.get_url("/missing.csv"), destination_directory=temporary_directory)
+        with pytest.raises(requests.HTTPError):
+            ingester.fetch_data()
+
+    def test_duplicate_file_names(self, temporary_directory: Path):
+        """Should raise a `ValueError` if multiple URLs share the same file name."""
+        with pytest.raises(ValueError, match="unique file name"):
+            HTTPIngester(
+                urls=["https://example.com/a/data.csv", "https://example.com/b/data.csv"],
+                destination_directory=temporary_directory,
+            )
@@ -5,6 +5,7 @@ from __future__ import annotations
 import io
 import json
 import os
+import zipfile
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -160,7 +161,7 @@ class TestKaggleIngester:
         sample_kaggle_credentials: KaggleCredentials,
         temporary_directory: Path,
     ):
-        """Should skip download the local cache is fresh."""
+        """Should skip the download while the local cache is fresh and download again once a local file changes."""
         mock_get_credentials.return_value = sample_kaggle_credentials
 
         ingester = KaggleIngester(
@@ -174,6 +175,7 @@ class TestKaggleIngester:
             {"name": "file1.csv", "creationDate": "2020-01-01T00:00:00.000Z", "totalBytes": 50},
             {"name": "file2.csv", "creationDate": "2020-02-01T00:00:00.000Z", "totalBytes": 75},
         ]
+        kaggle_files = files
         for file in files:
             fname = file["name"]
             fdate = datetime.strptime(file["creationDate"], "%Y-%m-%dT%H:%M:%S.%fZ")
@@ -187,8 +189,22 @@ class TestKaggleIngester:
         ingester._local_manifest_handler.set_files(
             [LocalFileEntry(name=file["name"], size=file["totalBytes"]) for file in files]
         )
+        ingester._local_manifest_handler.set_metadata(
+            {
+                "kaggle_files": {
+                    file["name"]: {
+                        "total_bytes": file["totalBytes"],
+                        "creation_timestamp": datetime.strptime(
+                            file["creationDate"].split(".")[0], "%Y-%m-%dT%H:%M:%S"
+                        ).timestamp(),
+                        "files": [file["name"]],
+                    }
+                    for file in files
+                }
+            }
+        )
 
-        with patch.object(requests, "get") as mock_requests_get:
+        with patch.object(requests.Session, "get") as mock_requests_get:
             mock_requests_get.return_value = MagicMock(
                 status_code=200,
                 content=json.dumps({"datasetFiles": [files[0]]}),
@@ -197,8 +213,26 @@ class TestKaggleIngester:
 
         assert len(files) == 1
         assert files == [ingester._destination_directory / "file1.csv"]
+        assert not (ingester._destination_directory / "file2.csv").exists()
+        assert list(ingester._local_manifest_handler.get_metadata()["kaggle_files"]) == ["file1.csv"]
         mock_kaggle_fetch_files.assert_not_called()
 
+        local_file_path = ingester._destination_directory / "file1.csv"
+        local_file_path.write_text("truncated")
+
+        def fetch_files(*_):
+            local_file_path.write_bytes(b"\0" * 50)
+            return {"file1.csv": [local_file_path]}
+
+        mock_kaggle_fetch_files.side_effect = fetch_files
+        with patch.object(requests.Session, "get") as mock_requests_get:
+            mock_requests_get.return_value = MagicMock(
+                status_code=200,
+                content=json.dumps({"datasetFiles": [kaggle_files[0]]}),
+            )
+            ingester.fetch_data()
+        mock_kaggle_fetch_files.assert_called_once()
+
     @patch("mleko.dataset.ingest.kaggle_ingester.KaggleCredentialsManager.get_kaggle_credentials")
     def test_raise_http_error_fetch_dataset_list(
         self,
@@ -216,7 +250,7 @@ class TestKaggleIngester:
             dataset_version="dummy_version",
         )
 
-        with patch.object(requests, "get") as mock_requests_get:
+        with patch.object(requests.Session, "get") as mock_requests_get:
             mock_requests_get.return_value = MagicMock(
                 status_code=401,
                 reason="Unauthorized",
@@ -242,7 +276,7 @@ class TestKaggleIngester:
             dataset_version="dummy_version",
         )
 
-        with patch.object(requests, "get") as mock_requests_get:
+        with patch.object(requests.Session, "get") as mock_requests_get:
             mock_requests_get.return_value = MagicMock(
                 requests.Response,
                 status_code=200,
@@ -253,16 +287,14 @@ class TestKaggleIngester:
 
     @pytest.mark.parametrize("force_recompute", [True, False])
     @patch("mleko.dataset.ingest.kaggle_ingester.KaggleCredentialsManager.get_kaggle_credentials")
-    @patch("shutil.unpack_archive")
     def test_fetch_data_when_cache_is_outdated(
         self,
         mock_get_credentials: MagicMock,
-        mock_unpack_archive: MagicMock,
         sample_kaggle_credentials: KaggleCredentials,
         temporary_directory: Path,
         force_recompute: bool,
     ):
-        """Should download the files if local ones are outdated."""
+        """Should download the files if local ones are outdated, extracting zip files and recording all of them."""
         mock_get_credentials.return_value = sample_kaggle_credentials
 
         ingester = KaggleIngester(
@@ -291,34 +323,102 @@ class TestKaggleIngester:
             [LocalFileEntry(name=file["name"], size=file["totalBytes"] + 1) for file in files]
         )
 
-        with patch.object(requests, "get") as mock_requests_get:
+        with patch.object(requests.Session, "get") as mock_requests_get:
             file_content = b"file1,file2\n1,2\n"
-            zip_file_content = b"PK\x03\x04,file2\n1,2\n"  # signature of a zip file
-            mock_requests_get.side_effect = [
-                MagicMock(
+            zip_buffer = io.BytesIO()
+            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr("file2.csv", "file2\n2\n")
+            zip_file_content = zip_buffer.getvalue()
+            responses = {
+                "list": MagicMock(
                     status_code=200,
                     content=json.dumps({"datasetFiles": files}),
                 ),
-                MagicMock(
+                "file1.csv": MagicMock(
                     requests.Response,
                     status_code=200,
                     stream=True,
+                    headers={},
                     raw=io.BytesIO(file_content),
                     iter_content=MagicMock(return_value=iter([file_content])),
                 ),
-                MagicMock(
+                "file2.csv": MagicMock(
                     requests.Response,
                     status_code=200,
                     stream=True,
+                    headers={},
                     raw=io.BytesIO(zip_file_content),
                     iter_content=MagicMock(return_value=iter([zip_file_content])),
                 ),
+            }
+            mock_requests_get.side_effect = lambda url, **kwargs: responses[
+                "list" if "/list/" in url else url.rsplit("/", 1)[-1]
             ]
             files = ingester.fetch_data(force_recompute=force_recompute)
 
-        assert len(files) == 1
-        assert files == [ingester._destination_directory / "file1.csv"]  # the zip file should be ignored
-        assert mock_unpack_archive.call_count == 1
+        assert sorted(files) == [
+            ingester._destination_directory / "file1.csv",
+            ingester._destination_directory / "file2.csv",
+        ]
+        assert (ingester._destination_directory / "file2.csv").read_text() == "file2\n2\n"
+        assert not (ingester._destination_directory / "file2.csv.zip").exists()
+        assert sorted(ingester._local_manifest_handler.get_file_names()) == ["file1.csv", "file2.csv"]
+
+        with patch.object(requests.Session, "get", return_value=responses["list"]):
+            with patch.object(ingester, "_kaggle_fetch_files") as mock_kaggle_fetch_files:
+                files = ingester.fetch_data()
+
+        mock_kaggle_fetch_files.assert_not_called()
+        assert sorted(files) == [
+            ingester._destination_directory / "file1.csv",
+            ingester._destination_directory / "file2.csv",
+        ]
+        assert (ingester._destination_directory / "file2.csv").read_text() == "file2\n2\n"
+
+    @patch("mleko.dataset.ingest.kaggle_ingester.KaggleCredentialsManager.get_kaggle_credentials")
+    def test_fetch_data_with_nested_files(
+        self,
+        mock_get_credentials: MagicMock,
+        sample_kaggle_credentials: KaggleCredentials,
+        temporary_directory: Path,
+    ):
+        """Should keep the folders of nested Kaggle files, also for files with the same name in different folders."""
+        mock_get_credentials.return_value = sample_kaggle_credentials
+
+        ingester = KaggleIngester(
+            destination_directory=temporary_directory,
+            owner_slug="dummy_owner",
+            dataset_slug="dummy_dataset",
+            dataset_version="dummy_version",
+        )
+
+        files = [
+            {"name": "train/data.csv", "creationDate": "2020-01-01T00:00:00.000Z", "totalBytes": 10},
+            {"name": "test/data.csv", "creationDate": "2020-02-01T00:00:00.000Z", "totalBytes": 10},
+        ]
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("data.csv", "test\n2\n")
+        file_contents = {"train/data.csv": b"train\n1\n", "test/data.csv": zip_buffer.getvalue()}
+
+        def get(url: str, **kwargs) -> MagicMock:
+            if "/list/" in url:
+                return MagicMock(status_code=200, content=json.dumps({"datasetFiles": files}))
+            file_content = file_contents[url.split("/dummy_owner/dummy_dataset/", 1)[1]]
+            return MagicMock(requests.Response, status_code=200, headers={}, raw=io.BytesIO(file_content))
+
+        with patch.object(requests.Session, "get", side_effect=get):
+            local_files = ingester.fetch_data()
+
+        assert sorted(local_files) == [
+            ingester._destination_directory / "test" / "data.csv",
+            ingester._destination_directory / "train" / "data.csv",
+        ]
+        assert (ingester._destination_directory / "train" / "data.csv").read_text() == "train\n1\n"
+        assert (ingester._destination_directory / "test" / "data.csv").read_text() == "test\n2\n"
+        assert ingester._local_manifest_handler.get_metadata()["kaggle_files"]["test/data.csv"]["files"] == [
+            "test/data.csv"
+        ]
 
     @patch("mleko.dataset.ingest.kaggle_ingester.KaggleCredentialsManager.get_kaggle_credentials")
     def test_fetch_data_raises_http_error_on_bad_request(
@@ -353,7 +453,7 @@ class TestKaggleIngester:
             file_pattern=["file1.csv", "file2.csv"],
         )
 
-        with patch.object(requests, "get") as mock_requests_get:
+        with patch.object(requests.Session, "get") as mock_requests_get:
             file_content = b"file1,file2\n1,2\n"
             mock_requests_get.side_effect = [
                 MagicMock(
@@ -364,6 +464,7 @@ class TestKaggleIngester:
                     requests.Response,
                     status_code=200,
                     stream=True,
+                    headers={},
                     raw=io.BytesIO(file_content),
                     iter_content=MagicMock(return_value=iter([file_content])),
                 ),
@@ -0,0 +1,171 @@
+"""Test suite for the `dataset.ingest.local_ingester` module."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from mleko.dataset.ingest import LocalIngester
+
+
+class TestLocalIngester:
+    """Test suite for `dataset.ingest.local_ingester.LocalIngester`."""
+
+    @pytest.fixture(scope="function")
+    def source_directory(self, temporary_directory: Path) -> Path:
+        """Source directory with CSV files in nested folders and a file not matching the pattern."""
+        source_directory = temporary_directory / "source"
+        (source_directory / "nested").mkdir(parents=True)
+        (source_directory / "file1.csv").write_text("a,b\n1,2\n")
+        (source_directory / "nested" / "file2.csv").write_text("a,b\n3,4\n")
+        (source_directory / "notes.txt").write_text("not a csv")
+        return source_directory
+
+    @pytest.mark.parametrize("staging_mode", ["hardlink", "symlink", "copy"])
+    def test_stage_files(self, source_directory: Path, temporary_directory: Path, staging_mode: str):
+        """Should stage the matching files, keeping nested paths, without copying them unless requested."""
+        ingester = LocalIngester(
+            source_directory=source_directory,
+            file_pattern="*.csv",
+            destination_directory=temporary_directory / "destination",
+            staging_mode=staging_mode,  # type: ignore
+        )
+        files = ingester.fetch_data()
+
+        destination_directory = ingester._destination_directory
+        assert files == [destination_directory / "file1.csv", destination_directory / "nested/file2.csv"]
+        assert files[1].read_text() == "a,b\n3,4\n"
+        assert ingester._local_manifest_handler.get_file_names() == ["file1.csv", "nested/file2.csv"]
+        assert os.path.samefile(files[0], source_directory / "file1.csv") == (staging_mode != "copy")
+        assert files[0].is_symlink() == (staging_mode == "symlink")
+
+    def test_fallback_to_symlink(self, source_directory: Path, temporary_directory: Path):
+        """Should fall back to a symlink if the file cannot be staged with the requested mode."""
+        ingester = LocalIngester(
+            source_directory=source_directory,
+            file_pattern="file1.csv",
+            destination_directory=temporary_directory / "destination",
+            staging_mode="reflink",
+        )
+        with patch.object(LocalIngester, "_reflink_file", side_effect=OSError("Operation not supported")):
+            files = ingester.fetch_data()
+
+        assert files[0].is_symlink()
+        assert files[0].read_text() == "a,b\n1,2\n"
+
+    def test_copy_error(self, source_directory: Path, temporary_directory: Path):
+        """Should raise errors of copies instead of falling back to a symlink."""
+        ingester = LocalIngester(
+            source_directory=source_directory,
+            file_pattern="file1.csv",
+            destination_directory=temporary_directory / "destination",
+            staging_mode="copy",
+        )
+        with patch("shutil.copy2", side_effect=OSError("No space left on device")):
+            with pytest.raises(OSError, match="No space left"):
+                ingester.fetch_data()
+
+    def test_reflink_file(self, source_directory: Path, temporary_directory: Path, monkeypatch: pytest.MonkeyPatch):
+        """Should clone the file with the `FICLONE` ioctl and remove the clone if the filesystem does not support it."""
+        import fcntl
+
+        target_path = temporary_directory / "clone.csv"
+        with patch.object(fcntl, "ioctl") as mocked_ioctl:
+            LocalIngester._reflink_file(source_directory / "file1.csv", target_path)
+        mocked_ioctl.assert_called_once()
+        assert target_path.exists()
+
+        with patch.object(fcntl, "ioctl", side_effect=OSError("Operation not supported")):
+            with pytest.raises(OSError, match="Operation not supported"):
+                LocalIngester._reflink_file(source_directory / "file1.csv", target_path)
+        assert not target_path.exists()
+
+        monkeypatch.setattr("sys.platform", "darwin")
+        with pytest.raises(OSError, match="not supported on darwin"):
+            LocalIngester._reflink_file(source_directory / "file1.csv", target_path)
+
+    def test_force_recompute(self, source_directory: Path, temporary_directory: Path):
+        """Should delete and restage all files if `force_recompute` is set, even if they are up to date."""
+        ingester = LocalIngester(
+            source_directory=source_directory,
+            file_pattern="*.csv",
+            destination_directory=temporary_directory / "destination",
+            staging_mode="copy",
+        )
+        ingester.fetch_data()
+
+        with patch.object(ingester, "_stage_file", wraps=ingester._stage_file) as mocked_stage_file:
+            files = ingester.fetch_data(force_recompute=True)
+
+        assert sorted(call.args[0] for call in mocked_stage_file.call_args_list) == ["file1.csv", "nested/file2.csv"]
+        assert files[0].read_text() == "a,b\n1,2\n"
+
+    def test_change_detection(self, source_directory: Path, temporary_directory: Path):
+        """Should only restage new or changed files and delete files removed from the source."""
+        ingester = LocalIngester(
+            source_directory=source_directory,
+            file_pattern="*.csv",
+            destination_directory=temporary_directory / "destination",
+            staging_mode="copy",
+        )
+        ingester.fetch_data()
+
+        with patch.object(ingester, "_stage_file") as mocked_stage_file:
+            ingester.fetch_data()
+            mocked_stage_file.assert_not_called()
+
+        (source_directory / "file1.csv").write_text("a,b\n1,2\n5,6\n")
+        (source_directory / "nested" / "file2.csv").unlink()
+        (source_directory / "file3.csv").write_text("a,b\n7,8\n")
+        files = ingester.fetch_data()
+
+        destination_directory = ingester._destination_directory
+        assert files == [destination_directory / "file1.csv", destination_directory / "file3.csv"]
+        assert files[0].read_text() == "a,b\n1,2\n5,6\n"
+        assert not (destination_directory / "nested" / "file2.csv").exists()
+
+    def test_hash_skips_touched_files(self, source_directory: Path, temporary_directory: Path):
+        """Should not restage files whose modification time changed but whose contents did not."""
+        ingester = LocalIngester(
+            source_directory=source_directory,
+            file_pattern="file1.csv",
+            destination_directory=temporary_directory / "destination",
+            staging_mode="copy",
+            hash_files=True,
+        )
+        ingester.fetch_data()
+        os.utime(source_directory / "file1.csv", (0, 0))
+
+        with patch.object(ingester, "_stage_file") as mocked_stage_file:
+            ingester.fetch_data()
+            mocked_stage_file.assert_not_called()
+        assert ingester._local_manifest_handler.get_files()[0].last_modified == "1970-01-01T00:00:00+00:00"
+
+    def test_hash_reused_for_unchanged_files(self, source_directory: Path, temporary_directory: Path):
+        """Should reuse the hash of the previous run for files whose size and modification time did not change."""
+        ingester = LocalIngester(
+            source_directory=source_directory,
+            file_pattern="file1.csv",
+            destination_directory=temporary_directory / "destination",
+            staging_mode="copy",
+            hash_files=True,
+        )
+        ingester.fetch_data()
+
+        with patch.object(ingester, "_hash_file") as mocked_hash_file:
+            ingester.fetch_data()
+            mocked_hash_file.assert_not_called()
+        assert ingester._local_manifest_handler.get_files()[0].hash is not None
+
+    def test_no_matching_files(self, source_directory: Path, temporary_directory: Path):
+        """Should raise `FileNotFoundError` if no files match the pattern."""
+        ingester = LocalIngester(
+            source_directory=source_directory,
+            file_pattern="*.parquet",
+            destination_directory=temporary_directory / "destination",
+        )
+        with pytest.raises(FileNotFoundError):
+            ingester.fetch_data()
@@ -14,6 +14,7 @@ from botocore.exceptions import ProfileNotFound
 from moto.s3.models import s3_backends
 
 from mleko.dataset.ingest import S3Ingester
+from mleko.utils import s3_helpers
 
 
 class TestS3Ingester:
@@ -148,11 +149,70 @@ class TestS3Ingester:
             )
             mocked_s3_fetch_all.assert_called()
 
+    def test_delta_sync(self, s3_bucket, temporary_directory: Path):
+        """Should only download new or changed files and delete removed files when the cache is outdated."""
+        s3_bucket.Object("test-prefix/test-file1.csv").put(Body="MLEKO1")
+        s3_bucket.Object("test-prefix/test-file2.csv").put(Body="MLEKO2")
+        s3_bucket.Object("test-prefix/test-file3.csv").put(Body="MLEKO3")
+        test_data = S3Ingester(
+            destination_directory=temporary_directory,
+            s3_bucket_name="test-bucket",
+            s3_key_prefix="test-prefix",
+            dataset_id="test-dataset",
+            aws_region_name="us-east-1",
+            max_concurrent_files=1,
+        )
+        test_data.fetch_data(force_recompute=True)
+
+        s3_bucket.Object("test-prefix/test-file2.csv").put(Body="MLEKO4")
+        s3_bucket.Object("test-prefix/test-file3.csv").delete()
+        s3_bucket.Object("test-prefix/test-file4.csv").put(Body="MLEKO5")
+        with patch.object(
+            test_data._s3_client, "download_file", wraps=test_data._s3_client.download_file
+        ) as mocked_download_file:
+            file_paths = test_data.fetch_data(force_recompute=False)
+
+        downloaded_keys = sorted(call.args[2] for call in mocked_download_file.call_args_list)
+        assert downloaded_keys == ["test-prefix/test-file2.csv", "test-prefix/test-file4.csv"]
+        assert sorted(file_path.name for file_path in file_paths) == [
+            "test-file1.csv",
+            "test-file2.csv",
+            "test-file4.csv",
+        ]
+        assert not (temporary_directory / "test-dataset" / "test-file3.csv").exists()
+        assert (temporary_directory / "test-dataset" / "test-file2.csv").read_text() == "MLEKO4"
+
+        with patch.object(test_data._s3_client, "download_file") as mocked_download_file:
+            test_data.fetch_data(force_recompute=False)
+            mocked_download_file.assert_not_called()
+
+    def test_get_s3_uris(self, s3_bucket, temporary_directory: Path):
+        """Should list the S3 URIs of the matching files without downloading them."""
+        s3_bucket.Object("test-prefix/test-file1.csv").put(Body="MLEKO1")
+        s3_bucket.Object("test-prefix/nested/test-file2.csv").put(Body="MLEKO2")
+        s3_bucket.Object("test-prefix/test-file3.json").put(Body="{}")
+        test_data = S3Ingester(
+            destination_directory=temporary_directory,
+            s3_bucket_name="test-bucket",
+            s3_key_prefix="test-prefix",
+            file_pattern="*.csv",
+            aws_region_name="us-east-1",
+            max_concurrent_files=1,
+        )
+
+        assert test_data.get_s3_uris() == [
+            "s3://test-bucket/test-prefix/nested/test-file2.csv",
+            "s3://test-bucket/test-prefix/test-file1.csv",
+        ]
+        assert list(test_data._destination_directory.glob("*.csv")) == []
+
     def test_custom_aws_profile_and_region_name(self, temporary_directory: Path):
         """Should init with custom aws_profile_name and aws_region_name."""
         with patch("boto3.Session.__init__") as mocked_session_init, patch(
             "boto3.Session.get_credentials"
-        ) as mocked_get_credentials, patch("boto3.client") as mocked_client:
+        ) as mocked_get_credentials, patch("boto3.client") as mocked_client, patch.dict(
+            s3_helpers._S3_CLIENTS, clear=True
+        ):
             # Return None for the default region_name and profile_name
             def side_effect(*args, **kwargs):
                 if kwargs.get("region_name") == "us-west-2" and kwargs.get("profile_name") == "custom-profile-name":
@@ -198,7 +258,7 @@ class TestS3Ingester:
         """Should init with custom aws_profile_name and aws_region_name."""
         with patch("boto3.Session.__init__") as mocked_session_init, patch(
             "boto3.Session.get_credentials"
-        ) as mocked_get_credentials:
+        ) as mocked_get_credentials, patch.dict(s3_helpers._S3_CLIENTS, clear=True):
             # Return None for the default region_name and profile_name
             def side_effect(*args, **kwargs):
                 if kwargs.get("region_name") == "us-west-2" and kwargs.get("profile_name") == "custom-profile-name":
@@ -288,3 +348,80 @@ class TestS3Ingester:
         assert len(file_paths) == 2
         assert (temporary_directory / "test-dataset" / "test-file1.csv").read_text() == "MLEKO"
         assert (temporary_directory / "test-dataset" / "test-file2.csv").read_text() == "MLEKO1"
+
+    def test_sample_fraction(self, s3_bucket, temporary_directory: Path):
+        """Should fetch a reproducible subset of the objects, cached separately from the full dataset."""
+        for i in range(10):
+            s3_bucket.Object(f"test-prefix/test-file{i}.csv").put(Body=f"a,b\n{i},{i}\n")
+
+        def create_ingester(**kwargs) -> S3Ingester:
+            return S3Ingester(
+                destination_directory=temporary_directory,
+                s3_bucket_name="test-bucket",
+                s3_key_prefix="test-prefix",
+                aws_region_name="us-east-1",
+                max_concurrent_files=1,
+                **kwargs,
+            )
+
+        full_ingester = create_ingester()
+        sample_ingester = create_ingester(sample_fraction=0.3, sample_seed=1)
+        file_paths = sample_ingester.fetch_data()
+
+        assert len(file_paths) == 3
+        assert sample_ingester._destination_directory != full_ingester._destination_directory
+        assert sample_ingester._local_manifest_handler.get_metadata() == {
+            "sample": {"fraction": 0.3, "bytes": None, "seed": 1}
+        }
+        assert [file_path.name for file_path in create_ingester(sample_fraction=0.3, sample_seed=1).fetch_data()] == [
+            file_path.name for file_path in file_paths
+        ]
+        assert [file_path.name for file_path in create_ingester(sample_fraction=0.3, sample_seed=2).fetch_data()] != [
+            file_path.name for file_path in file_paths
+        ]
+        assert len(create_ingester(sample_fraction=0.01).get_s3_uris()) == 1
+
+        with patch.object(sample_ingester._s3_client, "download_file") as mocked_download_file:
+            sample_ingester.fetch_data()
+            mocked_download_file.assert_not_called()
+
+    def test_sample_bytes(self, s3_bucket, temporary_directory: Path):
+        """Should fetch the leading bytes of large objects trimmed to whole lines and small objects whole."""
+        s3_bucket.Object("test-prefix/large.csv").put(Body="a,b\n1,2\n3,4\n5,6\n")
+        s3_bucket.Object("test-prefix/small.csv").put(Body="a,b\n1,2\n")
+        s3_bucket.Object("test-prefix/large.csv.gz").put(Body=b"\x1f\x8b" + b"0" * 20)
+        test_data = S3Ingester(
+            destination_directory=temporary_directory,
+            s3_bucket_name="test-bucket",
+            s3_key_prefix="test-prefix",
+            aws_region_name="us-east-1",
+            max_concurrent_files=1,
+            sample_bytes=10,
+        )
+        test_data.fetch_data()
+
+        assert (test_data._destination_directory / "large.csv").read_text() == "a,b\n1,2\n"
+        assert (test_data._destination_directory / "small.csv").read_text() == "a,b\n1,2\n"
+        assert (test_data._destination_directory / "large.csv.gz").stat().st_size == 22
+
+        with patch.object(test_data._s3_client, "download_file_head") as mocked_download_file_head, patch.object(
+            test_data._s3_client, "download_file"
+        ) as mocked_download_file:
+            test_data.fetch_data()
+            mocked_download_file_head.assert_not_called()
+            mocked_download_file.assert_not_called()
+
+        s3_bucket.Object("test-prefix/large.csv").put(Body="c,d\n1,2\n3,4\n5,6\n")
+        test_data.fetch_data()
+        assert (test_data._destination_directory / "large.csv").read_text() == "c,d\n1,2\n"
+
+    @pytest.mark.parametrize("sampling", [{"sample_fraction": 0.0}, {"sample_fraction": 1.5}, {"sample_bytes": 0}])
+    def test_invalid_sampling(self, sampling: dict, temporary_directory: Path):
+        """Should raise `ValueError` for sample fractions outside (0, 1] and non-positive sampled bytes."""
+        with pytest.raises(ValueError):
+            S3Ingester(
+                destination_directory=temporary_directory,
+                s3_bucket_name="test-bucket",
+                s3_key_prefix="test-prefix",
+                **sampling,
+            )
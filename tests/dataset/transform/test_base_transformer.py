@@ -85,3 +85,17 @@ class TestBaseTransformer:
 
         with pytest.raises(RuntimeError):
             test_derived_transformer.transform(example_data_schema, example_vaex_dataframe)
+
+    def test_get_features(self, temporary_directory: Path):
+        """Should return the features used by the transformer."""
+        assert self.DerivedTransformer(["a", "b"], temporary_directory, 1).get_features() == ("a", "b")
+
+    def test_get_scorer(self, temporary_directory: Path):
+        """Should raise an error for unfitted transformers and transformers that do not support scoring."""
+        test_derived_transformer = self.DerivedTransformer([], temporary_directory, 1)
+        with pytest.raises(RuntimeError):
+            test_derived_transformer.get_scorer()
+
+        test_derived_transformer._transformer = 1337
+        with pytest.raises(NotImplementedError):
+            test_derived_transformer.get_scorer()
@@ -1,16 +1,22 @@
 """Test suite for `dataset.transform.composite_transformer`."""
 
+import gc
+import os
+import pickle
 from pathlib import Path
 from unittest.mock import patch
 
 import numpy as np
 import pytest
 import vaex
+import vaex.progress
 
 from mleko.dataset.data_schema import DataSchema
 from mleko.dataset.transform.composite_transformer import CompositeTransformer
+from mleko.dataset.transform.expression_transformer import ExpressionTransformer
 from mleko.dataset.transform.frequency_encoder_transformer import FrequencyEncoderTransformer
 from mleko.dataset.transform.label_encoder_transformer import LabelEncoderTransformer
+from mleko.dataset.transform.max_abs_scaler_transformer import MaxAbsScalerTransformer
 
 
 @pytest.fixture()
@@ -41,7 +47,7 @@ class TestCompositeTransformer:
                 LabelEncoderTransformer(features=["a"], cache_directory=temporary_directory),
                 FrequencyEncoderTransformer(features=["b"], cache_directory=temporary_directory),
             ],
-            temporary_directory,
+            cache_directory=temporary_directory,
         )
 
         ds, _, df = test_composite_transformer.fit_transform(example_data_schema, example_vaex_dataframe)
@@ -65,7 +71,7 @@ class TestCompositeTransformer:
                 LabelEncoderTransformer(features=["a"], cache_directory=temporary_directory),
                 FrequencyEncoderTransformer(features=["b"], cache_directory=temporary_directory),
             ],
-            temporary_directory,
+            cache_directory=temporary_directory,
         )
 
         ds, _ = test_composite_transformer.fit(example_data_schema, example_vaex_dataframe)
@@ -90,7 +96,7 @@ class TestCompositeTransformer:
                 LabelEncoderTransformer(features=["a"], cache_directory=temporary_directory),
                 FrequencyEncoderTransformer(features=["b"], cache_directory=temporary_directory),
             ],
-            temporary_directory,
+            cache_directory=temporary_directory,
         ).fit_transform(example_data_schema, example_vaex_dataframe)
         first_cache = list(temporary_directory.glob("*"))
 
@@ -105,7 +111,7 @@ class TestCompositeTransformer:
                 LabelEncoderTransformer(features=["a"], cache_directory=temporary_directory),
                 FrequencyEncoderTransformer(features=["b"], cache_directory=temporary_directory),
             ],
-            temporary_directory,
+            cache_directory=temporary_directory,
         ).fit_transform(example_data_schema, example_vaex_dataframe)
         second_cache = list(temporary_directory.glob("*"))
 
@@ -116,3 +122,117 @@ class TestCompositeTransformer:
         assert str(ds) == "{'numerical': ['b'], 'categorical': ['a'], 'boolean': [], 'datetime': [], 'timedelta': []}"
 
         assert first_cache == second_cache
+
+    def test_materialization_policy(self, temporary_directory: Path):
+        """Should keep cheap virtual columns lazy and materialize deep or reused virtual columns."""
+        df = vaex.from_arrays(x=[1.0, 2.0, 3.0, 4.0])
+        transformers = [
+            ExpressionTransformer(
+                {"y": {"expression": "x * 2", "type": "numerical", "is_meta": False}},
+                cache_directory=temporary_directory,
+            ),
+            ExpressionTransformer(
+                {"z": {"expression": "y + 1", "type": "numerical", "is_meta": False}},
+                cache_directory=temporary_directory,
+            ),
+            ExpressionTransformer(
+                {"w": {"expression": "z * y", "type": "numerical", "is_meta": False}},
+                cache_directory=temporary_directory,
+            ),
+            MaxAbsScalerTransformer(features=["x"], cache_directory=temporary_directory),
+        ]
+
+        _, _, lazy_df = CompositeTransformer(transformers, cache_directory=temporary_directory).fit_transform(
+            DataSchema(numerical=["x"]), df, disable_cache=True
+        )
+        assert sorted(lazy_df.virtual_columns) == ["w", "x", "y", "z"]
+
+        _, _, fused_df = CompositeTransformer(
+            transformers, materialization_threshold=3, cache_directory=temporary_directory
+        ).fit_transform(DataSchema(numerical=["x"]), df, disable_cache=True)
+        assert sorted(fused_df.virtual_columns) == ["x", "y", "z"]
+        assert fused_df["w"].tolist() == lazy_df["w"].tolist() == [6.0, 20.0, 42.0, 72.0]
+        assert len(list((temporary_directory / "materialized").glob("*/*.arrow"))) == 1
+
+    def test_materialized_files_lifetime(self, temporary_directory: Path):
+        """Should keep the files of earlier results, delete them once unused, and delete stale directories."""
+        df = vaex.from_arrays(x=[1.0, 2.0, 3.0, 4.0])
+        stale_directory = temporary_directory / "materialized" / "stale"
+        stale_directory.mkdir(parents=True)
+        os.utime(stale_directory, (0, 0))
+
+        def make_transformer() -> CompositeTransformer:
+            """Return a composite transformer materializing after its first step."""
+            return CompositeTransformer(
+                [
+                    ExpressionTransformer(
+                        {"y": {"expression": "x * 2", "type": "numerical", "is_meta": False}},
+                        cache_directory=temporary_directory,
+                    ),
+                    MaxAbsScalerTransformer(features=["y"], cache_directory=temporary_directory),
+                ],
+                cache_directory=temporary_directory,
+                materialize_after_steps=[0],
+            )
+
+        _, _, first_df = make_transformer().fit_transform(DataSchema(numerical=["x"]), df, disable_cache=True)
+        _, _, second_df = make_transformer().fit_transform(DataSchema(numerical=["x"]), df, disable_cache=True)
+        directories = sorted((temporary_directory / "materialized").iterdir())
+        assert not stale_directory.exists()
+        assert len(directories) == 2
+        assert first_df["y"].tolist() == second_df["y"].tolist() == [0.25, 0.5, 0.75, 1.0]
+
+        # vaex never exits the root progress tree of `map_reduce`, which keeps the last evaluated DataFrame alive
+        vaex.progress._last_progress_tree = None
+        del first_df, second_df
+        gc.collect()
+        assert not any(directory.exists() for directory in directories)
+
+    def test_materialize_after_steps(self, temporary_directory: Path):
+        """Should materialize all virtual columns after the hinted steps and extract filtered DataFrames."""
+        df = vaex.from_arrays(x=[1.0, -2.0, 3.0, 4.0])
+        transformer = CompositeTransformer(
+            [
+                ExpressionTransformer(
+                    {"y": {"expression": "x * 2", "type": "numerical", "is_meta": False}},
+                    cache_directory=temporary_directory,
+                ),
+                MaxAbsScalerTransformer(features=["y"], cache_directory=temporary_directory),
+            ],
+            cache_directory=temporary_directory,
+            materialization_threshold=None,
+            materialize_after_steps=[0],
+        )
+        with patch.object(
+            MaxAbsScalerTransformer, "_fit_transform", wraps=transformer._transformers[1]._fit_transform
+        ) as mocked_fit_transform:
+            _, _, transformed_df = transformer.fit_transform(DataSchema(numerical=["x"]), df[df.x > 0])
+            assert "y" not in mocked_fit_transform.call_args.args[1].virtual_columns
+            assert not mocked_fit_transform.call_args.args[1].filtered
+
+        assert transformed_df["y"].tolist() == [0.25, 0.75, 1.0]
+
+    def test_get_scorer(self, temporary_directory: Path):
+        """Should export a scorer chaining the scorers of all transformers, raising an error if any is unsupported."""
+        df = vaex.from_arrays(x=[1.0, -2.0, 3.0, 4.0], y=["a", "b", "a", None])
+        data_schema = DataSchema(numerical=["x"], categorical=["y"])
+        transformer = CompositeTransformer(
+            [
+                ExpressionTransformer(
+                    {"z": {"expression": "x * 2 + 1", "type": "numerical", "is_meta": False}},
+                    cache_directory=temporary_directory,
+                ),
+                MaxAbsScalerTransformer(features=["x", "z"], cache_directory=temporary_directory),
+                LabelEncoderTransformer(features=["y"], cache_directory=temporary_directory),
+            ],
+            cache_directory=temporary_directory,
+        )
+        _, _, transformed_df = transformer.fit_transform(data_schema, df)
+
+        batch = pickle.loads(pickle.dumps(transformer.get_scorer()))({"x": df["x"].tolist(), "y": df["y"].tolist()})
+        for column in ["x", "y", "z"]:
+            assert batch[column].tolist() == transformed_df[column].tolist()
+
+        with patch.object(MaxAbsScalerTransformer, "_get_scorer", side_effect=NotImplementedError):
+            with pytest.raises(NotImplementedError):
+                transformer.get_scorer()
@@ -1,13 +1,18 @@
 """Test suite for `dataset.transform.test_expression_transformer`."""
 
+from __future__ import annotations
+
 from pathlib import Path
 from unittest.mock import patch
 
+import numpy as np
+import pyarrow as pa
 import pytest
 import vaex
 
 from mleko.dataset.data_schema import DataSchema
-from mleko.dataset.transform.expression_transformer import ExpressionTransformer
+from mleko.dataset.transform import expression_transformer as expression_transformer_module
+from mleko.dataset.transform.expression_transformer import ExpressionTransformer, ExpressionTransformerConfig
 
 
 @pytest.fixture()
@@ -51,6 +56,31 @@ class TestExpressionTransformer:
         assert ds.get_type("product") == "numerical"
         assert "all_positive" not in ds.get_features()
 
+    def test_jit(self, temporary_directory: Path, example_data_schema: DataSchema):
+        """Should JIT-compile numerical expressions into fused kernels and fall back for other expressions."""
+        df = vaex.from_arrays(a=pa.array([1.0, None, 4.0]), b=np.array([2.0, 2.0, 4.0]), s=["x", "y", "z"])
+        df["ratio"] = df.a / df.b
+        expressions: dict[str, ExpressionTransformerConfig] = {
+            "score": {"expression": "ratio * sqrt(b) + (a > 1)", "type": "numerical", "is_meta": False},
+            "upper": {"expression": "str_upper(s)", "type": "categorical", "is_meta": False},
+        }
+        _, _, expected_df = ExpressionTransformer(expressions, cache_directory=temporary_directory)._fit_transform(
+            example_data_schema, df
+        )
+
+        with patch.object(
+            expression_transformer_module, "jit_expression", wraps=expression_transformer_module.jit_expression
+        ) as mocked_jit_expression:
+            _, _, jit_df = ExpressionTransformer(
+                expressions, jit="numba", cache_directory=temporary_directory
+            )._fit_transform(example_data_schema, df)
+            assert mocked_jit_expression.call_count == 2
+
+        assert jit_df.virtual_columns["score"].startswith("as_arrow(_jit")
+        assert "ratio" not in jit_df.virtual_columns["score"]
+        assert jit_df["score"].tolist() == expected_df["score"].tolist()  # type: ignore
+        assert jit_df["upper"].tolist() == ["X", "Y", "Z"]  # type: ignore
+
     def test_cache(
         self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
     ):
@@ -72,3 +102,25 @@ class TestExpressionTransformer:
                 cache_directory=temporary_directory,
             ).fit_transform(example_data_schema, example_vaex_dataframe)
             mocked_fit_transform.assert_not_called()
+
+    def test_get_scorer(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should export a scorer evaluating the expressions in order with the same output as `transform`."""
+        expression_transformer = ExpressionTransformer(
+            cache_directory=temporary_directory,
+            expressions={
+                "ratio": {"expression": "b / (c + 2) + sqrt(b)", "type": "numerical", "is_meta": False},
+                "clipped": {"expression": "where(ratio > 3, 3, ratio)", "type": "numerical", "is_meta": False},
+                "label": {"expression": "str_upper(name)", "type": "categorical", "is_meta": False},
+            },
+        )
+        df = example_vaex_dataframe.copy()
+        df["name"] = np.array(["w", "x", "y", "z"])
+        _, _, transformed_df = expression_transformer.fit_transform(example_data_schema, df)
+        scorer = expression_transformer.get_scorer()
+
+        batch = scorer({column: df[column].tolist() for column in ["a", "b", "c", "name"]})
+        for column in ["ratio", "clipped", "label"]:
+            assert batch[column].tolist() == transformed_df[column].tolist()
+        assert scorer({"b": 7, "c": -1, "name": "x"})["label"] == "X"
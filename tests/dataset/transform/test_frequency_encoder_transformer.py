@@ -4,6 +4,7 @@ from pathlib import Path
 from unittest.mock import patch
 
 import numpy as np
+import pyarrow as pa
 import pytest
 import vaex
 
@@ -49,6 +50,42 @@ class TestFrequencyEncoderTransformer:
             == "{'numerical': ['a', 'b', 'c'], 'categorical': [], 'boolean': [], 'datetime': [], 'timedelta': []}"
         )
 
+    def test_frequency_encoding_dictionary_encoded(self, temporary_directory: Path, example_data_schema: DataSchema):
+        """Should frequency encode dictionary-encoded features like their plain string counterparts."""
+        frequency_encoder_transformer = FrequencyEncoderTransformer(
+            cache_directory=temporary_directory, features=["a", "b", "c"]
+        )
+        _, _, df = frequency_encoder_transformer._fit_transform(
+            example_data_schema,
+            vaex.from_arrays(
+                a=pa.array(["1", "1", "0", "0"]).dictionary_encode(),
+                b=["1", "1", "1", "1"],
+                c=pa.array([None, "1", "1", "1"]).dictionary_encode(),
+            ),
+        )
+        c = df["c"].tolist()  # type: ignore
+
+        assert df["a"].tolist() == [0.5, 0.5, 0.5, 0.5]  # type: ignore
+        assert df["b"].tolist() == [1.0, 1.0, 1.0, 1.0]  # type: ignore
+        assert np.isnan(c[0])
+        assert c[1:] == [0.75, 0.75, 0.75]
+
+    def test_fit_single_pass(self, temporary_directory: Path, example_data_schema: DataSchema):
+        """Should compute the value counts of all features in a single pass over the DataFrame."""
+        df = vaex.from_arrays(
+            a=pa.array(["1", "1", "0", "0"]).dictionary_encode(),
+            b=["1", "1", "1", "1"],
+            c=[None, "1", "1", "1"],
+        )
+        passes = df.executor.passes
+        _, transformer = FrequencyEncoderTransformer(
+            cache_directory=temporary_directory, features=["a", "b", "c"]
+        )._fit(example_data_schema, df)
+
+        assert df.executor.passes - passes == 1
+        assert transformer.mappings_["a"] == {"1": 0.5, "0": 0.5}
+        assert transformer.mappings_["c"]["1"] == 0.75
+
     def test_cache(
         self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
     ):
@@ -62,3 +99,28 @@ class TestFrequencyEncoderTransformer:
                 example_data_schema, example_vaex_dataframe
             )
             mocked_fit_transform.assert_not_called()
+
+    def test_get_scorer(self, temporary_directory: Path, example_data_schema: DataSchema):
+        """Should export a scorer with the same output as `transform`, including unseen, missing and NaN values."""
+        frequency_encoder_transformer = FrequencyEncoderTransformer(
+            cache_directory=temporary_directory, features=["a", "c", "d"], unseen_strategy="zero"
+        )
+        dataframe = vaex.from_arrays(
+            a=["1", "1", "0", "0"], c=[None, "1", "1", "1"], d=np.array([1.0, np.nan, 2.0, np.nan])
+        )
+        data_schema = example_data_schema.copy().add_feature("d", "numerical")
+        _, _, df = frequency_encoder_transformer.fit_transform(data_schema, dataframe)
+        scorer = frequency_encoder_transformer.get_scorer()
+
+        batch = scorer({feature: dataframe[feature].tolist() for feature in ["a", "c", "d"]})
+        np.testing.assert_array_equal(batch["a"], df["a"].values)
+        np.testing.assert_array_equal(batch["c"], df["c"].values)
+        np.testing.assert_array_equal(batch["d"], df["d"].values)
+        assert batch["d"].tolist() == [0.25, 0.5, 0.25, 0.5]
+        _, unseen_df = frequency_encoder_transformer.transform(
+            data_schema, vaex.from_arrays(a=["2"], c=["1"], d=[float("nan")]), disable_cache=True
+        )
+        record = scorer({"a": "2", "c": "1", "d": float("nan")})
+        np.testing.assert_array_equal(
+            [record["a"], record["c"], record["d"]], [unseen_df["a"].tolist()[0], 0.75, unseen_df["d"].tolist()[0]]
+        )
@@ -0,0 +1,133 @@
+"""Test suite for `dataset.transform.hashing_encoder_transformer`."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pyarrow as pa
+import pytest
+import vaex
+
+from mleko.dataset.data_schema import DataSchema
+from mleko.dataset.transform.hashing_encoder_transformer import FeatureHasher, HashingEncoderTransformer
+
+
+@pytest.fixture()
+def example_vaex_dataframe() -> vaex.DataFrame:
+    """Return an example vaex dataframe."""
+    return vaex.from_arrays(
+        user=["u1", "u2", "u1", None],
+        merchant=pa.array(["m1", "m1", "m2", "m1"]).dictionary_encode(),
+        amount=[1.0, 2.0, 3.0, 4.0],
+    )
+
+
+@pytest.fixture()
+def example_data_schema() -> DataSchema:
+    """Return an example data schema."""
+    return DataSchema(categorical=["user", "merchant"], numerical=["amount"])
+
+
+class TestFeatureHasher:
+    """Test suite for `dataset.transform.hashing_encoder_transformer.FeatureHasher`."""
+
+    def test_stable_hash(self):
+        """Should hash equal values to equal buckets regardless of chunking, encoding and string type."""
+        feature_hasher = FeatureHasher(n_buckets=1000, seed=0)
+        expected = feature_hasher.encode(pa.array(["a", "bb", "", None, "a longer value"])).to_pylist()
+
+        assert expected[3] is None
+        assert (
+            feature_hasher.encode(
+                pa.chunked_array([["a", "bb"], ["", None, "a longer value"]], pa.large_string())
+            ).to_pylist()
+            == expected
+        )
+        assert (
+            feature_hasher.encode(pa.array(["a", "bb", "", None, "a longer value"]).dictionary_encode()).to_pylist()
+            == expected
+        )
+        assert feature_hasher.encode(pa.array(["a", "bb", "", None, "a longer value"])[1:]).to_pylist() == expected[1:]
+        all_null = pa.DictionaryArray.from_arrays(pa.array([None, None], pa.int32()), pa.array([], pa.string()))
+        assert feature_hasher.encode(all_null).to_pylist() == [None, None]
+        assert all(0 <= bucket < 1000 for bucket in expected if bucket is not None)
+
+    def test_seed_and_crosses(self):
+        """Should hash differently with different seeds and cross the values of multiple columns in order."""
+        values = pa.array([f"value_{i}" for i in range(100)])
+        others = pa.array([f"other_{i % 3}" for i in range(100)])
+
+        assert FeatureHasher(2**20, 0).encode(values) != FeatureHasher(2**20, 1).encode(values)
+        assert len(set(FeatureHasher(2**20, 0).encode(values).to_pylist())) == 100
+        assert FeatureHasher(2**20, 0).encode(values, others) != FeatureHasher(2**20, 0).encode(others, values)
+        assert FeatureHasher(2**20, 0).encode(pa.array(["a", None]), pa.array([None, "b"])).null_count == 2
+
+    def test_negative_seed(self):
+        """Should accept negative seeds, taken modulo 2**64."""
+        values = pa.array([f"value_{i}" for i in range(100)])
+
+        assert FeatureHasher(2**20, -1).encode(values) == FeatureHasher(2**20, 2**64 - 1).encode(values)
+        assert FeatureHasher(2**20, -1).encode(values) != FeatureHasher(2**20, 1).encode(values)
+
+
+class TestHashingEncoderTransformer:
+    """Test suite for `dataset.transform.hashing_encoder_transformer.HashingEncoderTransformer`."""
+
+    def test_hashing_encoding(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should hash features in place and add crosses of the original values as new categorical features."""
+        feature_hasher = FeatureHasher(n_buckets=64, seed=3)
+        hashing_encoder_transformer = HashingEncoderTransformer(
+            features=["user", "merchant"],
+            n_buckets=64,
+            seed=3,
+            crosses={"user_merchant": ["user", "merchant"]},
+            cache_directory=temporary_directory,
+        )
+        ds, _, df = hashing_encoder_transformer._fit_transform(example_data_schema, example_vaex_dataframe)
+
+        assert df["user"].tolist() == feature_hasher.encode(pa.array(["u1", "u2", "u1", None])).to_pylist()
+        assert df["merchant"].tolist() == feature_hasher.encode(pa.array(["m1", "m1", "m2", "m1"])).to_pylist()
+        assert (
+            df["user_merchant"].tolist()
+            == feature_hasher.encode(pa.array(["u1", "u2", "u1", None]), pa.array(["m1", "m1", "m2", "m1"])).to_pylist()
+        )
+        assert ds.get_features(["categorical"]) == ["merchant", "user", "user_merchant"]
+
+    def test_no_fit_scan(self, temporary_directory: Path, example_data_schema: DataSchema):
+        """Should not pass over the data when fitting and hash unseen values when transforming."""
+        df = vaex.from_arrays(user=["u1", "u2"], merchant=["m1", "m2"])
+        passes = df.executor.passes
+        hashing_encoder_transformer = HashingEncoderTransformer(features=["user"], cache_directory=temporary_directory)
+        hashing_encoder_transformer._fit(example_data_schema, df)
+        assert df.executor.passes == passes
+
+        _, transformed_df = hashing_encoder_transformer._transform(
+            example_data_schema, vaex.from_arrays(user=["u3", "u1"])
+        )
+        assert transformed_df["user"].tolist()[1] == FeatureHasher(2**20, 0).encode(pa.array(["u1"]))[0].as_py()
+
+    def test_invalid_parameters(self, temporary_directory: Path):
+        """Should raise a `ValueError` for a non-positive number of buckets and invalid crosses."""
+        with pytest.raises(ValueError, match="positive"):
+            HashingEncoderTransformer(["user"], n_buckets=0, cache_directory=temporary_directory)
+        with pytest.raises(ValueError, match="at least two features"):
+            HashingEncoderTransformer(["user"], crosses={"cross": ["user"]}, cache_directory=temporary_directory)
+        with pytest.raises(ValueError, match="at least two features"):
+            HashingEncoderTransformer(
+                ["user"], crosses={"user": ["user", "merchant"]}, cache_directory=temporary_directory
+            )
+
+    def test_cache(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should correctly hash features and use cache if possible."""
+        HashingEncoderTransformer(["user"], cache_directory=temporary_directory).fit_transform(
+            example_data_schema, example_vaex_dataframe
+        )
+
+        with patch.object(HashingEncoderTransformer, "_fit_transform") as mocked_fit_transform:
+            HashingEncoderTransformer(["user"], cache_directory=temporary_directory).fit_transform(
+                example_data_schema, example_vaex_dataframe
+            )
+            mocked_fit_transform.assert_not_called()
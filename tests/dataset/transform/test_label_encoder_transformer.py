@@ -3,10 +3,12 @@
 from pathlib import Path
 from unittest.mock import patch
 
+import pyarrow as pa
 import pytest
 import vaex
 
 from mleko.dataset.data_schema import DataSchema
+from mleko.dataset.transform import label_encoder_transformer as label_encoder_transformer_module
 from mleko.dataset.transform.label_encoder_transformer import LabelEncoderTransformer
 
 
@@ -67,6 +69,25 @@ class TestLabelEncoderTransformer:
         assert df["b"].tolist() == [0, 0, 0, 0]  # type: ignore
         assert df["c"].tolist() == [-1, 0, 0, 0]  # type: ignore
 
+    def test_fit_single_pass(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should gather the labels of all features, including dictionary-encoded ones, with a single iterator."""
+        example_vaex_dataframe["b"] = pa.array(["1", "1", "1", "1"]).dictionary_encode()
+        label_encoder_transformer = LabelEncoderTransformer(
+            cache_directory=temporary_directory, features=["a", "b", "c"]
+        )
+        with patch(
+            "mleko.dataset.transform.label_encoder_transformer.get_unique_values",
+            wraps=label_encoder_transformer_module.get_unique_values,
+        ) as mocked_get_unique_values:
+            _, transformer = label_encoder_transformer._fit(example_data_schema, example_vaex_dataframe)
+            mocked_get_unique_values.assert_called_once()
+
+        assert transformer["a"].to_dict() == {"1": 0, "0": 1, None: None}
+        assert transformer["b"].to_dict() == {"1": 0, None: None}
+        assert transformer["c"].to_dict() == {"1": 0, None: None}
+
     def test_label_encoding_unseen(
         self,
         temporary_directory: Path,
@@ -105,6 +126,10 @@ class TestLabelEncoderTransformer:
         with pytest.raises(ValueError):
             _, _ = label_encoder_transformer._transform(example_data_schema, additional_example_vaex_dataframe)
 
+        empty_df = additional_example_vaex_dataframe[additional_example_vaex_dataframe.a == "missing"].extract()
+        _, df = label_encoder_transformer._transform(example_data_schema, empty_df)
+        assert len(df) == 0
+
     def test_label_encoding_label_dict(
         self,
         temporary_directory: Path,
@@ -216,6 +241,53 @@ class TestLabelEncoderTransformer:
         _, _, df = label_encoder_transformer._fit_transform(example_data_schema, example_vaex_dataframe)
         assert df["c"].tolist() == [-1, 2, 2, 2]  # type: ignore
 
+    def test_label_encoding_dictionary_encoded(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should label encode dictionary-encoded features exactly like their plain string counterparts."""
+        dictionary_vaex_dataframe = vaex.from_arrays(
+            a=pa.DictionaryArray.from_arrays(pa.array([1, 1, 0, 0], pa.int32()), pa.array(["0", "1"])),
+            b=pa.array(["1", "1", "1", "1"]).dictionary_encode(),
+            c=pa.array([None, "1", "1", "1"]).dictionary_encode(),
+            d=[1, 2, 3, 4],
+        )
+        for features_dataframe in [example_vaex_dataframe, dictionary_vaex_dataframe]:
+            label_encoder_transformer = LabelEncoderTransformer(
+                cache_directory=temporary_directory,
+                features=["a", "b", "c"],
+                allow_unseen=True,
+                encode_null=True,
+            )
+            label_encoder_transformer._fit(example_data_schema, features_dataframe)
+            _, df = label_encoder_transformer._transform(
+                example_data_schema,
+                vaex.from_arrays(
+                    a=pa.array(["0", "0", "1", "1"]).dictionary_encode(),
+                    b=pa.array(["1", "2", "0", None]).dictionary_encode(),
+                    c=pa.array([None, "0", None, "1"]).dictionary_encode(),
+                ),
+            )
+            assert df["a"].tolist() == [1, 1, 0, 0]  # type: ignore
+            assert df["b"].tolist() == [0, -2, -2, -1]  # type: ignore
+            assert df["c"].tolist() == [-1, -2, -1, 0]  # type: ignore
+
+    def test_arrow_label_encoding(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should store the mapping as Arrow arrays and encode chunked arrays with the same unseen and null codes."""
+        label_encoder_transformer = LabelEncoderTransformer(
+            cache_directory=temporary_directory, features=["a"], allow_unseen=True, encode_null=True
+        )
+        _, transformer = label_encoder_transformer._fit(example_data_schema, example_vaex_dataframe)
+        label_encoding = transformer["a"]
+
+        assert label_encoding.labels.type == pa.string()
+        assert label_encoding.codes.type == pa.int64()
+        values = pa.chunked_array([["0", "2"], [None, "1"]], pa.large_string())
+        assert label_encoding.count_unseen(values) == 1
+        assert label_encoding.encode(values, unseen_code=-2).to_pylist() == [1, -2, -1, 0]
+        assert label_encoding.encode(values).to_pylist() == [1, None, -1, 0]
+
     def test_invalid_feature_type(
         self,
         temporary_directory: Path,
@@ -244,3 +316,35 @@ class TestLabelEncoderTransformer:
                 example_data_schema, example_vaex_dataframe
             )
             mocked_fit_transform.assert_not_called()
+
+    def test_get_scorer(
+        self,
+        temporary_directory: Path,
+        example_data_schema: DataSchema,
+        example_vaex_dataframe: vaex.DataFrame,
+        additional_example_vaex_dataframe: vaex.DataFrame,
+    ):
+        """Should export a scorer with the same output as `transform` for records and batches."""
+        label_encoder_transformer = LabelEncoderTransformer(
+            cache_directory=temporary_directory, features=["a", "b", "c"], allow_unseen=True, encode_null=True
+        )
+        label_encoder_transformer.fit(example_data_schema, example_vaex_dataframe)
+        _, df = label_encoder_transformer.transform(example_data_schema, additional_example_vaex_dataframe)
+        scorer = label_encoder_transformer.get_scorer()
+
+        batch = scorer({feature: additional_example_vaex_dataframe[feature].tolist() for feature in ["a", "b", "c"]})
+        for feature in ["a", "b", "c"]:
+            assert batch[feature].tolist() == df[feature].tolist()
+        assert scorer({"a": "1", "b": None, "c": "2", "d": 7}) == {"a": 0, "b": -1, "c": -2, "d": 7}
+
+    def test_get_scorer_unseen_values(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should keep null values missing and raise an error for unseen values if they are not allowed."""
+        label_encoder_transformer = LabelEncoderTransformer(cache_directory=temporary_directory, features=["c"])
+        label_encoder_transformer.fit(example_data_schema, example_vaex_dataframe)
+        scorer = label_encoder_transformer.get_scorer()
+
+        assert scorer({"c": ["1", None]})["c"].tolist() == [0, None]
+        with pytest.raises(ValueError):
+            scorer({"c": "0"})
@@ -38,6 +38,18 @@ class TestMaxAbsScalerTransformer:
         assert df["a"].tolist() == [0.2, 0.4, 0.6, 0.8, 1.0]  # type: ignore
         assert df["b"].tolist() == [-0.5, -1.0, 0.0, 0.5, 1.0]  # type: ignore
 
+    def test_fit_single_pass(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should compute the statistics of all features in a single pass over the DataFrame."""
+        passes = example_vaex_dataframe.executor.passes
+        _, transformer = MaxAbsScalerTransformer(cache_directory=temporary_directory, features=["a", "b"])._fit(
+            example_data_schema, example_vaex_dataframe
+        )
+
+        assert example_vaex_dataframe.executor.passes - passes == 1
+        assert transformer.absmax_ == [5, 2]
+
     def test_cache(
         self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
     ):
@@ -51,3 +63,17 @@ class TestMaxAbsScalerTransformer:
                 example_data_schema, example_vaex_dataframe
             )
             mocked_fit_transform.assert_not_called()
+
+    def test_get_scorer(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should export a scorer with the same output as `transform`, keeping missing values missing."""
+        max_abs_scaler_transformer = MaxAbsScalerTransformer(cache_directory=temporary_directory, features=["a", "b"])
+        max_abs_scaler_transformer.fit(example_data_schema, example_vaex_dataframe)
+        _, df = max_abs_scaler_transformer.transform(example_data_schema, example_vaex_dataframe)
+        scorer = max_abs_scaler_transformer.get_scorer()
+
+        batch = scorer({"a": example_vaex_dataframe["a"].tolist(), "b": example_vaex_dataframe["b"].tolist()})
+        assert batch["a"].tolist() == df["a"].tolist()
+        assert batch["b"].tolist() == df["b"].tolist()
+        assert scorer({"a": [3, None], "b": 1})["a"].tolist() == [0.6, None]
@@ -0,0 +1,55 @@
+"""Test suite for `dataset.transform.median_imputer_transformer`."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pyarrow as pa
+import pytest
+import vaex
+
+from mleko.dataset.data_schema import DataSchema
+from mleko.dataset.transform.median_imputer_transformer import MedianImputerTransformer
+
+
+@pytest.fixture()
+def example_vaex_dataframe() -> vaex.DataFrame:
+    """Return an example vaex dataframe."""
+    return vaex.from_arrays(
+        a=pa.array([1.0, None, 3.0, 10.0, float("nan")]),
+        b=pa.array([4, 2, None, 8, 6]),
+    )
+
+
+@pytest.fixture()
+def example_data_schema() -> DataSchema:
+    """Return an example data schema."""
+    return DataSchema(numerical=["a", "b"])
+
+
+class TestMedianImputerTransformer:
+    """Test suite for `dataset.transform.median_imputer_transformer.MedianImputerTransformer`."""
+
+    def test_median_imputation(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should impute missing and nan values with the median of each feature."""
+        median_imputer_transformer = MedianImputerTransformer(cache_directory=temporary_directory, features=["a", "b"])
+        _, transformer, df = median_imputer_transformer._fit_transform(example_data_schema, example_vaex_dataframe)
+
+        assert transformer == {"a": 3.0, "b": 5.0}
+        assert df["a"].tolist() == [1.0, 3.0, 3.0, 10.0, 3.0]  # type: ignore
+        assert df["b"].tolist() == [4, 2, 5, 8, 6]  # type: ignore
+
+    def test_cache(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should correctly impute features and use cache if possible."""
+        MedianImputerTransformer(cache_directory=temporary_directory, features=["a"]).fit_transform(
+            example_data_schema, example_vaex_dataframe
+        )
+
+        with patch.object(MedianImputerTransformer, "_fit_transform") as mocked_fit_transform:
+            MedianImputerTransformer(cache_directory=temporary_directory, features=["a"]).fit_transform(
+                example_data_schema, example_vaex_dataframe
+            )
+            mocked_fit_transform.assert_not_called()
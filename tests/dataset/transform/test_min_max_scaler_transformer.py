@@ -50,6 +50,18 @@ class TestMinMaxScalerTransformer:
         assert df["a"].tolist() == [-1.0, -0.5, 0.0, 0.5, 1.0]  # type: ignore
         assert df["b"].tolist() == [-0.5, -1.0, 0.0, 0.5, 1.0]  # type: ignore
 
+    def test_fit_single_pass(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should compute the statistics of all features in a single pass over the DataFrame."""
+        passes = example_vaex_dataframe.executor.passes
+        _, transformer = MinMaxScalerTransformer(cache_directory=temporary_directory, features=["a", "b"])._fit(
+            example_data_schema, example_vaex_dataframe
+        )
+
+        assert example_vaex_dataframe.executor.passes - passes == 1
+        assert transformer.fmin_ == [1, -2]
+
     def test_cache(
         self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
     ):
@@ -63,3 +75,20 @@ class TestMinMaxScalerTransformer:
                 example_data_schema, example_vaex_dataframe
             )
             mocked_fit_transform.assert_not_called()
+
+    def test_get_scorer(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should export a scorer with the same output as `transform`, also outside of the fitted range."""
+        min_max_scaler_transformer = MinMaxScalerTransformer(
+            cache_directory=temporary_directory, features=["a", "b"], min_value=-1.0, max_value=3.0
+        )
+        min_max_scaler_transformer.fit(example_data_schema, example_vaex_dataframe)
+        new_df = vaex.from_arrays(a=[0.3, 7.0, 2.0], b=[-5, 1, 3])
+        _, df = min_max_scaler_transformer.transform(example_data_schema, new_df)
+        scorer = min_max_scaler_transformer.get_scorer()
+
+        batch = scorer({"a": new_df["a"].values, "b": new_df["b"].values})
+        assert batch["a"].tolist() == df["a"].tolist()
+        assert batch["b"].tolist() == df["b"].tolist()
+        assert scorer({"a": 0.3, "b": -5}) == {"a": df["a"].tolist()[0], "b": df["b"].tolist()[0]}
@@ -0,0 +1,79 @@
+"""Test suite for `dataset.transform.quantile_binning_transformer`."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pyarrow as pa
+import pytest
+import vaex
+
+from mleko.dataset.data_schema import DataSchema
+from mleko.dataset.transform.quantile_binning_transformer import QuantileBinningTransformer
+
+
+@pytest.fixture()
+def example_vaex_dataframe() -> vaex.DataFrame:
+    """Return an example vaex dataframe."""
+    return vaex.from_arrays(
+        a=pa.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, None]),
+        b=[1, 1, 1, 1, 1, 1, 2, 2, 2],
+    )
+
+
+@pytest.fixture()
+def example_data_schema() -> DataSchema:
+    """Return an example data schema."""
+    return DataSchema(numerical=["a", "b"])
+
+
+class TestQuantileBinningTransformer:
+    """Test suite for `dataset.transform.quantile_binning_transformer.QuantileBinningTransformer`."""
+
+    def test_quantile_binning(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should assign equally populated bins, merge bins with equal edges and keep missing values missing."""
+        quantile_binning_transformer = QuantileBinningTransformer(
+            cache_directory=temporary_directory, features=["a", "b"], n_bins=4
+        )
+        _, transformer, df = quantile_binning_transformer._fit_transform(example_data_schema, example_vaex_dataframe)
+
+        assert df["a"].tolist() == [0, 0, 1, 1, 2, 2, 3, 3, None]  # type: ignore
+        assert df["b"].tolist() == [0, 0, 0, 0, 0, 0, 0, 0, 0]  # type: ignore
+        assert transformer["b"].tolist() == [1.0, 2.0]
+
+        _, df = quantile_binning_transformer._transform(
+            example_data_schema, vaex.from_arrays(a=[-10.0, 4.5, 100.0], b=[0, 2, 3])
+        )
+        assert df["a"].tolist() == [0, 2, 3]  # type: ignore
+        assert df["b"].tolist() == [0, 0, 0]  # type: ignore
+
+    def test_large_dataframe(self, temporary_directory: Path):
+        """Should fit approximate quantile bins holding about the same number of samples."""
+        df = vaex.from_arrays(a=np.random.default_rng(0).exponential(size=100_000))
+        quantile_binning_transformer = QuantileBinningTransformer(
+            cache_directory=temporary_directory, features=["a"], n_bins=10, relative_error=0.01
+        )
+        _, _, df = quantile_binning_transformer._fit_transform(DataSchema(numerical=["a"]), df)
+
+        assert np.all(np.abs(np.bincount(df["a"].to_numpy(), minlength=10) / 100_000 - 0.1) < 0.02)
+
+    def test_invalid_number_of_bins(self, temporary_directory: Path):
+        """Should raise a `ValueError` if the number of bins is not positive."""
+        with pytest.raises(ValueError, match="positive"):
+            QuantileBinningTransformer(cache_directory=temporary_directory, features=["a"], n_bins=0)
+
+    def test_cache(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should correctly bin features and use cache if possible."""
+        QuantileBinningTransformer(cache_directory=temporary_directory, features=["a"]).fit_transform(
+            example_data_schema, example_vaex_dataframe
+        )
+
+        with patch.object(QuantileBinningTransformer, "_fit_transform") as mocked_fit_transform:
+            QuantileBinningTransformer(cache_directory=temporary_directory, features=["a"]).fit_transform(
+                example_data_schema, example_vaex_dataframe
+            )
+            mocked_fit_transform.assert_not_called()
@@ -0,0 +1,147 @@
+"""Test suite for `dataset.transform.target_encoder_transformer`."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pyarrow as pa
+import pytest
+import vaex
+
+from mleko.dataset.data_schema import DataSchema
+from mleko.dataset.transform.target_encoder_transformer import TargetEncoderTransformer
+
+
+@pytest.fixture()
+def example_vaex_dataframe() -> vaex.DataFrame:
+    """Return an example vaex dataframe."""
+    return vaex.from_arrays(
+        a=["x", "x", "x", "y", "y", None],
+        b=pa.array(["p", "p", "q", "q", "q", "q"]).dictionary_encode(),
+        target=[1, 1, 0, 0, 0, 1],
+        fold=[0, 1, 0, 1, 0, 1],
+    )
+
+
+@pytest.fixture()
+def example_data_schema() -> DataSchema:
+    """Return an example data schema."""
+    return DataSchema(categorical=["a", "b"], numerical=["target", "fold"])
+
+
+class TestTargetEncoderTransformer:
+    """Test suite for `dataset.transform.target_encoder_transformer.TargetEncoderTransformer`."""
+
+    def test_target_encoding(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should encode categories by their smoothed target mean and nulls as a category of their own."""
+        target_encoder_transformer = TargetEncoderTransformer(
+            cache_directory=temporary_directory, features=["a", "b"], target="target", smoothing=1.0
+        )
+        ds, transformer, df = target_encoder_transformer._fit_transform(example_data_schema, example_vaex_dataframe)
+
+        assert np.allclose(df["a"].tolist(), [0.625, 0.625, 0.625, 1 / 6, 1 / 6, 0.75])  # type: ignore
+        assert np.allclose(df["b"].tolist(), [5 / 6, 5 / 6, 0.3, 0.3, 0.3, 0.3])  # type: ignore
+        assert transformer["a"].labels.to_pylist() == ["x", "y"]
+        assert transformer["a"].prior == 0.5
+        assert ds.get_features(["numerical"]) == ["a", "b", "fold", "target"]
+
+    def test_unseen_values(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should encode unseen categories as the prior or nan depending on the unseen strategy."""
+        new_df = vaex.from_arrays(a=pa.array(["x", "z", None]).dictionary_encode(), b=["p", "r", None])
+        for unseen_strategy, expected in [("prior", [2 / 3, 0.5, 0.5]), ("nan", [2 / 3, np.nan, np.nan])]:
+            target_encoder_transformer = TargetEncoderTransformer(
+                cache_directory=temporary_directory,
+                features=["a", "b"],
+                target="target",
+                smoothing=0.0,
+                unseen_strategy=unseen_strategy,  # type: ignore
+            )
+            target_encoder_transformer._fit(example_data_schema, example_vaex_dataframe)
+            _, df = target_encoder_transformer._transform(example_data_schema, new_df)
+
+            assert np.allclose(df["a"].tolist()[:2], expected[:2], equal_nan=True)  # type: ignore
+            assert np.allclose(df["b"].tolist(), [1.0, *expected[1:]], equal_nan=True)  # type: ignore
+
+    def test_out_of_fold(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should encode the fitted DataFrame out-of-fold and new data with the statistics of all samples."""
+        target_encoder_transformer = TargetEncoderTransformer(
+            cache_directory=temporary_directory, features=["a"], target="target", smoothing=0.0, fold_column="fold"
+        )
+        _, _, df = target_encoder_transformer._fit_transform(example_data_schema, example_vaex_dataframe)
+        assert np.allclose(df["a"].tolist(), [1.0, 0.5, 1.0, 0.0, 0.0, 1 / 3])  # type: ignore
+
+        _, df = target_encoder_transformer._transform(example_data_schema, example_vaex_dataframe)
+        assert np.allclose(df["a"].tolist(), [2 / 3, 2 / 3, 2 / 3, 0.0, 0.0, 1.0])  # type: ignore
+
+    def test_out_of_fold_without_folds(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should encode with the statistics of all samples if the encoding was fitted without folds."""
+        _, transformer = TargetEncoderTransformer(
+            cache_directory=temporary_directory, features=["a"], target="target", smoothing=0.0
+        )._fit(example_data_schema, example_vaex_dataframe)
+        values, folds = pa.array(["x", "y", None]), pa.array([0, 1, 0])
+
+        assert transformer["a"].encode_out_of_fold(values, folds, np.nan).tolist() == [2 / 3, 0.0, 1.0]
+
+    def test_fit_single_pass(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should aggregate the statistics of all features in a single pass, combining the chunks' statistics."""
+        with patch.object(
+            example_vaex_dataframe, "evaluate_iterator", wraps=example_vaex_dataframe.evaluate_iterator
+        ) as mocked_evaluate_iterator, patch(
+            "mleko.dataset.transform.target_encoder_transformer.EVALUATION_CHUNK_SIZE", 2
+        ), patch(
+            "mleko.dataset.transform.target_encoder_transformer.MAX_PARTIAL_STATISTICS", 2
+        ):
+            _, transformer = TargetEncoderTransformer(
+                cache_directory=temporary_directory, features=["a", "b"], target="target", smoothing=0.0
+            )._fit(example_data_schema, example_vaex_dataframe)
+
+        mocked_evaluate_iterator.assert_called_once()
+        assert dict(zip(transformer["b"].labels.to_pylist(), transformer["b"].encodings.to_pylist())) == {
+            "p": 1.0,
+            "q": 0.25,
+        }
+
+    def test_invalid_parameters(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should raise a `ValueError` for negative smoothing, an encoded or non-numerical target and no targets."""
+        with pytest.raises(ValueError, match="non-negative"):
+            TargetEncoderTransformer(["a"], target="target", smoothing=-1, cache_directory=temporary_directory)
+        with pytest.raises(ValueError, match="cannot be encoded"):
+            TargetEncoderTransformer(["a", "target"], target="target", cache_directory=temporary_directory)
+        with pytest.raises(ValueError, match="numerical or boolean"):
+            TargetEncoderTransformer(["a"], target="b", cache_directory=temporary_directory)._fit(
+                example_data_schema, example_vaex_dataframe
+            )
+        with pytest.raises(ValueError, match="no non-null values"):
+            TargetEncoderTransformer(["a"], target="target", cache_directory=temporary_directory)._fit(
+                example_data_schema, vaex.from_arrays(a=["x", "y"], target=np.array([np.nan, np.nan]))
+            )
+        with pytest.raises(ValueError, match="no non-null values"):
+            TargetEncoderTransformer(["a"], target="target", cache_directory=temporary_directory)._fit(
+                example_data_schema, example_vaex_dataframe[example_vaex_dataframe.target > 1].extract()
+            )
+
+    def test_cache(
+        self, temporary_directory: Path, example_data_schema: DataSchema, example_vaex_dataframe: vaex.DataFrame
+    ):
+        """Should correctly target encode features and use cache if possible."""
+        TargetEncoderTransformer(cache_directory=temporary_directory, features=["a"], target="target").fit_transform(
+            example_data_schema, example_vaex_dataframe
+        )
+
+        with patch.object(TargetEncoderTransformer, "_fit_transform") as mocked_fit_transform:
+            TargetEncoderTransformer(
+                cache_directory=temporary_directory, features=["a"], target="target"
+            ).fit_transform(example_data_schema, example_vaex_dataframe)
+            mocked_fit_transform.assert_not_called()
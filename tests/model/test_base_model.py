@@ -6,6 +6,8 @@ import logging
 from pathlib import Path
 from unittest.mock import patch
 
+import pandas as pd
+import pyarrow as pa
 import pytest
 import vaex
 
@@ -86,6 +88,21 @@ class TestBaseModel:
         assert df.shape == (4, 3)
         assert df.column_names == ["a", "b", "c"]
 
+    def test_load_dataset_dictionary_encoded(self, temporary_directory: Path, example_data_schema: DataSchema):
+        """Should load dictionary-encoded features as pandas categoricals in the original column order."""
+        test_derived_model = self.DerivedModel(["a", "b", "c"], None, logging.INFO, 0, temporary_directory, 1)
+        dataframe = vaex.from_arrays(
+            a=["1", "1", "0", "0"],
+            b=pa.array(["1", None, "1", "0"]).dictionary_encode(),
+            c=[None, "1", "1", "1"],
+        )
+
+        df = test_derived_model._load_dataset(example_data_schema, dataframe)
+        assert list(df.columns) == ["a", "b", "c"]
+        assert isinstance(df["b"].dtype, pd.CategoricalDtype)
+        assert df["b"].tolist()[0] == "1"
+        assert pd.isna(df["b"].tolist()[1])
+
     def test_error_on_transform_before_fit(
         self, temporary_directory: Path, example_vaex_dataframe: vaex.DataFrame, example_data_schema: DataSchema
     ):
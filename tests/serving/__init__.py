@@ -0,0 +1,3 @@
+"""Test suite for the `serving` module."""
+
+from __future__ import annotations
@@ -0,0 +1,74 @@
+"""Test suite for `serving.scorer`."""
+
+from __future__ import annotations
+
+import pickle
+import subprocess  # noqa: S404
+import sys
+
+import numpy as np
+
+from mleko.serving.scorer import (
+    CompositeScorer,
+    ExpressionScorer,
+    MaxAbsScalerScorer,
+    from_list,
+    to_array,
+    to_scalar,
+)
+
+
+class TestBaseScorer:
+    """Test suite for `serving.scorer.BaseScorer`."""
+
+    def test_record_and_batch(self):
+        """Should return records for records and batches of arrays for batches, passing other columns through."""
+        scorer = MaxAbsScalerScorer(maximums={"a": 4.0})
+
+        assert scorer({"a": 2, "b": "x", "c": None}) == {"a": 0.5, "b": "x", "c": None}
+        batch = scorer({"a": np.array([2.0, 4.0]), "b": ["x", None]})
+        assert isinstance(batch["a"], np.ndarray)
+        assert batch["a"].tolist() == [0.5, 1.0]
+        assert batch["b"].tolist() == ["x", None]
+
+    def test_pickle(self):
+        """Should transform the same after being pickled, including compiled expressions."""
+        scorer = CompositeScorer(
+            scorers=[ExpressionScorer(expressions={"b": "a * 2"}), MaxAbsScalerScorer(maximums={"b": 8.0})]
+        )
+        unpickled_scorer = pickle.loads(pickle.dumps(scorer))
+
+        assert unpickled_scorer({"a": [1, 2, None]})["b"].tolist() == [0.25, 0.5, None]
+        assert unpickled_scorer == scorer
+
+    def test_unpickle_without_vaex(self):
+        """Should unpickle and apply scorers in a new process without importing `vaex`."""
+        scorer = CompositeScorer(scorers=[MaxAbsScalerScorer(maximums={"a": 4.0})])
+        code = (
+            "import pickle, sys; "
+            f"scorer = pickle.loads({pickle.dumps(scorer)!r}); "
+            "assert scorer({'a': 2.0}) == {'a': 0.5}; "
+            "assert not any(name.split('.')[0] == 'vaex' for name in sys.modules)"
+        )
+
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+
+class TestConversions:
+    """Test suite for the conversions of `serving.scorer`."""
+
+    def test_to_array(self):
+        """Should convert scalars and sequences to arrays, masking None values."""
+        assert to_array(1.5).tolist() == [1.5]
+        assert to_array(["a", None]).tolist() == ["a", None]
+        assert to_array([None, None]).tolist() == [None, None]
+        assert to_array(np.float64(2.0)).tolist() == [2.0]
+
+    def test_from_list_and_to_scalar(self):
+        """Should convert lists with None values to masked arrays and back to Python scalars."""
+        values = from_list([1, None], np.int64)
+
+        assert values.dtype == np.int64
+        assert values.tolist() == [1, None]
+        assert to_scalar(values) == 1
+        assert to_scalar(values[1:]) is None
@@ -0,0 +1,231 @@
+"""Test suite for the `utils.compression_helpers` module."""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+import struct
+import zipfile
+import zlib
+from pathlib import Path
+from unittest.mock import patch
+
+import pyarrow as pa
+import pytest
+
+from mleko.utils import compression_helpers
+from mleko.utils.compression_helpers import (
+    extract_zip_member,
+    get_bgzf_block_offsets,
+    get_zip_members,
+    get_zstd_frame_offsets,
+    is_zip_file,
+    open_compressed_file,
+    open_compressed_stream,
+    open_parallel_compressed_file,
+    read_compressed_file,
+)
+
+
+@pytest.fixture(scope="module")
+def example_data() -> bytes:
+    """Return example CSV contents large enough to span multiple compressed blocks."""
+    return b"id,value\n" + b"".join(b"%d,value_%d\n" % (i, i) for i in range(50_000))
+
+
+def write_bgzf_file(file_path: Path, data: bytes, block_size: int = 60_000, extra_prefix: bytes = b"") -> None:
+    """Write the data as a BGZF file, a series of gzip members with a `BC` extra subfield holding the block size.
+
+    The `extra_prefix` subfields are written before the `BC` subfield of every member.
+    """
+    with open(file_path, "wb") as file:
+        for block in [data[i : i + block_size] for i in range(0, len(data), block_size)] + [b""]:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            compressed = compressor.compress(block) + compressor.flush()
+            file.write(b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff" + struct.pack("<H", 6 + len(extra_prefix)))
+            file.write(extra_prefix + b"BC" + struct.pack("<HH", 2, len(compressed) + 25 + len(extra_prefix)))
+            file.write(compressed + struct.pack("<II", zlib.crc32(block), len(block)))
+
+
+def write_zstd_file(file_path: Path, data: bytes, frame_size: int = 60_000) -> None:
+    """Write the data as a Zstandard file with one frame per `frame_size` bytes."""
+    codec = pa.Codec("zstd")
+    with open(file_path, "wb") as file:
+        for i in range(0, len(data), frame_size):
+            file.write(codec.compress(data[i : i + frame_size], asbytes=True))
+
+
+class TestOpenCompressedFile:
+    """Test suite for `utils.compression_helpers.open_compressed_file`."""
+
+    def test_supported_formats(self, temporary_directory: Path, example_data: bytes):
+        """Should transparently decompress all supported formats based on the file suffix."""
+        (temporary_directory / "data.csv").write_bytes(example_data)
+        (temporary_directory / "data.csv.gz").write_bytes(gzip.compress(example_data))
+        (temporary_directory / "data.csv.bz2").write_bytes(bz2.compress(example_data))
+        (temporary_directory / "data.csv.xz").write_bytes(lzma.compress(example_data))
+        write_zstd_file(temporary_directory / "data.csv.zst", example_data)
+
+        for suffix in ["", ".gz", ".bz2", ".xz", ".zst"]:
+            with open_compressed_file(temporary_directory / f"data.csv{suffix}") as file:
+                assert file.readline() == b"id,value\n"
+                assert file.readline() + file.read() == example_data[9:]
+
+
+class TestOpenCompressedStream:
+    """Test suite for `utils.compression_helpers.open_compressed_stream`."""
+
+    def test_supported_formats(self, temporary_directory: Path, example_data: bytes):
+        """Should decompress the same formats as `open_compressed_file` and close the wrapped stream."""
+        (temporary_directory / "data.csv").write_bytes(example_data)
+        (temporary_directory / "data.csv.gz").write_bytes(gzip.compress(example_data))
+        (temporary_directory / "data.csv.bz2").write_bytes(bz2.compress(example_data))
+        (temporary_directory / "data.csv.xz").write_bytes(lzma.compress(example_data))
+        write_zstd_file(temporary_directory / "data.csv.zst", example_data)
+
+        for suffix in ["", ".gz", ".bz2", ".xz", ".zst"]:
+            raw_stream = pa.OSFile(str(temporary_directory / f"data.csv{suffix}"))
+            with open_compressed_stream(raw_stream, f"bucket/data.csv{suffix}") as file:  # type: ignore
+                assert file.read() == example_data
+            assert raw_stream.closed
+
+
+class TestParallelDecompression:
+    """Test suite for the parallel decompression in `utils.compression_helpers`."""
+
+    def test_bgzf(self, temporary_directory: Path, example_data: bytes):
+        """Should locate the blocks of a BGZF file and decompress them in parallel."""
+        file_path = temporary_directory / "data.csv.gz"
+        write_bgzf_file(file_path, example_data)
+
+        offsets = get_bgzf_block_offsets(file_path)
+        assert offsets is not None and len(offsets) > 3
+        assert offsets[-1] == file_path.stat().st_size
+        assert read_compressed_file(file_path, num_threads=4) == example_data
+
+    def test_bgzf_with_other_subfields(self, temporary_directory: Path, example_data: bytes):
+        """Should skip the extra subfields preceding the `BC` subfield of BGZF blocks."""
+        file_path = temporary_directory / "data.csv.gz"
+        write_bgzf_file(file_path, example_data, extra_prefix=b"XY" + struct.pack("<H", 3) + b"abc")
+
+        offsets = get_bgzf_block_offsets(file_path)
+        assert offsets is not None and offsets[-1] == file_path.stat().st_size
+        assert read_compressed_file(file_path, num_threads=4) == example_data
+
+    def test_gzip_without_block_size(self, temporary_directory: Path, example_data: bytes):
+        """Should not report blocks for a gzip file with extra subfields but without a `BC` subfield."""
+        file_path = temporary_directory / "data.csv.gz"
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        compressed = compressor.compress(example_data) + compressor.flush()
+        file_path.write_bytes(
+            b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff"
+            + struct.pack("<H", 6)
+            + b"XY"
+            + struct.pack("<HH", 2, 0)
+            + compressed
+            + struct.pack("<II", zlib.crc32(example_data), len(example_data))
+        )
+
+        assert get_bgzf_block_offsets(file_path) is None
+        assert read_compressed_file(file_path, num_threads=4) == example_data
+
+    def test_regular_gzip(self, temporary_directory: Path, example_data: bytes):
+        """Should fall back to sequential decompression for regular gzip files."""
+        file_path = temporary_directory / "data.csv.gz"
+        file_path.write_bytes(gzip.compress(example_data))
+
+        assert get_bgzf_block_offsets(file_path) is None
+        assert read_compressed_file(file_path, num_threads=4) == example_data
+
+    def test_multi_frame_zstd(self, temporary_directory: Path, example_data: bytes):
+        """Should locate the frames of a Zstandard file and decompress them in parallel."""
+        file_path = temporary_directory / "data.csv.zst"
+        write_zstd_file(file_path, example_data)
+
+        offsets = get_zstd_frame_offsets(file_path)
+        assert offsets is not None and len(offsets) == len(range(0, len(example_data), 60_000)) + 1
+        assert read_compressed_file(file_path, num_threads=4) == example_data
+
+    def test_stream_spans_ahead(self, temporary_directory: Path, example_data: bytes):
+        """Should stream the decompressed spans in order, holding at most two spans per thread at once."""
+        file_path = temporary_directory / "data.csv.zst"
+        write_zstd_file(file_path, example_data, frame_size=10_000)
+        submitted_spans = []
+        original_decompress_span = compression_helpers._decompress_span
+
+        def decompress_span(file_path: Path, span: tuple[int, int]) -> bytes:
+            submitted_spans.append(span)
+            return original_decompress_span(file_path, span)
+
+        with patch.object(compression_helpers, "PARALLEL_DECOMPRESSION_SPAN_SIZE", 1), patch.object(
+            compression_helpers, "_decompress_span", side_effect=decompress_span
+        ):
+            with open_parallel_compressed_file(file_path, num_threads=2) as file:
+                assert file.readline() == b"id,value\n"
+                assert len(submitted_spans) <= 5
+                assert file.readline() + file.read() == example_data[9:]
+
+        assert len(submitted_spans) == len(range(0, len(example_data), 10_000))
+        assert sorted(submitted_spans) == submitted_spans
+
+    def test_zstd_skippable_frame(self, temporary_directory: Path, example_data: bytes):
+        """Should locate skippable frames, such as the seek tables of seekable Zstandard files, between data frames."""
+        file_path = temporary_directory / "data.csv.zst"
+        write_zstd_file(file_path, example_data)
+        skippable_frame = struct.pack("<II", 0x184D2A5E, 4) + b"seek"
+        file_path.write_bytes(file_path.read_bytes() + skippable_frame)
+
+        offsets = get_zstd_frame_offsets(file_path)
+        assert offsets is not None and offsets[-2] == file_path.stat().st_size - len(skippable_frame)
+        assert read_compressed_file(file_path, num_threads=4) == example_data
+
+    @pytest.mark.parametrize(
+        "contents",
+        [
+            b"not a zstd file",
+            struct.pack("<I", 0xFD2FB528),
+            struct.pack("<IB", 0xFD2FB528, 0x20) + b"\x00",
+            struct.pack("<IB", 0xFD2FB528, 0x20) + b"\x00\x07\x00\x00",
+        ],
+        ids=["not_zstd", "truncated_frame_header", "truncated_block_header", "reserved_block_type"],
+    )
+    def test_invalid_zstd(self, temporary_directory: Path, contents: bytes):
+        """Should not report frames for a file that is not a valid Zstandard file."""
+        file_path = temporary_directory / "data.csv.zst"
+        file_path.write_bytes(contents)
+
+        assert get_zstd_frame_offsets(file_path) is None
+
+
+class TestZipExtraction:
+    """Test suite for the zip extraction helpers of `utils.compression_helpers`."""
+
+    def test_extract_zip_members(self, temporary_directory: Path, example_data: bytes):
+        """Should list the files of a zip archive and extract each of them, keeping nested paths."""
+        file_path = temporary_directory / "data.zip"
+        with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("train.csv", example_data)
+            archive.writestr("nested/", "")
+            archive.writestr("nested/test.csv", b"id\n1\n")
+
+        assert is_zip_file(file_path)
+        assert get_zip_members(file_path) == ["train.csv", "nested/test.csv"]
+
+        output_directory = temporary_directory / "output"
+        for member_name in get_zip_members(file_path):
+            extract_zip_member(file_path, member_name, output_directory)
+
+        assert (output_directory / "train.csv").read_bytes() == example_data
+        assert (output_directory / "nested" / "test.csv").read_bytes() == b"id\n1\n"
+        assert not list(output_directory.rglob("*.part"))
+
+    def test_extract_zip_member_outside_destination(self, temporary_directory: Path):
+        """Should refuse to extract a member whose path escapes the destination directory."""
+        file_path = temporary_directory / "data.zip"
+        with zipfile.ZipFile(file_path, "w") as archive:
+            archive.writestr("../escape.csv", b"id\n1\n")
+
+        with pytest.raises(ValueError, match="outside of the destination"):
+            extract_zip_member(file_path, "../escape.csv", temporary_directory / "output")
+        assert not (temporary_directory / "escape.csv").exists()
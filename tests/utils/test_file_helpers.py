@@ -92,3 +92,14 @@ class TestLocalManifestHandler:
         file_names = manifest_handler.get_file_names()
 
         assert file_names == ["file1.txt", "file2.txt"]
+
+    def test_get_files(self, temporary_directory: Path):
+        """Should correctly round-trip file entries including their hash and last modified date."""
+        manifest_handler = LocalManifestHandler(temporary_directory / "manifest.json")
+        file_entries = [
+            LocalFileEntry("file1.txt", 100, hash="abc", last_modified="2024-01-01T00:00:00+00:00"),
+            LocalFileEntry("file2.txt", 200),
+        ]
+        manifest_handler.set_files(file_entries)
+
+        assert manifest_handler.get_files() == file_entries
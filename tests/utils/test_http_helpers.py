@@ -0,0 +1,118 @@
+"""Test suite for the `utils.http_helpers` module."""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from mleko.utils.http_helpers import download_http_file, download_http_file_segments
+from tests.conftest import RangeRequestServer
+
+
+class TestDownloadHttpFile:
+    """Test suite for `utils.http_helpers.download_http_file`."""
+
+    def test_download(self, temporary_directory: Path):
+        """Should download the file and move it into place."""
+        with patch.object(requests, "get") as mock_requests_get:
+            mock_requests_get.return_value = MagicMock(
+                requests.Response, status_code=200, headers={"Content-Length": "5"}, raw=io.BytesIO(b"MLEKO")
+            )
+            file_path = download_http_file("https://example.com/data.csv", temporary_directory / "data.csv")
+
+        assert file_path.read_bytes() == b"MLEKO"
+        assert list(temporary_directory.iterdir()) == [file_path]
+
+    def test_resume_interrupted_download(self, temporary_directory: Path):
+        """Should keep the partial file of an interrupted download and only request the missing bytes."""
+        with patch.object(requests, "get") as mock_requests_get:
+            mock_requests_get.side_effect = [
+                MagicMock(
+                    requests.Response,
+                    status_code=200,
+                    headers={"Content-Length": "10", "ETag": '"v1"'},
+                    raw=io.BytesIO(b"01234"),
+                ),
+                MagicMock(
+                    requests.Response,
+                    status_code=206,
+                    headers={"Content-Range": "bytes 5-9/10", "Content-Length": "5", "ETag": '"v1"'},
+                    raw=io.BytesIO(b"56789"),
+                ),
+            ]
+            with pytest.raises(requests.ConnectionError):
+                download_http_file("https://example.com/data.csv", temporary_directory / "data.csv")
+            assert not (temporary_directory / "data.csv").exists()
+
+            file_path = download_http_file("https://example.com/data.csv", temporary_directory / "data.csv")
+
+        assert mock_requests_get.call_args.kwargs["headers"] == {
+            "Accept-Encoding": "identity",
+            "Range": "bytes=5-",
+            "If-Range": '"v1"',
+        }
+        assert file_path.read_bytes() == b"0123456789"
+        assert list(temporary_directory.iterdir()) == [file_path]
+
+    def test_restart_changed_file(self, temporary_directory: Path):
+        """Should overwrite the partial file if the server responds with the full, changed file."""
+        (temporary_directory / "data.csv.part").write_bytes(b"01234")
+        (temporary_directory / "data.csv.part.json").write_text(
+            '{"url": "https://example.com/data.csv", "validator": "\\"v1\\""}'
+        )
+        with patch.object(requests, "get") as mock_requests_get:
+            mock_requests_get.return_value = MagicMock(
+                requests.Response,
+                status_code=200,
+                headers={"Content-Length": "6", "ETag": '"v2"'},
+                raw=io.BytesIO(b"abcdef"),
+            )
+            file_path = download_http_file("https://example.com/data.csv", temporary_directory / "data.csv")
+
+        assert file_path.read_bytes() == b"abcdef"
+
+    def test_compressing_server(self, http_server: RangeRequestServer, temporary_directory: Path):
+        """Should request the unencoded file from a server compressing its responses."""
+        http_server.files["/data.csv"] = b"a,b\n" + b"1,2\n" * 100
+        http_server.compress_responses = True
+        file_path = download_http_file(http_server.get_url("/data.csv"), temporary_directory / "data.csv")
+
+        assert file_path.read_bytes() == b"a,b\n" + b"1,2\n" * 100
+
+
+class TestDownloadHttpFileSegments:
+    """Test suite for `utils.http_helpers.download_http_file_segments`."""
+
+    def test_download_segments(self, http_server: RangeRequestServer, temporary_directory: Path):
+        """Should download the file in segments with range requests and move it into place."""
+        http_server.files["/data.bin"] = bytes(range(50))
+        file_path = download_http_file_segments(
+            http_server.get_url("/data.bin"), temporary_directory / "data.bin", 50, None, num_workers=2, segment_size=8
+        )
+
+        assert file_path.read_bytes() == bytes(range(50))
+        assert sorted(log[2] for log in http_server.request_log) == sorted(
+            f"bytes={start}-{min(start + 7, 49)}" for start in range(0, 50, 8)
+        )
+        assert list(temporary_directory.iterdir()) == [file_path]
+
+    def test_changed_file(self, http_server: RangeRequestServer, temporary_directory: Path):
+        """Should discard the download if the file no longer matches the validator."""
+        http_server.files["/data.bin"] = bytes(range(50))
+        with pytest.raises(ValueError, match="changed during the download"):
+            download_http_file_segments(
+                http_server.get_url("/data.bin"), temporary_directory / "data.bin", 50, '"stale"', segment_size=8
+            )
+
+        assert list(temporary_directory.iterdir()) == []
+
+    def test_missing_file(self, http_server: RangeRequestServer, temporary_directory: Path):
+        """Should raise an `HTTPError` if the range requests fail."""
+        with pytest.raises(requests.HTTPError):
+            download_http_file_segments(
+                http_server.get_url("/missing.bin"), temporary_directory / "data.bin", 50, None, segment_size=8
+            )
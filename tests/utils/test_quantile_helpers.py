@@ -0,0 +1,75 @@
+"""Test suite for the `utils.quantile_helpers` module."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import numpy as np
+import pyarrow as pa
+import pytest
+import vaex
+
+from mleko.utils.quantile_helpers import QuantileSketch, get_quantile_sketches
+
+
+class TestQuantileSketch:
+    """Test suite for `utils.quantile_helpers.QuantileSketch`."""
+
+    def test_relative_error(self):
+        """Should estimate quantiles within the relative rank error with bounded memory, also after merging."""
+        values = np.random.default_rng(0).lognormal(size=200_000)
+        sorted_values = np.sort(values)
+        quantiles = np.linspace(0, 1, 11)
+        sketch, other_sketch = QuantileSketch(relative_error=0.01), QuantileSketch(relative_error=0.01)
+        for chunk in np.array_split(values[:100_000], 10):
+            sketch.update(chunk)
+        other_sketch.update(pa.array(values[100_000:]))
+        sketch.merge(other_sketch)
+
+        ranks = np.searchsorted(sorted_values, sketch.quantiles(quantiles)) / len(values)
+        assert np.max(np.abs(ranks - quantiles)) < 0.01
+        assert sketch.count == 200_000
+        assert sketch.quantiles([0.0, 1.0]).tolist() == [values.min(), values.max()]
+        assert sum(len(level) for level in sketch.levels) < 2_000
+
+    def test_missing_values(self):
+        """Should ignore missing and nan values and return nan quantiles when empty."""
+        sketch = QuantileSketch()
+        assert np.isnan(sketch.quantiles([0.5])[0])
+
+        sketch.update(pa.array([1.0, None, np.nan, 3.0]))
+        sketch.update(np.array([np.nan]))
+        sketch.merge(QuantileSketch())
+        assert sketch.count == 2
+        assert sketch.quantiles([0.5]).tolist() == [2.0]
+
+    def test_invalid_relative_error(self):
+        """Should raise a `ValueError` if the relative error is not between 0 and 1."""
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            QuantileSketch(relative_error=0)
+
+
+class TestGetQuantileSketches:
+    """Test suite for `utils.quantile_helpers.get_quantile_sketches`."""
+
+    def test_single_pass(self):
+        """Should sketch all expressions with a single iterator over the DataFrame."""
+        df = vaex.from_arrays(x=np.arange(1_000, dtype=float), y=np.arange(1_000) % 10)
+        with patch.object(df, "evaluate_iterator", wraps=df.evaluate_iterator) as mocked_evaluate_iterator:
+            sketches = get_quantile_sketches(df, ["x", "y", "x * 2"], relative_error=0.01, chunk_size=100)
+            mocked_evaluate_iterator.assert_called_once()
+
+        assert [sketch.count for sketch in sketches] == [1_000, 1_000, 1_000]
+        assert abs(sketches[0].quantiles([0.5])[0] - 499.5) < 10
+        assert sketches[1].quantiles([0.0, 1.0]).tolist() == [0.0, 9.0]
+        assert abs(sketches[2].quantiles([0.5])[0] - 999) < 20
+
+    def test_empty(self):
+        """Should return empty sketches without evaluating an empty DataFrame."""
+        df = vaex.from_arrays(x=np.array([], dtype=float))
+        with patch.object(df, "evaluate_iterator") as mocked_evaluate_iterator:
+            sketches = get_quantile_sketches(df, ["x"])
+            mocked_evaluate_iterator.assert_not_called()
+
+        assert [sketch.count for sketch in sketches] == [0]
+        assert get_quantile_sketches(df, []) == []
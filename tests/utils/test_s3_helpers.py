@@ -0,0 +1,333 @@
+"""Test suite for the `utils.s3_helpers` module."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import boto3
+import moto
+import pytest
+
+from mleko.utils import s3_helpers
+from mleko.utils.s3_helpers import (
+    AdaptiveConcurrencyLimiter,
+    S3Client,
+    S3TransferBudget,
+    get_adaptive_part_size,
+    get_etag_part_count,
+    get_multipart_etag,
+)
+
+
+@pytest.fixture(scope="module")
+def s3_bucket():
+    """Mock S3 bucket with more objects than a single `list_objects` call returns, spread over sub-prefixes."""
+    with moto.mock_s3():
+        s3 = boto3.resource("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="test-bucket")
+        bucket = s3.Bucket("test-bucket")
+        for i in range(1_100):
+            bucket.put_object(Key=f"test-prefix/part={i % 4}/file-{i:04d}.csv", Body=b"")
+        bucket.put_object(Key="test-prefix/root-file.csv", Body=b"")
+        bucket.put_object(Key="test-prefix/root-file.json", Body=b"")
+        yield bucket
+
+
+def upload_multipart(bucket, key: str, parts: list[bytes]) -> str:
+    """Upload an object to the mock S3 bucket in the given parts and return its ETag."""
+    # Recent `botocore` versions send part checksums as `aws-chunked` trailers, which moto hashes into the part ETags
+    with patch.dict(os.environ, {"AWS_REQUEST_CHECKSUM_CALCULATION": "when_required"}):
+        client = boto3.client("s3", region_name="us-east-1")
+    upload_id = client.create_multipart_upload(Bucket=bucket.name, Key=key)["UploadId"]
+    etags = [
+        client.upload_part(Bucket=bucket.name, Key=key, UploadId=upload_id, PartNumber=number, Body=part)["ETag"]
+        for number, part in enumerate(parts, start=1)
+    ]
+    return client.complete_multipart_upload(
+        Bucket=bucket.name,
+        Key=key,
+        UploadId=upload_id,
+        MultipartUpload={"Parts": [{"ETag": etag, "PartNumber": number} for number, etag in enumerate(etags, 1)]},
+    )["ETag"]
+
+
+class TestS3Client:
+    """Test suite for `utils.s3_helpers.S3Client`."""
+
+    @pytest.mark.parametrize("num_workers", [1, 2, 8])
+    def test_get_s3_manifest_paginated(self, s3_bucket, num_workers: int):
+        """Should list all matching objects beyond the first page, sorted by key, regardless of concurrency."""
+        s3_manifest = S3Client(aws_region_name="us-east-1").get_s3_manifest(
+            "test-bucket", "test-prefix", file_pattern="*.csv", num_workers=num_workers
+        )
+
+        keys = [str(entry.key) for entry in s3_manifest]
+        assert len(keys) == 1_101
+        assert keys == sorted(keys)
+        assert "test-prefix/root-file.csv" in keys
+        assert "test-prefix/part=3/file-1099.csv" in keys
+
+    def test_get_s3_manifest_with_manifest_file(self, s3_bucket):
+        """Should only include the files listed in the manifest file when listing concurrently."""
+        s3_bucket.put_object(
+            Key="test-prefix/manifest",
+            Body=json.dumps({"entries": [{"url": "s3://test-bucket/test-prefix/part=1/file-0001.csv"}]}),
+        )
+
+        s3_manifest = S3Client(aws_region_name="us-east-1").get_s3_manifest(
+            "test-bucket", "test-prefix", file_pattern="*.csv", num_workers=4
+        )
+        s3_bucket.Object("test-prefix/manifest").delete()
+
+        assert [str(entry.key) for entry in s3_manifest] == ["test-prefix/part=1/file-0001.csv"]
+
+    def test_download_file_resumes_interrupted_download(self, s3_bucket, temporary_directory: Path, monkeypatch):
+        """Should only download the missing byte ranges after an interrupted download and verify the result."""
+        monkeypatch.setattr(s3_helpers, "S3_DOWNLOAD_PART_SIZE", 4)
+        monkeypatch.setattr(s3_helpers, "S3_MAX_DOWNLOAD_PART_SIZE", 4)
+        s3_bucket.put_object(Key="test-prefix/download.csv", Body=b"a,b\n1,2\n3,4\n5,6\n7,8\n")
+        s3_client = S3Client(aws_region_name="us-east-1")
+        download_part = s3_client._download_part
+
+        def interrupted_download_part(*args):
+            if interrupted_download_part.calls == 3:
+                raise ConnectionError("Connection reset.")
+            interrupted_download_part.calls += 1
+            return download_part(*args)
+
+        interrupted_download_part.calls = 0
+        with patch.object(s3_client, "_download_part", side_effect=interrupted_download_part):
+            with pytest.raises(ConnectionError):
+                s3_client.download_file(temporary_directory, "test-bucket", "test-prefix/download.csv")
+        assert not (temporary_directory / "download.csv").exists()
+        assert (temporary_directory / "download.csv.part").exists()
+
+        part_file = temporary_directory / "download.csv.part"
+        part_file.write_bytes(b"X" + part_file.read_bytes()[1:])
+        with patch.object(s3_client, "_download_part", wraps=download_part) as mocked_download_part:
+            file_path = s3_client.download_file(temporary_directory, "test-bucket", "test-prefix/download.csv")
+
+        assert mocked_download_part.call_count == 3  # 2 missing parts and 1 corrupted part out of 5
+        assert file_path.read_bytes() == b"a,b\n1,2\n3,4\n5,6\n7,8\n"
+        assert not (temporary_directory / "download.csv.part").exists()
+        assert not (temporary_directory / "download.csv.part.json").exists()
+
+    def test_download_file_etag_mismatch(self, s3_bucket, temporary_directory: Path):
+        """Should raise `ValueError` and discard the partial download if the file does not match the ETag."""
+        s3_bucket.put_object(Key="test-prefix/corrupt.csv", Body=b"a,b\n1,2\n")
+        s3_client = S3Client(aws_region_name="us-east-1")
+
+        with patch.object(s3_client, "_download_part", return_value="0" * 32):
+            with pytest.raises(ValueError, match="does not match the ETag"):
+                s3_client.download_file(temporary_directory, "test-bucket", "test-prefix/corrupt.csv")
+
+        assert list(temporary_directory.iterdir()) == []
+
+    def test_download_file_multipart(self, s3_bucket, temporary_directory: Path):
+        """Should verify a multipart object with the ETag and size of its manifest entry, without `HEAD` requests."""
+        parts = [b"a" * 5 * 1024**2, b"b" * 5 * 1024**2, b"c,d\n"]
+        etag = upload_multipart(s3_bucket, "test-prefix/multipart.csv", parts)
+        s3_client = S3Client(aws_region_name="us-east-1")
+
+        with patch.object(s3_client._client, "head_object") as mocked_head_object:
+            with patch.object(s3_client, "_download_part", wraps=s3_client._download_part) as mocked_download_part:
+                file_path = s3_client.download_file(
+                    temporary_directory, "test-bucket", "test-prefix/multipart.csv", etag=etag, size=10 * 1024**2 + 4
+                )
+            mocked_head_object.assert_not_called()
+
+        assert [call.args[4] for call in mocked_download_part.call_args_list] == [
+            (0, 5 * 1024**2),
+            (5 * 1024**2, 10 * 1024**2),
+            (10 * 1024**2, 10 * 1024**2 + 4),
+        ]
+        assert file_path.read_bytes() == b"".join(parts)
+
+    def test_download_file_multipart_non_uniform(self, s3_bucket, temporary_directory: Path):
+        """Should keep a multipart object uploaded with parts of different sizes, which cannot be verified."""
+        parts = [b"a" * 5 * 1024**2, b"b" * 6 * 1024**2, b"c,d\n"]
+        upload_multipart(s3_bucket, "test-prefix/non-uniform.csv", parts)
+
+        file_path = S3Client(aws_region_name="us-east-1").download_file(
+            temporary_directory, "test-bucket", "test-prefix/non-uniform.csv"
+        )
+
+        assert file_path.read_bytes() == b"".join(parts)
+        assert list(temporary_directory.iterdir()) == [file_path]
+
+    def test_download_file_kms_encrypted(self, s3_bucket, temporary_directory: Path):
+        """Should not verify objects encrypted with any SSE-KMS variant, whose ETags are not MD5 digests."""
+        s3_bucket.put_object(Key="test-prefix/encrypted.csv", Body=b"a,b\n1,2\n")
+        s3_client = S3Client(aws_region_name="us-east-1")
+
+        with patch.object(s3_client._client, "head_object", return_value={"ServerSideEncryption": "aws:kms:dsse"}):
+            with patch.object(s3_client, "_download_part", return_value="0" * 32):
+                file_path = s3_client.download_file(
+                    temporary_directory, "test-bucket", "test-prefix/encrypted.csv", etag='"etag"', size=8
+                )
+
+        assert list(temporary_directory.iterdir()) == [file_path]
+
+    def test_download_file_unknown_part_layout(self, s3_bucket, temporary_directory: Path):
+        """Should skip the verification of multipart ETags whose part count differs from the downloaded ranges."""
+        part_path = temporary_directory / "unknown.csv.part"
+        part_path.write_bytes(b"a,b\n1,2\n")
+        s3_client = S3Client(aws_region_name="us-east-1")
+
+        with patch.object(s3_client._client, "head_object") as mocked_head_object:
+            assert s3_client._is_download_valid(
+                "test-bucket", "test-prefix/unknown.csv", "0" * 32 + "-5", part_path, {0: "0" * 32}
+            )
+            mocked_head_object.assert_not_called()
+
+    def test_is_local_dataset_up_to_date(self, s3_bucket, temporary_directory: Path):
+        """Should report the local dataset as up to date only if all files exist with the sizes of the manifest."""
+        s3_bucket.put_object(Key="test-prefix/local/data.csv", Body=b"a,b\n1,2\n")
+        s3_client = S3Client(aws_region_name="us-east-1")
+        s3_manifest = s3_client.get_s3_manifest("test-bucket", "test-prefix/local/")
+
+        assert not s3_client.is_local_dataset_up_to_date(temporary_directory, s3_manifest)
+        (temporary_directory / "data.csv").write_bytes(b"a,b\n")
+        assert not s3_client.is_local_dataset_up_to_date(temporary_directory, s3_manifest)
+        (temporary_directory / "data.csv").write_bytes(b"a,b\n1,2\n")
+        assert s3_client.is_local_dataset_up_to_date(temporary_directory, s3_manifest)
+
+    def test_download_file_head(self, s3_bucket, temporary_directory: Path):
+        """Should download the leading bytes trimmed to whole lines and raise `ValueError` without a whole line."""
+        s3_bucket.put_object(Key="test-prefix/head.csv", Body=b"a,b\n1,2\n3,4\n")
+        s3_client = S3Client(aws_region_name="us-east-1")
+
+        file_path = s3_client.download_file_head(temporary_directory, "test-bucket", "test-prefix/head.csv", 9)
+        assert file_path.read_bytes() == b"a,b\n1,2\n"
+        file_path = s3_client.download_file_head(temporary_directory, "test-bucket", "test-prefix/head.csv", 100)
+        assert file_path.read_bytes() == b"a,b\n1,2\n3,4\n"
+        with pytest.raises(ValueError, match="complete line"):
+            s3_client.download_file_head(temporary_directory, "test-bucket", "test-prefix/head.csv", 3)
+
+    def test_clients_are_pooled(self, s3_bucket):
+        """Should share the underlying client between instances and keep it when credentials are unchanged."""
+        first_client = S3Client(aws_region_name="us-east-1")
+        second_client = S3Client(aws_region_name="us-east-1")
+        assert first_client._client is second_client._client
+        assert S3Client(aws_region_name="us-east-1", max_connections=5)._client is not first_client._client
+
+        pooled_client = first_client._client
+        first_client.refresh_client()
+        assert first_client._client is pooled_client
+
+    def test_credentials_resolved_on_cache_miss(self, s3_bucket):
+        """Should only resolve the credentials on a cache miss or a refresh, recreating the client if they changed."""
+        with patch.dict(s3_helpers._S3_CLIENTS, clear=True), patch.object(
+            S3Client, "_get_credentials", wraps=S3Client._get_credentials
+        ) as mocked_get_credentials:
+            client = S3Client.get_s3_client(None, "us-east-1")
+            assert mocked_get_credentials.call_count == 1
+
+            assert S3Client.get_s3_client(None, "us-east-1") is client
+            assert S3Client(aws_region_name="us-east-1")._client is client
+            assert mocked_get_credentials.call_count == 1
+
+            assert S3Client.get_s3_client(None, "us-east-1", refresh=True) is client
+            assert mocked_get_credentials.call_count == 2
+
+            with patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": "rotated"}):
+                assert S3Client.get_s3_client(None, "us-east-1", refresh=True) is not client
+
+
+class TestMultipartETag:
+    """Test suite for the multipart ETag helpers of `utils.s3_helpers`."""
+
+    def test_get_etag_part_count(self):
+        """Should return the number of parts of multipart ETags and 0 for single-part ETags."""
+        assert get_etag_part_count('"d41d8cd98f00b204e9800998ecf8427e"') == 0
+        assert get_etag_part_count('"f1f907470fc1a6501f84d572a40956ee-12"') == 12
+
+    def test_get_multipart_etag(self):
+        """Should compute the MD5 of the concatenated binary part digests followed by the part count."""
+        parts = [b"a" * 10, b"b" * 5]
+        expected = hashlib.md5(b"".join(hashlib.md5(part).digest() for part in parts)).hexdigest() + "-2"
+
+        assert get_multipart_etag([hashlib.md5(part).hexdigest() for part in parts]) == expected
+
+
+class TestS3TransferBudget:
+    """Test suite for `utils.s3_helpers.S3TransferBudget`."""
+
+    def test_connections_are_capped(self):
+        """Should never hand out more connections than the budget allows across concurrent transfers."""
+        budget = S3TransferBudget(max_connections=3)
+        lock = threading.Lock()
+        in_use = [0]
+        peak = [0]
+
+        def transfer(n_connections: int):
+            with budget.connections(n_connections):
+                with lock:
+                    in_use[0] += min(n_connections, 3)
+                    peak[0] = max(peak[0], in_use[0])
+                time.sleep(0.01)
+                with lock:
+                    in_use[0] -= min(n_connections, 3)
+
+        threads = [threading.Thread(target=transfer, args=(n,)) for n in (2, 2, 1, 5, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak[0] <= 3
+        assert budget._available_connections == 3
+
+    def test_consume_throttles_bandwidth(self):
+        """Should sleep once the bandwidth budget is exhausted and not at all without a limit."""
+        start = time.monotonic()
+        S3TransferBudget().consume(100 * 1024**2)
+        assert time.monotonic() - start < 0.05
+
+        budget = S3TransferBudget(max_bandwidth_mb=1)
+        start = time.monotonic()
+        budget.consume(100 * 1024)
+        assert time.monotonic() - start >= 0.05
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test suite for `utils.s3_helpers.AdaptiveConcurrencyLimiter`."""
+
+    def test_limit_grows_with_throughput(self):
+        """Should raise the concurrency limit while throughput improves, up to the maximum."""
+        limiter = AdaptiveConcurrencyLimiter(max_concurrency=3)
+        assert limiter._limit == 2
+
+        for n_bytes in (1, 1, 1000, 1000, 1000, 10**7, 10**7, 10**7):
+            with limiter.slot(n_bytes):
+                pass
+
+        assert limiter._limit == 3
+
+    def test_failed_parts_release_slot(self):
+        """Should free the slot of a part that raised without recording it."""
+        limiter = AdaptiveConcurrencyLimiter(max_concurrency=4)
+        with pytest.raises(RuntimeError):
+            with limiter.slot(10):
+                raise RuntimeError
+
+        assert limiter._active == 0
+        assert limiter._round_parts == 0
+
+
+class TestAdaptivePartSize:
+    """Test suite for `utils.s3_helpers.get_adaptive_part_size`."""
+
+    def test_get_adaptive_part_size(self):
+        """Should target a few parts per worker within the bounds and respect the part count limit."""
+        assert get_adaptive_part_size(1024, 4, 8 * 1024**2, 64 * 1024**2) == 8 * 1024**2
+        assert get_adaptive_part_size(1024**3, 4, 8 * 1024**2, 512 * 1024**2) == 64 * 1024**2
+        assert get_adaptive_part_size(100 * 1024**3, 4, 8 * 1024**2, 64 * 1024**2) == 64 * 1024**2
+        assert get_adaptive_part_size(1024**4, 4, 8 * 1024**2, 512 * 1024**2) == 512 * 1024**2
+        assert get_adaptive_part_size(10_000 * 1024**3, 4, 8 * 1024**2, 512 * 1024**2) == 1024**3
@@ -2,10 +2,33 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import pytest
 import vaex
+from numba.core.errors import TypingError
 
-from mleko.utils.vaex_helpers import HashableVaexDataFrame, get_column, get_columns, get_filtered_df, get_indices
+from mleko.utils import vaex_helpers
+from mleko.utils.vaex_helpers import (
+    HashableVaexDataFrame,
+    get_column,
+    get_columns,
+    get_dictionary_codes,
+    get_dictionary_labels,
+    get_expression_depth,
+    get_filtered_df,
+    get_indices,
+    get_unique_values,
+    get_value_positions,
+    is_dictionary_encoded,
+    jit_expression,
+    map_dictionary_encoded,
+    materialize_columns,
+)
 
 
 @pytest.fixture(scope="module")
@@ -89,6 +112,158 @@ class TestGetIndices:
         assert result["column3"].tolist() == []  # type: ignore
 
 
+class TestDictionaryEncodedHelpers:
+    """Test suite for the dictionary-encoded column helpers in `utils.vaex_helpers`."""
+
+    @pytest.fixture
+    def dictionary_dataframe(self) -> vaex.DataFrame:
+        """Return a DataFrame with a dictionary-encoded and a plain string column."""
+        return vaex.from_arrays(
+            encoded=pa.array(["x", "y", None, "x"]).dictionary_encode(),
+            plain=["x", "y", None, "x"],
+        )
+
+    def test_is_dictionary_encoded(self, dictionary_dataframe: vaex.DataFrame):
+        """Should only report dictionary-encoded columns as encoded."""
+        assert is_dictionary_encoded(dictionary_dataframe, "encoded")
+        assert not is_dictionary_encoded(dictionary_dataframe, "plain")
+
+    def test_codes_and_labels(self, dictionary_dataframe: vaex.DataFrame):
+        """Should return the integer codes with -1 for missing values and the dictionary labels."""
+        assert get_dictionary_codes(dictionary_dataframe, "encoded").tolist() == [0, 1, -1, 0]
+        assert get_dictionary_labels(dictionary_dataframe, "encoded") == ["x", "y"]
+
+    def test_map_dictionary_encoded(self, dictionary_dataframe: vaex.DataFrame):
+        """Should map labels through the codes, using defaults for unmapped and missing values."""
+        result = map_dictionary_encoded(dictionary_dataframe, "encoded", {"x": 10}, default_value=0, missing_value=-5)
+        assert result.tolist() == [10, 0, -5, 10]
+
+
+class TestGetUniqueValues:
+    """Test suite for `utils.vaex_helpers.get_unique_values`."""
+
+    def test_get_unique_values(self):
+        """Should return the unique values of each expression in order of first occurrence across chunks."""
+        df = vaex.from_arrays(x=["b", "a", "b", None, "c", "a"], y=[3, 1, 3, 2, 2, 1])
+
+        unique_values = get_unique_values(df, ["x", "y", "y * 2"], chunk_size=2)
+
+        assert [values.to_pylist() for values in unique_values] == [["b", "a", None, "c"], [3, 1, 2], [6, 2, 4]]
+        assert unique_values[0].type == pa.string()
+        assert get_unique_values(df[df.y > 5], ["x"])[0].type == pa.string()
+
+    def test_combine_partial_unique_values(self):
+        """Should combine the partial unique values of many chunks without changing their order."""
+        df = vaex.from_arrays(x=np.arange(300) % 7)
+
+        with patch("mleko.utils.vaex_helpers.MAX_PARTIAL_UNIQUE_VALUES", 3):
+            with patch("mleko.utils.vaex_helpers.pc.unique", wraps=pc.unique) as mocked_unique:
+                unique_values = get_unique_values(df, ["x"], chunk_size=5)
+
+        assert unique_values[0].to_pylist() == [0, 1, 2, 3, 4, 5, 6]
+        assert all(
+            len(call.args[0].chunks) <= 3
+            for call in mocked_unique.call_args_list
+            if isinstance(call.args[0], pa.ChunkedArray)
+        )
+
+
+class TestGetValuePositions:
+    """Test suite for `utils.vaex_helpers.get_value_positions`."""
+
+    def test_get_value_positions(self):
+        """Should return the positions of plain, dictionary-encoded and chunked values, null if not found."""
+        value_set = pa.array(["a", "b"])
+
+        assert get_value_positions(pa.array(["b", "c", None, "a"]), value_set).to_pylist() == [1, None, None, 0]
+        assert get_value_positions(
+            pa.chunked_array([pa.array(["b", None]).dictionary_encode(), pa.array(["a"]).dictionary_encode()]),
+            value_set,
+        ).to_pylist() == [1, None, 0]
+
+
+class TestJitExpression:
+    """Test suite for `utils.vaex_helpers.jit_expression`."""
+
+    def test_jit_expression(self):
+        """Should fuse virtual columns into one cached kernel that propagates missing values."""
+        df = vaex.from_arrays(a=pa.array([1.0, None, 4.0]), b=np.array([2.0, 2.0, 4.0]))
+        df["y"] = df.a * 2
+        expression = "y / b + sqrt(b) * (a > 1)"
+
+        jitted = jit_expression(df, expression)
+        other_df = vaex.from_arrays(a=pa.array([2.0]), b=np.array([1.0]))
+        other_df["y"] = other_df.a * 2
+        other_jitted = jit_expression(other_df, expression)
+
+        assert set(jitted.expression.split("(")[1].rstrip(")").split(", ")) == {"a", "b"}
+        assert jitted.tolist() == df[expression].tolist() == [1.0, None, 4.0]
+        assert other_jitted.tolist() == [5.0]
+        assert (
+            other_df.functions[other_jitted.expression.split("(")[0]].f.f
+            is df.functions[jitted.expression.split("(")[0]].f.f
+        )
+        assert jit_expression(vaex.from_arrays(a=[1.0], b=[4.0]), "a / b").tolist() == [0.25]
+
+    def test_kernel_cache_eviction(self):
+        """Should keep only the most recently used kernels in the bounded kernel cache."""
+        df = vaex.from_arrays(a=[1.0, 2.0], b=[4.0, 1.0])
+        with patch.dict(vaex_helpers.JIT_KERNEL_CACHE, clear=True), patch.object(
+            vaex_helpers, "JIT_KERNEL_CACHE_SIZE", 2
+        ):
+            assert jit_expression(df, "a + b").tolist() == [5.0, 3.0]
+            assert jit_expression(df, "a - b").tolist() == [-3.0, 1.0]
+            assert jit_expression(df, "a + b").tolist() == [5.0, 3.0]
+            assert jit_expression(df, "a * b").tolist() == [4.0, 2.0]
+
+            assert [key[0] for key in vaex_helpers.JIT_KERNEL_CACHE] == ["(a + b)", "(a * b)"]
+
+    def test_pythran_backend(self):
+        """Should compile the expanded expression with `vaex` for the `pythran` backend."""
+        df = vaex.from_arrays(a=[1.0, 2.0], b=[4.0, 1.0])
+        df["y"] = df.a * 2
+        with patch.object(vaex.expression.Expression, "jit_pythran", autospec=True) as mocked_jit_pythran:
+            jit_expression(df, "y / b", backend="pythran")
+
+        assert mocked_jit_pythran.call_args.args[0].expression == "((a * 2) / b)"
+
+    def test_not_compilable(self):
+        """Should raise a `numba` typing error for expressions that cannot be compiled."""
+        with pytest.raises(TypingError, match="fillna"):
+            jit_expression(vaex.from_arrays(a=[1.0, 2.0]), "fillna(a, 0)")
+
+
+class TestMaterialization:
+    """Test suite for the materialization helpers of `utils.vaex_helpers`."""
+
+    @pytest.fixture(scope="function")
+    def virtual_dataframe(self) -> vaex.DataFrame:
+        """Return a DataFrame with a chain of virtual columns."""
+        df = vaex.from_arrays(x=[1, 2, 3, 4], s=["a", "b", "c", "d"])
+        df["y"] = df.x * 2
+        df["z"] = df.y + df.x
+        df["u"] = df.s.str.upper()
+        return df
+
+    def test_get_expression_depth(self, virtual_dataframe: vaex.DataFrame):
+        """Should return 0 for real columns and the length of the longest virtual column chain otherwise."""
+        assert [get_expression_depth(virtual_dataframe, column) for column in ["x", "y", "z", "u"]] == [0, 1, 2, 1]
+
+    def test_materialize_columns(self, virtual_dataframe: vaex.DataFrame, temporary_directory: Path):
+        """Should replace the virtual columns with memory-mapped columns, keeping their order and dependents."""
+        df = materialize_columns(
+            virtual_dataframe[virtual_dataframe.x > 1], ["y", "u"], temporary_directory / "m.arrow"
+        )
+
+        assert df.get_column_names() == ["x", "s", "y", "z", "u"]
+        assert list(df.virtual_columns) == ["z"]
+        assert not df.filtered
+        assert df.y.tolist() == [4, 6, 8]
+        assert df.z.tolist() == [6, 9, 12]
+        assert df.u.tolist() == ["B", "C", "D"]
+        assert [path.name for path in temporary_directory.iterdir()] == ["m.arrow"]
+
+
 class TestHashableVaexDataFrame:
     """Test suite for `utils.vaex_helpers.HashableVaexDataFrame`."""
 